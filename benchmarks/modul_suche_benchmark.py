@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+@file modul_suche_benchmark.py
+@brief Misst Sortierung, Filter und Volltextsuche der Modulübersicht auf großen Datenbanken.
+
+Legt eine temporäre Datenbank mit `--module` Modulen an und misst für jede
+Sortierspalte (auf- und absteigend), typische Filter und die Freitextsuche:
+- die Anzahl der Treffer (`COUNT(*)`, nötig für die Bildlaufleiste),
+- die erste Seite,
+- eine Folgeseite per Keyset sowie einen Sprung in die Mitte per Position.
+
+Zu jeder Abfrage wird ausgegeben, ob SQLite ein Zwischenergebnis sortieren muss
+(`TEMP B-TREE`), statt einem Index zu folgen.
+
+Aufruf: python benchmarks/modul_suche_benchmark.py --module 1000000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "dashboard"))
+
+from logik import Logik
+from modul_abfrage import ModulAbfrage, SORTIERSPALTEN
+
+SEITENGROESSE = 200
+NAMEN = ["Mathematik", "Programmierung", "Datenbanken", "Statistik", "Betriebssysteme", "Übersetzerbau",
+         "Rechnernetze", "Software Engineering", "Algorithmen", "Künstliche Intelligenz"]
+STATUS = ["Offen", "In Bearbeitung", "Abgeschlossen"]
+
+
+def module_erzeugen(anzahl: int):
+    """Erzeugt Module mit gestreuten Namen, Status, ECTS-Punkten und Startdaten."""
+    for i in range(anzahl):
+        yield (i % 6 + 1, f"{NAMEN[i * 7 % len(NAMEN)]} {i}", f"M{i}", STATUS[i % 3], 5 * (i % 3 + 1),
+               f"{2020 + i % 5}-{i % 12 + 1:02d}-{i % 28 + 1:02d}")
+
+
+def zeit_ms(funktion):
+    start = time.perf_counter()
+    ergebnis = funktion()
+    return (time.perf_counter() - start) * 1000, ergebnis
+
+
+def messen(logik, beschreibung: str, abfrage: ModulAbfrage):
+    """Misst Anzahl, erste Seite, Keyset-Folgeseite und Positionssprung einer Abfrage."""
+    dauer_anzahl, anzahl = zeit_ms(lambda: logik.get_moduluebersicht_anzahl(abfrage))
+    dauer_erste, erste = zeit_ms(lambda: logik.get_moduluebersicht_seite(SEITENGROESSE, abfrage=abfrage))
+    dauer_folge = dauer_sprung = 0.0
+    if erste:
+        dauer_folge, _ = zeit_ms(lambda: logik.get_moduluebersicht_seite(SEITENGROESSE, nach=erste[-1], abfrage=abfrage))
+        dauer_sprung, _ = zeit_ms(lambda: logik.get_moduluebersicht_seite(SEITENGROESSE, position=anzahl // 2, abfrage=abfrage))
+
+    sql, parameter = abfrage.seite_sql(SEITENGROESSE, nach=erste[-1] if erste else None)
+    plan = [zeile[3] for zeile in logik.datenbank.abfragen(f"EXPLAIN QUERY PLAN {sql}", parameter)]
+    sortiert = "TEMP B-TREE" if any("TEMP B-TREE" in schritt for schritt in plan) else "Index"
+    print(f"  {beschreibung:<32} {anzahl:>9}  Anzahl {dauer_anzahl:8.1f} ms  erste Seite {dauer_erste:7.1f} ms  "
+          f"Keyset {dauer_folge:6.1f} ms  Mitte {dauer_sprung:8.1f} ms  [{sortiert}]")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", type=int, default=1_000_000, help="Anzahl der Module in der Testdatenbank")
+    argumente = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as verzeichnis:
+        logik = Logik(db_pfad=str(Path(verzeichnis) / "modul_suche.db"))
+        logik.starten()
+        logik.set_startbildschirm_ansicht_daten(("Informatik", "2020-10-01", 0, "Vollzeit"))
+        dauer, _ = zeit_ms(lambda: logik.module_importieren(module_erzeugen(argumente.module)))
+        print(f"{argumente.module} Module importiert (inkl. Suchindex) in {dauer / 1000:.1f} s\n")
+
+        print("Sortierung:")
+        for sortierung in SORTIERSPALTEN:
+            for absteigend in (False, True):
+                messen(logik, f"{sortierung} {'absteigend' if absteigend else 'aufsteigend'}",
+                       ModulAbfrage(sortierung, absteigend))
+
+        print("Filter:")
+        messen(logik, "Status = Offen", ModulAbfrage(status="Offen"))
+        messen(logik, "Semester = 3, nach Name", ModulAbfrage("modulName", semester=3))
+        messen(logik, "ECTS = 10, nach Start", ModulAbfrage("modulStart", ects=10))
+        messen(logik, "Start im Juni 2022", ModulAbfrage("modulStart", von="2022-06-01", bis="2022-06-30"))
+        messen(logik, "Status + Semester + ECTS", ModulAbfrage(status="Abgeschlossen", semester=2, ects=15))
+
+        print("Volltextsuche:")
+        messen(logik, "'daten' (10 % Treffer)", ModulAbfrage(suchtext="daten"))
+        messen(logik, "'künstl intell'", ModulAbfrage("modulName", suchtext="künstl intell"))
+        messen(logik, "'M12345' (Kürzel)", ModulAbfrage(suchtext="M12345"))
+        messen(logik, "'statistik 4' + Offen", ModulAbfrage(status="Offen", suchtext="statistik 4"))
+        logik.beenden()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+@file schema_migration_benchmark.py
+@brief Misst die Dauer von Schema-Migrationen auf einer großen `modul`-Tabelle.
+
+Legt eine temporäre Datenbank mit den YAML-Definitionen an, füllt `modul` mit
+`--zeilen` Einträgen und migriert anschließend einmal per ADD COLUMN und einmal
+per Neuaufbau. Dabei wird geprüft, dass nur die geänderte Tabelle angefasst wird.
+
+Aufruf: python benchmarks/schema_migration_benchmark.py --zeilen 1000000
+"""
+
+import argparse
+import copy
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "dashboard"))
+
+from datenbank_zugriff import DatenbankZugriff, SCHEMA_VERZEICHNIS
+from schema_migration import SchemaMigration, Migrationsschritt
+
+
+def befuellen(db: DatenbankZugriff, zeilen: int):
+    """Füllt Studiengang, Semester und `zeilen` Module."""
+    db.studiengang_speichern("Informatik", "2023-10-01", 0, "Vollzeit")
+    status = ("Offen", "In Bearbeitung", "Abgeschlossen")
+    with db.transaktion():
+        db.verbindung.executemany(
+            "INSERT INTO modul (semesterID, modulName, modulKuerzel, modulStatus, modulEctsPunkte, modulStart) "
+            "VALUES (?, ?, ?, ?, ?, ?);",
+            ((i % 6 + 1, f"Modul {i}", f"M{i}", status[i % 3], 5, "2023-10-01") for i in range(zeilen))
+        )
+
+
+def migrieren(db: DatenbankZugriff, definitionen: list, beschreibung: str):
+    """Plant und wendet eine Migration an und gibt die Dauer aus."""
+    migration = SchemaMigration(db.verbindung)
+    start = time.perf_counter()
+    schritte = migration.planen(definitionen)
+    migration.anwenden(schritte, definitionen)
+    dauer = time.perf_counter() - start
+
+    tabellen_arten = (
+        Migrationsschritt.TABELLE_ERSTELLEN,
+        Migrationsschritt.SPALTE_HINZUFUEGEN,
+        Migrationsschritt.TABELLE_NEU_AUFBAUEN,
+    )
+    ziele = sorted({s.ziel for s in schritte if s.art in tabellen_arten})
+    print(f"{beschreibung:<28} {dauer:8.3f} s   Schritte: {len(schritte):2d}   Tabellen: {ziele}")
+    assert set(ziele) <= {"modul"}, "Nur die Tabelle 'modul' darf migriert werden."
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--zeilen", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as verzeichnis:
+        db = DatenbankZugriff(db_pfad=str(Path(verzeichnis) / "benchmark.db"))
+        db.starten()
+        befuellen(db, args.zeilen)
+        print(f"modul: {args.zeilen} Zeilen")
+
+        yaml_dateien = sorted(SCHEMA_VERZEICHNIS.glob("*.yaml"))
+        definitionen = db._lade_schema_definitionen(yaml_dateien, db._schema_fingerabdruck(yaml_dateien))
+        modul = next(config for _, config in definitionen if config.get("tabelle") == "modul")
+
+        mit_notiz = copy.deepcopy(definitionen)
+        modul_neu = next(config for _, config in mit_notiz if config.get("tabelle") == "modul")
+        modul_neu["spalten"]["modulNotiz"] = "TEXT DEFAULT ''"
+        migrieren(db, mit_notiz, "ADD COLUMN modulNotiz")
+
+        ohne_notiz = copy.deepcopy(definitionen)
+        migrieren(db, ohne_notiz, "Neuaufbau (Spalte entfernt)")
+        migrieren(db, ohne_notiz, "Unverändert")
+
+        assert modul["spalten"].keys() == {
+            zeile[1]: None for zeile in db.verbindung.execute("PRAGMA table_info(modul);")
+        }.keys()
+        db.trennen()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+@file verbindungsprofil_benchmark.py
+@brief Vergleicht den Schreibdurchsatz der Verbindungsprofile auf den `manipulieren`-Pfaden.
+
+Für jedes schreibende Profil wird eine temporäre Datenbank angelegt und
+`--module` Module einmal einzeln per `modul_speichern` (ein Commit je Modul,
+wie beim Speichern aus der Modulübersicht) und einmal innerhalb einer
+Transaktion gespeichert. Danach werden alle Module per `modul_aktualisieren`
+geändert und die Modulübersicht gelesen.
+
+Aufruf: python benchmarks/verbindungsprofil_benchmark.py --module 2000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "dashboard"))
+
+from datenbank_zugriff import DatenbankZugriff, VERBINDUNGSPROFILE
+
+
+def messen(beschreibung: str, anzahl: int, funktion):
+    """Führt `funktion` aus und gibt Dauer und Operationen pro Sekunde aus."""
+    start = time.perf_counter()
+    funktion()
+    dauer = time.perf_counter() - start
+    print(f"  {beschreibung:<32} {dauer:8.3f} s   {anzahl / dauer:12,.0f} Op/s")
+
+
+def profil_messen(profil: str, verzeichnis: str, anzahl: int):
+    """Misst alle Schreibpfade für ein Profil auf einer frischen Datenbank."""
+    db = DatenbankZugriff(db_pfad=str(Path(verzeichnis) / f"{profil}.db"), profil=profil)
+    db.starten()
+    db.studiengang_speichern("Informatik", "2023-10-01", 0, "Vollzeit")
+    print(f"{profil}: {VERBINDUNGSPROFILE[profil] or 'SQLite-Voreinstellungen'}")
+
+    def einzeln():
+        for i in range(anzahl):
+            db.modul_speichern(i % 6 + 1, f"Modul {i}", f"E{i}", "Offen", 5, "2023-10-01")
+
+    def transaktion():
+        with db.transaktion():
+            for i in range(anzahl):
+                db.modul_speichern(i % 6 + 1, f"Modul {i}", f"T{i}", "Offen", 5, "2023-10-01")
+
+    def aktualisieren():
+        for (modul_id,) in db.abfragen("SELECT modulID FROM modul;"):
+            db.modul_aktualisieren(modul_id, "Modul", f"U{modul_id}", "Abgeschlossen", 5, "2023-10-01")
+
+    messen("modul_speichern (je Commit)", anzahl, einzeln)
+    messen("modul_speichern (Transaktion)", anzahl, transaktion)
+    messen("modul_aktualisieren (je Commit)", 2 * anzahl, aktualisieren)
+    messen("SELECT moduluebersicht", 1, lambda: db.abfragen("SELECT * FROM moduluebersicht;"))
+    db.trennen()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--module", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as verzeichnis:
+        for profil in VERBINDUNGSPROFILE:
+            if not VERBINDUNGSPROFILE[profil].get("nur_lesen"):
+                profil_messen(profil, verzeichnis, args.module)
+
+
+if __name__ == "__main__":
+    main()
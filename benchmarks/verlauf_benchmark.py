@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+@file verlauf_benchmark.py
+@brief Misst das Laden des Studienfortschritts für das Diagramm auf großen Verlaufstabellen.
+
+Legt eine temporäre Datenbank mit `--tage` Verlaufseinträgen in zufälliger
+Einfügereihenfolge an und vergleicht:
+- den bisherigen Weg: Zeilen als Tupel laden, in Python sortieren, Datumswerte mit
+  `strptime` einlesen und die Zähler in numpy-Arrays umwandeln,
+- den spaltenweisen Weg über `Logik.get_studienfortschritt_spalten`
+  (Sortierung per Index, `datetime64[D]`- und `int32`-Arrays direkt aus SQLite).
+
+Aufruf: python benchmarks/verlauf_benchmark.py --tage 1000000
+"""
+
+import argparse
+import datetime
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "dashboard"))
+
+from logik import Logik
+
+
+def verlauf_erzeugen(anzahl: int):
+    """Erzeugt `anzahl` aufeinanderfolgende Tage mit Zählerständen, gemischt eingefügt."""
+    erster_tag = datetime.date(1000, 1, 1)
+    tage = list(range(anzahl))
+    random.Random(0).shuffle(tage)
+    for tag in tage:
+        yield tag % 40, tag % 7, tag % 30, (erster_tag + datetime.timedelta(days=tag)).isoformat()
+
+
+def zeilenweise(logik):
+    """Der bisherige Weg der Ansicht `Studienfortschritt`."""
+    daten = logik.datenbank.abfragen("SELECT * FROM studienfortschritt;")
+    daten.sort(key=lambda x: x[3])
+    x_werte = [datetime.datetime.strptime(d[3], "%Y-%m-%d") for d in daten]
+    return x_werte, np.array([int(d[0]) for d in daten]), np.array([int(d[1]) for d in daten]), \
+        np.array([int(d[2]) for d in daten])
+
+
+def zeit_ms(funktion):
+    start = time.perf_counter()
+    ergebnis = funktion()
+    return (time.perf_counter() - start) * 1000, ergebnis
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tage", type=int, default=1_000_000, help="Anzahl der Verlaufseinträge")
+    argumente = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as verzeichnis:
+        logik = Logik(db_pfad=str(Path(verzeichnis) / "verlauf.db"))
+        logik.starten()
+        logik.set_startbildschirm_ansicht_daten(("Informatik", "2020-10-01", 0, "Vollzeit"))
+        with logik.datenbank.transaktion() as datenbank:
+            dauer, _ = zeit_ms(lambda: datenbank.verbindung.executemany(
+                "INSERT INTO verlauf (modulOffen, modulInBearbeitung, modulAbgeschlossen, zeitpunkt) VALUES (?, ?, ?, ?);",
+                verlauf_erzeugen(argumente.tage),
+            ))
+        print(f"{argumente.tage} Verlaufseinträge eingefügt in {dauer / 1000:.1f} s\n")
+
+        plan = [zeile[3] for zeile in logik.datenbank.abfragen("EXPLAIN QUERY PLAN SELECT * FROM studienfortschritt;")]
+        print(f"  Query Plan: {plan}")
+
+        dauer_zeilen, (x_werte, offen, _, _) = zeit_ms(lambda: zeilenweise(logik))
+        print(f"  zeilenweise (sort, strptime, np.array)   {dauer_zeilen:9.1f} ms")
+        # Die erzeugten Tage reichen weit über heute hinaus, `bis` wäre sonst auf heute begrenzt
+        spalten_laden = lambda: logik.get_studienfortschritt_spalten(bis="9999-12-31")
+        dauer_spalten, (tage, offen_spalten, _, _) = zeit_ms(spalten_laden)
+        print(f"  spaltenweise (numpy-Arrays aus SQLite)   {dauer_spalten:9.1f} ms  [{tage.dtype}, {offen_spalten.dtype}]")
+        dauer_cache, _ = zeit_ms(spalten_laden)
+        print(f"  spaltenweise, aus dem Cache              {dauer_cache:9.1f} ms")
+
+        assert (tage == np.array(x_werte, dtype="datetime64[D]")).all() and (offen_spalten == offen).all()
+        logik.beenden()
+
+
+if __name__ == "__main__":
+    main()
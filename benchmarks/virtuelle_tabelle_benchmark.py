@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+@file virtuelle_tabelle_benchmark.py
+@brief Misst Scroll-Latenz und Speicherbedarf der virtuellen Modulübersicht.
+
+Legt eine temporäre Datenbank mit `--module` Modulen an und vergleicht:
+- das bisherige Vorgehen: alle Zeilen laden und jede als Treeview-Eintrag anlegen,
+- den `Seitenpuffer` der `VirtuellenTabelle`: zeilenweises Scrollen, seitenweises
+  Blättern und zufällige Sprünge mit der Bildlaufleiste.
+
+Ist ein Display verfügbar, werden zusätzlich beide Varianten mit einer echten
+`ttk.Treeview` gemessen (einschließlich Anlegen der Einträge).
+
+Aufruf: python benchmarks/virtuelle_tabelle_benchmark.py --module 100000
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "dashboard"))
+
+from logik import Logik
+from virtuelle_tabelle import Seitenpuffer, VirtuelleTabelle
+
+SICHTBARE_ZEILEN = 25
+
+
+def latenzen_ausgeben(beschreibung: str, dauern: list):
+    """Gibt Median, 95. Perzentil und Maximum einer Liste von Dauern in Sekunden aus."""
+    dauern = sorted(dauern)
+    p95 = dauern[int(len(dauern) * 0.95) - 1]
+    print(f"  {beschreibung:<34} p50 {statistics.median(dauern) * 1000:7.3f} ms   "
+          f"p95 {p95 * 1000:7.3f} ms   max {dauern[-1] * 1000:7.3f} ms")
+
+
+def speicher_messen(beschreibung: str, funktion):
+    """Führt `funktion` aus und gibt Dauer und Spitzenbedarf an Python-Speicher aus."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    ergebnis = funktion()
+    dauer = time.perf_counter() - start
+    _, spitze = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {beschreibung:<34} {dauer * 1000:9.1f} ms   Speicher {spitze / 2**20:8.2f} MiB")
+    return ergebnis
+
+
+def scrollen_messen(zeige_bereich, anzahl: int):
+    """Misst zeilenweises Scrollen, Blättern und zufällige Sprünge über `zeige_bereich(start)`."""
+    def messen(positionen):
+        dauern = []
+        for position in positionen:
+            start = time.perf_counter()
+            zeige_bereich(position)
+            dauern.append(time.perf_counter() - start)
+        return dauern
+
+    latenzen_ausgeben("Scrollen (1 Zeile)", messen(range(0, 2000)))
+    latenzen_ausgeben("Blättern (1 Seite)", messen(range(0, anzahl - SICHTBARE_ZEILEN, SICHTBARE_ZEILEN)[:2000]))
+    zufall = random.Random(42)
+    latenzen_ausgeben("Sprung (Bildlaufleiste)", messen(zufall.randrange(anzahl) for _ in range(500)))
+
+
+def tk_messen(logik, anzahl: int):
+    """Misst beide Varianten mit einer echten Treeview, sofern ein Display verfügbar ist."""
+    import tkinter as tk
+    from tkinter import ttk
+
+    try:
+        wurzel = tk.Tk()
+    except tk.TclError:
+        print("Kein Display verfügbar – Treeview-Messung übersprungen.")
+        return
+
+    print("Treeview mit allen Zeilen:")
+    tree = ttk.Treeview(wurzel, columns=tuple(range(7)), show="headings")
+
+    def alle_einfuegen():
+        for zeile in logik.get_moduluebersicht_ansicht_daten():
+            tree.insert("", tk.END, iid=str(zeile[0]), values=zeile)
+        wurzel.update()
+
+    speicher_messen(f"{anzahl} Einträge anlegen", alle_einfuegen)
+    latenzen_ausgeben("Sprung (yview_moveto)", [
+        _zeit(lambda: (tree.yview_moveto(random.random()), wurzel.update_idletasks())) for _ in range(200)
+    ])
+    tree.destroy()
+
+    print(f"VirtuelleTabelle ({SICHTBARE_ZEILEN} sichtbare Zeilen):")
+    tabelle = VirtuelleTabelle(wurzel, tuple(range(7)), logik.get_moduluebersicht_seite, logik.get_moduluebersicht_anzahl)
+    tabelle.sichtbare_zeilen = SICHTBARE_ZEILEN
+    tabelle.pack()
+    speicher_messen("Erste Anzeige", lambda: (tabelle.neu_laden(), wurzel.update()))
+
+    def zeige_bereich(position):
+        tabelle.scrollen_zu(position)
+        wurzel.update_idletasks()
+
+    scrollen_messen(zeige_bereich, anzahl)
+    print(f"  Treeview-Einträge: {len(tabelle.tree.get_children())}, gehaltene Seiten: {tabelle.puffer.geladene_seiten}")
+    wurzel.destroy()
+
+
+def _zeit(funktion) -> float:
+    start = time.perf_counter()
+    funktion()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", type=int, default=100_000, help="Anzahl der Module in der Testdatenbank")
+    argumente = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as verzeichnis:
+        logik = Logik(db_pfad=str(Path(verzeichnis) / "virtuelle_tabelle.db"))
+        logik.starten()
+        logik.set_startbildschirm_ansicht_daten(("Informatik", "2023-10-01", 0, "Vollzeit"))
+        logik.module_importieren(
+            (i % 6 + 1, f"Modul {i}", f"M{i}", "Offen", 5, "2023-10-01") for i in range(argumente.module)
+        )
+        anzahl = logik.get_moduluebersicht_anzahl()
+        print(f"{anzahl} Module in der Modulübersicht\n")
+
+        print("Bisher: alle Zeilen laden")
+        speicher_messen("SELECT * FROM moduluebersicht", lambda: logik.datenbank.abfragen("SELECT * FROM moduluebersicht;"))
+
+        print("Seitenpuffer (Keyset-Paginierung, 200 Zeilen je Seite):")
+        puffer = Seitenpuffer(logik.get_moduluebersicht_seite, logik.get_moduluebersicht_anzahl)
+        speicher_messen("Erste Seite", lambda: puffer.zeilen(0, SICHTBARE_ZEILEN))
+        scrollen_messen(lambda position: puffer.zeilen(position, position + SICHTBARE_ZEILEN), anzahl)
+        print(f"  Abfragen: {puffer.abfragen}, gehaltene Seiten: {puffer.geladene_seiten}\n")
+
+        tk_messen(logik, anzahl)
+        logik.beenden()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+@file abfrage_cache.py
+@brief Größenbeschränkter Ergebniscache für Leseabfragen der Logik-Schicht.
+
+Jeder Eintrag merkt sich die Tabellen, aus denen sein Ergebnis stammt. Ändert sich
+eine dieser Tabellen, wird genau dieser Eintrag verworfen. Ist der Cache voll, wird
+der am längsten nicht mehr verwendete Eintrag entfernt (LRU).
+
+@author CHOE
+@date 2025-01-31
+@version 1.0
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class AbfrageCache:
+    """
+    @class AbfrageCache
+    @brief Read-Through-Cache mit LRU-Verdrängung und Invalidierung auf Tabellenebene.
+    """
+
+    def __init__(self, maximale_groesse: int = 32):
+        """
+        @brief Initialisiert einen leeren Cache.
+        @param maximale_groesse Maximale Anzahl gleichzeitig gespeicherter Ergebnisse.
+        """
+        if maximale_groesse < 1:
+            raise ValueError("Die maximale Größe des Caches muss mindestens 1 sein.")
+        self.maximale_groesse = maximale_groesse
+        self.treffer = 0
+        self.fehlversuche = 0
+        self._eintraege = OrderedDict()  # Schlüssel -> (Ergebnis, Tabellen oder None)
+        self._generation = 0  # wird bei jeder Invalidierung erhöht
+        self._sperre = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._eintraege)
+
+    def __contains__(self, schluessel) -> bool:
+        return schluessel in self._eintraege
+
+    def holen(self, schluessel, laden, tabellen=None):
+        """
+        @brief Liefert das gespeicherte Ergebnis oder lädt und speichert es.
+
+        @param schluessel Hashbarer Schlüssel, z. B. (Ansichtsname, Parameter).
+        @param laden Funktion ohne Parameter, die das Ergebnis bei einem Fehlversuch liefert.
+        @param tabellen Tabellen, von denen das Ergebnis abhängt. `None` bedeutet, dass jede
+            Änderung den Eintrag ungültig macht.
+        @return Eine Kopie des Ergebnisses, damit Aufrufer den Cache nicht verändern.
+
+        @note Wird der Cache invalidiert, während `laden` läuft (z. B. durch einen Schreibzugriff
+            aus einem anderen Thread), wird das möglicherweise veraltete Ergebnis nicht gespeichert.
+        """
+        with self._sperre:
+            if schluessel in self._eintraege:
+                self._eintraege.move_to_end(schluessel)
+                self.treffer += 1
+                return list(self._eintraege[schluessel][0])
+            self.fehlversuche += 1
+            generation = self._generation
+
+        ergebnis = laden()
+
+        with self._sperre:
+            if generation != self._generation:
+                return list(ergebnis)
+            self._eintraege[schluessel] = (list(ergebnis), None if tabellen is None else frozenset(tabellen))
+            self._eintraege.move_to_end(schluessel)
+            while len(self._eintraege) > self.maximale_groesse:
+                self._eintraege.popitem(last=False)
+        return list(ergebnis)
+
+    def invalidieren(self, tabellen=None) -> int:
+        """
+        @brief Verwirft alle Einträge, die von einer der geänderten Tabellen abhängen.
+
+        @param tabellen Menge der geänderten Tabellen. `None` verwirft den gesamten Cache.
+        @return Anzahl der verworfenen Einträge.
+        """
+        with self._sperre:
+            self._generation += 1
+            if tabellen is None:
+                anzahl = len(self._eintraege)
+                self._eintraege.clear()
+                return anzahl
+
+            tabellen = set(tabellen)
+            veraltet = [
+                schluessel for schluessel, (_, abhaengig) in self._eintraege.items()
+                if abhaengig is None or abhaengig & tabellen
+            ]
+            for schluessel in veraltet:
+                del self._eintraege[schluessel]
+            return len(veraltet)
+
+    def statistik(self) -> dict:
+        """
+        @brief Liefert Kennzahlen zur Wirksamkeit des Caches.
+        @return Dictionary mit Treffern, Fehlversuchen, Trefferquote und Belegung.
+        """
+        with self._sperre:
+            anfragen = self.treffer + self.fehlversuche
+            return {
+                "treffer": self.treffer,
+                "fehlversuche": self.fehlversuche,
+                "trefferquote": self.treffer / anfragen if anfragen else 0.0,
+                "eintraege": len(self._eintraege),
+                "maximale_groesse": self.maximale_groesse,
+            }
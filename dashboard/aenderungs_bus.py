@@ -0,0 +1,156 @@
+"""
+@file aenderungs_bus.py
+@brief Publish/Subscribe-Kanal für festgeschriebene Datenbankänderungen.
+
+`DatenbankZugriff` veröffentlicht nach jedem Commit die geänderten Zeilen als
+`Aenderung(tabelle, operation, zeilen_id)`. Ansichten abonnieren die Tabellen,
+die sie anzeigen, und aktualisieren gezielt nur die betroffenen Zeilen, statt
+sich vollständig neu aufzubauen.
+
+@author CHOE
+@date 2025-01-31
+@version 1.0
+"""
+
+import logging
+import queue
+import threading
+from collections import namedtuple
+
+## Eine geänderte Zeile. `operation` ist "INSERT", "UPDATE" oder "DELETE". Bei sehr vielen
+## Änderungen an einer Tabelle wird eine Sammelmeldung mit `operation` und `zeilen_id` None
+## verschickt, auf die mit einem vollständigen Neuladen reagiert werden sollte.
+Aenderung = namedtuple("Aenderung", ["tabelle", "operation", "zeilen_id"])
+
+
+class Abonnement:
+    """
+    @class Abonnement
+    @brief Ein registrierter Empfänger von Änderungen.
+    """
+
+    def __init__(self, bus, rueckruf, tabellen=None, widget=None, abfrageintervall_ms: int = 100):
+        """
+        @param bus Der Bus, bei dem das Abonnement registriert ist.
+        @param rueckruf Funktion, die eine Liste von `Aenderung` erhält.
+        @param tabellen Optional: nur Änderungen an diesen Tabellen zustellen.
+        @param widget Optionales Tk-Widget. Änderungen werden dann gesammelt und im Tk-Thread
+            per `after()` zugestellt; das Abonnement endet mit der Zerstörung des Widgets.
+        @param abfrageintervall_ms Abstand der Zustellung im Tk-Thread.
+        """
+        self.bus = bus
+        self.rueckruf = rueckruf
+        self.tabellen = None if tabellen is None else frozenset(tabellen)
+        self.widget = widget
+        self.abfrageintervall_ms = abfrageintervall_ms
+        self.aktiv = True
+        self._eingang = queue.Queue()
+        if widget is not None:
+            widget.after(abfrageintervall_ms, self._abfragen)
+
+    def kuendigen(self) -> None:
+        """
+        @brief Beendet das Abonnement; danach werden keine Änderungen mehr zugestellt.
+        """
+        self.aktiv = False
+        self.bus._abmelden(self)
+
+    def zustellen(self, aenderungen: list) -> None:
+        """
+        @brief Filtert die Änderungen nach Tabellen und stellt sie zu (bzw. reiht sie ein).
+        @param aenderungen Liste von `Aenderung`.
+        """
+        if not self.aktiv:
+            return
+        if self.tabellen is not None:
+            aenderungen = [aenderung for aenderung in aenderungen if aenderung.tabelle in self.tabellen]
+        if not aenderungen:
+            return
+        if self.widget is None:
+            self.rueckruf(aenderungen)
+        else:
+            self._eingang.put(aenderungen)
+
+    def verarbeiten(self) -> int:
+        """
+        @brief Stellt eingereihte Änderungen im aufrufenden (Tk-)Thread in einem Aufruf zu.
+        @return Anzahl der zugestellten Änderungen.
+        """
+        gesammelt = []
+        while True:
+            try:
+                gesammelt.extend(self._eingang.get_nowait())
+            except queue.Empty:
+                break
+        if gesammelt and self.aktiv:
+            self.rueckruf(gesammelt)
+        return len(gesammelt)
+
+    def _abfragen(self) -> None:
+        """
+        @brief Von Tk aufgerufen: stellt Änderungen zu und plant die nächste Zustellung.
+        """
+        if not self.aktiv:
+            return
+        try:
+            if not self.widget.winfo_exists():
+                self.kuendigen()
+                return
+        except Exception:
+            self.kuendigen()
+            return
+        self.verarbeiten()
+        self.widget.after(self.abfrageintervall_ms, self._abfragen)
+
+
+class AenderungsBus:
+    """
+    @class AenderungsBus
+    @brief Verteilt festgeschriebene Änderungen an alle Abonnenten.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger("AenderungsBus")
+        self._abonnements = []
+        self._sperre = threading.Lock()
+
+    def abonnieren(self, rueckruf, tabellen=None, widget=None) -> Abonnement:
+        """
+        @brief Registriert einen Empfänger für Änderungen.
+
+        @code
+        logik.aenderungen.abonnieren(self.module_aktualisieren, {"modul"}, widget=self)
+        @endcode
+
+        @param rueckruf Funktion, die eine Liste von `Aenderung` erhält.
+        @param tabellen Optional: nur Änderungen an diesen Tabellen zustellen.
+        @param widget Optionales Tk-Widget für die Zustellung im Tk-Thread.
+        @return Das Abonnement, über das die Registrierung beendet werden kann.
+        """
+        abonnement = Abonnement(self, rueckruf, tabellen, widget)
+        with self._sperre:
+            self._abonnements.append(abonnement)
+        return abonnement
+
+    def veroeffentlichen(self, aenderungen: list) -> None:
+        """
+        @brief Stellt Änderungen allen passenden Abonnenten zu.
+
+        Fehler einzelner Empfänger werden protokolliert und beeinflussen die übrigen nicht.
+
+        @param aenderungen Liste von `Aenderung`.
+        """
+        if not aenderungen:
+            return
+        with self._sperre:
+            abonnements = list(self._abonnements)
+        for abonnement in abonnements:
+            try:
+                abonnement.zustellen(aenderungen)
+            except Exception as e:
+                self.logger.error(f"❌ Fehler beim Zustellen von Änderungen: {e}")
+
+    def _abmelden(self, abonnement: Abonnement) -> None:
+        with self._sperre:
+            if abonnement in self._abonnements:
+                self._abonnements.remove(abonnement)
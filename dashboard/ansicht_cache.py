@@ -0,0 +1,101 @@
+"""
+@file ansicht_cache.py
+@brief LRU-Cache für bereits aufgebaute Ansichten des Dashboards.
+
+Beim Wechsel der Ansicht wird die bisherige Ansicht nur ausgeblendet und bei einem
+erneuten Besuch wieder eingeblendet, statt sie samt Diagrammen und Datenbankabfragen
+neu aufzubauen. Übersteigt die Anzahl gehaltener Ansichten die Obergrenze, wird die
+am längsten nicht besuchte Ansicht zerstört, wodurch sie auch ihre Diagramme schließt.
+
+@author CHOE
+@date 2025-01-31
+@version 1.0
+"""
+
+import logging
+from collections import OrderedDict
+
+
+class AnsichtCache:
+    """
+    @class AnsichtCache
+    @brief Hält aufgebaute Ansichten und zerstört die am längsten nicht genutzte bei Überlauf.
+    """
+
+    def __init__(self, max_ansichten: int = 3):
+        """
+        @param max_ansichten Maximale Anzahl gleichzeitig gehaltener Ansichten (mindestens 1).
+        """
+        if max_ansichten < 1:
+            raise ValueError("max_ansichten muss mindestens 1 sein.")
+        self.max_ansichten = max_ansichten
+        self.logger = logging.getLogger("AnsichtCache")
+        self._ansichten = OrderedDict()
+        self.treffer = 0
+        self.erstellt = 0
+        self.verdraengt = 0
+
+    def holen(self, schluessel, erstellen) -> tuple:
+        """
+        @brief Liefert die gehaltene Ansicht oder baut sie mit `erstellen()` neu auf.
+
+        @param schluessel Schlüssel der Ansicht, z. B. ein `AnsichtTyp`.
+        @param erstellen Funktion ohne Parameter, die eine neue Ansicht erzeugt.
+        @return Tupel (Ansicht, True, falls sie neu erstellt wurde).
+        """
+        ansicht = self._ansichten.get(schluessel)
+        if ansicht is not None:
+            self._ansichten.move_to_end(schluessel)
+            self.treffer += 1
+            return ansicht, False
+
+        ansicht = erstellen()
+        self._ansichten[schluessel] = ansicht
+        self.erstellt += 1
+        while len(self._ansichten) > self.max_ansichten:
+            alter_schluessel, alte_ansicht = self._ansichten.popitem(last=False)
+            self.verdraengt += 1
+            self.logger.info(f"🧹 Ansicht '{alter_schluessel}' wird verworfen.")
+            alte_ansicht.destroy()
+        return ansicht, True
+
+    def entfernen(self, schluessel) -> None:
+        """
+        @brief Zerstört die Ansicht zu einem Schlüssel, falls sie gehalten wird.
+        """
+        ansicht = self._ansichten.pop(schluessel, None)
+        if ansicht is not None:
+            ansicht.destroy()
+
+    def leeren(self) -> None:
+        """
+        @brief Zerstört alle gehaltenen Ansichten.
+        """
+        while self._ansichten:
+            _, ansicht = self._ansichten.popitem(last=False)
+            ansicht.destroy()
+
+    def enthaelt_ansicht(self, ansicht) -> bool:
+        """
+        @brief Prüft, ob eine Ansichtsinstanz im Cache gehalten wird.
+        """
+        return any(gehalten is ansicht for gehalten in self._ansichten.values())
+
+    def statistik(self) -> dict:
+        """
+        @brief Liefert Treffer, Neuaufbauten und verdrängte Ansichten.
+        @return Dictionary mit den Kennzahlen des Caches.
+        """
+        return {
+            "treffer": self.treffer,
+            "erstellt": self.erstellt,
+            "verdraengt": self.verdraengt,
+            "ansichten": len(self._ansichten),
+            "max_ansichten": self.max_ansichten,
+        }
+
+    def __len__(self) -> int:
+        return len(self._ansichten)
+
+    def __contains__(self, schluessel) -> bool:
+        return schluessel in self._ansichten
@@ -0,0 +1,93 @@
+"""
+@file ansicht_register.py
+@brief Verzeichnis der Ansichten, deren Module erst beim ersten Öffnen importiert werden.
+
+Die Ansichtsmodule ziehen schwere Abhängigkeiten wie matplotlib, numpy und tkcalendar
+nach sich. Damit das erste Fenster schnell erscheint, hält das Register nur Modul- und
+Klassennamen und importiert ein Modul erst, wenn die Ansicht geöffnet wird. Optional
+werden die übrigen Module nach dem ersten Zeichnen in einem Hintergrund-Thread vorgeladen.
+
+@author CHOE
+@date 2025-01-31
+@version 1.0
+"""
+
+import importlib
+import logging
+import threading
+
+
+class AnsichtRegister:
+    """
+    @class AnsichtRegister
+    @brief Ordnet Ansichtstypen ihren Klassen zu und importiert diese bei Bedarf.
+
+    @code
+    register = AnsichtRegister({AnsichtTyp.MODULUEBERSICHT: ("ansichten.moduluebersicht", "Moduluebersicht")})
+    ansicht = register.klasse(AnsichtTyp.MODULUEBERSICHT)(master)
+    @endcode
+    """
+
+    def __init__(self, eintraege: dict):
+        """
+        @param eintraege Dictionary Ansichtstyp -> (Modulname, Klassenname); die Reihenfolge
+            bestimmt die Reihenfolge in der Navigation.
+        """
+        self.eintraege = dict(eintraege)
+        self.logger = logging.getLogger("AnsichtRegister")
+        self._klassen = {}
+        self._sperre = threading.Lock()
+
+    def klasse(self, typ):
+        """
+        @brief Liefert die Klasse einer Ansicht und importiert ihr Modul beim ersten Aufruf.
+
+        @param typ Der Ansichtstyp.
+        @return Die Ansichtsklasse.
+        @exception KeyError Falls der Typ nicht registriert ist.
+        """
+        klasse = self._klassen.get(typ)
+        if klasse is None:
+            modulname, klassenname = self.eintraege[typ]
+            # Ohne eigene Sperre: Python sperrt beim Import je Modul, sodass der Tk-Thread nicht
+            # hinter dem Vorwärmen eines anderen Moduls wartet
+            klasse = getattr(importlib.import_module(modulname), klassenname)
+            with self._sperre:
+                klasse = self._klassen.setdefault(typ, klasse)
+            self.logger.info(f"📦 Ansichtsmodul '{modulname}' geladen.")
+        return klasse
+
+    def geladen(self, typ) -> bool:
+        """
+        @brief Prüft, ob das Modul einer Ansicht bereits importiert wurde.
+        """
+        return typ in self._klassen
+
+    def vorwaermen(self, typen=None) -> threading.Thread:
+        """
+        @brief Importiert die Module noch nicht geöffneter Ansichten in einem Hintergrund-Thread.
+
+        Es werden nur Module importiert, aber keine Widgets erstellt; Fehler werden protokolliert
+        und erst beim tatsächlichen Öffnen der Ansicht gemeldet.
+
+        @param typen Optional: nur diese Ansichtstypen vorladen (Standard: alle).
+        @return Der gestartete Thread.
+        """
+        offen = [typ for typ in (typen or self.eintraege) if not self.geladen(typ)]
+
+        def laden():
+            for typ in offen:
+                try:
+                    self.klasse(typ)
+                except Exception as e:
+                    self.logger.warning(f"⚠️ Ansicht '{typ}' konnte nicht vorgeladen werden: {e}")
+
+        thread = threading.Thread(target=laden, name="AnsichtVorwaermen", daemon=True)
+        thread.start()
+        return thread
+
+    def __iter__(self):
+        return iter(self.eintraege)
+
+    def __contains__(self, typ) -> bool:
+        return typ in self.eintraege
@@ -0,0 +1,67 @@
+"""
+@file aktualisierbare_ansicht.py
+@brief Gemeinsames Verhalten für Ansichten, die im Ansicht-Cache gehalten werden.
+
+Eine ausgeblendete Ansicht lädt bei Datenänderungen nicht sofort neu, sondern merkt
+sich nur, dass ihre Anzeige veraltet ist. Erst beim erneuten Einblenden über
+`anzeigen()` werden die Daten nachgeladen.
+
+@author CHOE
+@date 2025-01-31
+@version 1.0
+"""
+
+
+class AktualisierbareAnsicht:
+    """
+    @class AktualisierbareAnsicht
+    @brief Mixin für `ttk.Frame`-Ansichten mit Abonnement auf dem Änderungsbus.
+
+    Die Ansicht implementiert `lade_daten()` und lädt über `laden()`. Optional überschreibt
+    sie `aenderungen_anwenden()`, um Änderungen feiner als durch Neuladen zu übernehmen.
+    """
+
+    def aktualisierung_einrichten(self, tabellen) -> None:
+        """
+        @brief Abonniert Änderungen an den Tabellen, aus denen die Ansicht liest.
+        @param tabellen Menge der Tabellennamen.
+        """
+        self.veraltet = False
+        self.ladeauftrag = None
+        self.abonnement = self.master.logik.aenderungen.abonnieren(self._daten_geaendert, tabellen, widget=self)
+
+    def laden(self, funktion, fertig, platzhalter=None):
+        """
+        @brief Startet einen Ladevorgang über den Hintergrund-Lader und merkt ihn sich.
+
+        Wird der Auftrag beim Wechsel der Ansicht abgebrochen, lädt `anzeigen()` nach.
+        """
+        self.ladeauftrag = self.master.lader.laden(funktion, fertig, platzhalter=platzhalter)
+        return self.ladeauftrag
+
+    def aenderungen_anwenden(self, aenderungen) -> None:
+        """
+        @brief Übernimmt Änderungen in die sichtbare Ansicht; standardmäßig durch Neuladen.
+        @param aenderungen Liste von `Aenderung`.
+        """
+        self.lade_daten()
+
+    def anzeigen(self) -> None:
+        """
+        @brief Wird beim erneuten Einblenden aufgerufen; lädt nur nach, wenn sich Daten geändert
+        haben oder ein Ladevorgang abgebrochen wurde.
+        """
+        if self.veraltet or (self.ladeauftrag is not None and self.ladeauftrag.abgebrochen):
+            self.veraltet = False
+            self.lade_daten()
+
+    def destroy(self) -> None:
+        if getattr(self, "abonnement", None) is not None:
+            self.abonnement.kuendigen()
+        super().destroy()
+
+    def _daten_geaendert(self, aenderungen) -> None:
+        if self.winfo_ismapped():
+            self.aenderungen_anwenden(aenderungen)
+        else:
+            self.veraltet = True
@@ -18,6 +18,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from tkcalendar import Calendar
 import logging
+from hintergrund_lader import HintergrundLader
 
 
 class Einstellungen(ttk.Frame):
@@ -49,12 +50,15 @@ class Einstellungen(ttk.Frame):
         }
 
         self.logger.info("📌 Einstellungen geladen.")
-        
-        self.daten = self.master.logik.get_einstellungen_ansicht_daten()
 
+        self.daten = []
         self.erstelle_gui()
         self.update_idletasks()
-        self.lade_daten()
+        self.master.lader.laden(
+            lambda logik: logik.get_einstellungen_ansicht_daten(),
+            self.daten_uebernehmen,
+            platzhalter=HintergrundLader.ladehinweis(self, "⏳ Einstellungen werden geladen..."),
+        )
 
     def erstelle_gui(self):
             """
@@ -172,6 +176,15 @@ class Einstellungen(ttk.Frame):
         ttk.Button(button_frame, text="💾 Änderungen speichern", command=self.speichern).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="🗑️ Alle Daten löschen", command=self.datenbank_loeschen).pack(side=tk.LEFT, padx=5)
 
+    def daten_uebernehmen(self, daten):
+        """
+        @brief Übernimmt die im Hintergrund geladenen Einstellungen und zeigt sie an.
+
+        @param daten Liste mit den Zeilen der View `einstellungen`.
+        """
+        self.daten = daten
+        self.lade_daten()
+
     def lade_daten(self):
         """
         @brief Lädt gespeicherte Benutzerdaten in die GUI.
@@ -248,6 +261,8 @@ class Einstellungen(ttk.Frame):
             return
 
         self.logger.warning("⚠️ Datenbank wird gelöscht...")
+        # Die Verbindung des Hintergrund-Laders muss vor dem Löschen der Datei geschlossen sein
+        self.master.lader.beenden()
         erfolg = self.master.logik.set_einstellungen_ansicht_daten("DELETE")
 
         if erfolg:
@@ -256,4 +271,6 @@ class Einstellungen(ttk.Frame):
             self.master.beenden()
         else:
             self.logger.error("❌ Fehler beim Löschen der Datenbank.")
+            # Die Anwendung läuft weiter; ohne Lader würden keine Ansichten mehr geladen
+            self.master.lader = HintergrundLader(self.master, self.master.logik)
             messagebox.showerror("Fehler", "Datenbank konnte nicht gelöscht werden.")
\ No newline at end of file
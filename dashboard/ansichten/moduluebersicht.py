@@ -7,6 +7,8 @@ Studiums zu verwalten. Der Benutzer kann neue Module hinzufügen, vorhandene bea
 und löschen. Zudem werden die Moduldaten aus der Datenbank geladen und angezeigt.
 
 Die Anwendung verwendet eine `Treeview`, um die Module in tabellarischer Form darzustellen.
+Sortierung (Klick auf einen Spaltenkopf), Filter und Suche werden als `ModulAbfrage`
+in der Datenbank ausgewertet; die Tabelle lädt weiterhin nur die sichtbaren Seiten.
 
 @author CHOE
 @date 2025-01-31
@@ -15,10 +17,20 @@ Die Anwendung verwendet eine `Treeview`, um die Module in tabellarischer Form da
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-from tkcalendar import Calendar
+import datetime
 import logging
-
-class Moduluebersicht(ttk.Frame):
+from ansichten.aktualisierbare_ansicht import AktualisierbareAnsicht
+from hintergrund_lader import HintergrundLader
+from modul_abfrage import ModulAbfrage, SORTIERSPALTEN
+from virtuelle_tabelle import VirtuelleTabelle
+
+## Spaltenüberschriften der Tabelle, in der Reihenfolge von `SORTIERSPALTEN`
+SPALTEN = ("ID", "Semester", "Modulname", "Kürzel", "Status", "ECTS", "Startdatum")
+STATUS_WERTE = ["Offen", "In Bearbeitung", "Abgeschlossen"]
+## Wartezeit nach der letzten Eingabe in Suche und Datumsfeldern, bevor neu abgefragt wird
+FILTER_VERZOEGERUNG_MS = 300
+
+class Moduluebersicht(AktualisierbareAnsicht, ttk.Frame):
     """
     @brief GUI-Komponente für die Modulübersicht.
 
@@ -42,9 +54,13 @@ class Moduluebersicht(ttk.Frame):
         self.logger = logging.getLogger("Moduluebersicht")
 
         self.ects_werte = ["5", "10"]
-        self.semester_werte = [str(i) for i in range(1, 13)]
+        self.semester_werte = []  # wird aus den angelegten Semestern befüllt (siehe `semester_laden`)
+        self.abfrage = ModulAbfrage()
+        self.filter_auftrag = None
 
         self.logger.info("📌 Modulübersicht geladen.")
+        # Festgeschriebene Änderungen werden zeilenweise übernommen statt die Tabelle neu zu laden
+        self.aktualisierung_einrichten({"modul", "semester"})
         self.erstelle_gui()
         self.lade_daten()
 
@@ -56,14 +72,22 @@ class Moduluebersicht(ttk.Frame):
         zur Verwaltung der Module.
         """
         ttk.Label(self, text="📚 Modulübersicht", font=("Arial", 16)).pack(pady=10)
-
-        self.tree = ttk.Treeview(
-            self, columns=("ID", "Semester", "Modulname", "Kürzel", "Status", "ECTS", "Startdatum"), show="headings"
+        self.erstelle_filterleiste()
+
+        # Nur die sichtbaren Zeilen werden angelegt; Anzahl und Seiten fragt der Hintergrund-Lader
+        # mit der Leser-Logik seines Worker-Threads ab
+        self.tabelle = VirtuelleTabelle(
+            self, SPALTEN,
+            seite_laden=lambda logik, anzahl, **grenze: logik.get_moduluebersicht_seite(
+                anzahl, abfrage=self.abfrage, **grenze
+            ),
+            anzahl_laden=lambda logik: logik.get_moduluebersicht_anzahl(self.abfrage),
+            lader=self.master.lader,
         )
-        for spalte in ("ID", "Semester", "Modulname", "Kürzel", "Status", "ECTS", "Startdatum"):
-            self.tree.heading(spalte, text=spalte)
-
-        self.tree.pack(fill=tk.BOTH, expand=True, pady=5)
+        self.tree = self.tabelle.tree
+        for spalte, sortierung in zip(SPALTEN, SORTIERSPALTEN):
+            self.tree.heading(spalte, command=lambda sortierung=sortierung: self.sortieren(sortierung))
+        self.tabelle.pack(fill=tk.BOTH, expand=True, pady=5)
 
         button_frame = ttk.Frame(self)
         button_frame.pack(pady=10)
@@ -71,16 +95,183 @@ class Moduluebersicht(ttk.Frame):
         ttk.Button(button_frame, text="✏️ Modul bearbeiten", command=self.modul_bearbeiten_popup).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="🗑️ Modul löschen", command=self.modul_loeschen).pack(side=tk.LEFT, padx=5)
 
+    def erstelle_filterleiste(self):
+        """
+        @brief Erstellt die Filterleiste für Status, Semester, ECTS, Startdatum und Freitextsuche.
+
+        Auswahlfelder filtern sofort, Texteingaben erst nach einer kurzen Pause.
+        """
+        leiste = ttk.Frame(self)
+        leiste.pack(fill=tk.X, padx=5)
+
+        ttk.Label(leiste, text="🔍").pack(side=tk.LEFT)
+        self.suche_entry = ttk.Entry(leiste, width=20)
+        self.suche_entry.pack(side=tk.LEFT, padx=(0, 10))
+
+        self.filter_status = self.erstelle_filter(leiste, "Status:", STATUS_WERTE, 14)
+        self.filter_semester = self.erstelle_filter(leiste, "Semester:", self.semester_werte, 4)
+        self.filter_ects = self.erstelle_filter(leiste, "ECTS:", self.ects_werte, 4)
+
+        ttk.Label(leiste, text="Start von:").pack(side=tk.LEFT)
+        self.filter_von = ttk.Entry(leiste, width=11)
+        self.filter_von.pack(side=tk.LEFT)
+        ttk.Label(leiste, text="bis:").pack(side=tk.LEFT)
+        self.filter_bis = ttk.Entry(leiste, width=11)
+        self.filter_bis.pack(side=tk.LEFT)
+
+        for entry in (self.suche_entry, self.filter_von, self.filter_bis):
+            entry.bind("<KeyRelease>", lambda e: self.filter_verzoegert())
+        ttk.Button(leiste, text="✖", width=3, command=self.filter_zuruecksetzen).pack(side=tk.LEFT, padx=5)
+
+    def erstelle_filter(self, leiste, text, werte, breite):
+        """
+        @brief Erstellt ein Auswahlfeld der Filterleiste; der leere Eintrag steht für "alle".
+
+        @param leiste Der Frame der Filterleiste.
+        @param text Beschriftung des Feldes.
+        @param werte Auswahlmöglichkeiten.
+        @param breite Breite des Feldes in Zeichen.
+        @return Ein `ttk.Combobox`-Widget.
+        """
+        ttk.Label(leiste, text=text).pack(side=tk.LEFT)
+        combobox = ttk.Combobox(leiste, values=["", *werte], state="readonly", width=breite)
+        combobox.pack(side=tk.LEFT, padx=(0, 10))
+        combobox.bind("<<ComboboxSelected>>", lambda e: self.filter_anwenden())
+        return combobox
+
+    def filter_verzoegert(self):
+        """
+        @brief Wendet die Filter erst an, wenn für kurze Zeit nicht mehr getippt wurde.
+        """
+        if self.filter_auftrag is not None:
+            self.after_cancel(self.filter_auftrag)
+        self.filter_auftrag = self.after(FILTER_VERZOEGERUNG_MS, self.filter_anwenden)
+
+    def filter_anwenden(self):
+        """
+        @brief Übernimmt die Filterleiste in die Abfrage und zeigt die Treffer ab der ersten Zeile an.
+
+        Unvollständige Datumsangaben werden ignoriert, bis sie ein gültiges Datum ergeben.
+        """
+        self.filter_auftrag = None
+        self.abfrage_setzen(self.abfrage.geaendert(
+            status=self.filter_status.get(),
+            semester=int(self.filter_semester.get()) if self.filter_semester.get() else None,
+            ects=int(self.filter_ects.get()) if self.filter_ects.get() else None,
+            von=self.datum_lesen(self.filter_von),
+            bis=self.datum_lesen(self.filter_bis),
+            suchtext=self.suche_entry.get().strip(),
+        ))
+
+    def filter_zuruecksetzen(self):
+        """
+        @brief Leert alle Filter und die Suche; die Sortierung bleibt erhalten.
+        """
+        for combobox in (self.filter_status, self.filter_semester, self.filter_ects):
+            combobox.set("")
+        for entry in (self.suche_entry, self.filter_von, self.filter_bis):
+            entry.delete(0, tk.END)
+        self.filter_anwenden()
+
+    @staticmethod
+    def datum_lesen(entry):
+        """
+        @brief Liest ein Datum im Format YYYY-MM-DD aus einem Eingabefeld.
+        @return Das Datum als Text oder None, falls das Feld leer oder ungültig ist.
+        """
+        text = entry.get().strip()
+        try:
+            return datetime.date.fromisoformat(text).isoformat() if text else None
+        except ValueError:
+            return None
+
+    def sortieren(self, sortierung):
+        """
+        @brief Sortiert nach einer Spalte; ein erneuter Klick kehrt die Richtung um.
+        @param sortierung Name der Sortierspalte, siehe `SORTIERSPALTEN`.
+        """
+        absteigend = sortierung == self.abfrage.sortierung and not self.abfrage.absteigend
+        self.abfrage_setzen(self.abfrage.geaendert(sortierung=sortierung, absteigend=absteigend))
+
+        for spalte, name in zip(SPALTEN, SORTIERSPALTEN):
+            pfeil = (" ▼" if absteigend else " ▲") if name == sortierung else ""
+            self.tree.heading(spalte, text=spalte + pfeil)
+
+    def abfrage_setzen(self, abfrage):
+        """
+        @brief Zeigt die Modulübersicht mit neuer Sortierung bzw. neuen Filtern ab der ersten Zeile an.
+        @param abfrage Die neue `ModulAbfrage`.
+        """
+        if abfrage == self.abfrage:
+            return
+        self.logger.info(f"🔎 Modulübersicht: {abfrage}")
+        self.abfrage = abfrage
+        self.tabelle.erste_zeile = 0
+        self.lade_daten()
+
     def lade_daten(self):
         """
-        @brief Lädt die Moduldaten aus der Datenbank.
+        @brief Lädt den aktuellen Bereich der Modulübersicht im Hintergrund neu.
 
-        Falls keine Daten vorhanden sind, bleibt die Tabelle leer.
+        Die virtuelle Tabelle lädt Anzahl und sichtbare Seiten per Keyset-Abfrage über den
+        Hintergrund-Lader; bis die erste Seite eintrifft, wird ein Ladehinweis angezeigt.
+        Scrollposition und Auswahl bleiben erhalten.
+        """
+        platzhalter = None
+        if self.tabelle.platzhalter is None:
+            platzhalter = HintergrundLader.ladehinweis(self, "⏳ Moduldaten werden geladen...")
+        self.tabelle.neu_laden(platzhalter)
+        self.semester_laden()
+        self.logger.info("🔄 Modulübersicht wird geladen...")
+
+    def anzeigen(self):
+        """
+        @brief Lädt beim erneuten Einblenden zusätzlich Seiten nach, deren Abfrage beim Wechsel
+        der Ansicht abgebrochen wurde.
         """
-        self.daten = self.master.logik.get_moduluebersicht_ansicht_daten()
-        self.logger.info(f"📊 Geladene Moduldaten: {self.daten}")
-        for eintrag in self.daten:
-            self.tree.insert("", tk.END, values=eintrag)
+        # Nach einem fehlgeschlagenen Löschen der Datenbank legt die Einstellungsansicht einen
+        # neuen Lader an; der beendete liefert nur noch abgebrochene Aufträge
+        self.tabelle.puffer.lader = self.master.lader
+        if self.tabelle.puffer.unterbrochen:
+            self.tabelle.darstellen()
+        super().anzeigen()
+
+    def semester_laden(self):
+        """
+        @brief Lädt die angelegten Semesternummern im Hintergrund für Filter und Moduldialog.
+
+        Die Anzahl der Semester hängt von Zeitmodell und Urlaubssemestern ab; angeboten werden
+        nur Semester, denen ein Modul auch zugeordnet werden kann.
+        """
+        self.master.lader.laden(lambda logik: logik.get_semester_nummern(), self.semester_anzeigen)
+
+    def semester_anzeigen(self, nummern):
+        """
+        @brief Übernimmt die Semesternummern in die Auswahl des Semesterfilters.
+        @param nummern Liste der Semesternummern aus `Logik.get_semester_nummern`.
+        """
+        self.semester_werte = [str(nummer) for nummer in nummern]
+        self.filter_semester.configure(values=["", *self.semester_werte])
+
+    def aenderungen_anwenden(self, aenderungen):
+        """
+        @brief Übernimmt festgeschriebene Änderungen an Modulen in die Tabelle.
+
+        Reine Aktualisierungen werden zeilenweise im Hintergrund nachgeladen und in Puffer und
+        Tabelle ersetzt. Neue oder gelöschte Module verschieben die Positionen, daher wird dann
+        der sichtbare Bereich neu geladen; ebenso bei Änderungen an Semestern oder Sammelmeldungen
+        und bei aktiver Sortierung oder Filterung, da eine Änderung die Zeile dann verschieben kann.
+
+        @param aenderungen Liste von `Aenderung` aus dem Änderungsbus.
+        """
+        if self.abfrage != ModulAbfrage() or any(
+            aenderung.tabelle != "modul" or aenderung.operation != "UPDATE" for aenderung in aenderungen
+        ):
+            self.lade_daten()
+            return
+
+        geaendert = sorted({aenderung.zeilen_id for aenderung in aenderungen})
+        self.laden(lambda logik: logik.get_moduluebersicht_zeilen(geaendert), self.tabelle.zeilen_aktualisieren)
 
     def modul_hinzufuegen_popup(self):
         """
@@ -113,6 +304,8 @@ class Moduluebersicht(ttk.Frame):
         @param aktion Art der Aktion ("INSERT" oder "UPDATE").
         @param modulwerte Falls vorhanden, enthält es die bestehenden Modulwerte.
         """
+        from tkcalendar import Calendar  # erst beim ersten Dialog importieren, nicht beim Start
+
         popup = tk.Toplevel(self)
         popup.title(titel)
         popup.geometry("400x600")
@@ -120,7 +313,7 @@ class Moduluebersicht(ttk.Frame):
         self.semester_combobox = self.erstelle_dropdown(popup, "Semester-ID:", self.semester_werte)
         self.modulname_entry = self.erstelle_entry(popup, "Modulname:")
         self.kuerzel_entry = self.erstelle_entry(popup, "Kürzel:")
-        self.status_combobox = self.erstelle_dropdown(popup, "Status:", ["Offen", "In Bearbeitung", "Abgeschlossen"])
+        self.status_combobox = self.erstelle_dropdown(popup, "Status:", STATUS_WERTE)
         self.ects_combobox = self.erstelle_dropdown(popup, "ECTS-Punkte:", self.ects_werte)
 
         ttk.Label(popup, text="Startdatum auswählen:").pack(pady=5)
@@ -189,19 +382,68 @@ class Moduluebersicht(ttk.Frame):
         if aktion == "UPDATE":
             daten = (modul_id, *daten)
 
+        if self.master.logik.schreibpuffer is not None:
+            self.optimistisch_speichern(aktion, daten)
+            popup.destroy()
+            return
+
         erfolg = self.master.logik.set_moduluebersicht_ansicht_daten(aktion, daten)
 
         if erfolg:
             self.logger.info(f"✅ Modul erfolgreich gespeichert: {daten}")
             messagebox.showinfo("Erfolg", f"Modul erfolgreich {aktion.lower()}!")
             popup.destroy()
-            self.tree.delete(*self.tree.get_children())
-            self.lade_daten()
         else:
             self.logger.error("❌ Fehler beim Speichern des Moduls.")
             messagebox.showerror("Fehler", "Modul konnte nicht gespeichert werden.")
 
 
+    def optimistisch_speichern(self, aktion, daten):
+        """
+        @brief Zeigt eine Änderung sofort in der Tabelle an und reiht sie im Schreibpuffer ein.
+
+        Neue Module erscheinen bis zum Festschreiben ohne ID; die endgültige Zeile kommt danach
+        über den Änderungsbus. Meldet der Schreibpuffer einen Konflikt (z. B. ein bereits
+        vergebenes Kürzel), wird der sichtbare Bereich aus der Datenbank neu geladen und eine
+        Fehlermeldung angezeigt.
+
+        @param aktion "INSERT", "UPDATE" oder "DELETE".
+        @param daten Die Moduldaten wie bei `set_moduluebersicht_ansicht_daten`.
+        """
+        platzhalter = None
+        if aktion == "INSERT":
+            platzhalter = self.tree.insert("", tk.END, values=("…", *daten))
+        else:
+            # Zeilen außerhalb des sichtbaren Bereichs werden nur geschrieben, nicht angezeigt
+            zeile = self.zeile_finden(daten[0])
+            if zeile is not None and aktion == "UPDATE":
+                # Über die Tabelle, damit ein späterer Abgleich die optimistische Zeile kennt
+                self.tabelle.zeilen_aktualisieren([daten])
+            elif zeile is not None:
+                self.tree.delete(zeile)
+
+        def rueckmeldung(erfolg, meldung):
+            if erfolg:
+                self.logger.info(f"✅ Modul erfolgreich gespeichert ({aktion}): {daten}")
+                if platzhalter is not None and self.winfo_exists() and self.tree.exists(platzhalter):
+                    self.tree.delete(platzhalter)  # die Zeile mit der vergebenen ID liefert der Änderungsbus
+                return
+            self.logger.error(f"❌ Moduländerung ({aktion}) abgelehnt: {meldung}")
+            if self.winfo_exists():
+                self.lade_daten()
+            messagebox.showerror("Konflikt", f"Das Modul konnte nicht gespeichert werden:\n{meldung}")
+
+        self.master.logik.set_moduluebersicht_ansicht_daten(aktion, daten, rueckmeldung)
+
+    def zeile_finden(self, modul_id):
+        """
+        @brief Sucht die Tabellenzeile eines Moduls anhand seiner ID.
+
+        @param modul_id Die Modul-ID.
+        @return Die Zeilenkennung der Treeview oder None.
+        """
+        return str(modul_id) if self.tree.exists(str(modul_id)) else None
+
     def validiere_eingaben(self):
         """
         @brief Überprüft die Benutzereingaben auf Korrektheit.
@@ -233,7 +475,9 @@ class Moduluebersicht(ttk.Frame):
             return
 
         modul_id = self.tree.item(selected_item, "values")[0]
-        if self.master.logik.set_moduluebersicht_ansicht_daten("DELETE", (modul_id,)):
+        if self.master.logik.schreibpuffer is not None:
+            self.optimistisch_speichern("DELETE", (modul_id,))
+        elif self.master.logik.set_moduluebersicht_ansicht_daten("DELETE", (modul_id,)):
             self.tree.delete(selected_item)
             self.logger.info(f"✅ Modul mit ID {modul_id} gelöscht.")
         else:
@@ -2,10 +2,13 @@
 @file studienfortschritt.py
 @brief Modul zur Visualisierung des Studienfortschritts.
 
-Dieses Modul stellt eine grafische Oberfläche bereit, um den Fortschritt des Studiums 
-über die Zeit zu visualisieren. Die Daten werden aus der Datenbank geladen und 
+Dieses Modul stellt eine grafische Oberfläche bereit, um den Fortschritt des Studiums
+über die Zeit zu visualisieren. Die Daten werden aus der Datenbank geladen und
 in einem Liniendiagramm dargestellt.
 
+Das Diagramm wird in einem eigenen Prozess gezeichnet (siehe `diagramm_renderer.py`);
+die Ansicht zeigt nur das fertige Bild an.
+
 @author CHOE
 @date 2025-01-31
 @version 1.0
@@ -14,20 +17,66 @@ in einem Liniendiagramm dargestellt.
 import tkinter as tk
 from tkinter import ttk, messagebox
 import logging
-import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 from matplotlib.ticker import MaxNLocator
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import datetime
-import numpy as np
+from diagramm_renderer import DiagrammRenderer, ppm_daten
+from hintergrund_lader import HintergrundLader
+from ansichten.aktualisierbare_ansicht import AktualisierbareAnsicht
+
+## Stil der drei Linien; die Markierungen entfallen bei langen Reihen.
+LINIEN = {
+    "offen": {"marker": "o", "label": "Offene Module", "color": "red"},
+    "bearbeitung": {"marker": "s", "label": "In Bearbeitung", "color": "orange"},
+    "abgeschlossen": {"marker": "^", "label": "Abgeschlossen", "color": "green"},
+}
+## Auswahl der Auflösung: Beschriftung -> Zeitraum für `Logik.get_studienfortschritt_spalten`.
+ZEITRAEUME = {"Automatisch": "auto", "Täglich": "tag", "Wöchentlich": "woche", "Monatlich": "monat"}
+## Bis zu so vielen Punkten werden die Linien mit Markierungen gezeichnet.
+MARKIERUNGEN_BIS = 120
+## Größe des Bilds in Pixeln, solange die Zeichenfläche noch nicht angezeigt wird.
+BILDGROESSE = (800, 500)
+## Anteil des sichtbaren Bereichs, der nach einem Schritt des Mausrads hinein übrig bleibt.
+ZOOMFAKTOR = 0.8
+
+
+def diagramm_aufbauen(diagramm):
+    """
+    @brief Richtet das Diagramm für den Studienfortschritt ein; läuft im Worker-Prozess des Renderers.
+
+    Das Diagramm zeigt die Anzahl der offenen, in Bearbeitung befindlichen und
+    abgeschlossenen Module über die Zeit. Lange Reihen werden per Min/Max auf die Breite
+    der Zeichenfläche verdichtet: Die Zähler ändern sich stufenweise, und so bleibt jede
+    Stufe auch in einer Pixelspalte sichtbar.
 
+    @param diagramm Ein neues `Diagramm` ohne Tk-Widget.
+    """
+    for name, stil in LINIEN.items():
+        diagramm.linie(name, linestyle="-", alpha=0.8, **stil)
+    diagramm.verdichtung_aktivieren("minmax")
+
+    # Layout
+    ax = diagramm.ax
+    ax.set_xlabel("Datum")
+    ax.set_ylabel("Anzahl Module")
+    ax.set_title("Studienfortschritt über die Zeit")
+    ax.legend()
+    ax.grid(True)
+
+    # Datum formatieren; die Abstände passen sich beim Zoomen an
+    ax.xaxis.set_major_locator(mdates.AutoDateLocator())
+    ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d"))
+    ax.tick_params(axis="x", labelrotation=45)
 
-class Studienfortschritt(ttk.Frame):
+    # Nur ganze Zahlen auf der Y-Achse
+    ax.yaxis.set_major_locator(MaxNLocator(integer=True))
+
+
+class Studienfortschritt(AktualisierbareAnsicht, ttk.Frame):
     """
     @brief GUI-Komponente zur Darstellung des Studienfortschritts.
 
     Diese Klasse ermöglicht die Anzeige des Fortschritts im Studium anhand eines Diagramms.
-    Die Verlaufsdaten werden aus der Datenbank geladen, verarbeitet und visualisiert.
+    Die Verlaufsdaten werden spaltenweise aus der Datenbank geladen und visualisiert.
 
     @extends ttk.Frame
     """
@@ -36,7 +85,7 @@ class Studienfortschritt(ttk.Frame):
         """
         @brief Initialisiert das Studienfortschritt-Widget.
 
-        Erstellt die grafische Oberfläche für die Anzeige des Studienfortschritts 
+        Erstellt die grafische Oberfläche für die Anzeige des Studienfortschritts
         und lädt die Verlaufsdaten aus der Datenbank.
 
         @param master Das Hauptfenster (tkinter Parent Widget).
@@ -44,8 +93,21 @@ class Studienfortschritt(ttk.Frame):
         super().__init__(master)
         self.master = master
         self.logger = logging.getLogger("Studienfortschritt")
+        self.renderer = None
+        self.leinwand = None
+        self.bild_id = None
+        self.foto = None
+        self.stile = None         # Linienstile der aktuellen Daten; None, solange keine Daten vorliegen
+        self.ausschnitt = None    # Grenzen der x-Achse nach Zoomen oder Verschieben; None: alles
+        self.achse = None         # Lage der Achse und Grenzen der x-Achse im angezeigten Bild
+        self.xlim = None
+        self.groesse = None       # Größe des zuletzt beauftragten Bilds
+        self._ziehen = None
+        self.zeitraum = tk.StringVar(value="auto")
 
         self.logger.info("📊 Studienfortschritt geladen.")
+        # Jede festgeschriebene Statusänderung verschiebt den Verlauf; das Diagramm wird neu gezeichnet
+        self.aktualisierung_einrichten({"modul_ereignis", "verlauf"})
         self.erstelle_gui()
         self.lade_daten()
 
@@ -53,80 +115,184 @@ class Studienfortschritt(ttk.Frame):
         """
         @brief Erstellt die GUI-Struktur für den Studienfortschritt.
 
-        Fügt Labels zur Anzeige der Fortschrittsinformationen hinzu.
+        Fügt Labels zur Anzeige der Fortschrittsinformationen und die Auswahl der Auflösung
+        hinzu und legt die Zeichenfläche an, in der das fertige Diagramm angezeigt wird.
         """
         ttk.Label(self, text="📈 Studienfortschritt", font=("Arial", 16)).pack(pady=10)
 
+        auswahl = ttk.Frame(self)
+        auswahl.pack(pady=5)
+        ttk.Label(auswahl, text="Auflösung:").pack(side=tk.LEFT, padx=5)
+        for beschriftung, zeitraum in ZEITRAEUME.items():
+            ttk.Radiobutton(auswahl, text=beschriftung, value=zeitraum, variable=self.zeitraum,
+                            command=self.lade_daten).pack(side=tk.LEFT, padx=5)
+        ttk.Label(self, text="Mausrad: Zoomen · Ziehen: Verschieben · Doppelklick: Gesamtansicht").pack()
+
+        self.erstelle_fortschritt_diagramm()
+
     def lade_daten(self):
         """
-        @brief Lädt die Verlaufsdaten aus der Datenbank und verarbeitet sie.
+        @brief Lädt die Verlaufsdaten im Hintergrund aus der Datenbank.
 
-        Falls keine Daten gefunden werden, wird eine Meldung an den Nutzer ausgegeben.
+        Bevorzugt wird die lückenlose, aus dem Ereignisprotokoll rekonstruierte Tagesreihe.
+        Ist das Protokoll leer, werden die gespeicherten Tageswerte aus `verlauf` verwendet.
+        Die Werte kommen bereits sortiert und im gewählten Zeitraum zusammengefasst als
+        numpy-Arrays an. "Automatisch" wählt den feinsten Zeitraum, der höchstens einen Punkt
+        je Pixel der Diagrammbreite ergibt.
+        """
+        zeitraum = self.zeitraum.get()
+        pixel = max(int(self.achse[2]) if self.achse else self.bildgroesse()[0], 1)
+        self.laden(
+            lambda logik: logik.get_studienfortschritt_spalten(zeitraum=zeitraum, max_punkte=pixel),
+            self.daten_anzeigen,
+            platzhalter=HintergrundLader.ladehinweis(self, "⏳ Verlaufsdaten werden geladen..."),
+        )
+
+    def daten_anzeigen(self, daten):
         """
-        daten = self.master.logik.get_studienfortschritt_ansicht_daten()
+        @brief Verarbeitet die geladenen Verlaufsdaten und zeichnet das Diagramm.
+
+        Falls keine Daten gefunden werden, wird eine Meldung an den Nutzer ausgegeben.
 
-        if not daten:
+        @param daten Liste [tage, offen, bearbeitung, abgeschlossen] aus
+            `Logik.get_studienfortschritt_spalten`.
+        """
+        if not daten or not len(daten[0]):
             messagebox.showinfo("Keine Daten", "Es sind keine Verlaufsdaten verfügbar.")
             self.logger.warning("⚠️ Keine Verlaufsdaten gefunden.")
             return
 
-        x_werte, y_offen, y_bearbeitung, y_abgeschlossen = self.verarbeite_daten(daten)
-        self.erstelle_fortschritt_diagramm(x_werte, y_offen, y_bearbeitung, y_abgeschlossen)
+        self.zeige_fortschritt_diagramm(*daten)
 
-    def verarbeite_daten(self, daten):
+    def erstelle_fortschritt_diagramm(self):
         """
-        @brief Konvertiert die Rohdaten in ein geeignetes Format für die Darstellung.
+        @brief Legt Zeichenfläche und Renderer für den Studienfortschritt einmalig an.
 
-        @param daten Liste mit Verlaufswerten aus der Datenbank.
-        @return Ein Tupel mit Listen: (x_werte, y_offen, y_bearbeitung, y_abgeschlossen).
+        Der Renderer startet seinen Worker-Prozess sofort, damit matplotlib bis zum
+        Eintreffen der Daten geladen ist. Die Zeichenfläche wird erst mit den ersten Daten
+        angezeigt; danach zeichnet jede Größenänderung das Bild in der neuen Größe.
         """
-        self.logger.info("📊 Verarbeite Verlaufsdaten für das Diagramm...")
-        daten.sort(key=lambda x: x[3])  # Sortierung nach Datum
-
-        x_werte = [datetime.datetime.strptime(d[3], "%Y-%m-%d") for d in daten]
-        y_offen = np.array([int(d[0]) for d in daten])
-        y_bearbeitung = np.array([int(d[1]) for d in daten])
-        y_abgeschlossen = np.array([int(d[2]) for d in daten])
+        self.renderer = DiagrammRenderer(self, diagramm_aufbauen)
+        breite, hoehe = BILDGROESSE
+        self.leinwand = tk.Canvas(self, width=breite, height=hoehe, highlightthickness=0)
+        self.bild_id = self.leinwand.create_image(0, 0, anchor=tk.NW)
 
-        return x_werte, y_offen, y_bearbeitung, y_abgeschlossen
+        self.leinwand.bind("<Configure>", lambda e: self.neu_zeichnen())
+        self.leinwand.bind("<MouseWheel>", self.zoomen)
+        self.leinwand.bind("<Button-4>", self.zoomen)
+        self.leinwand.bind("<Button-5>", self.zoomen)
+        self.leinwand.bind("<ButtonPress-1>", self.ziehen_beginnen)
+        self.leinwand.bind("<B1-Motion>", self.ziehen)
+        self.leinwand.bind("<Double-Button-1>", self.ausschnitt_zuruecksetzen)
 
-    def erstelle_fortschritt_diagramm(self, x_werte, y_offen, y_bearbeitung, y_abgeschlossen):
+    def zeige_fortschritt_diagramm(self, x_werte, y_offen, y_bearbeitung, y_abgeschlossen):
         """
-        @brief Erstellt das Diagramm für den Studienfortschritt.
+        @brief Übergibt neue Verlaufsdaten an den Renderer und beauftragt ein neues Bild.
 
-        Diese Methode visualisiert die Anzahl der offenen, in Bearbeitung befindlichen 
-        und abgeschlossenen Module über die Zeit.
+        Ein noch laufendes Bild mit den alten Daten wird verworfen.
 
-        @param x_werte Liste mit Datumseinträgen.
+        @param x_werte Tage als `datetime64[D]`-Array (oder Liste von Datumswerten).
         @param y_offen Anzahl offener Module pro Datum.
         @param y_bearbeitung Anzahl der Module in Bearbeitung pro Datum.
         @param y_abgeschlossen Anzahl abgeschlossener Module pro Datum.
         """
-        self.logger.info("📊 Erstelle Diagramm für Studienfortschritt...")
+        self.logger.info("📊 Aktualisiere Diagramm für Studienfortschritt...")
+        markierungen = len(x_werte) <= MARKIERUNGEN_BIS
+        self.stile = {name: {"marker": stil["marker"] if markierungen else ""} for name, stil in LINIEN.items()}
+        self.renderer.daten_setzen(mdates.date2num(x_werte), {
+            "offen": y_offen,
+            "bearbeitung": y_bearbeitung,
+            "abgeschlossen": y_abgeschlossen,
+        })
+        self.ausschnitt = None
+        if not self.leinwand.winfo_manager():
+            self.leinwand.pack(fill=tk.BOTH, expand=True, pady=10)
+        self.neu_zeichnen(erzwingen=True)
 
-        fig, ax = plt.subplots(figsize=(8, 5))
-        ax.plot(x_werte, y_offen, marker="o", linestyle="-", label="Offene Module", color="red", alpha=0.8)
-        ax.plot(x_werte, y_bearbeitung, marker="s", linestyle="-", label="In Bearbeitung", color="orange", alpha=0.8)
-        ax.plot(x_werte, y_abgeschlossen, marker="^", linestyle="-", label="Abgeschlossen", color="green", alpha=0.8)
+    def bildgroesse(self) -> tuple:
+        """
+        @brief Liefert die Größe der Zeichenfläche in Pixeln bzw. `BILDGROESSE`, solange sie nicht angezeigt wird.
+        """
+        if self.leinwand is not None and self.leinwand.winfo_ismapped():
+            return self.leinwand.winfo_width(), self.leinwand.winfo_height()
+        return BILDGROESSE
 
-        # Layout
-        ax.set_xlabel("Datum")
-        ax.set_ylabel("Anzahl Module")
-        ax.set_title("Studienfortschritt über die Zeit")
-        ax.legend()
-        ax.grid(True)
+    def neu_zeichnen(self, erzwingen: bool = False):
+        """
+        @brief Beauftragt ein Bild in der aktuellen Größe und mit dem aktuellen Ausschnitt.
 
-        # Datum formatieren
-        ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d"))
-        ax.xaxis.set_major_locator(mdates.DayLocator(interval=max(1, len(x_werte) // 10)))
-        plt.xticks(rotation=45)
+        @param erzwingen False: nur zeichnen, wenn sich die Größe geändert hat (Größenänderung).
+        """
+        if self.stile is None:
+            return
+        groesse = self.bildgroesse()
+        if not erzwingen and groesse == self.groesse:
+            return
+        self.groesse = groesse
+        self.renderer.zeichnen(*groesse, self.bild_anzeigen, ausschnitt=self.ausschnitt, stile=self.stile)
+
+    def bild_anzeigen(self, bild):
+        """
+        @brief Kopiert ein fertiges Bild des Renderers in das `PhotoImage` der Zeichenfläche.
+
+        @param bild Das `Bild`; seine Pixel sind nur während dieses Aufrufs gültig.
+        """
+        hoehe, breite = bild.pixel.shape[:2]
+        if self.foto is None or (self.foto.width(), self.foto.height()) != (breite, hoehe):
+            self.foto = tk.PhotoImage(master=self.leinwand, width=breite, height=hoehe)
+            self.leinwand.itemconfigure(self.bild_id, image=self.foto)
+        self.foto.configure(data=ppm_daten(bild.pixel), format="PPM")
+        self.achse, self.xlim = bild.achse, bild.xlim
+        self.logger.info("✅ Diagramm erfolgreich aktualisiert.")
 
-        # Nur ganze Zahlen auf der Y-Achse
-        ax.yaxis.set_major_locator(MaxNLocator(integer=True))
+    def x_wert(self, pixel_x: float) -> float:
+        """
+        @brief Rechnet eine x-Position auf der Zeichenfläche in einen Wert der x-Achse um.
+        """
+        links, rechts = self.xlim
+        return links + (pixel_x - self.achse[0]) / self.achse[2] * (rechts - links)
 
-        # Diagramm einbinden
-        canvas = FigureCanvasTkAgg(fig, master=self)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, pady=10)
+    def zoomen(self, event):
+        """
+        @brief Zoomt mit dem Mausrad um die Position des Mauszeigers.
+        """
+        if self.xlim is None:
+            return
+        faktor = ZOOMFAKTOR if event.num == 4 or event.delta > 0 else 1 / ZOOMFAKTOR
+        links, rechts = self.xlim
+        mitte = self.x_wert(event.x)
+        self.ausschnitt = (mitte - (mitte - links) * faktor, mitte + (rechts - mitte) * faktor)
+        self.neu_zeichnen(erzwingen=True)
 
-        self.logger.info("✅ Diagramm erfolgreich erstellt und eingebunden.")
\ No newline at end of file
+    def ziehen_beginnen(self, event):
+        """
+        @brief Merkt sich Mausposition und Ausschnitt zu Beginn des Verschiebens.
+        """
+        self._ziehen = (event.x, self.xlim) if self.xlim is not None else None
+
+    def ziehen(self, event):
+        """
+        @brief Verschiebt den Ausschnitt mit gedrückter Maustaste.
+        """
+        if self._ziehen is None:
+            return
+        start_x, (links, rechts) = self._ziehen
+        verschiebung = (event.x - start_x) / self.achse[2] * (rechts - links)
+        self.ausschnitt = (links - verschiebung, rechts - verschiebung)
+        self.neu_zeichnen(erzwingen=True)
+
+    def ausschnitt_zuruecksetzen(self, event=None):
+        """
+        @brief Zeigt wieder den vollständigen Verlauf.
+        """
+        self.ausschnitt = None
+        self.neu_zeichnen(erzwingen=True)
+
+    def destroy(self):
+        """
+        @brief Beendet beim Verwerfen der Ansicht auch den Renderer und seinen Worker-Prozess.
+        """
+        if self.renderer is not None:
+            self.renderer.beenden()
+            self.renderer = None
+        super().destroy()
@@ -15,12 +15,13 @@ Lerntempo nicht im erwarteten Bereich liegt.
 import tkinter as tk
 from tkinter import ttk, messagebox
 import logging
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from datetime import datetime, timedelta
+from diagramm import Diagramm
+from hintergrund_lader import HintergrundLader
+from ansichten.aktualisierbare_ansicht import AktualisierbareAnsicht
 
 
-class Zeitmanagement(ttk.Frame):
+class Zeitmanagement(AktualisierbareAnsicht, ttk.Frame):
     """
     @brief GUI-Komponente für das Zeitmanagement.
 
@@ -43,8 +44,12 @@ class Zeitmanagement(ttk.Frame):
         super().__init__(master)
         self.master = master
         self.logger = logging.getLogger("Zeitmanagement")
+        self.diagramm = None
+        self.hinweise_angezeigt = False
 
         self.logger.info("📅 Zeitmanagement geladen.")
+        # Neue ECTS, Module oder ein geänderter Studiengang ändern Prognose und Diagramm
+        self.aktualisierung_einrichten({"modul", "semester", "studiengang"})
         self.erstelle_gui()
         self.lade_daten()
 
@@ -52,25 +57,40 @@ class Zeitmanagement(ttk.Frame):
         """
         @brief Erstellt die GUI-Struktur für das Zeitmanagement.
 
-        Fügt Labels und Container für die Anzeige der Zeitmanagement-Informationen hinzu.
+        Fügt Labels und Container für die Anzeige der Zeitmanagement-Informationen hinzu und
+        legt das Diagramm an, das bei jeder Aktualisierung nur neue Balkenhöhen erhält.
         """
         ttk.Label(self, text="⏳ Zeitmanagement", font=("Arial", 16)).pack(pady=10)
         self.info_frame = ttk.Frame(self)
         self.info_frame.pack(pady=5, fill=tk.X)
+        self.erstelle_wochenstunden_diagramm()
 
     def lade_daten(self):
         """
-        @brief Lädt die Zeitmanagement-Daten aus der Datenbank.
+        @brief Lädt die Zeitmanagement-Daten im Hintergrund aus der Datenbank.
+        """
+        self.laden(
+            lambda logik: logik.get_zeitmanagement_ansicht_daten(),
+            self.daten_anzeigen,
+            platzhalter=HintergrundLader.ladehinweis(self.info_frame, "⏳ Zeitmanagement wird berechnet..."),
+        )
 
-        Falls keine Daten gefunden werden, wird eine Meldung an den Nutzer ausgegeben.
+    def daten_anzeigen(self, daten):
         """
-        daten = self.master.logik.get_zeitmanagement_ansicht_daten()
+        @brief Zeigt die geladenen Zeitmanagement-Daten an.
 
+        Falls keine Daten gefunden werden, wird eine Meldung an den Nutzer ausgegeben.
+        Eine zuvor angezeigte Auswertung wird ersetzt.
+
+        @param daten Liste mit den Zeilen der View `zeitmanagement`.
+        """
         if not daten:
             messagebox.showinfo("Keine Daten", "Es sind keine Zeitmanagement-Daten verfügbar.")
             self.logger.warning("⚠️ Keine Zeitmanagement-Daten gefunden.")
             return
 
+        for widget in self.info_frame.winfo_children():
+            widget.destroy()
         self.anzeige_zeitmanagement(daten[0])
 
     def anzeige_zeitmanagement(self, daten):
@@ -99,11 +119,13 @@ class Zeitmanagement(ttk.Frame):
         prognose_text = prognose_ende.strftime("%d.%m.%Y") if prognose_ende else "Unbekannt (kein Fortschritt)"
         ttk.Label(self.info_frame, text=f"🎯 Erwartetes Studienende: {prognose_text}").pack(anchor="w", pady=2)
 
-        # Diagramm erzeugen
-        self.erstelle_wochenstunden_diagramm(geplante_stunden_pro_woche, aktuelle_ects_pro_woche)
+        # Diagramm aktualisieren
+        self.zeige_wochenstunden_diagramm(geplante_stunden_pro_woche, aktuelle_ects_pro_woche)
 
-        # Warnungen anzeigen
-        self.prüfe_lerntempo(geplante_stunden_pro_woche, aktuelle_ects_pro_woche)
+        # Warnungen nur beim ersten Anzeigen, nicht bei jeder Aktualisierung
+        if not self.hinweise_angezeigt:
+            self.hinweise_angezeigt = True
+            self.prüfe_lerntempo(geplante_stunden_pro_woche, aktuelle_ects_pro_woche)
 
     def berechne_studienpensum(self, zeitmodell, studienstart, aktuelle_ects, module_gesamt):
         """
@@ -136,22 +158,34 @@ class Zeitmanagement(ttk.Frame):
         return geplante_stunden_pro_woche, aktuelle_ects_pro_woche, prognose_ende
 
 
-    def erstelle_wochenstunden_diagramm(self, geplante_stunden, aktuelle_stunden):
+    def erstelle_wochenstunden_diagramm(self):
         """
-        @brief Erstellt ein Balkendiagramm für geplante und tatsächliche Lernzeiten.
+        @brief Legt das Balkendiagramm für geplante und tatsächliche Lernzeiten einmalig an.
+        """
+        self.diagramm = Diagramm(self, figsize=(6, 4))
+        self.diagramm.balken_anlegen(["Geplante Stunden", "Geleistete Stunden"], color=["blue", "green"])
+        self.diagramm.ax.set_ylabel("Stunden/Woche")
+        self.diagramm.ax.set_title("Vergleich: Geplante vs. Geleistete Lernstunden")
+
+    def zeige_wochenstunden_diagramm(self, geplante_stunden, aktuelle_stunden):
+        """
+        @brief Übernimmt neue Lernzeiten in die vorhandenen Balken.
 
         @param geplante_stunden Geplante Lernstunden pro Woche.
         @param aktuelle_stunden Tatsächlich geleistete Lernstunden pro Woche.
         """
-        fig, ax = plt.subplots(figsize=(6, 4))
-        ax.bar(["Geplante Stunden", "Geleistete Stunden"], [geplante_stunden, aktuelle_stunden], 
-               color=["blue", "green"])
-        ax.set_ylabel("Stunden/Woche")
-        ax.set_title("Vergleich: Geplante vs. Geleistete Lernstunden")
+        self.diagramm.balken_setzen([geplante_stunden, aktuelle_stunden])
+        if not self.diagramm.widget.winfo_manager():
+            self.diagramm.widget.pack(fill=tk.BOTH, expand=True, pady=10)
 
-        canvas = FigureCanvasTkAgg(fig, master=self)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, pady=10)
+    def destroy(self):
+        """
+        @brief Gibt beim Verwerfen der Ansicht auch die Figure des Diagramms frei.
+        """
+        if self.diagramm is not None:
+            self.diagramm.zerstoeren()
+            self.diagramm = None
+        super().destroy()
 
     def prüfe_lerntempo(self, geplante_stunden, aktuelle_stunden):
         """
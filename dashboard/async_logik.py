@@ -0,0 +1,199 @@
+"""
+@file async_logik.py
+@brief asyncio-Fassade für die Logik-Schicht.
+
+`AsyncLogik` stellt die Methoden der `Logik` als Koroutinen bereit, damit sie in einem
+asyncio-Dienst verwendet werden können, ohne die Ereignisschleife zu blockieren. Die
+Datenbankzugriffe laufen in einem eigenen Thread-Pool auf einer Logik im Pool-Betrieb.
+Die Anzahl gleichzeitiger Zugriffe ist begrenzt, und identische Lesezugriffe, die
+gleichzeitig laufen, teilen sich eine einzige Abfrage.
+
+@author CHOE
+@date 2025-01-31
+@version 1.0
+"""
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from logik import Logik, MAX_DIAGRAMMPUNKTE
+
+
+class AsyncLogik:
+    """
+    @class AsyncLogik
+    @brief Awaitable Variante der Logik-Schicht mit begrenzter Parallelität und Zusammenfassen von Abfragen.
+
+    @code
+    logik = AsyncLogik(max_parallel=4)
+    await logik.starten()
+    module = await logik.get_moduluebersicht_ansicht_daten()
+    await logik.beenden()
+    @endcode
+    """
+
+    def __init__(self, db_pfad=None, profil: str = None, max_parallel: int = 4, cache_groesse: int = 32):
+        """
+        @brief Initialisiert die Fassade und die zugrunde liegende Logik.
+
+        Die Logik wird im Pool-Betrieb mit `max_parallel` Leseverbindungen erstellt, da ihre
+        Methoden aus mehreren Threads des Executors aufgerufen werden.
+
+        @param db_pfad Optionaler Pfad zur SQLite-Datenbank.
+        @param profil Optionaler Name des Verbindungsprofils.
+        @param max_parallel Maximale Anzahl gleichzeitig laufender Datenbankzugriffe.
+        @param cache_groesse Maximale Anzahl zwischengespeicherter Ergebnisse.
+        """
+        if max_parallel < 1:
+            raise ValueError("max_parallel muss mindestens 1 sein.")
+        self.logger = logging.getLogger("AsyncLogik")
+        self.logik = Logik(db_pfad=db_pfad, cache_groesse=cache_groesse, profil=profil, pool_groesse=max_parallel)
+        self.max_parallel = max_parallel
+
+        self._ausfuehrer = ThreadPoolExecutor(max_workers=max_parallel, thread_name_prefix="AsyncLogik")
+        self._begrenzung = asyncio.Semaphore(max_parallel)
+        self._laufende_abfragen = {}  # Schlüssel -> asyncio.Future der laufenden Abfrage
+        self.zusammengefasst = 0
+
+    async def _ausfuehren(self, funktion, *args):
+        """
+        @brief Führt eine Logik-Methode im Executor aus, sobald ein Platz frei ist.
+
+        @param funktion Aufzurufende Methode der Logik.
+        @param args Positionsparameter der Methode.
+        @return Das Ergebnis der Methode.
+        """
+        async with self._begrenzung:
+            schleife = asyncio.get_running_loop()
+            return await schleife.run_in_executor(self._ausfuehrer, functools.partial(funktion, *args))
+
+    async def _lesen(self, funktion, *args):
+        """
+        @brief Führt einen Lesezugriff aus; gleichzeitige identische Aufrufe teilen sich das Ergebnis.
+
+        Läuft bereits eine Abfrage mit derselben Methode und denselben Parametern, wird auf
+        deren Ergebnis gewartet, statt eine weitere Abfrage zu starten. Bricht ein einzelner
+        Aufrufer ab, läuft die gemeinsame Abfrage für die übrigen weiter.
+
+        @param funktion Aufzurufende Lesemethode der Logik.
+        @param args Positionsparameter der Methode.
+        @return Eine eigene Kopie des Ergebnisses.
+        """
+        schluessel = (funktion.__name__, args)
+        laufend = self._laufende_abfragen.get(schluessel)
+        if laufend is None:
+            laufend = asyncio.ensure_future(self._ausfuehren(funktion, *args))
+            self._laufende_abfragen[schluessel] = laufend
+            laufend.add_done_callback(lambda _: self._abfrage_beendet(schluessel, laufend))
+        else:
+            self.zusammengefasst += 1
+
+        ergebnis = await asyncio.shield(laufend)
+        return ergebnis.copy() if isinstance(ergebnis, (list, dict)) else ergebnis
+
+    def _abfrage_beendet(self, schluessel, future) -> None:
+        """
+        @brief Entfernt eine abgeschlossene Abfrage aus den laufenden Abfragen.
+        @param schluessel Schlüssel der Abfrage.
+        @param future Die abgeschlossene Abfrage.
+        """
+        if self._laufende_abfragen.get(schluessel) is future:
+            del self._laufende_abfragen[schluessel]
+
+    async def _schreiben(self, funktion, *args):
+        """
+        @brief Führt einen Schreibzugriff aus.
+
+        Danach gestartete Lesezugriffe schließen sich keiner älteren, noch laufenden
+        Abfrage mehr an, damit sie die Änderung sicher sehen.
+
+        @param funktion Aufzurufende Schreibmethode der Logik.
+        @param args Positionsparameter der Methode.
+        @return Das Ergebnis der Methode.
+        """
+        try:
+            return await self._ausfuehren(funktion, *args)
+        finally:
+            self._laufende_abfragen.clear()
+
+    async def starten(self) -> bool:
+        """
+        @brief Startet die Logik-Schicht im Executor.
+        @return True, wenn der Start erfolgreich war, sonst False.
+        """
+        return await self._ausfuehren(self.logik.starten)
+
+    async def beenden(self) -> None:
+        """
+        @brief Beendet die Logik-Schicht und den Executor.
+        """
+        await self._ausfuehren(self.logik.beenden)
+        self._ausfuehrer.shutdown(wait=True)
+
+    def statistik(self) -> dict:
+        """
+        @brief Liefert Kennzahlen zu Cache, Verbindungspool und zusammengefassten Abfragen.
+        @return Dictionary mit den Kennzahlen.
+        """
+        pool = self.logik.datenbank.pool
+        return {
+            "zusammengefasst": self.zusammengefasst,
+            "laufend": len(self._laufende_abfragen),
+            "cache": self.logik.cache_statistik(),
+            "pool": pool.statistik() if pool else {},
+        }
+
+    async def get_daten_ansicht(self, ansicht_name: str):
+        """@brief Awaitable Variante von `Logik.get_daten_ansicht`."""
+        return await self._lesen(self.logik.get_daten_ansicht, ansicht_name)
+
+    async def get_moduluebersicht_ansicht_daten(self):
+        """@brief Awaitable Variante von `Logik.get_moduluebersicht_ansicht_daten`."""
+        return await self._lesen(self.logik.get_moduluebersicht_ansicht_daten)
+
+    async def set_moduluebersicht_ansicht_daten(self, aktion: str, daten: tuple) -> bool:
+        """@brief Awaitable Variante von `Logik.set_moduluebersicht_ansicht_daten`."""
+        return await self._schreiben(self.logik.set_moduluebersicht_ansicht_daten, aktion, daten)
+
+    async def module_importieren(self, module) -> tuple:
+        """@brief Awaitable Variante von `Logik.module_importieren`."""
+        return await self._schreiben(self.logik.module_importieren, list(module))
+
+    async def get_startbildschirm_ansicht_daten(self):
+        """@brief Awaitable Variante von `Logik.get_startbildschirm_ansicht_daten`."""
+        return await self._lesen(self.logik.get_startbildschirm_ansicht_daten)
+
+    async def set_startbildschirm_ansicht_daten(self, daten: tuple) -> bool:
+        """@brief Awaitable Variante von `Logik.set_startbildschirm_ansicht_daten`."""
+        return await self._schreiben(self.logik.set_startbildschirm_ansicht_daten, daten)
+
+    async def get_modul_status_zaehler(self) -> dict:
+        """@brief Awaitable Variante von `Logik.get_modul_status_zaehler`."""
+        return await self._lesen(self.logik.get_modul_status_zaehler)
+
+    async def get_studienfortschritt_ansicht_daten(self):
+        """@brief Awaitable Variante von `Logik.get_studienfortschritt_ansicht_daten`."""
+        return await self._lesen(self.logik.get_studienfortschritt_ansicht_daten)
+
+    async def get_studienfortschritt_verlauf(self, von: str = None, bis: str = None):
+        """@brief Awaitable Variante von `Logik.get_studienfortschritt_verlauf`."""
+        return await self._lesen(self.logik.get_studienfortschritt_verlauf, von, bis)
+
+    async def get_studienfortschritt_spalten(self, von: str = None, bis: str = None, zeitraum: str = "tag",
+                                             max_punkte: int = MAX_DIAGRAMMPUNKTE):
+        """@brief Awaitable Variante von `Logik.get_studienfortschritt_spalten`."""
+        return await self._lesen(self.logik.get_studienfortschritt_spalten, von, bis, zeitraum, max_punkte)
+
+    async def get_zeitmanagement_ansicht_daten(self):
+        """@brief Awaitable Variante von `Logik.get_zeitmanagement_ansicht_daten`."""
+        return await self._lesen(self.logik.get_zeitmanagement_ansicht_daten)
+
+    async def get_einstellungen_ansicht_daten(self):
+        """@brief Awaitable Variante von `Logik.get_einstellungen_ansicht_daten`."""
+        return await self._lesen(self.logik.get_einstellungen_ansicht_daten)
+
+    async def set_einstellungen_ansicht_daten(self, aktion: str, daten: tuple = None) -> bool:
+        """@brief Awaitable Variante von `Logik.set_einstellungen_ansicht_daten`."""
+        return await self._schreiben(self.logik.set_einstellungen_ansicht_daten, aktion, daten)
@@ -1,3 +1,4 @@
+import os
 import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).resolve().parent.parent))
@@ -5,38 +6,63 @@ sys.path.append(str(Path(__file__).resolve().parent.parent))
 import tkinter as tk
 from tkinter import ttk, messagebox
 from ansicht_enum import AnsichtTyp
-from ansichten.startbildschirm import Startbildschirm
-from ansichten.moduluebersicht import Moduluebersicht
-from ansichten.studienfortschritt import Studienfortschritt
-from ansichten.zeitmanagement import Zeitmanagement
-from ansichten.einstellungen import Einstellungen
+from ansicht_register import AnsichtRegister
 from logik import Logik
+from hintergrund_lader import HintergrundLader
+from ansicht_cache import AnsichtCache
 import logging
 
+# Die Ansichtsmodule (und damit matplotlib, numpy und tkcalendar) werden erst beim
+# ersten Öffnen der jeweiligen Ansicht importiert.
+ANSICHT_MODULE = {
+    AnsichtTyp.MODULUEBERSICHT: ("ansichten.moduluebersicht", "Moduluebersicht"),
+    AnsichtTyp.STUDIENFORTSCHRITT: ("ansichten.studienfortschritt", "Studienfortschritt"),
+    AnsichtTyp.ZEITMANAGEMENT: ("ansichten.zeitmanagement", "Zeitmanagement"),
+    AnsichtTyp.EINSTELLUNGEN: ("ansichten.einstellungen", "Einstellungen"),
+    AnsichtTyp.STARTBILDSCHIRM: ("ansichten.startbildschirm", "Startbildschirm"),
+}
+
+# Wartezeit nach dem Start, bevor die übrigen Ansichtsmodule im Hintergrund vorgeladen werden
+VORWAERMEN_VERZOEGERUNG_MS = 1000
+
+# Mit "1" werden Moduländerungen im Write-Behind-Modus geschrieben (siehe `Logik.schreibpuffer_aktivieren`)
+SCHREIBPUFFER_UMGEBUNGSVARIABLE = "DASHBOARD_SCHREIBPUFFER"
+
 
 class Dashboard(tk.Tk):
-    def __init__(self):
+    def __init__(self, vorwaermen: bool = True, schreibpuffer: bool = None):
+        """
+        @param vorwaermen Die übrigen Ansichtsmodule nach dem Start im Hintergrund vorladen.
+        @param schreibpuffer Moduländerungen im Write-Behind-Modus schreiben; ohne Angabe gilt
+            die Umgebungsvariable `DASHBOARD_SCHREIBPUFFER`, sonst wird direkt geschrieben.
+        """
         super().__init__()
         self.title("IU Dashboard")
         self.geometry("800x600")
+        self.protocol("WM_DELETE_WINDOW", self.beenden)
 
         self.logger = logging.getLogger("Dashboard")
         self.logik = Logik()
         self.logik.starten()
+        if schreibpuffer is None:
+            schreibpuffer = os.environ.get(SCHREIBPUFFER_UMGEBUNGSVARIABLE) == "1"
+        if schreibpuffer:
+            self.logik.schreibpuffer_aktivieren(self)
+        self.lader = HintergrundLader(self, self.logik)
 
         self.navigation = None
         self.inhalt = None
         self.aktuelle_ansicht = None
+        # Aufgebaute Ansichten bleiben erhalten und werden beim erneuten Besuch nur eingeblendet
+        self.ansichten = AnsichtCache(max_ansichten=3)
 
-        self.ansicht_typen = {
-            AnsichtTyp.MODULUEBERSICHT: Moduluebersicht,
-            AnsichtTyp.STUDIENFORTSCHRITT: Studienfortschritt,
-            AnsichtTyp.ZEITMANAGEMENT: Zeitmanagement,
-            AnsichtTyp.EINSTELLUNGEN: Einstellungen,
-        }
+        self.ansicht_typen = AnsichtRegister(ANSICHT_MODULE)
 
         self.logger.info("🚀 Dashboard gestartet, prüfe Studienstart...")
         self.studienstart_pruefen()
+        if vorwaermen:
+            # Erst nach dem ersten Zeichnen, damit der Start nicht verzögert wird
+            self.after(VORWAERMEN_VERZOEGERUNG_MS, self.ansicht_typen.vorwaermen)
 
     def navigation_erstellen(self):
         """Erstellt die Navigationsleiste (ohne den Startbildschirm)."""
@@ -47,6 +73,8 @@ class Dashboard(tk.Tk):
         self.navigation.pack(side=tk.LEFT, fill=tk.Y)
 
         for ansicht in self.ansicht_typen:
+            if ansicht == AnsichtTyp.STARTBILDSCHIRM:
+                continue
             button = ttk.Button(
                 self.navigation,
                 text=ansicht.value,
@@ -70,15 +98,26 @@ class Dashboard(tk.Tk):
 
     def ansicht_wechseln(self, ansicht: AnsichtTyp):
         """Wechselt die Ansicht und zeigt Navigation nach Studienstart an."""
+        # Ergebnisse für die bisherige Ansicht werden nicht mehr benötigt
+        self.lader.alle_abbrechen()
         if self.aktuelle_ansicht:
-            self.aktuelle_ansicht.pack_forget()
+            if self.ansichten.enthaelt_ansicht(self.aktuelle_ansicht):
+                self.aktuelle_ansicht.pack_forget()
+            else:
+                # Nicht zwischengespeicherte Ansichten (Startbildschirm) werden verworfen
+                self.aktuelle_ansicht.destroy()
 
         if ansicht == AnsichtTyp.MODULUEBERSICHT and not self.navigation:
             self.logger.info("🔄 Wechsel zur Modulübersicht -> Navigationsleiste aktivieren.")
             self.navigation_erstellen()
 
-        ansicht_klasse = self.ansicht_typen.get(ansicht, Startbildschirm)
-        self.aktuelle_ansicht = ansicht_klasse(self)
+        ansicht_klasse = self.ansicht_typen.klasse(ansicht)
+        if ansicht == AnsichtTyp.STARTBILDSCHIRM:
+            self.aktuelle_ansicht = ansicht_klasse(self)
+        else:
+            self.aktuelle_ansicht, neu = self.ansichten.holen(ansicht, lambda: ansicht_klasse(self))
+            if not neu and hasattr(self.aktuelle_ansicht, "anzeigen"):
+                self.aktuelle_ansicht.anzeigen()
         self.aktuelle_ansicht.pack(fill=tk.BOTH, expand=True)
 
         self.logger.info(f"🔄 Wechsel zur Ansicht: {ansicht.value}")
@@ -86,6 +125,10 @@ class Dashboard(tk.Tk):
     def beenden(self):
         """Beendet die Anwendung und trennt die Datenbankverbindung."""
         self.logger.info("⏹️ Dashboard wird beendet...")
+        # Haltelinie: alle gepufferten Moduländerungen festschreiben, bevor die Verbindungen schließen
+        self.logik.schreibpuffer_beenden()
+        self.lader.beenden()
+        self.ansichten.leeren()
         self.logik.beenden()
         self.destroy()
 
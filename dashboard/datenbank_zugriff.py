@@ -11,21 +11,108 @@ Es umfasst das Verbinden, Trennen, Initialisieren der Tabellen sowie CRUD-Operat
 """
 
 import os
+import re
+import json
+import datetime
+import hashlib
 import sqlite3
-import yaml
 import logging
+from contextlib import contextmanager
 from pathlib import Path
+from schema_migration import SchemaMigration
+from verbindungs_pool import VerbindungsPool, verbindung_oeffnen
+from aenderungs_bus import Aenderung
+
+SCHEMA_VERZEICHNIS = Path(__file__).parent.parent / "data"
+SCHEMA_SNAPSHOT = SCHEMA_VERZEICHNIS / ".schema_snapshot.json"
+SCHEMA_FORMAT_VERSION = 3
+
+MODUL_STATUS = ("Offen", "In Bearbeitung", "Abgeschlossen")
+SEMESTER_JE_ZEITMODELL = {"Vollzeit": 6, "TeilzeitI": 8, "TeilzeitII": 12}
+# Benannte Verbindungsprofile. Die Werte werden beim Verbinden als PRAGMA gesetzt;
+# "nur_lesen" öffnet die Datenbank schreibgeschützt (mode=ro).
+VERBINDUNGSPROFILE = {
+    # SQLite-Voreinstellungen (Rollback-Journal, synchronous=FULL), nur zum Vergleich
+    "standard": {},
+    # GUI-Betrieb: WAL erlaubt parallele Leser, NORMAL genügt unter WAL für Konsistenz
+    "interaktiv": {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16000,
+        "mmap_size": 64 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    },
+    # Große Importe: keine fsyncs, großer Seitencache; ein Absturz kann letzte Commits kosten
+    "massenimport": {
+        "busy_timeout": 30000,
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -262144,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    },
+    # Auswertungen: schreibgeschützt, großer mmap-Bereich für Scans
+    "analyse": {
+        "nur_lesen": True,
+        "busy_timeout": 5000,
+        "cache_size": -65536,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "query_only": "ON",
+    },
+}
+STANDARD_PROFIL = "interaktiv"
+PROFIL_UMGEBUNGSVARIABLE = "DASHBOARD_DB_PROFIL"
+
+# Ordnet einen Tag (`zeitpunkt`) dem ersten Tag seines Zeitraums zu (Woche ab Montag)
+ZEITRAEUME = {
+    "tag": "zeitpunkt",
+    "woche": "DATE(zeitpunkt, '-6 days', 'weekday 1')",
+    "monat": "DATE(zeitpunkt, 'start of month')",
+}
+
+# Empfohlene Frist für `verlauf_verdichten`: ältere Tageswerte bleiben nur als Wochen- und
+# Monatswerte erhalten. Beim Start wird nur verdichtet, wenn eine Frist gesetzt ist, entweder
+# über `Logik(verlauf_aufbewahrung_tage=...)` oder über die Umgebungsvariable
+VERLAUF_AUFBEWAHRUNG_TAGE = 730
+AUFBEWAHRUNG_UMGEBUNGSVARIABLE = "DASHBOARD_VERLAUF_AUFBEWAHRUNG_TAGE"
+
+# Ab so vielen geänderten Zeilen einer Tabelle je Commit wird nur eine Sammelmeldung verschickt
+AENDERUNGEN_SAMMELGRENZE = 500
+
+SCHREIBZIEL_MUSTER = re.compile(
+    r"^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)\s+[\"'`\[]?(\w+)",
+    re.IGNORECASE,
+)
+MODUL_INSERT_SQL = """
+INSERT INTO modul (semesterID, modulName, modulKuerzel, modulStatus, modulEctsPunkte, modulStart)
+VALUES (?, ?, ?, ?, ?, ?);
+"""
 
 class DatenbankZugriff:
     """
     @class DatenbankZugriff
     @brief Klasse für den Zugriff auf eine SQLite-Datenbank.
     """
-    def __init__(self, db_pfad=None):
+    def __init__(self, db_pfad=None, profil: str = None, pool_groesse: int = None, aenderungs_bus=None):
         """
         @brief Initialisiert die Datenbankverbindung.
         @param db_pfad Optionaler Pfad zur SQLite-Datenbank.
+        @param profil Optionaler Name eines Verbindungsprofils aus `VERBINDUNGSPROFILE`.
+            Ohne Angabe gilt die Umgebungsvariable `DASHBOARD_DB_PROFIL`, sonst "interaktiv".
+        @param pool_groesse Optionale Anzahl an Leseverbindungen. Ist sie gesetzt, arbeitet der
+            Zugriff mit einem `VerbindungsPool` und darf von mehreren Threads genutzt werden.
+        @param aenderungs_bus Optionaler `AenderungsBus`, an den nach jedem Commit die geänderten
+            Zeilen (Tabelle, Operation, rowid) veröffentlicht werden.
         """
+        profil = profil or os.environ.get(PROFIL_UMGEBUNGSVARIABLE) or STANDARD_PROFIL
+        if profil not in VERBINDUNGSPROFILE:
+            raise ValueError(
+                f"Unbekanntes Verbindungsprofil '{profil}' (erlaubt: {', '.join(VERBINDUNGSPROFILE)})."
+            )
+        self.profil = profil
+
         if db_pfad is None:
             base_path = Path(__file__).parent.parent / "data"
             self.db_pfad = str(base_path / "datenbank.db")
@@ -33,7 +120,15 @@ class DatenbankZugriff:
             self.db_pfad = db_pfad
         
         self.logger = logging.getLogger("DatenbankZugriff")
+        self.pool_groesse = pool_groesse
+        self.pool = None
         self.verbindung = None
+        self.letzter_fehler = None
+        self.aenderungs_bus = aenderungs_bus
+        self._protokoll_aktiv = False
+        self._transaktions_tiefe = 0
+        self._aenderungs_beobachter = []
+        self._transaktions_tabellen = set()
 
         db_verzeichnis = os.path.dirname(self.db_pfad)
         if not os.path.exists(db_verzeichnis):
@@ -58,127 +153,424 @@ class DatenbankZugriff:
     def verbinden(self):
         """
         @brief Verbindet mit der SQLite-Datenbank.
+
+        Die Verbindung läuft im Autocommit-Modus; Transaktionen werden ausschließlich
+        über `transaktion()` gesteuert. Anschließend werden die PRAGMAs des gewählten
+        Verbindungsprofils gesetzt. Im Pool-Betrieb ist `self.verbindung` die serialisierte
+        Schreibverbindung des Pools; Leseverbindungen werden bei Bedarf geöffnet.
         """
         try:
-            self.verbindung = sqlite3.connect(self.db_pfad)
-            self.verbindung.execute("PRAGMA foreign_keys = ON;")
-            self.logger.info(f"✅ Verbindung zur Datenbank '{self.db_pfad}' hergestellt.")
+            einstellungen = VERBINDUNGSPROFILE[self.profil]
+            if self.pool_groesse:
+                self.pool = VerbindungsPool(self.db_pfad, einstellungen, self.pool_groesse)
+                self.verbindung = self.pool.schreiber
+            else:
+                self.verbindung = verbindung_oeffnen(self.db_pfad, einstellungen)
+            self._aenderungsprotokoll_einrichten()
+            self.logger.info(f"✅ Verbindung zur Datenbank '{self.db_pfad}' hergestellt (Profil '{self.profil}').")
         except sqlite3.Error as e:
             self.logger.error(f"❌ Fehler beim Verbinden mit der Datenbank: {e}")
             raise
 
     def trennen(self):
         """
-        @brief Schließt die Verbindung zur Datenbank.
+        @brief Schließt die Verbindung zur Datenbank (im Pool-Betrieb alle Verbindungen des Pools).
         """
         if self.verbindung:
-            self.verbindung.close()
+            if self.pool:
+                self.pool.schliessen()
+                self.pool = None
+            else:
+                self.verbindung.close()
             self.verbindung = None
+            self._transaktions_tiefe = 0
+            self._protokoll_aktiv = False
             self.logger.info("✅ Datenbankverbindung erfolgreich geschlossen.")
 
-    def initialisieren(self):
+    def initialisieren(self, erzwingen: bool = False):
         """
         @brief Initialisiert Tabellen und Views basierend auf YAML-Definitionen.
+
+        Über alle YAML-Dateien wird ein Fingerabdruck gebildet und in `PRAGMA user_version`
+        abgelegt. Stimmt er beim nächsten Start überein, entfällt das Parsen der YAML-Dateien
+        und das erneute Ausführen der DDL-Befehle vollständig. Andernfalls gleicht
+        `SchemaMigration` die bestehende Datenbank mit den Definitionen ab.
+
+        @param erzwingen Führt die Initialisierung auch bei unverändertem Fingerabdruck aus.
         """
-        yaml_verzeichnis = Path(__file__).parent.parent / "data"
-        yaml_dateien = yaml_verzeichnis.glob("*.yaml")
+        yaml_dateien = sorted(SCHEMA_VERZEICHNIS.glob("*.yaml"))
+        fingerabdruck = self._schema_fingerabdruck(yaml_dateien)
 
+        if not erzwingen and self._gespeicherte_schema_version() == self._schema_version(fingerabdruck):
+            self.logger.info("✅ Schema unverändert, Initialisierung übersprungen.")
+            return
+
+        definitionen = self._lade_schema_definitionen(yaml_dateien, fingerabdruck)
+
+        try:
+            # Die TEMP-Trigger des Änderungsprotokolls dürfen Umbauten der Tabellen nicht stören
+            self._aenderungsprotokoll_entfernen()
+            migration = SchemaMigration(self.verbindung)
+            schritte = migration.planen(definitionen)
+            migration.anwenden(
+                schritte, definitionen,
+                abschluss_sql=(f"PRAGMA user_version = {self._schema_version(fingerabdruck)};",)
+            )
+            self.logger.info(f"✅ Schema initialisiert ({len(schritte)} Migrationsschritte).")
+        except sqlite3.Error as e:
+            self.logger.error(f"❌ Fehler beim Initialisieren des Schemas: {e}")
+        finally:
+            self._aenderungsprotokoll_einrichten()
+
+    @staticmethod
+    def _schema_fingerabdruck(yaml_dateien: list) -> str:
+        """
+        @brief Bildet einen SHA-256-Fingerabdruck über Namen und Inhalt aller YAML-Dateien.
+        @param yaml_dateien Sortierte Liste der YAML-Dateipfade.
+        @return Der Fingerabdruck als Hex-String.
+        """
+        hasher = hashlib.sha256(f"schema-format:{SCHEMA_FORMAT_VERSION}".encode("utf-8"))
+        for yaml_datei in yaml_dateien:
+            hasher.update(yaml_datei.name.encode("utf-8"))
+            hasher.update(yaml_datei.read_bytes())
+        return hasher.hexdigest()
+
+    @staticmethod
+    def _schema_version(fingerabdruck: str) -> int:
+        """
+        @brief Verdichtet den Fingerabdruck auf einen positiven Wert für `PRAGMA user_version`.
+        @param fingerabdruck Der Fingerabdruck als Hex-String.
+        @return Eine Ganzzahl ungleich 0 (0 steht für eine uninitialisierte Datenbank).
+        """
+        return int(fingerabdruck[:7], 16) or 1
+
+    def _gespeicherte_schema_version(self) -> int:
+        """
+        @brief Liest die in der Datenbank hinterlegte Schema-Version.
+        @return Der Wert von `PRAGMA user_version`.
+        """
+        return self.verbindung.execute("PRAGMA user_version;").fetchone()[0]
+
+    def _lade_schema_definitionen(self, yaml_dateien: list, fingerabdruck: str) -> list:
+        """
+        @brief Lädt die Schema-Definitionen aus dem Snapshot oder, falls veraltet, aus den YAML-Dateien.
+
+        Der Snapshot ist eine vorkompilierte JSON-Fassung der YAML-Dateien (Kommentare in den
+        SQL-Abschnitten bereits entfernt). Passt er zum Fingerabdruck, wird PyYAML nicht geladen.
+
+        @param yaml_dateien Sortierte Liste der YAML-Dateipfade.
+        @param fingerabdruck Aktueller Fingerabdruck der YAML-Dateien.
+        @return Liste von Tupeln (Dateiname, Definition).
+        """
+        try:
+            with open(SCHEMA_SNAPSHOT, "r", encoding="utf-8") as file:
+                snapshot = json.load(file)
+            if snapshot.get("fingerabdruck") == fingerabdruck:
+                self.logger.info("📦 Schema-Definitionen aus Snapshot geladen.")
+                return [tuple(eintrag) for eintrag in snapshot["definitionen"]]
+        except (OSError, ValueError, KeyError):
+            pass
+
+        import yaml
+
+        definitionen = []
         for yaml_datei in yaml_dateien:
             try:
                 with open(yaml_datei, "r", encoding="utf-8") as file:
                     config = yaml.safe_load(file)
-                    
-                    if "tabelle" in config:
-                        self._erstelle_tabelle(config)
-                    
-                    if "views" in config:
-                        self._erstelle_views(config["views"])
-                    
             except Exception as e:
-                self.logger.error(f"❌ Fehler beim Initialisieren mit '{yaml_datei}': {e}")
-
-    def _erstelle_views(self, views: dict):
-        for view_name, view_sql_list in views.items():
-            for view_sql in view_sql_list:
-                try:
-                    # Alle Zeilen, die mit '#' beginnen, raus filtern:
-                    lines = []
-                    for line in view_sql.split('\n'):
-                        if not line.strip().startswith('#'):
-                            lines.append(line)
-                    cleaned_view_sql = "\n".join(lines)
-
-                    cursor = self.verbindung.cursor()
-                    cursor.execute(cleaned_view_sql)
-                    self.logger.info(f"✅ View '{view_name}' erfolgreich erstellt.")
-                except sqlite3.Error as e:
-                    self.logger.error(f"❌ Fehler beim Erstellen der View '{view_name}': {e}")
-                    raise
-
-    def _erstelle_tabelle(self, model: dict):
-        """
-        @brief Erstellt Tabellen basierend auf YAML-Definitionen.
-        @param model Dictionary mit Tabellenname und Spalten.
-        """
-        tabellen_name = model["tabelle"]
-        spalten = model["spalten"]
-
-        spalten_definitionen = []
-        for spalte, definition in spalten.items():
-            spalten_definitionen.append(f"{spalte} {definition}")
-
-        sql_befehl = f"""
-        CREATE TABLE IF NOT EXISTS {tabellen_name} (
-            {', '.join(spalten_definitionen)}
-        );
-        """
-        
+                self.logger.error(f"❌ Fehler beim Lesen von '{yaml_datei}': {e}")
+                continue
+
+            for abschnitt in ("views", "trigger", "virtuelle_tabellen"):
+                if abschnitt in config:
+                    config[abschnitt] = {
+                        name: [self._entferne_kommentare(sql_befehl) for sql_befehl in sql_list]
+                        for name, sql_list in config[abschnitt].items()
+                    }
+            if "befuellen" in config:
+                config["befuellen"] = [self._entferne_kommentare(sql_befehl) for sql_befehl in config["befuellen"]]
+            definitionen.append((yaml_datei.name, config))
+
         try:
-            cursor = self.verbindung.cursor()
-            cursor.execute(sql_befehl)
-            self.verbindung.commit()
-            self.logger.info(f"✅ Tabelle '{tabellen_name}' erfolgreich erstellt.")
-        except sqlite3.Error as e:
-            self.logger.error(f"❌ Fehler beim Erstellen der Tabelle '{tabellen_name}': {e}")
-            raise
+            with open(SCHEMA_SNAPSHOT, "w", encoding="utf-8") as file:
+                json.dump({"fingerabdruck": fingerabdruck, "definitionen": definitionen}, file)
+        except OSError as e:
+            self.logger.warning(f"⚠️ Schema-Snapshot konnte nicht geschrieben werden: {e}")
+
+        return definitionen
 
-    def semester_vorbereiten(self, studiengang_id: int):
+    @staticmethod
+    def _entferne_kommentare(sql_befehl: str) -> str:
         """
-        @brief Stellt sicher, dass die Semester 1 - 12 für den gegebenen Studiengang existieren.
-        
-        Diese Methode überprüft, ob für den angegebenen Studiengang bereits 12 Semester existieren.
-        Falls weniger als 12 Semester vorhanden sind, werden die fehlenden Semester automatisch hinzugefügt.
+        @brief Entfernt alle Zeilen, die mit '#' beginnen, aus einem SQL-Befehl.
+        @param sql_befehl Der SQL-Befehl aus der YAML-Datei.
+        @return Der bereinigte SQL-Befehl.
+        """
+        return "\n".join(
+            line for line in sql_befehl.split("\n") if not line.strip().startswith("#")
+        )
+
+    @contextmanager
+    def _schreibverbindung(self):
+        """
+        @brief Liefert die Verbindung für Schreibzugriffe.
+
+        Im Pool-Betrieb wird die Schreibverbindung für die Dauer des Blocks exklusiv für den
+        aufrufenden Thread reserviert; andere Threads warten, bis sie wieder frei ist.
+        """
+        if self.pool is None:
+            yield self.verbindung
+            return
+        with self.pool.schreiben() as verbindung:
+            if verbindung is not self.verbindung:
+                # Der Pool hat eine defekte Verbindung ersetzt
+                self.verbindung = verbindung
+                self._aenderungsprotokoll_einrichten()
+            yield verbindung
+
+    @contextmanager
+    def _leseverbindung(self):
+        """
+        @brief Liefert die Verbindung für Lesezugriffe.
+
+        Im Pool-Betrieb wird eine Leseverbindung ausgeliehen. Hält der Thread gerade die
+        Schreibverbindung (offene Transaktion), wird diese verwendet, damit die eigenen,
+        noch nicht festgeschriebenen Änderungen sichtbar sind.
+        """
+        if self.pool is None or self.pool.schreiber_gehalten():
+            yield self.verbindung
+            return
+        with self.pool.lesen() as verbindung:
+            yield verbindung
+
+    @contextmanager
+    def transaktion(self):
+        """
+        @brief Fasst alle Datenbankzugriffe innerhalb des Blocks zu einer Transaktion zusammen.
+
+        Die äußerste Ebene startet eine Transaktion und committet sie beim Verlassen des
+        Blocks genau einmal. Verschachtelte Aufrufe legen einen SAVEPOINT an, sodass ein
+        Fehler im inneren Block nur dessen Änderungen zurückrollt. Bei einer Ausnahme wird
+        die jeweilige Ebene zurückgerollt und die Ausnahme weitergereicht.
+
+        @code
+        with datenbank.transaktion():
+            datenbank.modul_speichern(...)
+            datenbank.modul_speichern(...)
+        @endcode
+
+        Im Pool-Betrieb hält die Transaktion die Schreibverbindung bis zum Ende des Blocks.
+        """
+        with self._schreibverbindung() as verbindung:
+            ebene = self._transaktions_tiefe
+            if ebene == 0:
+                verbindung.execute("BEGIN IMMEDIATE;")
+            else:
+                verbindung.execute(f"SAVEPOINT ebene_{ebene};")
+            self._transaktions_tiefe += 1
+
+            try:
+                yield self
+            except BaseException:
+                self._transaktions_tiefe = ebene
+                if ebene == 0:
+                    verbindung.rollback()
+                    self.logger.warning("↩️ Transaktion zurückgerollt.")
+                else:
+                    verbindung.execute(f"ROLLBACK TO ebene_{ebene};")
+                    verbindung.execute(f"RELEASE ebene_{ebene};")
+                # Zwischenzeitlich gelesene Ergebnisse enthalten nun verworfene Änderungen
+                self._benachrichtigen(self._transaktions_tabellen)
+                if ebene == 0:
+                    self._transaktions_tabellen = set()
+                raise
+            else:
+                self._transaktions_tiefe = ebene
+                if ebene == 0:
+                    tabellen, self._transaktions_tabellen = self._transaktions_tabellen, set()
+                    verbindung.commit()
+                    # Andere Verbindungen lesen bis zum Commit den alten Stand; was sie in der
+                    # Zwischenzeit zwischengespeichert haben, ist erst jetzt veraltet
+                    self._benachrichtigen(tabellen)
+                    self._aenderungen_veroeffentlichen()
+                else:
+                    verbindung.execute(f"RELEASE ebene_{ebene};")
+
+    def _aenderungsprotokoll_einrichten(self) -> None:
+        """
+        @brief Legt je Tabelle TEMP-Trigger an, die geänderte Zeilen in `temp.aenderungsprotokoll` notieren.
+
+        Die Trigger gehören nur zu dieser Verbindung und erfassen auch Änderungen durch
+        Trigger (z. B. an `modul_status_zaehler`). Da das Protokoll Teil der Transaktion ist,
+        verschwinden Einträge zurückgerollter Änderungen automatisch. Ohne Änderungsbus oder
+        bei schreibgeschützten Profilen wird nichts eingerichtet.
+        """
+        if self.aenderungs_bus is None or VERBINDUNGSPROFILE[self.profil].get("nur_lesen"):
+            return
+        self._aenderungsprotokoll_entfernen()
+        self.verbindung.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS aenderungsprotokoll "
+            "(tabelle TEXT NOT NULL, operation TEXT NOT NULL, zeilen_id INTEGER);"
+        )
+        # Virtuelle Tabellen (z. B. FTS5) und ihre Schattentabellen erlauben keine Trigger bzw.
+        # spiegeln nur Änderungen anderer Tabellen
+        tabellen = self.verbindung.execute("""
+            SELECT t.name FROM main.sqlite_master t
+            WHERE t.type = 'table' AND t.name NOT LIKE 'sqlite_%' AND t.name <> 'schema_objekte'
+              AND t.sql NOT LIKE 'CREATE VIRTUAL TABLE%'
+              AND NOT EXISTS (
+                  SELECT 1 FROM main.sqlite_master v
+                  WHERE v.type = 'table' AND v.sql LIKE 'CREATE VIRTUAL TABLE%' AND t.name GLOB v.name || '_*'
+              );
+        """).fetchall()
+        for (tabelle,) in tabellen:
+            for operation, zeile in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+                self.verbindung.execute(f"""
+                CREATE TEMP TRIGGER aenderung_{tabelle}_{operation.lower()}
+                AFTER {operation} ON main.{tabelle}
+                BEGIN
+                    INSERT INTO aenderungsprotokoll VALUES ('{tabelle}', '{operation}', {zeile}.rowid);
+                END;
+                """)
+        self._protokoll_aktiv = True
+
+    def _aenderungsprotokoll_entfernen(self) -> None:
+        """
+        @brief Entfernt alle TEMP-Trigger des Änderungsprotokolls dieser Verbindung.
+        """
+        trigger = self.verbindung.execute(
+            "SELECT name FROM sqlite_temp_master WHERE type = 'trigger' AND name GLOB 'aenderung_*';"
+        ).fetchall()
+        for (name,) in trigger:
+            self.verbindung.execute(f"DROP TRIGGER temp.{name};")
+        self._protokoll_aktiv = False
+
+    def _aenderungen_veroeffentlichen(self) -> None:
+        """
+        @brief Liest festgeschriebene Änderungen aus dem Protokoll und veröffentlicht sie auf dem Bus.
+
+        Innerhalb einer Transaktion passiert nichts; veröffentlicht wird erst nach dem Commit.
+        Tabellen mit mehr als `AENDERUNGEN_SAMMELGRENZE` geänderten Zeilen werden zu einer
+        Sammelmeldung ohne Operation und rowid zusammengefasst.
+        """
+        if not self._protokoll_aktiv or self._transaktions_tiefe:
+            return
+        anzahlen = dict(self.verbindung.execute(
+            "SELECT tabelle, COUNT(*) FROM temp.aenderungsprotokoll GROUP BY tabelle;"
+        ).fetchall())
+        if not anzahlen:
+            return
+
+        aenderungen = [
+            Aenderung(*zeile) for zeile in self.verbindung.execute(
+                "SELECT tabelle, operation, zeilen_id FROM temp.aenderungsprotokoll ORDER BY rowid;"
+            ) if anzahlen[zeile[0]] <= AENDERUNGEN_SAMMELGRENZE
+        ]
+        aenderungen += [
+            Aenderung(tabelle, None, None) for tabelle, anzahl in anzahlen.items()
+            if anzahl > AENDERUNGEN_SAMMELGRENZE
+        ]
+        self.verbindung.execute("DELETE FROM temp.aenderungsprotokoll;")
+        self.aenderungs_bus.veroeffentlichen(aenderungen)
+
+    def aenderungen_beobachten(self, beobachter) -> None:
+        """
+        @brief Registriert eine Funktion, die nach jedem Schreibzugriff aufgerufen wird.
+
+        Der Beobachter erhält die Menge der geschriebenen Tabellen oder `None`, wenn sich
+        die gesamte Datenbank geändert hat (z. B. nach dem Löschen). Wird eine Transaktion
+        zurückgerollt, werden die darin geschriebenen Tabellen erneut gemeldet.
+
+        @param beobachter Aufrufbares Objekt mit einem Parameter (Tabellenmenge oder None).
+        """
+        self._aenderungs_beobachter.append(beobachter)
+
+    def _aenderung_melden(self, sql_befehl: str) -> None:
+        """
+        @brief Ermittelt die Zieltabelle eines Schreibbefehls und meldet sie den Beobachtern.
+        @param sql_befehl Der ausgeführte INSERT-, UPDATE- oder DELETE-Befehl.
+        """
+        treffer = SCHREIBZIEL_MUSTER.match(sql_befehl)
+        tabellen = {treffer.group(1).lower()} if treffer else None
+        if self._transaktions_tiefe:
+            if tabellen is None:
+                self._transaktions_tabellen = None
+            elif self._transaktions_tabellen is not None:
+                self._transaktions_tabellen |= tabellen
+        self._benachrichtigen(tabellen)
+
+    def _benachrichtigen(self, tabellen) -> None:
+        """
+        @brief Ruft alle registrierten Beobachter mit den geänderten Tabellen auf.
+        @param tabellen Menge der Tabellen oder `None` für die gesamte Datenbank.
+        """
+        if tabellen is not None and not tabellen:
+            return
+        for beobachter in self._aenderungs_beobachter:
+            beobachter(None if tabellen is None else set(tabellen))
+
+    def semester_vorbereiten(self, studiengang_id: int, anzahl: int = None) -> int:
+        """
+        @brief Stellt sicher, dass alle Semester für den gegebenen Studiengang existieren.
+
+        Die fehlenden Semester werden mengenbasiert mit genau einem Befehl angelegt: Ein rekursiver
+        CTE erzeugt die Semesternummern, bereits vorhandene Semester werden per
+        `ON CONFLICT DO NOTHING` übersprungen. Die Anzahl der Semester ergibt sich ohne
+        Angabe aus dem Zeitmodell des Studiengangs (Vollzeit 6, Teilzeit I 8, Teilzeit II 12)
+        zuzüglich der Urlaubssemester.
 
         @param studiengang_id Die eindeutige ID des Studiengangs.
+        @param anzahl Optionale Anzahl der Semester; überschreibt den Wert aus dem Zeitmodell.
+        @return Die Anzahl der neu angelegten Semester.
         """
         self.logger.info(f"📚 Überprüfe, ob Semester für Studiengang {studiengang_id} existieren...")
 
-        # Anzahl der vorhandenen Semester abrufen
-        vorhandene_semester = self.abfragen(
-            "SELECT COUNT(*) FROM semester WHERE studiengangID = ?;",
-            (studiengang_id,)
-        )[0][0]
-
-        # Falls weniger als 12 Semester existieren, fehlende Semester hinzufügen
-        if vorhandene_semester < 12:
-            self.logger.info(f"➕ Fehlen Semester für Studiengang {studiengang_id}, füge sie hinzu...")
-
-            for semester_nr in range(1, 13):
-                # Überprüfen, ob das Semester bereits existiert
-                existiert = self.abfragen(
-                    "SELECT semesterID FROM semester WHERE studiengangID = ? AND semesterNR = ?;",
-                    (studiengang_id, semester_nr)
+        if anzahl is None:
+            zeitmodell = self.abfragen(
+                "SELECT zeitModell FROM studiengang WHERE studiengangID = ?;", (studiengang_id,)
+            )
+            if zeitmodell and zeitmodell[0][0] not in SEMESTER_JE_ZEITMODELL:
+                self.logger.error(
+                    f"❌ Unbekanntes Zeitmodell '{zeitmodell[0][0]}' für Studiengang {studiengang_id}; "
+                    f"es werden keine Semester angelegt (erlaubt: {', '.join(SEMESTER_JE_ZEITMODELL)})."
                 )
-                
-                # Falls das Semester nicht existiert, hinzufügen
-                if not existiert:
-                    self.manipulieren(
-                        "INSERT INTO semester (studiengangID, semesterNR, istUrlaubSemester) VALUES (?, ?, ?);",
-                        (studiengang_id, semester_nr, 0)
-                    )
-                    self.logger.info(f"✅ Semester {semester_nr} für Studiengang {studiengang_id} hinzugefügt.")
+                return 0
+
+        semester_je_zeitmodell = " ".join(
+            f"WHEN '{zeitmodell}' THEN {semester}" for zeitmodell, semester in SEMESTER_JE_ZEITMODELL.items()
+        )
+        sql = f"""
+        INSERT INTO semester (studiengangID, semesterNR, istUrlaubSemester)
+        WITH RECURSIVE ziel(studiengangID, anzahl) AS (
+            SELECT studiengangID,
+                   COALESCE(:anzahl, CASE zeitModell {semester_je_zeitmodell} END + urlaubsSemester)
+            FROM studiengang
+            WHERE studiengangID = :studiengang_id
+        ),
+        nummern(semesterNR) AS (
+            SELECT 1
+            UNION ALL
+            SELECT semesterNR + 1 FROM nummern WHERE semesterNR < (SELECT anzahl FROM ziel)
+        )
+        SELECT z.studiengangID, n.semesterNR, 0
+        FROM ziel z
+        JOIN nummern n ON n.semesterNR <= z.anzahl
+        WHERE true
+        ON CONFLICT DO NOTHING;
+        """
+        parameter = {"studiengang_id": studiengang_id, "anzahl": anzahl}
+
+        with self._schreibverbindung() as verbindung:
+            cursor = verbindung.cursor()
+            cursor.execute(sql, parameter)
+            self._aenderung_melden(sql)
+            self._aenderungen_veroeffentlichen()
+        if cursor.rowcount:
+            self.logger.info(f"✅ {cursor.rowcount} Semester für Studiengang {studiengang_id} hinzugefügt.")
         else:
             self.logger.info(f"✅ Alle Semester für Studiengang {studiengang_id} existieren bereits.")
+        return cursor.rowcount
 
     def abfragen(self, sql_befehl: str, parameter: tuple = ()) -> list:
         """
@@ -188,32 +580,78 @@ class DatenbankZugriff:
         @return Liste der Abfrageergebnisse.
         """
         try:
-            cursor = self.verbindung.cursor()
-            cursor.execute(sql_befehl, parameter)
-            ergebnisse = cursor.fetchall()
+            with self._leseverbindung() as verbindung:
+                ergebnisse = verbindung.execute(sql_befehl, parameter).fetchall()
             self.logger.info(f"✅ Abfrage erfolgreich: {sql_befehl}")
             return ergebnisse
         except sqlite3.Error as e:
             self.logger.error(f"❌ Fehler bei der Abfrage: {e}")
             raise
 
+    def spalten_abfragen(self, sql_befehl: str, parameter=(), datumsspalten=()) -> list:
+        """
+        @brief Führt eine SELECT-Abfrage aus und liefert das Ergebnis spaltenweise als numpy-Arrays.
+
+        Die Zeilen werden mit `fetchall()` geholt und in C transponiert (`zip(*zeilen)`); numpy
+        wandelt jede Spalte anschließend in einem Schritt um, ohne Python-Schleife je Zeile.
+        Zahlenspalten werden zu `int32`, Datumsspalten (Format 'YYYY-MM-DD') zu `datetime64[D]`.
+        Die Zeilen behalten die Reihenfolge der Abfrage, die daher ein `ORDER BY` enthalten sollte.
+
+        @param sql_befehl Die SELECT-Abfrage; alle Spalten müssen ganzzahlig oder Datumswerte sein.
+        @param parameter Optionale Parameter für die SQL-Abfrage.
+        @param datumsspalten Namen der Spalten, die als Datum eingelesen werden.
+        @return Liste mit einem Array je Spalte, in der Reihenfolge der Abfrage.
+        @throws ValueError Bei NULL-Werten, nicht ganzzahligen Werten oder ungültigen Datumsangaben.
+        """
+        import numpy as np
+
+        try:
+            with self._leseverbindung() as verbindung:
+                cursor = verbindung.execute(sql_befehl, parameter)
+                namen = [spalte[0] for spalte in cursor.description]
+                zeilen = cursor.fetchall()
+            self.logger.info(f"✅ Spaltenweise Abfrage erfolgreich: {sql_befehl}")
+        except sqlite3.Error as e:
+            self.logger.error(f"❌ Fehler bei der spaltenweisen Abfrage: {e}")
+            raise
+
+        spalten = []
+        for name, werte in zip(namen, zip(*zeilen) if zeilen else [()] * len(namen)):
+            if name in datumsspalten:
+                # Wirft bei Texten, die kein Datum sind; NULL wird zu NaT
+                spalte = np.array(werte, dtype="datetime64[D]")
+                if np.isnat(spalte).any():
+                    raise ValueError(f"Spalte '{name}' enthält NULL-Werte.")
+            else:
+                spalte = np.array(werte) if werte else np.array(werte, dtype=np.int32)
+                if spalte.dtype.kind not in "iub":
+                    raise ValueError(f"Spalte '{name}' enthält NULL-Werte, Texte oder Kommazahlen ({spalte.dtype}).")
+                spalte = spalte.astype(np.int32)
+            spalten.append(spalte)
+        return spalten
+
     def manipulieren(self, sql_befehl: str, parameter: tuple = ()) -> bool:
         """
         @brief Führt eine Datenmanipulation (INSERT, UPDATE, DELETE) aus.
+
+        Außerhalb einer Transaktion wird der Befehl sofort festgeschrieben. Innerhalb von
+        `transaktion()` wird er Teil der umgebenden Transaktion und erst mit ihr committet.
         @param sql_befehl Der auszuführende SQL-Befehl.
         @param parameter Optionale Parameter für die SQL-Abfrage.
-        @return True, wenn erfolgreich, sonst False.
+        @return True, wenn erfolgreich, sonst False. Der Fehler steht dann in `letzter_fehler`.
         """
         try:
             if not self.verbindung:
                 self.logger.error("❌ Datenbankverbindung ist nicht aktiv.")
                 return False
-            cursor = self.verbindung.cursor()
-            cursor.execute(sql_befehl, parameter)
-            self.verbindung.commit()
+            with self._schreibverbindung() as verbindung:
+                verbindung.execute(sql_befehl, parameter)
+                self._aenderung_melden(sql_befehl)
+                self._aenderungen_veroeffentlichen()
             self.logger.info(f"✅ Manipulation erfolgreich: {sql_befehl}")
             return True
         except sqlite3.Error as e:
+            self.letzter_fehler = e
             self.logger.error(f"❌ Fehler bei der Manipulation: {e}")
             return False
 
@@ -240,18 +678,21 @@ class DatenbankZugriff:
         daten = (studiengang_name, startdatum, urlaubssemester, zeitmodell, unique_constraint)
 
         self.logger.info(f"✏️ Speichern des Studiengangs: {daten}")
-        erfolg = self.manipulieren(sql, daten)
 
-        if erfolg:
-            self.logger.info("✅ Studiengang erfolgreich gespeichert.")
+        # Studiengang und Semester werden gemeinsam festgeschrieben
+        with self.transaktion():
+            erfolg = self.manipulieren(sql, daten)
 
-            # Studiengang-ID abrufen, um die zugehörigen Semester vorzubereiten
-            studiengang_id = self.abfragen(
-                "SELECT studiengangID FROM studiengang WHERE uniqueConstraint = 1;"
-            )[0][0]
-            
-            # Sicherstellen, dass die Semester für den Studiengang erstellt werden
-            self.semester_vorbereiten(studiengang_id)
+            if erfolg:
+                self.logger.info("✅ Studiengang erfolgreich gespeichert.")
+
+                # Studiengang-ID abrufen, um die zugehörigen Semester vorzubereiten
+                studiengang_id = self.abfragen(
+                    "SELECT studiengangID FROM studiengang WHERE uniqueConstraint = 1;"
+                )[0][0]
+
+                # Sicherstellen, dass die Semester für den Studiengang erstellt werden
+                self.semester_vorbereiten(studiengang_id)
 
         return erfolg
     
@@ -270,14 +711,99 @@ class DatenbankZugriff:
         @param startdatum Das Startdatum des Moduls im Format 'YYYY-MM-DD'.
         @return True, wenn das Modul erfolgreich gespeichert wurde, sonst False.
         """
-        sql = """
-        INSERT INTO modul (semesterID, modulName, modulKuerzel, modulStatus, modulEctsPunkte, modulStart)
-        VALUES (?, ?, ?, ?, ?, ?);
-        """
-        
         daten = (semester_id, modul_name, kuerzel, status, ects, startdatum)
-        return self.manipulieren(sql, daten)
-    
+        return self.manipulieren(MODUL_INSERT_SQL, daten)
+
+    def modul_speichern_viele(self, module) -> tuple:
+        """
+        @brief Speichert viele Module mit einem `executemany` in einer gemeinsamen Transaktion.
+
+        Alle Module werden zunächst in einem Durchlauf geprüft (Aufbau, Status, ECTS, Datum,
+        vorhandenes Semester und eindeutiges Kürzel, auch innerhalb des Imports). Ungültige
+        Einträge werden gemeldet, ohne den Import der übrigen Module abzubrechen. Schlägt das
+        `executemany` dennoch fehl, werden die Module einzeln über SAVEPOINTs eingefügt.
+
+        @param module Iterable von Tupeln (semester_id, modul_name, kuerzel, status, ects, startdatum).
+        @return Tupel (Anzahl gespeicherter Module, Liste von Fehlern als (Index, Modul, Meldung)).
+        """
+        gueltig, fehler = self._validiere_module(list(module))
+        gespeichert = 0
+
+        with self.transaktion():
+            try:
+                with self.transaktion():
+                    self.verbindung.executemany(MODUL_INSERT_SQL, [modul for _, modul in gueltig])
+                    self._aenderung_melden(MODUL_INSERT_SQL)
+                gespeichert = len(gueltig)
+            except sqlite3.Error as e:
+                self.logger.warning(f"⚠️ Sammelimport fehlgeschlagen ({e}), füge Module einzeln ein...")
+                for index, modul in gueltig:
+                    try:
+                        with self.transaktion():
+                            self.verbindung.execute(MODUL_INSERT_SQL, modul)
+                            self._aenderung_melden(MODUL_INSERT_SQL)
+                        gespeichert += 1
+                    except sqlite3.Error as e:
+                        fehler.append((index, modul, str(e)))
+
+        fehler.sort(key=lambda eintrag: eintrag[0])
+        self.logger.info(f"✅ Sammelimport: {gespeichert} Module gespeichert, {len(fehler)} fehlerhaft.")
+        return gespeichert, fehler
+
+    def _validiere_module(self, module: list) -> tuple:
+        """
+        @brief Prüft eine Liste von Modulen in einem Durchlauf.
+        @param module Liste von Modul-Tupeln.
+        @return Tupel (Liste gültiger (Index, Modul), Liste von Fehlern als (Index, Modul, Meldung)).
+        """
+        semester_ids = {zeile[0] for zeile in self.abfragen("SELECT semesterID FROM semester;")}
+        vorhandene_kuerzel = set()
+        kuerzel_liste = list({modul[2] for modul in module if len(modul) == 6})
+        for start in range(0, len(kuerzel_liste), 500):
+            teil = kuerzel_liste[start:start + 500]
+            platzhalter = ", ".join("?" * len(teil))
+            vorhandene_kuerzel.update(zeile[0] for zeile in self.abfragen(
+                f"SELECT modulKuerzel FROM modul WHERE modulKuerzel IN ({platzhalter});", tuple(teil)
+            ))
+
+        gueltig, fehler = [], []
+        for index, modul in enumerate(module):
+            meldung = self._pruefe_modul(modul, semester_ids, vorhandene_kuerzel)
+            if meldung:
+                fehler.append((index, modul, meldung))
+            else:
+                vorhandene_kuerzel.add(modul[2])
+                gueltig.append((index, tuple(modul)))
+        return gueltig, fehler
+
+    @staticmethod
+    def _pruefe_modul(modul, semester_ids: set, vorhandene_kuerzel: set):
+        """
+        @brief Prüft ein einzelnes Modul-Tupel.
+        @param modul Tupel (semester_id, modul_name, kuerzel, status, ects, startdatum).
+        @param semester_ids Menge der vorhandenen Semester-IDs.
+        @param vorhandene_kuerzel Bereits vergebene Modulkürzel.
+        @return Fehlermeldung oder None, falls das Modul gültig ist.
+        """
+        if len(modul) != 6:
+            return "Ungültige Anzahl an Feldern."
+        semester_id, modul_name, kuerzel, status, ects, startdatum = modul
+        if semester_id not in semester_ids:
+            return f"Semester {semester_id} existiert nicht."
+        if not modul_name or not kuerzel:
+            return "Modulname und Kürzel dürfen nicht leer sein."
+        if kuerzel in vorhandene_kuerzel:
+            return f"Kürzel '{kuerzel}' ist bereits vergeben."
+        if status not in MODUL_STATUS:
+            return f"Ungültiger Status '{status}'."
+        if not isinstance(ects, int) or ects <= 0 or ects % 5 != 0:
+            return f"Ungültige ECTS-Punkte '{ects}'."
+        try:
+            datetime.date.fromisoformat(startdatum)
+        except (TypeError, ValueError):
+            return f"Ungültiges Startdatum '{startdatum}'."
+        return None
+
     def modul_aktualisieren(self, modul_id: int, modul_name: str, kuerzel: str, status: str, ects: int, startdatum: str) -> bool:
         """
         @brief Aktualisiert die Daten eines bestehenden Moduls in der Datenbank.
@@ -336,13 +862,22 @@ class DatenbankZugriff:
             WHERE uniqueConstraint = 1;
             """
             self.logger.info(f"✏️ Aktualisiere Einstellungen: {daten}")
-            return self.manipulieren(sql, daten)
+            with self.transaktion():
+                erfolg = self.manipulieren(sql, daten)
+                if erfolg:
+                    # Ein längeres Zeitmodell benötigt zusätzliche Semester
+                    for (studiengang_id,) in self.abfragen(
+                        "SELECT studiengangID FROM studiengang WHERE uniqueConstraint = 1;"
+                    ):
+                        self.semester_vorbereiten(studiengang_id)
+            return erfolg
 
         elif aktion.upper() == "DELETE":
             import os
             try:
                 self.trennen()
                 os.remove(self.db_pfad)
+                self._benachrichtigen(None)
                 self.logger.warning("⚠️ Datenbank erfolgreich gelöscht. Anwendung wird beendet.")
                 return True
             except Exception as e:
@@ -353,49 +888,245 @@ class DatenbankZugriff:
             self.logger.error(f"❌ Ungültige Aktion: {aktion}")
             return False
         
+    def modul_status_zaehlen(self) -> dict:
+        """
+        @brief Liefert die Anzahl der Module je Status aus der Zählertabelle.
+
+        Die Zählertabelle `modul_status_zaehler` wird per Trigger bei jeder Änderung an
+        `modul` fortgeschrieben, sodass das Lesen unabhängig von der Modulanzahl ist.
+
+        @return Dictionary {Status: Anzahl} für alle Werte aus `MODUL_STATUS`.
+        """
+        zaehler = dict.fromkeys(MODUL_STATUS, 0)
+        zaehler.update(self.abfragen("SELECT modulStatus, anzahl FROM modul_status_zaehler;"))
+        return zaehler
+
+    @staticmethod
+    def verlauf_zusammenfassen_sql(sql_befehl: str, zeitraum: str = "tag") -> str:
+        """
+        @brief Fasst eine Tagesreihe des Studienfortschritts in SQL zu Wochen oder Monaten zusammen.
+
+        Je Zeitraum wird der Stand des letzten erfassten Tags übernommen und dem ersten Tag
+        des Zeitraums zugeordnet. Dafür nutzt die Abfrage, dass SQLite bei `MAX()` die übrigen
+        Spalten aus der Zeile mit dem größten Wert liefert.
+
+        @param sql_befehl Abfrage mit den Spalten modulOffen, modulInBearbeitung,
+            modulAbgeschlossen und zeitpunkt.
+        @param zeitraum "tag" (unverändert), "woche" oder "monat".
+        @return Die zusammenfassende Abfrage, nach Datum sortiert.
+        @throws ValueError Bei einem unbekannten Zeitraum.
+        """
+        if zeitraum not in ZEITRAEUME:
+            raise ValueError(f"Unbekannter Zeitraum: {zeitraum} (erlaubt: {', '.join(ZEITRAEUME)})")
+        if zeitraum == "tag":
+            return sql_befehl
+        return f"""
+        SELECT modulOffen, modulInBearbeitung, modulAbgeschlossen, zeitraum AS zeitpunkt
+        FROM (
+            SELECT reihe.*, {ZEITRAEUME[zeitraum]} AS zeitraum, MAX(reihe.zeitpunkt)
+            FROM ({sql_befehl.strip().rstrip(";")}) reihe
+            GROUP BY zeitraum
+        )
+        ORDER BY zeitpunkt;
+        """
+
+    def verlauf_rekonstruieren(self, von: str = None, bis: str = None, spaltenweise: bool = False,
+                               zeitraum: str = "tag") -> list:
+        """
+        @brief Rekonstruiert den Studienfortschritt für jeden Tag eines Zeitraums aus `modul_ereignis`.
+
+        Die Ereignisse werden in SQL je Tag zu Änderungen (+1 für den neuen, -1 für den alten
+        Status) zusammengefasst und in einem einzigen geordneten Durchlauf per Präfixsumme
+        (`SUM(...) OVER (ORDER BY tag)`) aufaddiert. Tage ohne Ereignis übernehmen den Stand
+        des Vortags, sodass die Reihe lückenlos ist.
+
+        @param von Erster Tag im Format 'YYYY-MM-DD' (Standard: erstes Ereignis).
+        @param bis Letzter Tag im Format 'YYYY-MM-DD' (Standard: heute).
+        @param spaltenweise True, um die Reihe als numpy-Arrays zu erhalten (siehe `spalten_abfragen`).
+        @param zeitraum "tag", "woche" oder "monat" (siehe `verlauf_zusammenfassen_sql`).
+        @return Liste von Tupeln (modulOffen, modulInBearbeitung, modulAbgeschlossen, zeitpunkt)
+            bzw. eine Liste mit diesen vier Spalten als Arrays.
+        """
+        sql = """
+        WITH RECURSIVE
+        grenzen AS (
+            SELECT
+                COALESCE(DATE(:von), (SELECT MIN(zeitpunkt) FROM modul_ereignis)) AS von,
+                COALESCE(DATE(:bis), DATE('now')) AS bis
+        ),
+        tage(tag) AS (
+            SELECT von FROM grenzen WHERE von IS NOT NULL
+            UNION ALL
+            SELECT DATE(tag, '+1 day') FROM tage, grenzen WHERE tag < grenzen.bis
+        ),
+        deltas AS (
+            SELECT
+                zeitpunkt AS tag,
+                SUM((statusNeu IS 'Offen') - (statusAlt IS 'Offen')) AS offen,
+                SUM((statusNeu IS 'In Bearbeitung') - (statusAlt IS 'In Bearbeitung')) AS bearbeitung,
+                SUM((statusNeu IS 'Abgeschlossen') - (statusAlt IS 'Abgeschlossen')) AS abgeschlossen
+            FROM modul_ereignis
+            WHERE zeitpunkt <= (SELECT bis FROM grenzen)
+            GROUP BY zeitpunkt
+        ),
+        anfang AS (
+            SELECT
+                COALESCE(SUM(offen), 0) AS offen,
+                COALESCE(SUM(bearbeitung), 0) AS bearbeitung,
+                COALESCE(SUM(abgeschlossen), 0) AS abgeschlossen
+            FROM deltas
+            WHERE tag < (SELECT von FROM grenzen)
+        )
+        SELECT
+            a.offen + SUM(COALESCE(d.offen, 0)) OVER fenster AS modulOffen,
+            a.bearbeitung + SUM(COALESCE(d.bearbeitung, 0)) OVER fenster AS modulInBearbeitung,
+            a.abgeschlossen + SUM(COALESCE(d.abgeschlossen, 0)) OVER fenster AS modulAbgeschlossen,
+            t.tag AS zeitpunkt
+        FROM tage t
+        CROSS JOIN anfang a
+        LEFT JOIN deltas d ON d.tag = t.tag
+        WINDOW fenster AS (ORDER BY t.tag)
+        ORDER BY t.tag;
+        """
+        sql = self.verlauf_zusammenfassen_sql(sql, zeitraum)
+        if spaltenweise:
+            return self.spalten_abfragen(sql, {"von": von, "bis": bis}, datumsspalten={"zeitpunkt"})
+        return self.abfragen(sql, {"von": von, "bis": bis})
+
     def aktualisiere_studienfortschritt(self):
         """
         @brief Aktualisiert die Studienfortschrittsdaten in der Tabelle `verlauf`.
 
-        Diese Methode überprüft den aktuellen Status der Module und aktualisiert 
-        die Studienfortschrittsstatistik in der `verlauf`-Tabelle. Falls für das 
-        aktuelle Datum noch kein Eintrag existiert, wird ein neuer Datensatz erstellt.
+        Diese Methode übernimmt den aktuellen Stand der Zählertabelle `modul_status_zaehler`
+        als Tageswert in die `verlauf`-Tabelle. Falls für das aktuelle Datum noch kein
+        Eintrag existiert, wird ein neuer Datensatz erstellt, sonst wird er überschrieben.
 
-        @note Diese Methode zählt die Module in den verschiedenen Statuskategorien 
-            ("Offen", "In Bearbeitung", "Abgeschlossen") und speichert die Ergebnisse 
-            in der Datenbank.
+        @note Die Statuskategorien ("Offen", "In Bearbeitung", "Abgeschlossen") werden nicht
+            mehr per `COUNT(*)` über `modul` ermittelt, sondern als einzelne Zeile aus den
+            per Trigger gepflegten Zählern kopiert.
 
         @exception sqlite3.Error Falls ein Fehler bei der Datenbankaktualisierung auftritt.
         """
         try:
             self.logger.info("🔄 Aktualisiere Studienfortschritt...")
 
-            sql_update = """
-            UPDATE verlauf
-            SET 
-                modulOffen = (SELECT COUNT(*) FROM modul WHERE modulStatus = 'Offen'),
-                modulInBearbeitung = (SELECT COUNT(*) FROM modul WHERE modulStatus = 'In Bearbeitung'),
-                modulAbgeschlossen = (SELECT COUNT(*) FROM modul WHERE modulStatus = 'Abgeschlossen')
-            WHERE zeitpunkt = DATE('now');
+            sql = """
+            INSERT INTO verlauf (modulOffen, modulInBearbeitung, modulAbgeschlossen, zeitpunkt)
+            SELECT
+                COALESCE(SUM(CASE WHEN modulStatus = 'Offen' THEN anzahl END), 0),
+                COALESCE(SUM(CASE WHEN modulStatus = 'In Bearbeitung' THEN anzahl END), 0),
+                COALESCE(SUM(CASE WHEN modulStatus = 'Abgeschlossen' THEN anzahl END), 0),
+                DATE('now')
+            FROM modul_status_zaehler
+            WHERE true
+            ON CONFLICT (zeitpunkt) DO UPDATE SET
+                modulOffen = excluded.modulOffen,
+                modulInBearbeitung = excluded.modulInBearbeitung,
+                modulAbgeschlossen = excluded.modulAbgeschlossen;
             """
-            cursor = self.verbindung.cursor()
-            cursor.execute(sql_update)
-
-            # Falls kein Eintrag für das heutige Datum existiert, neuen Eintrag erstellen
-            if cursor.rowcount == 0:
-                sql_insert = """
-                INSERT INTO verlauf (modulOffen, modulInBearbeitung, modulAbgeschlossen, zeitpunkt)
-                SELECT 
-                    (SELECT COUNT(*) FROM modul WHERE modulStatus = 'Offen'),
-                    (SELECT COUNT(*) FROM modul WHERE modulStatus = 'In Bearbeitung'),
-                    (SELECT COUNT(*) FROM modul WHERE modulStatus = 'Abgeschlossen'),
-                    DATE('now')
-                WHERE NOT EXISTS (SELECT 1 FROM verlauf WHERE zeitpunkt = DATE('now'));
-                """
-                cursor.execute(sql_insert)
-
-            self.verbindung.commit()
+            with self._schreibverbindung() as verbindung:
+                verbindung.execute(sql)
+                self._aenderung_melden(sql)
+                self._aenderungen_veroeffentlichen()
             self.logger.info("✅ Studienfortschritt erfolgreich aktualisiert.")
-        
+
+        except sqlite3.Error as e:
+            self.logger.error(f"❌ Fehler beim Aktualisieren des Studienfortschritts: {e}")
+
+    def verlauf_spalten(self, von: str = None, bis: str = None, zeitraum: str = "tag") -> list:
+        """
+        @brief Liest den gespeicherten Studienfortschritt spaltenweise als Tages-, Wochen- oder Monatswerte.
+
+        Tageswerte stammen aus der View `studienfortschritt`, Wochen- und Monatswerte aus der
+        vorab verdichteten Tabelle `verlauf_zusammenfassung` (letzter Stand je Zeitraum, datiert
+        auf den ersten Tag des Zeitraums). Ein Zeitraum wird geliefert, sobald er sich mit
+        `von` bis `bis` überschneidet.
+
+        @param von Erster Tag im Format 'YYYY-MM-DD' (Standard: ohne Begrenzung).
+        @param bis Letzter Tag im Format 'YYYY-MM-DD' (Standard: ohne Begrenzung).
+        @param zeitraum "tag", "woche" oder "monat".
+        @return Liste [modulOffen, modulInBearbeitung, modulAbgeschlossen, zeitpunkt] als Arrays
+            (siehe `spalten_abfragen`), nach Datum sortiert.
+        @throws ValueError Bei einem unbekannten Zeitraum.
+        """
+        if zeitraum not in ZEITRAEUME:
+            raise ValueError(f"Unbekannter Zeitraum: {zeitraum} (erlaubt: {', '.join(ZEITRAEUME)})")
+        grenzen = {"von": von or "0000-01-01", "bis": bis or "9999-12-31", "zeitraum": zeitraum}
+        if zeitraum == "tag":
+            sql = """
+            SELECT modulOffen, modulInBearbeitung, modulAbgeschlossen, zeitpunkt
+            FROM studienfortschritt
+            WHERE zeitpunkt BETWEEN :von AND :bis
+            ORDER BY zeitpunkt
+            """
+        else:
+            sql = """
+            SELECT modulOffen, modulInBearbeitung, modulAbgeschlossen, zeitpunkt
+            FROM verlauf_zusammenfassung
+            WHERE zeitraum = :zeitraum AND zeitpunkt <= :bis AND letzterTag >= :von
+            ORDER BY zeitpunkt
+            """
+        return self.spalten_abfragen(sql, grenzen, datumsspalten={"zeitpunkt"})
+
+    def verlauf_grenzen(self) -> tuple:
+        """
+        @brief Liefert den ersten gespeicherten Tag insgesamt und den ersten noch vorhandenen Tageswert.
+
+        Liegt der erste Tageswert nach dem ersten Tag insgesamt, wurden ältere Tageswerte
+        bereits in die Wochen- und Monatswerte verdichtet.
+
+        @return Tupel (erster_tag, erster_tageswert) im Format 'YYYY-MM-DD'. Ohne gespeicherte
+            Werte (None, None); sind alle Tageswerte verdichtet, ist erster_tageswert '9999-12-31'.
+        """
+        sql = """
+        SELECT
+            MIN(
+                COALESCE((SELECT MIN(zeitpunkt) FROM verlauf), '9999-12-31'),
+                COALESCE((SELECT MIN(zeitpunkt) FROM verlauf_zusammenfassung WHERE zeitraum = 'woche'), '9999-12-31')
+            ),
+            COALESCE((SELECT MIN(zeitpunkt) FROM verlauf), '9999-12-31');
+        """
+        erster_tag, erster_tageswert = self.abfragen(sql)[0]
+        if erster_tag == "9999-12-31":
+            return None, None
+        return erster_tag, erster_tageswert
+
+    def verlauf_verdichten(self, aufbewahrung_tage: int = VERLAUF_AUFBEWAHRUNG_TAGE) -> int:
+        """
+        @brief Löscht Tageswerte aus `verlauf`, die älter als die Aufbewahrungsfrist sind.
+
+        Die Werte bleiben als Wochen- und Monatswerte in `verlauf_zusammenfassung` erhalten,
+        die bei jedem Schreiben eines Tageswerts per Trigger fortgeschrieben werden. Gelöscht
+        wird nur ein Tag, dessen Woche und Monat dort vorhanden sind. So bleibt der
+        Speicherbedarf von `verlauf` auf die Frist begrenzt.
+
+        @param aufbewahrung_tage Anzahl der Tage, für die Tageswerte erhalten bleiben;
+            0 oder None verdichtet nichts.
+        @return Anzahl der gelöschten Tageswerte.
+        """
+        if not aufbewahrung_tage:
+            return 0
+        sql = """
+        DELETE FROM verlauf
+        WHERE zeitpunkt < DATE('now', :frist)
+            AND EXISTS (
+                SELECT 1 FROM verlauf_zusammenfassung z
+                WHERE z.zeitraum = 'woche' AND z.zeitpunkt = DATE(verlauf.zeitpunkt, '-6 days', 'weekday 1')
+            )
+            AND EXISTS (
+                SELECT 1 FROM verlauf_zusammenfassung z
+                WHERE z.zeitraum = 'monat' AND z.zeitpunkt = DATE(verlauf.zeitpunkt, 'start of month')
+            );
+        """
+        try:
+            with self._schreibverbindung() as verbindung:
+                geloescht = verbindung.execute(sql, {"frist": f"-{int(aufbewahrung_tage)} days"}).rowcount
+                if geloescht:
+                    self._aenderung_melden(sql)
+                self._aenderungen_veroeffentlichen()
+            if geloescht:
+                self.logger.info(f"🗜️ {geloescht} Tageswerte älter als {aufbewahrung_tage} Tage verdichtet.")
+            return geloescht
         except sqlite3.Error as e:
-            self.logger.error(f"❌ Fehler beim Aktualisieren des Studienfortschritts: {e}")
\ No newline at end of file
+            self.logger.error(f"❌ Fehler beim Verdichten des Verlaufs: {e}")
+            return 0
@@ -0,0 +1,203 @@
+"""
+@file diagramm.py
+@brief Wiederverwendbare Diagramm-Komponente auf Basis von `matplotlib.figure.Figure`.
+
+Die Ansichten erzeugen ihr Diagramm einmal und aktualisieren danach nur noch die
+Daten der vorhandenen Linien bzw. Balken. Es wird kein pyplot verwendet: Die Figure
+wird nicht im globalen Register von pyplot angemeldet und kann mit der Ansicht
+vollständig freigegeben werden.
+
+Lange Zeitreihen können auf die Breite der Zeichenfläche verdichtet werden (siehe
+`verdichtung.py`); beim Zoomen und Verschieben wird der sichtbare Ausschnitt neu verdichtet.
+
+Ohne Tk-Widget zeichnet das Diagramm nur in einen Speicherpuffer (Agg); so wird es auch
+von `diagramm_renderer.py` in einem eigenen Prozess verwendet.
+
+@author CHOE
+@date 2025-01-31
+@version 1.0
+"""
+
+import logging
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from verdichtung import VERFAHREN, verdichten
+
+
+class Diagramm:
+    """
+    @class Diagramm
+    @brief Eine Figure mit einer Achse, deren Linien und Balken an Ort und Stelle aktualisiert werden.
+
+    @code
+    self.diagramm = Diagramm(self, figsize=(8, 5))
+    self.diagramm.linie("offen", color="red", label="Offene Module")
+    self.diagramm.widget.pack(fill=tk.BOTH, expand=True)
+    ...
+    self.diagramm.linien_setzen(x_werte, {"offen": y_offen})
+    @endcode
+    """
+
+    def __init__(self, master=None, figsize: tuple = (8, 5), dpi: int = 100):
+        """
+        @param master Tk-Eltern-Widget. Ohne Angabe wird nur in einen Speicherpuffer gezeichnet
+            (Agg), z. B. für Tests oder das Rendern außerhalb des Tk-Threads.
+        @param figsize Größe der Figure in Zoll.
+        @param dpi Auflösung der Figure.
+        """
+        self.logger = logging.getLogger("Diagramm")
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        self.ax = self.figure.add_subplot()
+        self.linien = {}
+        self.balken = None
+        self.verdichtung = None
+        self._x_werte = None       # Vollständige Daten der Linien, wenn verdichtet wird
+        self._reihen = {}
+        self._ausschnitt = None    # (Beginn, Ende, Pixel) der zuletzt verdichteten Daten
+
+        if master is None:
+            self.canvas = FigureCanvasAgg(self.figure)
+            self.widget = None
+        else:
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            self.canvas = FigureCanvasTkAgg(self.figure, master=master)
+            self.widget = self.canvas.get_tk_widget()
+
+    def linie(self, name: str, **stil):
+        """
+        @brief Legt eine (zunächst leere) Linie an, die später über `linien_setzen` befüllt wird.
+
+        @param name Schlüssel der Linie.
+        @param stil Stilangaben wie bei `Axes.plot` (color, marker, label, ...).
+        @return Die `Line2D`.
+        """
+        self.linien[name], = self.ax.plot([], [], **stil)
+        return self.linien[name]
+
+    def linien_setzen(self, x_werte, reihen: dict, ausschnitt: tuple = None) -> None:
+        """
+        @brief Ersetzt die Daten der Linien und passt die Achsen an.
+
+        Ist die Verdichtung aktiv, werden die vollständigen Daten behalten und die Linien
+        erhalten nur die für die aktuelle Breite ausgewählten Punkte.
+
+        @param x_werte Gemeinsame x-Werte aller Linien.
+        @param reihen Dictionary Name -> y-Werte.
+        @param ausschnitt Optionale Grenzen (links, rechts) der x-Achse; ohne Angabe wird die
+            vollständige Reihe gezeigt.
+        """
+        if self.verdichtung is None:
+            for name, y_werte in reihen.items():
+                self.linien[name].set_data(x_werte, y_werte)
+        else:
+            self._x_werte = np.asarray(x_werte, dtype=float)
+            self._reihen = {name: np.asarray(y_werte) for name, y_werte in reihen.items()}
+            self._ausschnitt = None
+            self._linien_verdichten(-np.inf, np.inf)
+        self.aktualisieren(ausschnitt)
+
+    def verdichtung_aktivieren(self, verfahren: str = "lttb") -> None:
+        """
+        @brief Verdichtet die Linien künftig auf die Pixelbreite der Achse.
+
+        Ändern sich die Grenzen der x-Achse (Zoomen, Verschieben) oder die Größe der
+        Zeichenfläche, wird der sichtbare Ausschnitt aus den vollständigen Daten neu verdichtet.
+
+        @param verfahren "lttb" oder "minmax" (siehe `verdichtung.verdichten`).
+        @throws ValueError Bei einem unbekannten Verfahren.
+        """
+        if verfahren not in VERFAHREN:
+            raise ValueError(f"Unbekanntes Verdichtungsverfahren: {verfahren} (erlaubt: {', '.join(VERFAHREN)})")
+        if self.verdichtung is None:
+            self.ax.callbacks.connect("xlim_changed", self._ausschnitt_verdichten)
+            if self.widget is not None:
+                self.canvas.mpl_connect("resize_event", self._ausschnitt_verdichten)
+        self.verdichtung = verfahren
+
+    def _ausschnitt_verdichten(self, *_) -> None:
+        """
+        @brief Verdichtet den sichtbaren Ausschnitt neu und zeichnet bei Bedarf neu.
+
+        Ohne Tk-Widget wird nicht gezeichnet; das übernimmt der nächste Aufruf von `aktualisieren`.
+        """
+        if self._x_werte is None or self.canvas is None:
+            return
+        if self._linien_verdichten(*self.ax.get_xlim()) and self.widget is not None:
+            self.canvas.draw_idle()
+
+    def _linien_verdichten(self, links: float, rechts: float) -> bool:
+        """
+        @brief Setzt die Linien auf die verdichteten Punkte zwischen `links` und `rechts`.
+
+        Je ein Punkt links und rechts außerhalb wird mitgenommen, damit die Linien bis an den
+        Rand reichen.
+
+        @return False, wenn Ausschnitt und Breite unverändert sind und nichts zu tun war.
+        """
+        beginn = max(int(np.searchsorted(self._x_werte, links, side="left")) - 1, 0)
+        ende = min(int(np.searchsorted(self._x_werte, rechts, side="right")) + 1, len(self._x_werte))
+        pixel = max(int(self.ax.bbox.width), 1)
+        if self._ausschnitt == (beginn, ende, pixel):
+            return False
+        self._ausschnitt = (beginn, ende, pixel)
+
+        x_werte = self._x_werte[beginn:ende]
+        for name, y_werte in self._reihen.items():
+            y_werte = y_werte[beginn:ende]
+            indizes = verdichten(x_werte, y_werte, pixel, self.verdichtung)
+            self.linien[name].set_data(x_werte[indizes], y_werte[indizes])
+        return True
+
+    def balken_anlegen(self, beschriftungen: list, **stil):
+        """
+        @brief Legt ein Balkendiagramm mit Höhe 0 an, das über `balken_setzen` befüllt wird.
+
+        @param beschriftungen Beschriftungen der Balken auf der x-Achse.
+        @param stil Stilangaben wie bei `Axes.bar` (color, ...).
+        @return Der `BarContainer`.
+        """
+        self.balken = self.ax.bar(beschriftungen, [0] * len(beschriftungen), **stil)
+        return self.balken
+
+    def balken_setzen(self, hoehen: list) -> None:
+        """
+        @brief Ersetzt die Höhen der Balken und passt die y-Achse an.
+        @param hoehen Neue Höhen in der Reihenfolge der Beschriftungen.
+        """
+        for rechteck, hoehe in zip(self.balken, hoehen):
+            rechteck.set_height(hoehe)
+        self.aktualisieren()
+
+    def aktualisieren(self, ausschnitt: tuple = None) -> None:
+        """
+        @brief Berechnet die Achsengrenzen neu und zeichnet beim nächsten Leerlauf von Tk neu.
+
+        Ohne Tk-Widget wird sofort in den Speicherpuffer gezeichnet.
+
+        @param ausschnitt Optionale Grenzen (links, rechts) der x-Achse.
+        """
+        self.ax.relim()
+        self.ax.autoscale_view()
+        if ausschnitt is not None:
+            self.ax.set_xlim(ausschnitt)
+        if self.widget is None:
+            self.canvas.draw()
+        else:
+            self.canvas.draw_idle()
+
+    def zerstoeren(self) -> None:
+        """
+        @brief Gibt Widget, Zeichenfläche und alle Artists der Figure frei.
+        """
+        if self.widget is not None:
+            self.widget.destroy()
+            self.widget = None
+        self.figure.clear()
+        self.linien.clear()
+        self._x_werte = None
+        self._reihen = {}
+        self.balken = None
+        self.canvas = None
@@ -0,0 +1,305 @@
+"""
+@file diagramm_renderer.py
+@brief Zeichnet Diagramme in einem eigenen Prozess und liefert sie als RGBA-Bild an Tk zurück.
+
+`FigureCanvasTkAgg.draw()` rastert die Figure im Tk-Thread; bei langen Reihen steht die
+Oberfläche so lange still. Der `DiagrammRenderer` verlagert Aufbau und Rastern in einen
+Worker-Prozess, der ein `Diagramm` ohne Tk (Agg) verwendet. Das fertige Bild landet in einem
+Block `multiprocessing.shared_memory`, den der Tk-Thread anlegt und für weitere Bilder derselben
+Größe wiederverwendet; die Pixel werden also nicht gepickelt. Die Ansicht übergibt sie nur noch
+als PPM-Daten (`ppm_daten`) an ein `PhotoImage`.
+
+Jeder Auftrag erhält eine fortlaufende Generation. Ein neuer Auftrag macht alle älteren
+veraltet: Noch nicht gestartete werden abgebrochen, bereits laufende verworfen, sobald sie
+fertig sind. Die Daten werden nur bei Änderungen an den Worker übertragen; Größenänderungen,
+Zoomen und Verschieben schicken lediglich Größe und Ausschnitt.
+
+@author CHOE
+@date 2025-01-31
+@version 1.0
+"""
+
+import logging
+import multiprocessing
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from diagramm import Diagramm
+
+## Ein fertiges Bild. `pixel` ist ein (Höhe, Breite, 4)-Array im gemeinsamen Speicher und nur
+## während des Rückrufs gültig. `achse` enthält (x0, y0, Breite, Hoehe) der Achse in Pixeln,
+## gemessen von unten links, `xlim` die Grenzen der x-Achse.
+Bild = namedtuple("Bild", ["pixel", "achse", "xlim", "generation"])
+
+## Zustand im Worker-Prozess: Aufbaufunktion -> [Diagramm, x-Werte, Reihen]
+_diagramme = {}
+
+
+def ppm_daten(pixel) -> bytes:
+    """
+    @brief Wandelt RGBA-Pixel in binäre PPM-Daten für `tk.PhotoImage(data=...)` um.
+
+    Tk liest PPM ohne Zusatzpakete ein; der Alphakanal entfällt, da das Diagramm deckend ist.
+
+    @param pixel (Höhe, Breite, 4)-Array vom Typ uint8, z. B. `Bild.pixel`.
+    @return Kopf und RGB-Pixel des Bilds.
+    """
+    hoehe, breite = pixel.shape[:2]
+    return f"P6 {breite} {hoehe} 255\n".encode("ascii") + np.ascontiguousarray(pixel[..., :3]).tobytes()
+
+
+def _vorbereiten() -> None:
+    """
+    @brief Startet den Worker-Prozess vorab; matplotlib wird dabei mit diesem Modul geladen.
+    """
+
+
+def _zeichnen(aufbau, dpi: int, breite: int, hoehe: int, daten, ausschnitt, stile, speichername: str):
+    """
+    @brief Zeichnet das Diagramm im Worker-Prozess und schreibt die Pixel in den gemeinsamen Speicher.
+
+    Die Figure wird je Aufbaufunktion nur einmal angelegt und danach wiederverwendet.
+
+    @param aufbau Funktion, die ein neues `Diagramm` einrichtet (Linien, Beschriftungen, ...).
+    @param dpi Auflösung der Figure.
+    @param breite Breite des Bilds in Pixeln.
+    @param hoehe Höhe des Bilds in Pixeln.
+    @param daten (x_werte, reihen) oder None, wenn sich die Daten nicht geändert haben.
+    @param ausschnitt Optionale Grenzen (links, rechts) der x-Achse.
+    @param stile Optionales Dictionary Linienname -> Eigenschaften für `Line2D.set`.
+    @param speichername Name des gemeinsamen Speicherblocks mit Platz für breite * hoehe * 4 Bytes.
+    @return (achse, xlim) wie in `Bild`.
+    """
+    zustand = _diagramme.get(aufbau)
+    if zustand is None:
+        diagramm = Diagramm(dpi=dpi)
+        aufbau(diagramm)
+        zustand = _diagramme[aufbau] = [diagramm, None, None]
+    diagramm = zustand[0]
+    if daten is not None:
+        zustand[1], zustand[2] = daten
+    for name, eigenschaften in (stile or {}).items():
+        diagramm.linien[name].set(**eigenschaften)
+
+    diagramm.figure.set_size_inches(breite / dpi, hoehe / dpi)
+    diagramm.linien_setzen(zustand[1], zustand[2], ausschnitt)
+    pixel = np.asarray(diagramm.canvas.buffer_rgba())
+
+    speicher = shared_memory.SharedMemory(name=speichername)
+    ziel = np.ndarray((hoehe, breite, 4), dtype=np.uint8, buffer=speicher.buf)
+    try:
+        # Durch Rundung kann die Figure ein Pixel kleiner ausfallen; der Rest des wiederverwendeten
+        # Blocks wird weiß gefüllt, damit kein älteres Bild durchscheint
+        zeilen, spalten = min(hoehe, pixel.shape[0]), min(breite, pixel.shape[1])
+        ziel[:zeilen, :spalten] = pixel[:zeilen, :spalten]
+        ziel[zeilen:] = 255
+        ziel[:, spalten:] = 255
+    finally:
+        del ziel
+        speicher.close()
+    return tuple(map(float, diagramm.ax.bbox.bounds)), tuple(map(float, diagramm.ax.get_xlim()))
+
+
+class DiagrammRenderer:
+    """
+    @class DiagrammRenderer
+    @brief Zeichnet ein Diagramm in einem Worker-Prozess und liefert nur das neueste Bild aus.
+
+    @code
+    self.renderer = DiagrammRenderer(self, diagramm_aufbauen)
+    self.renderer.daten_setzen(x_werte, {"offen": y_offen})
+    self.renderer.zeichnen(800, 500, self.bild_anzeigen)
+    ...
+    self.renderer.beenden()
+    @endcode
+    """
+
+    def __init__(self, widget, aufbau, dpi: int = 100, abfrageintervall_ms: int = 20):
+        """
+        @brief Initialisiert den Renderer und startet den Worker-Prozess im Hintergrund.
+
+        @param widget Tk-Widget, über dessen `after()` die fertigen Bilder abgeholt werden.
+        @param aufbau Funktion auf Modulebene, die ein neues `Diagramm` einrichtet; sie wird
+            im Worker-Prozess aufgerufen und muss daher importierbar sein.
+        @param dpi Auflösung der Figure.
+        @param abfrageintervall_ms Abstand, in dem auf fertige Bilder geprüft wird.
+        """
+        self.widget = widget
+        self.aufbau = aufbau
+        self.dpi = dpi
+        self.abfrageintervall_ms = abfrageintervall_ms
+        self.logger = logging.getLogger("DiagrammRenderer")
+        self.verworfen = 0
+        self.generation = 0  # Generation des neuesten Auftrags; nur dessen Bild wird ausgeliefert
+
+        # "spawn": der Worker erbt weder den Tk-Interpreter noch die Threads des Dashboards
+        self._ausfuehrer = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        self._ausfuehrer.submit(_vorbereiten)
+        self._offen = []  # [Generation, Future, Speicher, (Breite, Hoehe), Rückruf, mit Daten]
+        # Unbenutzte Speicherblöcke der zuletzt gezeichneten Größe; meist genügt einer, ein
+        # zweiter wird nur gebraucht, solange der Worker noch ein veraltetes Bild schreibt
+        self._speicher_frei = []
+        self._speicher_groesse = None
+        self._daten = None
+        self._daten_neu = False
+        self._abfrage_id = None
+        self._beendet = False
+
+    def daten_setzen(self, x_werte, reihen: dict) -> None:
+        """
+        @brief Übernimmt neue Daten; sie werden mit dem nächsten `zeichnen` an den Worker übertragen.
+
+        @param x_werte Gemeinsame x-Werte aller Linien.
+        @param reihen Dictionary Linienname -> y-Werte.
+        """
+        self._daten = (x_werte, reihen)
+        self._daten_neu = True
+
+    def zeichnen(self, breite: int, hoehe: int, fertig, ausschnitt: tuple = None, stile: dict = None):
+        """
+        @brief Beauftragt ein neues Bild; alle älteren Aufträge sind damit veraltet.
+
+        @param breite Breite des Bilds in Pixeln.
+        @param hoehe Höhe des Bilds in Pixeln.
+        @param fertig Rückruf im Tk-Thread mit dem `Bild`.
+        @param ausschnitt Optionale Grenzen (links, rechts) der x-Achse.
+        @param stile Optionales Dictionary Linienname -> Eigenschaften für `Line2D.set`.
+        @return Die `Future` des Auftrags; das Bild wird trotzdem erst über `verarbeiten` ausgeliefert.
+        @throws RuntimeError Wenn der Renderer beendet wurde oder noch keine Daten gesetzt sind.
+        """
+        if self._beendet:
+            raise RuntimeError("Der Renderer wurde bereits beendet.")
+        if self._daten is None:
+            raise RuntimeError("Vor dem Zeichnen müssen Daten gesetzt werden.")
+
+        # Noch nicht gestartete Aufträge entfallen; ihre Daten gehen mit diesem Auftrag mit
+        for auftrag in list(self._offen):
+            if auftrag[1].cancel():
+                self._daten_neu = self._daten_neu or auftrag[5]
+                self._verwerfen(auftrag)
+
+        self.generation += 1
+        breite, hoehe = max(int(breite), 1), max(int(hoehe), 1)
+        speicher = self._speicher_holen(breite, hoehe)
+        daten = self._daten if self._daten_neu else None
+        future = self._ausfuehrer.submit(
+            _zeichnen, self.aufbau, self.dpi, breite, hoehe, daten, ausschnitt, stile, speicher.name
+        )
+        self._daten_neu = False
+        self._offen.append([self.generation, future, speicher, (breite, hoehe), fertig, daten is not None])
+        self._abfrage_planen()
+        return future
+
+    def verarbeiten(self) -> int:
+        """
+        @brief Liefert das neueste fertige Bild im aufrufenden (Tk-)Thread aus und verwirft veraltete.
+
+        @return Anzahl der ausgelieferten Bilder (0 oder 1).
+        """
+        ausgeliefert = 0
+        for auftrag in [auftrag for auftrag in self._offen if auftrag[1].done()]:
+            generation, future, speicher, (breite, hoehe), fertig, _ = auftrag
+            if generation != self.generation or future.cancelled():
+                self._verwerfen(auftrag)
+                continue
+            try:
+                achse, xlim = future.result()
+            except Exception as e:
+                self.logger.error(f"❌ Fehler beim Zeichnen im Worker-Prozess: {e}")
+                self._freigeben(auftrag)
+                continue
+
+            pixel = np.ndarray((hoehe, breite, 4), dtype=np.uint8, buffer=speicher.buf)
+            try:
+                fertig(Bild(pixel, achse, xlim, generation))
+                ausgeliefert += 1
+            finally:
+                del pixel
+                self._freigeben(auftrag)
+        return ausgeliefert
+
+    def beenden(self) -> None:
+        """
+        @brief Bricht offene Aufträge ab, beendet den Worker-Prozess und gibt den Speicher frei.
+
+        Auf ein gerade laufendes Bild wird nicht gewartet: Der Worker schreibt es in einen
+        bereits freigegebenen Block und beendet sich danach. Mehrfache Aufrufe sind unschädlich.
+        """
+        if self._beendet:
+            return
+        self._beendet = True
+        if self._abfrage_id is not None:
+            self.widget.after_cancel(self._abfrage_id)
+            self._abfrage_id = None
+        self._ausfuehrer.shutdown(wait=False, cancel_futures=True)
+        for auftrag in list(self._offen):
+            self._freigeben(auftrag)
+        for speicher in self._speicher_frei:
+            self._speicher_loeschen(speicher)
+        self._speicher_frei = []
+        self.logger.info("⏹️ Diagramm-Renderer beendet.")
+
+    def _verwerfen(self, auftrag: list) -> None:
+        """
+        @brief Gibt einen veralteten Auftrag frei, ohne sein Bild auszuliefern.
+        """
+        self.verworfen += 1
+        self._freigeben(auftrag)
+
+    def _freigeben(self, auftrag: list) -> None:
+        """
+        @brief Entfernt einen Auftrag; sein Speicherblock wird wiederverwendet oder gelöscht.
+
+        Aufgerufen wird nur für fertige oder abgebrochene Aufträge (und beim Beenden), der
+        Worker schreibt also nicht mehr in den Block.
+        """
+        self._offen.remove(auftrag)
+        if not self._beendet and auftrag[3] == self._speicher_groesse:
+            self._speicher_frei.append(auftrag[2])
+        else:
+            self._speicher_loeschen(auftrag[2])
+
+    def _speicher_holen(self, breite: int, hoehe: int) -> shared_memory.SharedMemory:
+        """
+        @brief Liefert einen freien Speicherblock für ein Bild der angegebenen Größe.
+
+        Nach einer Größenänderung werden die freien Blöcke der alten Größe gelöscht; noch
+        belegte folgen, sobald ihr Auftrag freigegeben wird.
+        """
+        if self._speicher_groesse != (breite, hoehe):
+            for speicher in self._speicher_frei:
+                self._speicher_loeschen(speicher)
+            self._speicher_frei = []
+            self._speicher_groesse = (breite, hoehe)
+        if self._speicher_frei:
+            return self._speicher_frei.pop()
+        return shared_memory.SharedMemory(create=True, size=breite * hoehe * 4)
+
+    def _speicher_loeschen(self, speicher: shared_memory.SharedMemory) -> None:
+        """
+        @brief Schließt einen Speicherblock und entfernt ihn aus dem System.
+        """
+        try:
+            speicher.close()
+        except BufferError:
+            # Der Rückruf hält noch eine Sicht auf die Pixel; der Block wird mit ihr freigegeben
+            self.logger.warning("⚠️ Bildpuffer wird nach dem Rückruf noch verwendet.")
+        speicher.unlink()
+
+    def _abfrage_planen(self) -> None:
+        """
+        @brief Plant die nächste Prüfung auf fertige Bilder, solange Aufträge offen sind.
+        """
+        if self._abfrage_id is None and self._offen and not self._beendet:
+            self._abfrage_id = self.widget.after(self.abfrageintervall_ms, self._abfragen)
+
+    def _abfragen(self) -> None:
+        """
+        @brief Von Tk aufgerufen: liefert fertige Bilder aus und plant ggf. die nächste Prüfung.
+        """
+        self._abfrage_id = None
+        self.verarbeiten()
+        self._abfrage_planen()
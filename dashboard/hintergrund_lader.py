@@ -0,0 +1,236 @@
+"""
+@file hintergrund_lader.py
+@brief Lädt Ansichtsdaten in einem Hintergrund-Thread, ohne die Tk-Oberfläche zu blockieren.
+
+Die Ansichten übergeben eine Ladefunktion, die in einem eigenen Worker-Thread mit einer
+eigenen Datenbankverbindung ausgeführt wird. Die Ergebnisse landen in einer Warteschlange,
+die im Tk-Hauptthread per `after()` abgefragt wird; erst dort werden die Rückruffunktionen
+der Ansicht aufgerufen. Beim Wechsel der Ansicht werden offene Aufträge abgebrochen.
+
+@author CHOE
+@date 2025-01-31
+@version 1.0
+"""
+
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import tkinter as tk
+from tkinter import ttk
+
+
+class Ladeauftrag:
+    """
+    @class Ladeauftrag
+    @brief Ein einzelner Ladevorgang, der abgebrochen werden kann.
+    """
+
+    def __init__(self, funktion, fertig, fehler=None, platzhalter=None):
+        """
+        @brief Initialisiert den Auftrag.
+
+        @param funktion Funktion, die im Worker-Thread mit der Leser-Logik aufgerufen wird.
+        @param fertig Rückruf im Tk-Thread mit dem Ergebnis.
+        @param fehler Optionaler Rückruf im Tk-Thread mit der aufgetretenen Ausnahme.
+        @param platzhalter Optionales Widget (z. B. Ladehinweis), das danach entfernt wird.
+        """
+        self.funktion = funktion
+        self.fertig = fertig
+        self.fehler = fehler
+        self.platzhalter = platzhalter
+        self.future = None
+        self._abgebrochen = threading.Event()
+
+    @property
+    def abgebrochen(self) -> bool:
+        return self._abgebrochen.is_set()
+
+    def abbrechen(self) -> None:
+        """
+        @brief Bricht den Auftrag ab.
+
+        Noch nicht gestartete Aufträge werden nicht mehr ausgeführt. Läuft die Abfrage bereits,
+        wird ihr Ergebnis verworfen und keine Rückruffunktion mehr aufgerufen.
+        """
+        self._abgebrochen.set()
+        if self.future is not None:
+            self.future.cancel()
+
+
+class HintergrundLader:
+    """
+    @class HintergrundLader
+    @brief Führt Ladefunktionen in einem Worker-Thread aus und liefert die Ergebnisse an Tk zurück.
+    """
+
+    def __init__(self, widget, logik, abfrageintervall_ms: int = 50):
+        """
+        @brief Initialisiert den Lader.
+
+        @param widget Tk-Widget, über dessen `after()` die Ergebnisse abgeholt werden.
+        @param logik Logik-Instanz des GUI-Threads; der Worker erstellt daraus einen eigenen Leser.
+        @param abfrageintervall_ms Abstand, in dem die Ergebniswarteschlange geprüft wird.
+        """
+        self.widget = widget
+        self.logik = logik
+        self.abfrageintervall_ms = abfrageintervall_ms
+        self.logger = logging.getLogger("HintergrundLader")
+
+        self._ausfuehrer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="HintergrundLader")
+        self._ergebnisse = queue.Queue()
+        self._offen = set()
+        self._leser = None  # gehört ausschließlich dem Worker-Thread
+        self._abfrage_geplant = False
+        self._beendet = False
+
+    @staticmethod
+    def ladehinweis(eltern, text: str = "⏳ Daten werden geladen...") -> ttk.Label:
+        """
+        @brief Erstellt einen Platzhalter, der angezeigt wird, bis die Daten geladen sind.
+
+        @param eltern Widget, in das der Hinweis gepackt wird.
+        @param text Anzuzeigender Text.
+        @return Das erstellte Label, das an `laden()` übergeben werden kann.
+        """
+        hinweis = ttk.Label(eltern, text=text)
+        hinweis.pack(pady=5)
+        return hinweis
+
+    def laden(self, funktion, fertig, fehler=None, platzhalter=None) -> Ladeauftrag:
+        """
+        @brief Startet einen Ladevorgang im Hintergrund.
+
+        @code
+        self.master.lader.laden(
+            lambda logik: logik.get_moduluebersicht_ansicht_daten(),
+            self.daten_anzeigen,
+            platzhalter=HintergrundLader.ladehinweis(self),
+        )
+        @endcode
+
+        @param funktion Funktion, die mit der Leser-Logik des Worker-Threads aufgerufen wird.
+        @param fertig Rückruf im Tk-Thread mit dem Ergebnis.
+        @param fehler Optionaler Rückruf im Tk-Thread mit der Ausnahme.
+        @param platzhalter Optionales Widget, das nach Abschluss oder Abbruch entfernt wird.
+        @return Der Auftrag, über den der Ladevorgang abgebrochen werden kann.
+        """
+        auftrag = Ladeauftrag(funktion, fertig, fehler, platzhalter)
+        if self._beendet:
+            self._auftrag_beenden(auftrag, abbrechen=True)
+            return auftrag
+
+        self._offen.add(auftrag)
+        auftrag.future = self._ausfuehrer.submit(self._ausfuehren, auftrag)
+        self._abfrage_planen()
+        return auftrag
+
+    def abbrechen(self, auftrag: Ladeauftrag) -> None:
+        """
+        @brief Bricht einen einzelnen Auftrag ab und nimmt ihn aus den offenen Aufträgen.
+        @param auftrag Der von `laden()` gelieferte Auftrag.
+        """
+        self._auftrag_beenden(auftrag, abbrechen=True)
+
+    def alle_abbrechen(self) -> None:
+        """
+        @brief Bricht alle offenen Aufträge ab, z. B. beim Wechsel der Ansicht.
+        """
+        for auftrag in list(self._offen):
+            self._auftrag_beenden(auftrag, abbrechen=True)
+
+    def beenden(self) -> None:
+        """
+        @brief Bricht offene Aufträge ab, schließt die Verbindung des Workers und beendet ihn.
+
+        Mehrfache Aufrufe sind unschädlich.
+        """
+        if self._beendet:
+            return
+        self._beendet = True
+        self.alle_abbrechen()
+        self._ausfuehrer.submit(self._leser_schliessen)
+        self._ausfuehrer.shutdown(wait=True)
+        self.logger.info("⏹️ Hintergrund-Lader beendet.")
+
+    def verarbeiten(self) -> int:
+        """
+        @brief Liefert alle fertigen Ergebnisse im aufrufenden (Tk-)Thread aus.
+
+        @return Anzahl der ausgelieferten Ergebnisse.
+        """
+        ausgeliefert = 0
+        while True:
+            try:
+                auftrag, ergebnis, ausnahme = self._ergebnisse.get_nowait()
+            except queue.Empty:
+                break
+            if auftrag.abgebrochen:
+                continue
+
+            self._auftrag_beenden(auftrag)
+            ausgeliefert += 1
+            if ausnahme is None:
+                auftrag.fertig(ergebnis)
+            elif auftrag.fehler is not None:
+                auftrag.fehler(ausnahme)
+            else:
+                self.logger.error(f"❌ Fehler beim Laden im Hintergrund: {ausnahme}")
+        return ausgeliefert
+
+    def _ausfuehren(self, auftrag: Ladeauftrag) -> None:
+        """
+        @brief Führt einen Auftrag im Worker-Thread aus und stellt das Ergebnis bereit.
+        @param auftrag Der auszuführende Auftrag.
+        """
+        if auftrag.abgebrochen:
+            return
+        try:
+            if self._leser is None:
+                self._leser = self.logik.thread_logik_erstellen()
+            ergebnis, ausnahme = auftrag.funktion(self._leser), None
+        except Exception as e:
+            ergebnis, ausnahme = None, e
+        if not auftrag.abgebrochen:
+            self._ergebnisse.put((auftrag, ergebnis, ausnahme))
+
+    def _leser_schliessen(self) -> None:
+        """
+        @brief Schließt die Verbindung des Workers in dem Thread, der sie geöffnet hat.
+        """
+        if self._leser is not None:
+            self._leser.datenbank.trennen()
+            self._leser = None
+
+    def _auftrag_beenden(self, auftrag: Ladeauftrag, abbrechen: bool = False) -> None:
+        """
+        @brief Entfernt einen Auftrag aus den offenen Aufträgen und räumt den Platzhalter ab.
+        @param auftrag Der erledigte oder abzubrechende Auftrag.
+        @param abbrechen True, wenn der Auftrag abgebrochen werden soll.
+        """
+        if abbrechen:
+            auftrag.abbrechen()
+        self._offen.discard(auftrag)
+        if auftrag.platzhalter is not None:
+            try:
+                auftrag.platzhalter.destroy()
+            except tk.TclError:
+                pass  # Platzhalter wurde bereits mit der Ansicht zerstört
+            auftrag.platzhalter = None
+
+    def _abfrage_planen(self) -> None:
+        """
+        @brief Plant die nächste Abfrage der Ergebniswarteschlange, solange Aufträge offen sind.
+        """
+        if not self._abfrage_geplant and self._offen:
+            self._abfrage_geplant = True
+            self.widget.after(self.abfrageintervall_ms, self._abfragen)
+
+    def _abfragen(self) -> None:
+        """
+        @brief Von Tk aufgerufen: liefert Ergebnisse aus und plant ggf. die nächste Abfrage.
+        """
+        self._abfrage_geplant = False
+        self.verarbeiten()
+        self._abfrage_planen()
@@ -15,7 +15,25 @@ Zeitmanagement und Einstellungen.
 """
 
 import logging
-from datenbank_zugriff import DatenbankZugriff
+import datetime
+import os
+from abfrage_cache import AbfrageCache
+from aenderungs_bus import AenderungsBus
+from datenbank_zugriff import DatenbankZugriff, AUFBEWAHRUNG_UMGEBUNGSVARIABLE
+from modul_abfrage import ModulAbfrage
+from schreib_puffer import SchreibPuffer
+
+# Basistabellen, aus denen die einzelnen Views lesen. Ein Schreibzugriff auf eine
+# dieser Tabellen macht die zwischengespeicherten Ergebnisse der View ungültig.
+ANSICHT_ABHAENGIGKEITEN = {
+    "startbildschirm": {"studiengang"},
+    "moduluebersicht": {"modul", "semester"},
+    "studienfortschritt": {"verlauf", "studiengang"},
+    "zeitmanagement": {"studiengang", "semester", "modul"},
+    "einstellungen": {"studiengang"},
+}
+# Standardobergrenze der Punkte für `get_studienfortschritt_spalten(zeitraum="auto")`
+MAX_DIAGRAMMPUNKTE = 1000
 
 class Logik:
     """
@@ -27,22 +45,46 @@ class Logik:
     und zur Durchführung von CRUD-Operationen.
     """
 
-    def __init__(self, db_pfad=None):
+    def __init__(self, db_pfad=None, cache_groesse: int = 32, profil: str = None, cache: AbfrageCache = None,
+                 pool_groesse: int = None, aenderungs_bus: AenderungsBus = None,
+                 verlauf_aufbewahrung_tage: int = None):
         """
         @brief Initialisiert die Logik-Schicht.
 
         Erstellt eine Verbindung zur Datenbank und setzt das Logging für die Logik-Klasse auf.
+        Leseergebnisse werden in einem LRU-Cache gehalten, der bei jedem Schreibzugriff auf
+        eine zugrunde liegende Tabelle gezielt geleert wird.
         db_pfad (optional): Über diesen Pfad wird die Test-DB angegeben.
+        cache_groesse (optional): Maximale Anzahl zwischengespeicherter Ergebnisse.
+        profil (optional): Name des Verbindungsprofils, siehe `VERBINDUNGSPROFILE`.
+        cache (optional): Gemeinsam genutzter Ergebniscache, z. B. mit einer anderen Logik-Instanz.
+        pool_groesse (optional): Anzahl paralleler Leseverbindungen; aktiviert den Pool-Betrieb.
+        aenderungs_bus (optional): Gemeinsamer Bus für festgeschriebene Änderungen, z. B. mit einer
+            anderen Logik-Instanz. Ansichten abonnieren ihn über `aenderungen`.
+        verlauf_aufbewahrung_tage (optional): Tageswerte in `verlauf`, die älter sind, werden beim
+            Start zu Wochen- und Monatswerten verdichtet (z. B. `VERLAUF_AUFBEWAHRUNG_TAGE`). Ohne
+            Angabe gilt die Umgebungsvariable `DASHBOARD_VERLAUF_AUFBEWAHRUNG_TAGE`, sonst bleiben
+            alle Tageswerte erhalten.
         """
         self.logger = logging.getLogger("Logik")
-        self.datenbank = DatenbankZugriff(db_pfad=db_pfad)
+        self.aenderungen = aenderungs_bus if aenderungs_bus is not None else AenderungsBus()
+        self.datenbank = DatenbankZugriff(
+            db_pfad=db_pfad, profil=profil, pool_groesse=pool_groesse, aenderungs_bus=self.aenderungen
+        )
+        self.cache = cache if cache is not None else AbfrageCache(cache_groesse)
+        self.schreibpuffer = None
+        if verlauf_aufbewahrung_tage is None:
+            verlauf_aufbewahrung_tage = int(os.environ.get(AUFBEWAHRUNG_UMGEBUNGSVARIABLE) or 0)
+        self.verlauf_aufbewahrung_tage = verlauf_aufbewahrung_tage
+        self.datenbank.aenderungen_beobachten(self._tabellen_geaendert)
         
     def starten(self) -> bool:
         """
         @brief Startet die Logik-Schicht und verbindet zur Datenbank.
 
         Diese Methode initialisiert die Logik-Schicht und stellt sicher, 
-        dass die Verbindung zur Datenbank hergestellt wird.
+        dass die Verbindung zur Datenbank hergestellt wird. Ist eine Aufbewahrungsfrist gesetzt,
+        werden anschließend ältere Tageswerte verdichtet.
 
         @return True, wenn der Start erfolgreich war, sonst False.
         """
@@ -50,6 +92,7 @@ class Logik:
         try:
             erfolgreich = self.datenbank.starten()
             if erfolgreich:
+                self.datenbank.verlauf_verdichten(self.verlauf_aufbewahrung_tage)
                 self.logger.info("✅ Logik-Schicht erfolgreich gestartet.")
             else:
                 self.logger.error("❌ Fehler beim Start der Logik-Schicht.")
@@ -65,20 +108,108 @@ class Logik:
         Diese Methode sorgt dafür, dass die Verbindung zur Datenbank sicher geschlossen wird.
         """
         self.logger.info("⏹️ Beende Logik-Schicht...")
+        self.schreibpuffer_beenden()
         self.datenbank.trennen()
         self.logger.info("✅ Logik-Schicht erfolgreich beendet.")
     
+    def thread_logik_erstellen(self) -> "Logik":
+        """
+        @brief Erstellt eine Logik-Instanz mit eigener Verbindung für einen anderen Thread.
+
+        SQLite-Verbindungen dürfen nur in dem Thread verwendet werden, der sie geöffnet hat.
+        Die neue Instanz muss daher im Ziel-Thread erstellt werden. Sie teilt den Ergebniscache
+        und den Änderungsbus mit dieser Instanz, sodass Schreibzugriffe eines Threads die
+        Ergebnisse aller verwerfen und bei allen Abonnenten ankommen.
+        Das Schema wird nicht erneut geprüft, da `starten()` bereits erfolgt ist.
+
+        @return Verbundene Logik-Instanz für den aufrufenden Thread.
+        """
+        leser = Logik(
+            db_pfad=self.datenbank.db_pfad, profil=self.datenbank.profil, cache=self.cache,
+            aenderungs_bus=self.aenderungen
+        )
+        leser.datenbank.verbinden()
+        return leser
+
+    def schreibpuffer_aktivieren(self, widget=None, max_stapel: int = 50, sammelzeit: float = 0.05) -> SchreibPuffer:
+        """
+        @brief Schaltet Moduländerungen in den Write-Behind-Modus.
+
+        `set_moduluebersicht_ansicht_daten` reiht Änderungen danach nur noch ein und bestätigt
+        sie sofort. Ein Hintergrund-Thread schreibt sie gesammelt in Transaktionen; Erfolg oder
+        Konflikt wird über die übergebene Rückmeldung nachgereicht.
+
+        @param widget Optionales Tk-Widget; Rückmeldungen laufen dann per `after()` im Tk-Thread.
+        @param max_stapel Maximale Anzahl an Änderungen je Transaktion.
+        @param sammelzeit Wartezeit in Sekunden, um weitere Änderungen für einen Stapel zu sammeln.
+        @return Der aktive Schreibpuffer.
+        """
+        if self.schreibpuffer is None:
+            self.schreibpuffer = SchreibPuffer(self, widget, max_stapel=max_stapel, sammelzeit=sammelzeit)
+            self.logger.info("📝 Write-Behind-Modus für Moduländerungen aktiviert.")
+        return self.schreibpuffer
+
+    def schreibpuffer_beenden(self) -> None:
+        """
+        @brief Haltelinie für die Dauerhaftigkeit: wartet, bis alle eingereihten Änderungen
+        festgeschrieben sind, und beendet den Write-Behind-Modus.
+        """
+        if self.schreibpuffer is not None:
+            self.schreibpuffer.beenden()
+            self.schreibpuffer = None
+            self.logger.info("✅ Alle gepufferten Moduländerungen festgeschrieben.")
+
+    def transaktion(self):
+        """
+        @brief Fasst mehrere Logik-Aufrufe zu einer Arbeitseinheit (Unit of Work) zusammen.
+
+        Alle Schreibzugriffe innerhalb des `with`-Blocks werden gemeinsam mit einem einzigen
+        Commit festgeschrieben. Verschachtelte Blöcke werden als SAVEPOINT angelegt. Wird im
+        Block eine Ausnahme ausgelöst, werden sämtliche Änderungen zurückgerollt.
+
+        @code
+        with logik.transaktion():
+            logik.set_startbildschirm_ansicht_daten(studiengang)
+            logik.set_moduluebersicht_ansicht_daten("INSERT", modul)
+        @endcode
+
+        @return Kontextmanager der Datenbanktransaktion.
+        """
+        return self.datenbank.transaktion()
+
+    def _tabellen_geaendert(self, tabellen) -> None:
+        """
+        @brief Verwirft die zwischengespeicherten Ergebnisse, die von den Tabellen abhängen.
+        @param tabellen Menge der geänderten Tabellen oder `None` für die gesamte Datenbank.
+        """
+        verworfen = self.cache.invalidieren(tabellen)
+        if verworfen:
+            self.logger.info(f"🧹 {verworfen} Cache-Einträge verworfen (geändert: {tabellen or 'alle'}).")
+
+    def cache_statistik(self) -> dict:
+        """
+        @brief Liefert Treffer, Fehlversuche und Belegung des Ergebniscaches.
+        @return Dictionary mit den Kennzahlen des Caches.
+        """
+        return self.cache.statistik()
+
     def get_daten_ansicht(self, ansicht_name: str):
         """
         @brief Ruft Daten für eine bestimmte Ansicht aus der Datenbank ab.
 
+        Das Ergebnis wird zwischengespeichert, bis eine der in `ANSICHT_ABHAENGIGKEITEN`
+        hinterlegten Tabellen geändert wird. Unbekannte Ansichten werden bei jeder Änderung
+        verworfen.
+
         @param ansicht_name Name der Datenbanktabelle, aus der Daten geladen werden sollen.
         @return Eine Liste mit den Ergebnissen der SQL-Abfrage oder eine leere Liste bei Fehlern.
         """
         sql = f"SELECT * FROM {ansicht_name};"
         try:
             self.logger.info(f"🔍 Abrufe Daten für Ansicht '{ansicht_name}'...")
-            ergebnisse = self.datenbank.abfragen(sql)
+            ergebnisse = self.cache.holen(
+                (ansicht_name, ()), lambda: self.datenbank.abfragen(sql), ANSICHT_ABHAENGIGKEITEN.get(ansicht_name)
+            )
             self.logger.info(f"✅ Daten erfolgreich geladen: {len(ergebnisse)} Einträge.")
             return ergebnisse
         except Exception as e:
@@ -93,30 +224,101 @@ class Logik:
         """
         return self.get_daten_ansicht("moduluebersicht")
 
-    def set_moduluebersicht_ansicht_daten(self, aktion: str, daten: tuple) -> bool:
+    def get_moduluebersicht_anzahl(self, abfrage: ModulAbfrage = None) -> int:
+        """
+        @brief Liefert die Anzahl der Zeilen der Modulübersicht.
+        @param abfrage Optional: nur Module, die den Filtern dieser `ModulAbfrage` entsprechen.
+        @return Anzahl der (gefilterten) Module mit Semesterzuordnung.
+        """
+        sql, parameter = (abfrage or ModulAbfrage()).anzahl_sql()
+        ergebnis = self.datenbank.abfragen(sql, parameter)
+        return ergebnis[0][0] if ergebnis else 0
+
+    def get_moduluebersicht_seite(self, anzahl: int, nach: tuple = None, vor: tuple = None, position: int = None,
+                                  abfrage: ModulAbfrage = None) -> list:
+        """
+        @brief Lädt eine Seite der Modulübersicht (Keyset-Paginierung).
+
+        Mit `nach` bzw. `vor` wird die Seite direkt über den Sortierschlüssel der Nachbarzeile
+        gesucht, ohne vorherige Zeilen zu überspringen. Nur für Sprünge ohne bekannte
+        Nachbarzeile wird die Startzeile über `position` ermittelt.
+
+        @param anzahl Maximale Anzahl an Zeilen.
+        @param nach Optional: Zeilen nach dieser Zeile der Modulübersicht.
+        @param vor Optional: Zeilen vor dieser Zeile (die letzten `anzahl` davor).
+        @param position Optional: Anzahl der zu überspringenden Zeilen ab Anfang.
+        @param abfrage Optional: Sortierung und Filter; ohne Angabe aufsteigend nach `modulID`.
+        @return Liste der Zeilen in der Sortierung der Abfrage.
+        """
+        sql, parameter = (abfrage or ModulAbfrage()).seite_sql(anzahl, nach, vor, position)
+        return self.datenbank.abfragen(sql, parameter)
+
+    def get_moduluebersicht_zeilen(self, modul_ids) -> list:
+        """
+        @brief Lädt nur die angegebenen Zeilen der Modulübersicht, z. B. nach einer Änderungsmeldung.
+
+        @param modul_ids IDs der Module (rowid der Tabelle `modul`).
+        @return Liste der gefundenen Zeilen; gelöschte Module fehlen darin.
+        """
+        modul_ids = list(modul_ids)
+        if not modul_ids:
+            return []
+        platzhalter = ", ".join("?" * len(modul_ids))
+        return self.datenbank.abfragen(
+            f"SELECT * FROM moduluebersicht WHERE modulID IN ({platzhalter});", tuple(modul_ids)
+        )
+
+    def get_semester_nummern(self) -> list:
+        """
+        @brief Liefert die angelegten Semesternummern, z. B. für die Auswahlfelder der Modulübersicht.
+
+        @return Aufsteigend sortierte Liste der Semesternummern (leer bei Fehlern).
+        """
+        sql = "SELECT DISTINCT semesterNR FROM semester ORDER BY semesterNR;"
+        try:
+            zeilen = self.cache.holen(("semester_nummern", ()), lambda: self.datenbank.abfragen(sql), {"semester"})
+            return [zeile[0] for zeile in zeilen]
+        except Exception as e:
+            self.logger.error(f"❌ Fehler beim Lesen der Semester: {e}")
+            return []
+
+    def set_moduluebersicht_ansicht_daten(self, aktion: str, daten: tuple, rueckmeldung=None) -> bool:
         """
         @brief Bearbeitet Moduleinträge (INSERT, UPDATE, DELETE).
 
+        Nach einer erfolgreichen Änderung wird in derselben Transaktion der Tageswert
+        in `verlauf` aus den Statuszählern übernommen. Ist der Schreibpuffer aktiv, wird
+        die Änderung nur eingereiht und das Ergebnis später über `rueckmeldung` gemeldet.
+
         @param aktion Die gewünschte Aktion ("INSERT", "UPDATE", "DELETE").
         @param daten Ein Tupel mit den erforderlichen Daten für die Aktion.
-        @return True, wenn die Aktion erfolgreich war, sonst False.
+        @param rueckmeldung Optionaler Rückruf (erfolg, meldung) für den Write-Behind-Modus.
+        @return True, wenn die Aktion erfolgreich war (bzw. eingereiht wurde), sonst False.
         """
+        if self.schreibpuffer is not None:
+            return self.schreibpuffer.modul_einreihen(aktion, daten, rueckmeldung)
+
         try:
-            if aktion.upper() == "INSERT":
-                self.logger.info(f"➕ Neues Modul wird eingefügt: {daten}")
-                erfolg = self.datenbank.modul_speichern(*daten)
+            # Moduländerung und Tageswert im Verlauf werden gemeinsam festgeschrieben
+            with self.datenbank.transaktion():
+                if aktion.upper() == "INSERT":
+                    self.logger.info(f"➕ Neues Modul wird eingefügt: {daten}")
+                    erfolg = self.datenbank.modul_speichern(*daten)
 
-            elif aktion.upper() == "UPDATE":
-                self.logger.info(f"✏️ Modul wird aktualisiert: {daten}")
-                erfolg = self.datenbank.modul_aktualisieren(*daten)
+                elif aktion.upper() == "UPDATE":
+                    self.logger.info(f"✏️ Modul wird aktualisiert: {daten}")
+                    erfolg = self.datenbank.modul_aktualisieren(*daten)
 
-            elif aktion.upper() == "DELETE":
-                self.logger.info(f"🗑️ Modul wird gelöscht: ID {daten[0]}")
-                erfolg = self.datenbank.modul_loeschen(daten[0])
+                elif aktion.upper() == "DELETE":
+                    self.logger.info(f"🗑️ Modul wird gelöscht: ID {daten[0]}")
+                    erfolg = self.datenbank.modul_loeschen(daten[0])
 
-            else:
-                self.logger.error(f"❌ Ungültige Aktion '{aktion}' für Modulbearbeitung.")
-                return False
+                else:
+                    self.logger.error(f"❌ Ungültige Aktion '{aktion}' für Modulbearbeitung.")
+                    return False
+
+                if erfolg:
+                    self.datenbank.aktualisiere_studienfortschritt()
 
             if erfolg:
                 self.logger.info(f"✅ Aktion '{aktion}' erfolgreich durchgeführt.")
@@ -129,6 +331,27 @@ class Logik:
             self.logger.error(f"❌ Fehler bei Modulbearbeitung ({aktion}): {e}")
             return False
 
+    def module_importieren(self, module) -> tuple:
+        """
+        @brief Importiert viele Module auf einmal (z. B. einen vollständigen Studienplan).
+
+        @param module Iterable von Tupeln (semester_id, modul_name, kuerzel, status, ects, startdatum).
+        @return Tupel (Anzahl gespeicherter Module, Liste von Fehlern als (Index, Modul, Meldung)).
+        """
+        self.logger.info("📥 Sammelimport von Modulen wird gestartet...")
+        try:
+            with self.datenbank.transaktion():
+                gespeichert, fehler = self.datenbank.modul_speichern_viele(module)
+                if gespeichert:
+                    self.datenbank.aktualisiere_studienfortschritt()
+        except Exception as e:
+            self.logger.error(f"❌ Fehler beim Sammelimport: {e}")
+            return 0, [(None, None, str(e))]
+
+        for index, modul, meldung in fehler:
+            self.logger.warning(f"⚠️ Modul {index} nicht importiert ({meldung}): {modul}")
+        return gespeichert, fehler
+
     def get_startbildschirm_ansicht_daten(self):
         """
         @brief Ruft die Daten für den Startbildschirm aus der Datenbank ab.
@@ -151,6 +374,18 @@ class Logik:
         self.logger.info(f"✏️ Speichern des Studiengangs: {daten}")
         return self.datenbank.studiengang_speichern(*daten)
         
+    def get_modul_status_zaehler(self) -> dict:
+        """
+        @brief Liefert die aktuelle Anzahl offener, laufender und abgeschlossener Module.
+
+        @return Dictionary {Status: Anzahl} oder ein leeres Dictionary bei Fehlern.
+        """
+        try:
+            return self.datenbank.modul_status_zaehlen()
+        except Exception as e:
+            self.logger.error(f"❌ Fehler beim Lesen der Statuszähler: {e}")
+            return {}
+
     def get_studienfortschritt_ansicht_daten(self):
         """
         @brief Ruft die Daten für den Studienfortschritt aus der Datenbank ab.
@@ -159,6 +394,122 @@ class Logik:
         """
         return self.get_daten_ansicht("studienfortschritt")
     
+    def get_studienfortschritt_verlauf(self, von: str = None, bis: str = None):
+        """
+        @brief Liefert eine lückenlose Tagesreihe des Studienfortschritts aus dem Ereignisprotokoll.
+
+        @param von Erster Tag im Format 'YYYY-MM-DD' (Standard: erstes Ereignis).
+        @param bis Letzter Tag im Format 'YYYY-MM-DD' (Standard: heute).
+        @return Liste von Tupeln (modulOffen, modulInBearbeitung, modulAbgeschlossen, zeitpunkt)
+            oder eine leere Liste bei Fehlern.
+        """
+        try:
+            self.logger.info(f"🔍 Rekonstruiere Studienfortschritt ({von or 'Anfang'} bis {bis or 'heute'})...")
+            # "heute" geht mit Datum in den Schlüssel ein, damit die Reihe nach Mitternacht neu entsteht
+            schluessel = ("verlauf_rekonstruieren", (von, bis or datetime.date.today().isoformat()))
+            return self.cache.holen(
+                schluessel, lambda: self.datenbank.verlauf_rekonstruieren(von, bis), {"modul", "modul_ereignis"}
+            )
+        except Exception as e:
+            self.logger.error(f"❌ Fehler beim Rekonstruieren des Studienfortschritts: {e}")
+            return []
+
+    def get_studienfortschritt_spalten(self, von: str = None, bis: str = None, zeitraum: str = "tag",
+                                       max_punkte: int = MAX_DIAGRAMMPUNKTE):
+        """
+        @brief Liefert den Studienfortschritt spaltenweise als numpy-Arrays für das Diagramm.
+
+        Ab dem ersten Ereignis wird die aus dem Ereignisprotokoll rekonstruierte Tagesreihe
+        verwendet; Wochen- und Monatswerte werden daraus in SQL gebildet. Für die Zeit davor
+        (etwa vor der Einführung des Protokolls) werden die gespeicherten Werte gelesen:
+        Tageswerte aus `verlauf`, Wochen- und Monatswerte aus der vorab verdichteten Tabelle
+        `verlauf_zusammenfassung`. Die Tage sind aufsteigend sortiert.
+
+        @param von Erster Tag im Format 'YYYY-MM-DD' (Standard: erster erfasster Tag).
+        @param bis Letzter Tag im Format 'YYYY-MM-DD' (Standard: heute).
+        @param zeitraum "tag", "woche", "monat" oder "auto"; je Woche bzw. Monat zählt der letzte
+            Stand. "auto" wählt den feinsten Zeitraum, der höchstens `max_punkte` Punkte ergibt.
+        @param max_punkte Obergrenze für "auto", z. B. die Breite des Diagramms in Pixeln.
+        @return Liste [tage, offen, bearbeitung, abgeschlossen] mit schreibgeschützten
+            `datetime64[D]`- bzw. `int32`-Arrays (leer, wenn keine Daten vorliegen) oder eine
+            leere Liste bei Fehlern.
+        """
+        try:
+            self.logger.info("🔍 Lade Studienfortschritt spaltenweise...")
+            bis = bis or datetime.date.today().isoformat()
+            schluessel = ("studienfortschritt_spalten", (von, bis, zeitraum, max_punkte if zeitraum == "auto" else None))
+            return self.cache.holen(
+                schluessel, lambda: self._studienfortschritt_spalten_laden(von, bis, zeitraum, max_punkte),
+                {"modul", "modul_ereignis", "verlauf_zusammenfassung"} | ANSICHT_ABHAENGIGKEITEN["studienfortschritt"]
+            )
+        except Exception as e:
+            self.logger.error(f"❌ Fehler beim spaltenweisen Laden des Studienfortschritts: {e}")
+            return []
+
+    @staticmethod
+    def zeitraum_waehlen(von: str, bis: str, max_punkte: int, erster_tageswert: str = None) -> str:
+        """
+        @brief Wählt den feinsten Zeitraum, mit dem `von` bis `bis` höchstens `max_punkte` Punkte ergibt.
+
+        Tageswerte kommen nur in Frage, wenn sie für den ganzen Bereich noch vorhanden sind,
+        also ab `erster_tageswert` nicht bereits verdichtet wurden.
+
+        @param von Erster Tag im Format 'YYYY-MM-DD'.
+        @param bis Letzter Tag im Format 'YYYY-MM-DD'.
+        @param max_punkte Höchstzahl an Punkten.
+        @param erster_tageswert Erster noch vorhandene Tageswert (None: keiner verdichtet).
+        @return "tag", "woche" oder "monat".
+        """
+        tage = (datetime.date.fromisoformat(bis) - datetime.date.fromisoformat(von)).days + 1
+        if tage <= max_punkte and (erster_tageswert is None or von >= erster_tageswert):
+            return "tag"
+        if tage <= 7 * max_punkte:
+            return "woche"
+        return "monat"
+
+    def _studienfortschritt_spalten_laden(self, von: str, bis: str, zeitraum: str, max_punkte: int):
+        """
+        @brief Liest die Spalten für `get_studienfortschritt_spalten` ohne Zwischenspeicher.
+        @return Liste [tage, offen, bearbeitung, abgeschlossen].
+        """
+        import numpy as np
+
+        erstes_ereignis = self.datenbank.abfragen("SELECT MIN(zeitpunkt) FROM modul_ereignis;")[0][0]
+        if zeitraum == "auto":
+            erster_tag, erster_tageswert = self.datenbank.verlauf_grenzen()
+            if erstes_ereignis is not None:
+                # Ab dem ersten Ereignis liefert das Protokoll lückenlose Tageswerte
+                erster_tag = min(erster_tag or erstes_ereignis, erstes_ereignis)
+                if erster_tageswert is not None:
+                    erster_tageswert = min(erster_tageswert, erstes_ereignis)
+            zeitraum = self.zeitraum_waehlen(von or erster_tag or bis, bis, max_punkte, erster_tageswert)
+
+        teile = []
+        if erstes_ereignis is None or von is None or von < erstes_ereignis:
+            vortag = None if erstes_ereignis is None else (
+                datetime.date.fromisoformat(erstes_ereignis) - datetime.timedelta(days=1)
+            ).isoformat()
+            teile.append(self.datenbank.verlauf_spalten(von, min(bis, vortag or bis), zeitraum))
+        if erstes_ereignis is not None and bis >= erstes_ereignis:
+            rekonstruiert = self.datenbank.verlauf_rekonstruieren(
+                max(von or erstes_ereignis, erstes_ereignis), bis, spaltenweise=True, zeitraum=zeitraum
+            )
+            if teile and len(rekonstruiert[3]):
+                # Eine Woche bzw. ein Monat, in dem das Protokoll beginnt, zählt mit dessen letztem Stand
+                behalten = teile[0][3] < rekonstruiert[3][0]
+                teile[0] = [spalte[behalten] for spalte in teile[0]]
+            teile.append(rekonstruiert)
+        if not teile:
+            teile.append(self.datenbank.verlauf_spalten(von, bis, "tag"))
+        offen, bearbeitung, abgeschlossen, tage = (np.concatenate(spalten) for spalten in zip(*teile))
+        self.logger.info(f"📊 Studienfortschritt mit Zeitraum '{zeitraum}': {len(tage)} Punkte.")
+
+        spalten = [tage, offen, bearbeitung, abgeschlossen]
+        # Der Cache gibt dieselben Arrays an alle Aufrufer aus
+        for spalte in spalten:
+            spalte.flags.writeable = False
+        return spalten
+
     def get_zeitmanagement_ansicht_daten(self):
         """
         @brief Ruft die Daten für das Zeitmanagement aus der Datenbank ab.
@@ -183,4 +534,7 @@ class Logik:
         @param daten Ein Tupel mit den neuen Einstellungen (optional für UPDATE).
         @return True, wenn die Aktion erfolgreich war, sonst False.
         """
+        if aktion.upper() == "DELETE":
+            # Die Verbindung des Schreib-Threads muss vor dem Löschen der Datei geschlossen sein
+            self.schreibpuffer_beenden()
         return self.datenbank.einstellungen_verwalten(aktion, daten)
\ No newline at end of file
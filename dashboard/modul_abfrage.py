@@ -0,0 +1,169 @@
+"""
+@file modul_abfrage.py
+@brief Sortierung, Filter und Volltextsuche der Modulübersicht als parametrisiertes SQL.
+
+`ModulAbfrage` beschreibt, welche Module in welcher Reihenfolge angezeigt werden, und
+übersetzt das in Abfragen gegen die View `moduluebersicht`. Seiten werden per Keyset
+über (Sortierspalte, modulID) geladen, sodass auch bei sortierter und gefilterter
+Anzeige kein OFFSET über Millionen Zeilen nötig ist. Die Freitextsuche nutzt den
+FTS5-Index `modul_suche`.
+
+@author CHOE
+@date 2025-01-31
+@version 1.0
+"""
+
+import re
+
+## Sortierbare Spalten der View: Name -> (SQL-Ausdruck, Position in der Ergebniszeile).
+## Jede Sortierung wird über `modulID` eindeutig gemacht und durch einen Index gestützt.
+SORTIERSPALTEN = {
+    "modulID": ("modulID", 0),
+    "semesterNR": ("semesterNR", 1),
+    "modulName": ("modulName COLLATE NOCASE", 2),
+    "modulKuerzel": ("modulKuerzel", 3),
+    "modulStatus": ("modulStatus", 4),
+    "modulEctsPunkte": ("modulEctsPunkte", 5),
+    "modulStart": ("modulStart", 6),
+}
+
+SUCHWORT_MUSTER = re.compile(r"\w+", re.UNICODE)
+
+
+class ModulAbfrage:
+    """
+    @class ModulAbfrage
+    @brief Sortierung und Filter der Modulübersicht.
+
+    @code
+    abfrage = ModulAbfrage(sortierung="modulName", status="Offen", suchtext="math")
+    logik.get_moduluebersicht_seite(200, abfrage=abfrage)
+    @endcode
+    """
+
+    def __init__(self, sortierung: str = "modulID", absteigend: bool = False, status: str = None,
+                 semester: int = None, ects: int = None, von: str = None, bis: str = None, suchtext: str = None):
+        """
+        @param sortierung Name der Sortierspalte, siehe `SORTIERSPALTEN`.
+        @param absteigend True für absteigende Sortierung.
+        @param status Optional: nur Module mit diesem Status.
+        @param semester Optional: nur Module dieser Semesternummer.
+        @param ects Optional: nur Module mit diesen ECTS-Punkten.
+        @param von Optional: frühestes Startdatum (YYYY-MM-DD, einschließlich).
+        @param bis Optional: spätestes Startdatum (YYYY-MM-DD, einschließlich).
+        @param suchtext Optional: Wortanfänge, die in Modulname oder Kürzel vorkommen müssen.
+        @exception ValueError Falls die Sortierspalte unbekannt ist.
+        """
+        if sortierung not in SORTIERSPALTEN:
+            raise ValueError(f"Unbekannte Sortierspalte '{sortierung}'.")
+        self.sortierung = sortierung
+        self.absteigend = absteigend
+        self.status = status or None
+        self.semester = semester
+        self.ects = ects
+        self.von = von or None
+        self.bis = bis or None
+        self.suchtext = suchtext or None
+
+    def geaendert(self, **werte) -> "ModulAbfrage":
+        """
+        @brief Liefert eine Kopie mit geänderten Einstellungen, z. B. neuer Sortierung bei gleichen Filtern.
+        @param werte Zu ändernde Parameter wie bei `__init__`.
+        @return Eine neue `ModulAbfrage`.
+        """
+        return ModulAbfrage(**{**vars(self), **werte})
+
+    @staticmethod
+    def fts_ausdruck(suchtext: str) -> str:
+        """
+        @brief Übersetzt eine Benutzereingabe in einen FTS5-Ausdruck.
+
+        Jedes Wort wird als Präfix gesucht und alle Wörter müssen vorkommen. Sonderzeichen
+        der FTS5-Syntax werden dabei nicht ausgewertet.
+
+        @param suchtext Die Eingabe, z. B. "math grund".
+        @return Der Ausdruck, z. B. '"math"* "grund"*', oder "" ohne verwertbare Wörter.
+        """
+        return " ".join(f'"{wort}"*' for wort in SUCHWORT_MUSTER.findall(suchtext or ""))
+
+    def bedingungen(self) -> tuple:
+        """
+        @brief Erzeugt die WHERE-Bedingungen der Filter.
+        @return Tupel (Liste von SQL-Bedingungen, Liste der Parameter).
+        """
+        bedingungen, parameter = [], []
+        for ausdruck, wert in (
+            ("modulStatus = ?", self.status),
+            ("semesterNR = ?", self.semester),
+            ("modulEctsPunkte = ?", self.ects),
+            ("modulStart >= ?", self.von),
+            ("modulStart <= ?", self.bis),
+        ):
+            if wert is not None:
+                bedingungen.append(ausdruck)
+                parameter.append(wert)
+        if self.suchtext is not None:
+            bedingungen.append("modulID IN (SELECT rowid FROM modul_suche WHERE modul_suche MATCH ?)")
+            # Eine Eingabe ohne Wörter findet nichts statt alles
+            parameter.append(self.fts_ausdruck(self.suchtext) or '""')
+        return bedingungen, parameter
+
+    def anzahl_sql(self) -> tuple:
+        """
+        @brief Erzeugt die Abfrage für die Anzahl der gefilterten Module.
+        @return Tupel (SQL, Parameter).
+        """
+        bedingungen, parameter = self.bedingungen()
+        return f"SELECT COUNT(*) FROM moduluebersicht{self._where(bedingungen)};", tuple(parameter)
+
+    def seite_sql(self, anzahl: int, nach: tuple = None, vor: tuple = None, position: int = None) -> tuple:
+        """
+        @brief Erzeugt die Abfrage für eine Seite in der gewählten Sortierung.
+
+        @param anzahl Maximale Anzahl an Zeilen.
+        @param nach Optional: Zeilen nach dieser Zeile (letzte Zeile der vorherigen Seite).
+        @param vor Optional: Zeilen vor dieser Zeile (erste Zeile der nächsten Seite).
+        @param position Optional: Anzahl der zu überspringenden Zeilen, falls keine Nachbarzeile bekannt ist.
+        @return Tupel (SQL, Parameter).
+        """
+        ausdruck, index = SORTIERSPALTEN[self.sortierung]
+        bedingungen, parameter = self.bedingungen()
+        vorwaerts = "DESC" if self.absteigend else "ASC"
+        rueckwaerts = "ASC" if self.absteigend else "DESC"
+        reihenfolge = f"ORDER BY {ausdruck} {vorwaerts}, modulID {vorwaerts}"
+
+        if self.sortierung == "modulID":
+            schluessel, werte = "modulID", lambda zeile: [zeile[0]]
+        else:
+            schluessel, werte = f"({ausdruck}, modulID)", lambda zeile: [zeile[index], zeile[0]]
+        platzhalter = "?" if self.sortierung == "modulID" else "(?, ?)"
+
+        if nach is not None:
+            bedingungen.append(f"{schluessel} {'<' if self.absteigend else '>'} {platzhalter}")
+            parameter.extend(werte(nach))
+            return f"SELECT * FROM moduluebersicht{self._where(bedingungen)} {reihenfolge} LIMIT ?;", (*parameter, anzahl)
+
+        if vor is not None:
+            bedingungen.append(f"{schluessel} {'>' if self.absteigend else '<'} {platzhalter}")
+            parameter.extend(werte(vor))
+            innen = (
+                f"SELECT * FROM moduluebersicht{self._where(bedingungen)} "
+                f"ORDER BY {ausdruck} {rueckwaerts}, modulID {rueckwaerts} LIMIT ?"
+            )
+            return f"SELECT * FROM ({innen}) {reihenfolge};", (*parameter, anzahl)
+
+        return (
+            f"SELECT * FROM moduluebersicht{self._where(bedingungen)} {reihenfolge} LIMIT ? OFFSET ?;",
+            (*parameter, anzahl, position or 0),
+        )
+
+    @staticmethod
+    def _where(bedingungen: list) -> str:
+        return f" WHERE {' AND '.join(bedingungen)}" if bedingungen else ""
+
+    def __eq__(self, andere) -> bool:
+        return isinstance(andere, ModulAbfrage) and vars(self) == vars(andere)
+
+    def __repr__(self):
+        gesetzt = ", ".join(f"{name}={wert!r}" for name, wert in vars(self).items() if wert not in (None, False))
+        return f"ModulAbfrage({gesetzt})"
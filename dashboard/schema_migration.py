@@ -0,0 +1,377 @@
+"""
+@file schema_migration.py
+@brief Inkrementelle Schema-Migration auf Basis der YAML-Tabellendefinitionen.
+
+Dieses Modul vergleicht die in den YAML-Dateien beschriebenen Spalten mit dem
+tatsächlichen Aufbau der Datenbank (`PRAGMA table_info`) und erzeugt daraus eine
+geordnete Liste von Migrationsschritten. Die Schritte werden gemeinsam in einer
+Transaktion angewendet, sodass bestehende Daten beim Ändern einer Spalte erhalten bleiben.
+
+@author CHOE
+@date 2025-01-31
+@version 1.0
+"""
+
+import json
+import logging
+import re
+import sqlite3
+
+
+class Migrationsschritt:
+    """
+    @class Migrationsschritt
+    @brief Ein einzelner, geplanter Schritt einer Schema-Migration.
+    """
+
+    TABELLE_ERSTELLEN = "Tabelle erstellen"
+    SPALTE_HINZUFUEGEN = "Spalte hinzufügen"
+    TABELLE_NEU_AUFBAUEN = "Tabelle neu aufbauen"
+    VIEWS_ENTFERNEN = "Views und Trigger entfernen"
+    INDEX_ENTFERNEN = "Index entfernen"
+    INDEX_ERSTELLEN = "Index erstellen"
+    TABELLE_BEFUELLEN = "Tabelle befüllen"
+    TRIGGER_ENTFERNEN = "Trigger entfernen"
+    VIRTUELLE_TABELLE_NEU_ERSTELLEN = "Virtuelle Tabelle neu erstellen"
+    TRIGGER_NEU_ERSTELLEN = "Trigger neu erstellen"
+    VIEW_NEU_ERSTELLEN = "View neu erstellen"
+
+    def __init__(self, art: str, ziel: str, sql_befehle: list):
+        """
+        @brief Initialisiert den Migrationsschritt.
+        @param art Art des Schritts (eine der Klassenkonstanten).
+        @param ziel Name der betroffenen Tabelle, View, des Triggers oder des Index.
+        @param sql_befehle Liste der auszuführenden SQL-Befehle.
+        """
+        self.art = art
+        self.ziel = ziel
+        self.sql_befehle = sql_befehle
+
+    def __repr__(self):
+        return f"Migrationsschritt({self.art!r}, {self.ziel!r})"
+
+
+class SchemaMigration:
+    """
+    @class SchemaMigration
+    @brief Plant und wendet Migrationen zwischen YAML-Definition und Datenbank an.
+
+    Der zuletzt angewendete Stand jeder Tabelle, View, jedes Triggers und Index wird in der Tabelle
+    `schema_objekte` abgelegt. Tabellen, deren Definition sich nicht geändert hat,
+    werden weder angefasst noch neu aufgebaut.
+    """
+
+    META_TABELLE = "schema_objekte"
+
+    def __init__(self, verbindung: sqlite3.Connection):
+        """
+        @brief Initialisiert die Migration für eine bestehende Verbindung.
+        @param verbindung Offene SQLite-Verbindung.
+        """
+        self.verbindung = verbindung
+        self.logger = logging.getLogger("SchemaMigration")
+        self.verbindung.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.META_TABELLE} (
+                name TEXT PRIMARY KEY,
+                art TEXT NOT NULL,
+                definition TEXT NOT NULL
+            );
+        """)
+
+    @staticmethod
+    def tabelle_sql(tabellen_name: str, spalten: dict) -> str:
+        """
+        @brief Erzeugt den CREATE-TABLE-Befehl für eine YAML-Tabellendefinition.
+        @param tabellen_name Name der Tabelle.
+        @param spalten Dictionary mit Spaltennamen und Definitionen.
+        @return Der SQL-Befehl.
+        """
+        spalten_definitionen = [f"{spalte} {definition}" for spalte, definition in spalten.items()]
+        return f"CREATE TABLE IF NOT EXISTS {tabellen_name} (\n    {', '.join(spalten_definitionen)}\n);"
+
+    @staticmethod
+    def index_sql(index_name: str, tabellen_name: str, index: dict) -> str:
+        """
+        @brief Erzeugt den CREATE-INDEX-Befehl für eine Indexdefinition aus dem Abschnitt `indizes`.
+
+        Unterstützt zusammengesetzte Indizes (mehrere `spalten`), eindeutige Indizes
+        (`eindeutig: true`) und partielle Indizes (`bedingung`).
+
+        @param index_name Name des Index.
+        @param tabellen_name Name der indizierten Tabelle.
+        @param index Dictionary mit `spalten` sowie optional `eindeutig` und `bedingung`.
+        @return Der SQL-Befehl.
+        """
+        eindeutig = "UNIQUE " if index.get("eindeutig") else ""
+        sql_befehl = f"CREATE {eindeutig}INDEX IF NOT EXISTS {index_name} ON {tabellen_name} ({', '.join(index['spalten'])})"
+        if index.get("bedingung"):
+            sql_befehl += f" WHERE {index['bedingung']}"
+        return sql_befehl + ";"
+
+    @staticmethod
+    def spalte_hinzufuegbar(definition: str) -> bool:
+        """
+        @brief Prüft, ob eine Spalte per `ALTER TABLE ... ADD COLUMN` ergänzt werden kann.
+
+        SQLite erlaubt dabei weder PRIMARY KEY noch UNIQUE, verlangt bei NOT NULL einen
+        konstanten Standardwert und bei Fremdschlüsseln den Standardwert NULL.
+
+        @param definition Die Spaltendefinition aus der YAML-Datei.
+        @return True, wenn die Spalte ohne Neuaufbau ergänzt werden kann.
+        """
+        definition = definition.upper()
+        if "PRIMARY KEY" in definition or "UNIQUE" in definition:
+            return False
+        if re.search(r"DEFAULT\s*(\(|CURRENT_)", definition):
+            return False
+        if "NOT NULL" in definition and ("DEFAULT" not in definition or "REFERENCES" in definition):
+            return False
+        return True
+
+    def _gespeicherte_definitionen(self, art: str) -> dict:
+        """
+        @brief Liest den zuletzt angewendeten Stand aller Schema-Objekte einer Art.
+        @param art "tabelle", "view", "trigger" oder "index".
+        @return Dictionary {name: definition}.
+        """
+        zeilen = self.verbindung.execute(
+            f"SELECT name, definition FROM {self.META_TABELLE} WHERE art = ?;", (art,)
+        ).fetchall()
+        return dict(zeilen)
+
+    def _vorhandene_objekte(self, art: str) -> set:
+        """
+        @brief Liefert die Namen aller vorhandenen Tabellen, Views, Trigger oder Indizes.
+        @param art "table", "view", "trigger" oder "index".
+        @return Menge der Objektnamen.
+        """
+        zeilen = self.verbindung.execute("SELECT name FROM sqlite_master WHERE type = ?;", (art,)).fetchall()
+        return {zeile[0] for zeile in zeilen}
+
+    def planen(self, definitionen: list) -> list:
+        """
+        @brief Ermittelt die notwendigen Migrationsschritte.
+
+        Reihenfolge: abhängige Objekte entfernen (nur bei Neuaufbau), Tabellen, Indizes,
+        Erstbefüllung neuer Tabellen, virtuelle Tabellen (z. B. FTS5), Trigger und zuletzt Views.
+
+        @param definitionen Liste von Tupeln (Dateiname, YAML-Definition).
+        @return Geordnete Liste von `Migrationsschritt`-Objekten.
+        """
+        gespeicherte_tabellen = self._gespeicherte_definitionen("tabelle")
+        tabellen = self._vorhandene_objekte("table")
+
+        tabellen_schritte = []
+        befuellen_schritte = []
+        for _, config in definitionen:
+            if "tabelle" in config:
+                schritt = self._plane_tabelle(config["tabelle"], config["spalten"], tabellen, gespeicherte_tabellen)
+                if schritt:
+                    tabellen_schritte.append(schritt)
+                if schritt and schritt.art == Migrationsschritt.TABELLE_ERSTELLEN and config.get("befuellen"):
+                    befuellen_schritte.append(Migrationsschritt(
+                        Migrationsschritt.TABELLE_BEFUELLEN, config["tabelle"], config["befuellen"]
+                    ))
+
+        neu_aufgebaut = {s.ziel for s in tabellen_schritte if s.art == Migrationsschritt.TABELLE_NEU_AUFBAUEN}
+        neuaufbau = bool(neu_aufgebaut)
+
+        views, trigger, virtuelle_tabellen = {}, {}, {}
+        for _, config in definitionen:
+            views.update(config.get("views", {}))
+            trigger.update(config.get("trigger", {}))
+            virtuelle_tabellen.update(config.get("virtuelle_tabellen", {}))
+
+        schritte = []
+        if neuaufbau:
+            # Views und Trigger verweisen auf die alten Tabellen und würden das Umbenennen blockieren
+            vorhandene_views = self._vorhandene_objekte("view")
+            vorhandene_trigger = self._vorhandene_objekte("trigger")
+            schritte.append(Migrationsschritt(
+                Migrationsschritt.VIEWS_ENTFERNEN, "*",
+                [f"DROP VIEW IF EXISTS {name};" for name in views if name in vorhandene_views]
+                + [f"DROP TRIGGER IF EXISTS {name};" for name in vorhandene_trigger]
+            ))
+        schritte.extend(tabellen_schritte)
+        schritte.extend(self._plane_indizes(definitionen, neu_aufgebaut))
+        schritte.extend(befuellen_schritte)
+        # Virtuelle Tabellen verweisen nur über den Namen auf ihre Inhaltstabelle und überstehen deren Neuaufbau
+        schritte.extend(self._plane_abhaengige(
+            "virtuelle_tabelle", virtuelle_tabellen, False, Migrationsschritt.VIRTUELLE_TABELLE_NEU_ERSTELLEN
+        ))
+        schritte.extend(self._plane_abhaengige("trigger", trigger, neuaufbau, Migrationsschritt.TRIGGER_NEU_ERSTELLEN))
+        schritte.extend(self._plane_abhaengige("view", views, neuaufbau, Migrationsschritt.VIEW_NEU_ERSTELLEN))
+
+        return schritte
+
+    def _plane_abhaengige(self, art: str, objekte: dict, neuaufbau: bool, schritt_art: str) -> list:
+        """
+        @brief Plant das (Neu-)Erstellen von Views, Triggern oder virtuellen Tabellen.
+
+        Ein Objekt wird neu erstellt, wenn es fehlt, seine Definition sich geändert hat
+        oder Tabellen neu aufgebaut werden. Nicht mehr deklarierte Trigger werden entfernt.
+
+        @param art "view", "trigger" oder "virtuelle_tabelle".
+        @param objekte Dictionary {name: Liste der SQL-Befehle} laut YAML-Definition.
+        @param neuaufbau True, falls in dieser Migration Tabellen neu aufgebaut werden.
+        @param schritt_art Art des Migrationsschritts für das Erstellen.
+        @return Liste von `Migrationsschritt`-Objekten.
+        """
+        sqlite_typ, drop_befehl = {
+            "view": ("view", "DROP VIEW"),
+            "trigger": ("trigger", "DROP TRIGGER"),
+            "virtuelle_tabelle": ("table", "DROP TABLE"),
+        }[art]
+        gespeichert = self._gespeicherte_definitionen(art)
+        vorhanden = self._vorhandene_objekte(sqlite_typ)
+
+        schritte = []
+        if art == "trigger":
+            schritte.extend(
+                Migrationsschritt(Migrationsschritt.TRIGGER_ENTFERNEN, name, [f"{drop_befehl} IF EXISTS {name};"])
+                for name in gespeichert if name not in objekte
+            )
+        for name, sql_list in objekte.items():
+            if neuaufbau or name not in vorhanden or gespeichert.get(name) != json.dumps(sql_list):
+                schritte.append(Migrationsschritt(schritt_art, name, [f"{drop_befehl} IF EXISTS {name};", *sql_list]))
+        return schritte
+
+    def _plane_indizes(self, definitionen: list, neu_aufgebaut: set) -> list:
+        """
+        @brief Vergleicht die deklarierten Indizes mit den vorhandenen.
+
+        Ein Index wird (neu) erstellt, wenn er fehlt, seine Definition sich geändert hat
+        oder seine Tabelle neu aufgebaut wird. Nicht mehr deklarierte Indizes werden entfernt.
+
+        @param definitionen Liste von Tupeln (Dateiname, YAML-Definition).
+        @param neu_aufgebaut Namen der Tabellen, die in dieser Migration neu aufgebaut werden.
+        @return Liste von `Migrationsschritt`-Objekten.
+        """
+        gespeicherte_indizes = self._gespeicherte_definitionen("index")
+        vorhandene_indizes = self._vorhandene_objekte("index")
+
+        deklariert = {}
+        for _, config in definitionen:
+            for index_name, index in config.get("indizes", {}).items():
+                deklariert[index_name] = (config["tabelle"], self.index_sql(index_name, config["tabelle"], index))
+
+        schritte = [
+            Migrationsschritt(Migrationsschritt.INDEX_ENTFERNEN, index_name, [f"DROP INDEX IF EXISTS {index_name};"])
+            for index_name in gespeicherte_indizes if index_name not in deklariert
+        ]
+        for index_name, (tabellen_name, sql_befehl) in deklariert.items():
+            if (index_name not in vorhandene_indizes or tabellen_name in neu_aufgebaut
+                    or gespeicherte_indizes.get(index_name) != sql_befehl):
+                schritte.append(Migrationsschritt(
+                    Migrationsschritt.INDEX_ERSTELLEN, index_name, [f"DROP INDEX IF EXISTS {index_name};", sql_befehl]
+                ))
+        return schritte
+
+    def _plane_tabelle(self, tabellen_name: str, spalten: dict, tabellen: set, gespeichert: dict):
+        """
+        @brief Vergleicht eine Tabellendefinition mit `PRAGMA table_info`.
+        @param tabellen_name Name der Tabelle.
+        @param spalten Spalten laut YAML-Definition.
+        @param tabellen Menge der vorhandenen Tabellen.
+        @param gespeichert Zuletzt angewendete Definitionen.
+        @return Ein `Migrationsschritt` oder None, falls die Tabelle unverändert ist.
+        """
+        if tabellen_name not in tabellen:
+            return Migrationsschritt(
+                Migrationsschritt.TABELLE_ERSTELLEN, tabellen_name, [self.tabelle_sql(tabellen_name, spalten)]
+            )
+
+        ist_spalten = [zeile[1] for zeile in self.verbindung.execute(f"PRAGMA table_info({tabellen_name});")]
+
+        if tabellen_name in gespeichert:
+            alte_spalten = json.loads(gespeichert[tabellen_name])
+        else:
+            # Ältere Datenbanken ohne Metadaten: vorhandene Spalten gelten als unverändert
+            alte_spalten = {spalte: spalten.get(spalte) for spalte in ist_spalten}
+
+        entfernt = [spalte for spalte in ist_spalten if spalte not in spalten]
+        hinzu = [spalte for spalte in spalten if spalte not in ist_spalten]
+        geaendert = [
+            spalte for spalte in spalten
+            if spalte in ist_spalten and alte_spalten.get(spalte) != spalten[spalte]
+        ]
+
+        if not (entfernt or hinzu or geaendert):
+            return None
+
+        if not entfernt and not geaendert and all(self.spalte_hinzufuegbar(spalten[s]) for s in hinzu):
+            return Migrationsschritt(
+                Migrationsschritt.SPALTE_HINZUFUEGEN, tabellen_name,
+                [f"ALTER TABLE {tabellen_name} ADD COLUMN {spalte} {spalten[spalte]};" for spalte in hinzu]
+            )
+
+        gemeinsam = ", ".join(spalte for spalte in spalten if spalte in ist_spalten)
+        temp_name = f"_migration_{tabellen_name}"
+        return Migrationsschritt(Migrationsschritt.TABELLE_NEU_AUFBAUEN, tabellen_name, [
+            f"DROP TABLE IF EXISTS {temp_name};",
+            self.tabelle_sql(temp_name, spalten),
+            f"INSERT INTO {temp_name} ({gemeinsam}) SELECT {gemeinsam} FROM {tabellen_name};",
+            f"DROP TABLE {tabellen_name};",
+            f"ALTER TABLE {temp_name} RENAME TO {tabellen_name};",
+        ])
+
+    def anwenden(self, schritte: list, definitionen: list, abschluss_sql: tuple = ()):
+        """
+        @brief Wendet die geplanten Schritte in einer gemeinsamen Transaktion an.
+
+        Fremdschlüssel werden währenddessen deaktiviert, damit Tabellen neu aufgebaut werden
+        können, ohne abhängige Zeilen per ON DELETE CASCADE zu verlieren. Nach einem Neuaufbau
+        wird vor dem Commit die referenzielle Integrität mit `PRAGMA foreign_key_check` geprüft.
+
+        @param schritte Die von `planen` gelieferten Schritte.
+        @param definitionen Die zugrunde liegenden YAML-Definitionen.
+        @param abschluss_sql Zusätzliche Befehle, die vor dem Commit ausgeführt werden.
+        @exception sqlite3.Error Falls ein Schritt fehlschlägt; alle Änderungen werden zurückgerollt.
+        """
+        self.verbindung.execute("PRAGMA foreign_keys = OFF;")
+        self.verbindung.execute("BEGIN;")
+        try:
+            for schritt in schritte:
+                for sql_befehl in schritt.sql_befehle:
+                    self.verbindung.execute(sql_befehl)
+                self.logger.info(f"✅ Migration: {schritt.art} '{schritt.ziel}'.")
+
+            if any(s.art == Migrationsschritt.TABELLE_NEU_AUFBAUEN for s in schritte):
+                verletzungen = self.verbindung.execute("PRAGMA foreign_key_check;").fetchall()
+                if verletzungen:
+                    raise sqlite3.IntegrityError(f"Fremdschlüssel verletzt: {verletzungen[:5]}")
+
+            self._speichere_definitionen(definitionen)
+            for sql_befehl in abschluss_sql:
+                self.verbindung.execute(sql_befehl)
+            self.verbindung.commit()
+        except sqlite3.Error:
+            self.verbindung.rollback()
+            raise
+        finally:
+            self.verbindung.execute("PRAGMA foreign_keys = ON;")
+
+    def _speichere_definitionen(self, definitionen: list):
+        """
+        @brief Hinterlegt die angewendeten Definitionen in der Meta-Tabelle.
+        @param definitionen Liste von Tupeln (Dateiname, YAML-Definition).
+        """
+        eintraege = []
+        for _, config in definitionen:
+            if "tabelle" in config:
+                eintraege.append((config["tabelle"], "tabelle", json.dumps(config["spalten"])))
+            for index_name, index in config.get("indizes", {}).items():
+                eintraege.append((index_name, "index", self.index_sql(index_name, config["tabelle"], index)))
+            for view_name, view_sql_list in config.get("views", {}).items():
+                eintraege.append((view_name, "view", json.dumps(view_sql_list)))
+            for trigger_name, trigger_sql_list in config.get("trigger", {}).items():
+                eintraege.append((trigger_name, "trigger", json.dumps(trigger_sql_list)))
+            for tabellen_name, tabellen_sql_list in config.get("virtuelle_tabellen", {}).items():
+                eintraege.append((tabellen_name, "virtuelle_tabelle", json.dumps(tabellen_sql_list)))
+
+        # Nicht mehr deklarierte Objekte werden nicht weiter verwaltet
+        self.verbindung.execute(f"DELETE FROM {self.META_TABELLE};")
+        self.verbindung.executemany(
+            f"INSERT OR REPLACE INTO {self.META_TABELLE} (name, art, definition) VALUES (?, ?, ?);",
+            eintraege
+        )
@@ -0,0 +1,268 @@
+"""
+@file schreib_puffer.py
+@brief Write-Behind-Puffer für Moduländerungen aus der GUI.
+
+Änderungen werden in eine Warteschlange gestellt und sofort bestätigt, sodass die
+Oberfläche optimistisch aktualisiert werden kann. Ein Hintergrund-Thread mit eigener
+Datenbankverbindung sammelt sie zu Stapeln und schreibt jeden Stapel in einer
+Transaktion. Erfolg oder Konflikt (z. B. ein doppeltes `modulKuerzel`) wird je
+Änderung über eine Rückmeldung nachgereicht.
+
+@author CHOE
+@date 2025-01-31
+@version 1.0
+"""
+
+import logging
+import queue
+import threading
+
+MODUL_AKTIONEN = ("INSERT", "UPDATE", "DELETE")
+
+
+class Schreibauftrag:
+    """
+    @class Schreibauftrag
+    @brief Eine eingereihte Moduländerung samt Rückmeldung.
+    """
+
+    def __init__(self, aktion: str, daten: tuple, rueckmeldung=None):
+        """
+        @param aktion "INSERT", "UPDATE" oder "DELETE".
+        @param daten Daten wie bei `Logik.set_moduluebersicht_ansicht_daten`.
+        @param rueckmeldung Optionaler Rückruf (erfolg, meldung).
+        """
+        self.aktion = aktion
+        self.daten = daten
+        self.rueckmeldung = rueckmeldung
+
+
+class SchreibPuffer:
+    """
+    @class SchreibPuffer
+    @brief Sammelt Moduländerungen und schreibt sie gebündelt in einem Hintergrund-Thread.
+    """
+
+    def __init__(self, logik, widget=None, max_stapel: int = 50, sammelzeit: float = 0.05,
+                 abfrageintervall_ms: int = 100):
+        """
+        @brief Initialisiert den Puffer und startet den Schreib-Thread.
+
+        @param logik Logik-Instanz, aus der der Schreib-Thread eine eigene Instanz erstellt.
+        @param widget Optionales Tk-Widget. Ist es gesetzt, werden Rückmeldungen gesammelt und
+            per `after()` im Tk-Thread ausgeliefert, sonst direkt im Schreib-Thread.
+        @param max_stapel Maximale Anzahl an Änderungen je Transaktion.
+        @param sammelzeit Wartezeit in Sekunden auf weitere Änderungen für denselben Stapel.
+        @param abfrageintervall_ms Abstand, in dem der Tk-Thread nach Rückmeldungen sieht.
+        """
+        self.logik = logik
+        self.widget = widget
+        self.max_stapel = max_stapel
+        self.sammelzeit = sammelzeit
+        self.abfrageintervall_ms = abfrageintervall_ms
+        self.logger = logging.getLogger("SchreibPuffer")
+
+        self.geschriebene_stapel = 0
+        self._auftraege = queue.Queue()
+        self._rueckmeldungen = queue.Queue()
+        self._offene_rueckmeldungen = 0
+        self._sperre = threading.Lock()
+        self._abfrage_geplant = False
+        self._beendet = False
+        self._thread = threading.Thread(target=self._schreiben, name="SchreibPuffer", daemon=True)
+        self._thread.start()
+
+    def modul_einreihen(self, aktion: str, daten: tuple, rueckmeldung=None) -> bool:
+        """
+        @brief Reiht eine Moduländerung ein und bestätigt sie sofort.
+
+        @param aktion "INSERT", "UPDATE" oder "DELETE".
+        @param daten Daten wie bei `Logik.set_moduluebersicht_ansicht_daten`.
+        @param rueckmeldung Optionaler Rückruf (erfolg, meldung), der nach dem Schreiben folgt.
+        @return True, wenn die Änderung eingereiht wurde, sonst False.
+        """
+        if self._beendet:
+            self.logger.error("❌ Schreibpuffer ist bereits beendet.")
+            return False
+        if aktion.upper() not in MODUL_AKTIONEN:
+            self.logger.error(f"❌ Ungültige Aktion '{aktion}' für Modulbearbeitung.")
+            return False
+
+        if self.widget is not None:
+            with self._sperre:
+                self._offene_rueckmeldungen += 1
+            self._abfrage_planen()
+        self._auftraege.put(Schreibauftrag(aktion.upper(), daten, rueckmeldung))
+        self.logger.info(f"📝 Moduländerung eingereiht ({aktion}): {daten}")
+        return True
+
+    def barriere(self, timeout: float = None) -> bool:
+        """
+        @brief Wartet, bis alle bisher eingereihten Änderungen festgeschrieben sind.
+
+        @param timeout Maximale Wartezeit in Sekunden (None: unbegrenzt).
+        @return True, wenn alle Änderungen geschrieben wurden, sonst False.
+        """
+        fertig = threading.Event()
+
+        def warten():
+            self._auftraege.join()
+            fertig.set()
+
+        threading.Thread(target=warten, daemon=True).start()
+        return fertig.wait(timeout)
+
+    def beenden(self) -> None:
+        """
+        @brief Schreibt alle offenen Änderungen, beendet den Schreib-Thread und liefert
+        verbliebene Rückmeldungen aus.
+        """
+        if self._beendet:
+            return
+        self._beendet = True
+        self._auftraege.put(None)
+        self._thread.join()
+        self.verarbeiten()
+
+    def verarbeiten(self) -> int:
+        """
+        @brief Liefert gesammelte Rückmeldungen im aufrufenden (Tk-)Thread aus.
+        @return Anzahl der ausgelieferten Rückmeldungen.
+        """
+        ausgeliefert = 0
+        while True:
+            try:
+                auftrag, erfolg, meldung = self._rueckmeldungen.get_nowait()
+            except queue.Empty:
+                return ausgeliefert
+            with self._sperre:
+                self._offene_rueckmeldungen -= 1
+            ausgeliefert += 1
+            self._melden(auftrag, erfolg, meldung)
+
+    def _schreiben(self) -> None:
+        """
+        @brief Schleife des Schreib-Threads: Stapel sammeln und gemeinsam festschreiben.
+        """
+        try:
+            thread_logik = self.logik.thread_logik_erstellen()
+        except Exception as e:
+            # Aufträge werden weiter angenommen und als fehlgeschlagen gemeldet
+            self.logger.error(f"❌ Schreib-Thread konnte keine Verbindung öffnen: {e}")
+            thread_logik = None
+
+        try:
+            while True:
+                auftrag = self._auftraege.get()
+                if auftrag is None:
+                    self._auftraege.task_done()
+                    return
+
+                stapel = [auftrag]
+                ende = False
+                while len(stapel) < self.max_stapel:
+                    try:
+                        naechster = self._auftraege.get(timeout=self.sammelzeit)
+                    except queue.Empty:
+                        break
+                    if naechster is None:
+                        ende = True
+                        break
+                    stapel.append(naechster)
+
+                try:
+                    self._stapel_schreiben(thread_logik, stapel)
+                finally:
+                    for _ in range(len(stapel) + ende):
+                        self._auftraege.task_done()
+                if ende:
+                    return
+        finally:
+            if thread_logik is not None:
+                thread_logik.datenbank.trennen()
+
+    def _stapel_schreiben(self, thread_logik, stapel: list) -> None:
+        """
+        @brief Schreibt einen Stapel in einer Transaktion; jede Änderung läuft in einem SAVEPOINT.
+
+        Eine fehlgeschlagene Änderung wird nur für sich zurückgerollt und gemeldet, die übrigen
+        Änderungen des Stapels werden trotzdem festgeschrieben.
+
+        @param thread_logik Logik-Instanz des Schreib-Threads.
+        @param stapel Liste von `Schreibauftrag`.
+        """
+        ergebnisse = []
+        try:
+            if thread_logik is None:
+                raise RuntimeError("Keine Datenbankverbindung im Schreib-Thread.")
+            datenbank = thread_logik.datenbank
+            with datenbank.transaktion():
+                for auftrag in stapel:
+                    datenbank.letzter_fehler = None
+                    try:
+                        with datenbank.transaktion():
+                            erfolg = self._anwenden(datenbank, auftrag)
+                        meldung = None if erfolg else str(datenbank.letzter_fehler or "Modul nicht gefunden")
+                    except Exception as e:
+                        # Der SAVEPOINT dieser Änderung ist zurückgerollt, der Stapel läuft weiter
+                        erfolg, meldung = False, f"{type(e).__name__}: {e}"
+                    ergebnisse.append((auftrag, erfolg, meldung))
+                if any(erfolg for _, erfolg, _ in ergebnisse):
+                    datenbank.aktualisiere_studienfortschritt()
+            self.geschriebene_stapel += 1
+            self.logger.info(f"💾 {len(stapel)} Moduländerungen in einer Transaktion geschrieben.")
+        except Exception as e:
+            self.logger.error(f"❌ Stapel mit {len(stapel)} Moduländerungen fehlgeschlagen: {e}")
+            ergebnisse = [(auftrag, False, str(e)) for auftrag in stapel]
+
+        for auftrag, erfolg, meldung in ergebnisse:
+            if not erfolg:
+                self.logger.warning(f"⚠️ Konflikt bei Moduländerung ({auftrag.aktion}) {auftrag.daten}: {meldung}")
+            if self.widget is None:
+                self._melden(auftrag, erfolg, meldung)
+            else:
+                self._rueckmeldungen.put((auftrag, erfolg, meldung))
+
+    @staticmethod
+    def _anwenden(datenbank, auftrag: Schreibauftrag) -> bool:
+        """
+        @brief Führt eine einzelne Moduländerung aus.
+        @param datenbank DatenbankZugriff des Schreib-Threads.
+        @param auftrag Die auszuführende Änderung.
+        @return True, wenn die Änderung erfolgreich war.
+        """
+        if auftrag.aktion == "INSERT":
+            return datenbank.modul_speichern(*auftrag.daten)
+        if auftrag.aktion == "UPDATE":
+            erfolg = datenbank.modul_aktualisieren(*auftrag.daten)
+        else:
+            erfolg = datenbank.modul_loeschen(auftrag.daten[0])
+        # UPDATE und DELETE ohne betroffene Zeile gelten als Konflikt (Modul inzwischen gelöscht)
+        return erfolg and datenbank.abfragen("SELECT changes();")[0][0] > 0
+
+    def _melden(self, auftrag: Schreibauftrag, erfolg: bool, meldung: str) -> None:
+        """
+        @brief Ruft die Rückmeldung eines Auftrags auf; Fehler darin werden nur protokolliert.
+        """
+        if auftrag.rueckmeldung is None:
+            return
+        try:
+            auftrag.rueckmeldung(erfolg, meldung)
+        except Exception as e:
+            self.logger.error(f"❌ Fehler in der Rückmeldung einer Moduländerung: {e}")
+
+    def _abfrage_planen(self) -> None:
+        """
+        @brief Plant die nächste Abfrage der Rückmeldungen, solange welche ausstehen.
+        """
+        if not self._abfrage_geplant and self._offene_rueckmeldungen > 0 and not self._beendet:
+            self._abfrage_geplant = True
+            self.widget.after(self.abfrageintervall_ms, self._abfragen)
+
+    def _abfragen(self) -> None:
+        """
+        @brief Von Tk aufgerufen: liefert Rückmeldungen aus und plant ggf. die nächste Abfrage.
+        """
+        self._abfrage_geplant = False
+        self.verarbeiten()
+        self._abfrage_planen()
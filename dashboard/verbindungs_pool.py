@@ -0,0 +1,301 @@
+"""
+@file verbindungs_pool.py
+@brief Thread-sicherer Pool von SQLite-Verbindungen.
+
+Der Pool hält eine begrenzte Anzahl von Leseverbindungen und genau eine
+Schreibverbindung. Leser können parallel arbeiten (WAL), Schreibzugriffe werden
+über eine Sperre serialisiert. Verbindungen werden über Kontextmanager ausgeliehen,
+vor der Wiederverwendung geprüft und bei Bedarf ersetzt. Wartezeiten auf eine
+Verbindung werden für die Auswertung mitgezählt.
+
+@author CHOE
+@date 2025-01-31
+@version 1.0
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+logger = logging.getLogger("VerbindungsPool")
+
+
+def verbindung_oeffnen(db_pfad: str, einstellungen: dict, check_same_thread: bool = True) -> sqlite3.Connection:
+    """
+    @brief Öffnet eine SQLite-Verbindung im Autocommit-Modus und setzt die PRAGMAs eines Profils.
+
+    `busy_timeout` sollte im Profil vorne stehen, damit bereits das Umschalten des Journals
+    auf eine kurz gesperrte Datenbank wartet.
+
+    @param db_pfad Pfad zur Datenbankdatei.
+    @param einstellungen Verbindungsprofil {PRAGMA-Name: Wert}; "nur_lesen" öffnet mit mode=ro.
+    @param check_same_thread False, wenn die Verbindung (serialisiert) von mehreren Threads genutzt wird.
+    @return Die geöffnete Verbindung.
+    """
+    einstellungen = dict(einstellungen)
+    if einstellungen.pop("nur_lesen", False):
+        uri = f"{Path(db_pfad).resolve().as_uri()}?mode=ro"
+        verbindung = sqlite3.connect(uri, uri=True, isolation_level=None, check_same_thread=check_same_thread)
+    else:
+        verbindung = sqlite3.connect(db_pfad, isolation_level=None, check_same_thread=check_same_thread)
+
+    verbindung.execute("PRAGMA foreign_keys = ON;")
+    for name, wert in einstellungen.items():
+        ergebnis = verbindung.execute(f"PRAGMA {name} = {wert};").fetchone()
+        if name == "journal_mode" and ergebnis and ergebnis[0].upper() != str(wert).upper():
+            logger.warning(f"⚠️ journal_mode '{wert}' nicht verfügbar, verwende '{ergebnis[0]}'.")
+    return verbindung
+
+
+class VerbindungsPool:
+    """
+    @class VerbindungsPool
+    @brief Begrenzter Pool von Leseverbindungen plus eine serialisierte Schreibverbindung.
+    """
+
+    def __init__(self, db_pfad: str, einstellungen: dict, groesse: int = 4,
+                 wartezeit: float = 30.0, pruefintervall: float = 30.0):
+        """
+        @brief Initialisiert den Pool und öffnet die Schreibverbindung.
+
+        Leseverbindungen werden erst bei Bedarf geöffnet, höchstens `groesse` gleichzeitig.
+
+        @param db_pfad Pfad zur Datenbankdatei.
+        @param einstellungen Verbindungsprofil {PRAGMA-Name: Wert}.
+        @param groesse Maximale Anzahl an Leseverbindungen.
+        @param wartezeit Maximale Wartezeit in Sekunden auf eine freie Verbindung.
+        @param pruefintervall Leerlaufzeit in Sekunden, nach der eine Verbindung vor der
+            Ausgabe mit `SELECT 1` geprüft wird.
+        """
+        if groesse < 1:
+            raise ValueError("Der Verbindungspool benötigt mindestens eine Leseverbindung.")
+        self.db_pfad = db_pfad
+        self.einstellungen = dict(einstellungen)
+        self.groesse = groesse
+        self.wartezeit = wartezeit
+        self.pruefintervall = pruefintervall
+
+        self._frei = queue.LifoQueue()  # (Verbindung, Zeitpunkt der Rückgabe)
+        self._anzahl_leser = 0
+        self._sperre = threading.Lock()
+        self._schreibsperre = threading.RLock()
+        self._schreiber_besitzer = None
+        self._geschlossen = False
+        self._statistik = {
+            "lesen": {"ausleihen": 0, "wartezeit_summe": 0.0, "wartezeit_max": 0.0},
+            "schreiben": {"ausleihen": 0, "wartezeit_summe": 0.0, "wartezeit_max": 0.0},
+            "ersetzte_verbindungen": 0,
+        }
+
+        self.schreiber = verbindung_oeffnen(db_pfad, self.einstellungen, check_same_thread=False)
+
+    @contextmanager
+    def lesen(self):
+        """
+        @brief Leiht eine Leseverbindung aus und gibt sie nach dem Block zurück.
+
+        Ist keine Verbindung frei und das Limit erreicht, wird bis zu `wartezeit` Sekunden
+        gewartet; danach wird `sqlite3.OperationalError` ausgelöst.
+
+        @code
+        with pool.lesen() as verbindung:
+            verbindung.execute("SELECT * FROM moduluebersicht;").fetchall()
+        @endcode
+        """
+        start = time.perf_counter()
+        verbindung = self._leser_ausleihen()
+        self._wartezeit_erfassen("lesen", time.perf_counter() - start)
+        fehlerhaft = False
+        try:
+            yield verbindung
+        except sqlite3.DatabaseError:
+            fehlerhaft = True
+            raise
+        finally:
+            self._leser_zurueckgeben(verbindung, fehlerhaft)
+
+    @contextmanager
+    def schreiben(self):
+        """
+        @brief Reserviert die Schreibverbindung exklusiv für den aktuellen Thread.
+
+        Die Sperre ist wiedereintrittsfähig, sodass verschachtelte Transaktionen desselben
+        Threads die Verbindung weiter nutzen können.
+        """
+        start = time.perf_counter()
+        if not self._schreibsperre.acquire(timeout=self.wartezeit):
+            raise sqlite3.OperationalError("Zeitüberschreitung beim Warten auf die Schreibverbindung.")
+        vorheriger_besitzer = self._schreiber_besitzer
+        try:
+            if vorheriger_besitzer is None:
+                self._wartezeit_erfassen("schreiben", time.perf_counter() - start)
+                self._schreiber_pruefen()
+            self._schreiber_besitzer = threading.get_ident()
+            yield self.schreiber
+        finally:
+            self._schreiber_besitzer = vorheriger_besitzer
+            self._schreibsperre.release()
+
+    def schreiber_gehalten(self) -> bool:
+        """
+        @brief Prüft, ob der aktuelle Thread die Schreibverbindung hält.
+
+        Lesezugriffe innerhalb einer Transaktion müssen über die Schreibverbindung laufen,
+        damit sie die noch nicht festgeschriebenen Änderungen sehen.
+
+        @return True, wenn der aufrufende Thread die Schreibverbindung reserviert hat.
+        """
+        return self._schreiber_besitzer == threading.get_ident()
+
+    def statistik(self) -> dict:
+        """
+        @brief Liefert Kennzahlen zu Ausleihen, Wartezeiten und Verbindungen.
+        @return Dictionary mit den Kennzahlen je Verbindungsart.
+        """
+        with self._sperre:
+            statistik = {
+                art: dict(werte) if isinstance(werte, dict) else werte
+                for art, werte in self._statistik.items()
+            }
+            statistik["leseverbindungen"] = self._anzahl_leser
+            statistik["frei"] = self._frei.qsize()
+        for art in ("lesen", "schreiben"):
+            werte = statistik[art]
+            werte["wartezeit_mittel"] = werte["wartezeit_summe"] / werte["ausleihen"] if werte["ausleihen"] else 0.0
+        return statistik
+
+    def schliessen(self) -> None:
+        """
+        @brief Schließt alle freien Leseverbindungen und die Schreibverbindung.
+
+        Noch ausgeliehene Leseverbindungen werden bei ihrer Rückgabe geschlossen.
+        """
+        with self._schreibsperre:
+            self._geschlossen = True
+            while True:
+                try:
+                    verbindung, _ = self._frei.get_nowait()
+                except queue.Empty:
+                    break
+                self._leser_verwerfen(verbindung)
+            self.schreiber.close()
+
+    def _leser_ausleihen(self) -> sqlite3.Connection:
+        """
+        @brief Liefert eine freie, geprüfte Leseverbindung oder öffnet eine neue.
+        @return Eine Leseverbindung.
+        """
+        if self._geschlossen:
+            raise sqlite3.ProgrammingError("Der Verbindungspool ist geschlossen.")
+
+        frist = time.monotonic() + self.wartezeit
+        while True:
+            try:
+                verbindung, zurueckgegeben = self._frei.get_nowait()
+            except queue.Empty:
+                with self._sperre:
+                    neu_oeffnen = self._anzahl_leser < self.groesse
+                    if neu_oeffnen:
+                        self._anzahl_leser += 1
+                if neu_oeffnen:
+                    return self._leser_oeffnen()
+                rest = frist - time.monotonic()
+                if rest <= 0:
+                    raise sqlite3.OperationalError("Zeitüberschreitung beim Warten auf eine Leseverbindung.")
+                try:
+                    verbindung, zurueckgegeben = self._frei.get(timeout=rest)
+                except queue.Empty:
+                    continue
+
+            if time.monotonic() - zurueckgegeben < self.pruefintervall or self._ist_gesund(verbindung):
+                return verbindung
+            logger.warning("⚠️ Leseverbindung fehlerhaft, wird ersetzt.")
+            self._leser_verwerfen(verbindung, ersetzt=True)
+
+    def _leser_oeffnen(self) -> sqlite3.Connection:
+        """
+        @brief Öffnet eine neue Leseverbindung; Schreibversuche werden per `query_only` abgewiesen.
+        @return Die neue Verbindung.
+        """
+        try:
+            verbindung = verbindung_oeffnen(self.db_pfad, self.einstellungen, check_same_thread=False)
+            verbindung.execute("PRAGMA query_only = ON;")
+            return verbindung
+        except sqlite3.Error:
+            with self._sperre:
+                self._anzahl_leser -= 1
+            raise
+
+    def _leser_zurueckgeben(self, verbindung: sqlite3.Connection, fehlerhaft: bool) -> None:
+        """
+        @brief Gibt eine Leseverbindung zurück oder verwirft sie, falls sie unbrauchbar ist.
+        @param verbindung Die zurückgegebene Verbindung.
+        @param fehlerhaft True, wenn während der Ausleihe ein Datenbankfehler auftrat.
+        """
+        if verbindung.in_transaction:
+            verbindung.rollback()
+        if self._geschlossen or (fehlerhaft and not self._ist_gesund(verbindung)):
+            self._leser_verwerfen(verbindung, ersetzt=not self._geschlossen)
+        else:
+            self._frei.put((verbindung, time.monotonic()))
+
+    def _leser_verwerfen(self, verbindung: sqlite3.Connection, ersetzt: bool = False) -> None:
+        """
+        @brief Schließt eine Leseverbindung und gibt ihren Platz im Pool frei.
+        @param verbindung Die zu schließende Verbindung.
+        @param ersetzt True, wenn die Verbindung wegen einer fehlgeschlagenen Prüfung verworfen wird.
+        """
+        try:
+            verbindung.close()
+        except sqlite3.Error:
+            pass
+        with self._sperre:
+            self._anzahl_leser -= 1
+            if ersetzt:
+                self._statistik["ersetzte_verbindungen"] += 1
+
+    def _schreiber_pruefen(self) -> None:
+        """
+        @brief Stellt sicher, dass die Schreibverbindung nutzbar ist und keine Transaktion offen hält.
+        """
+        if self.schreiber.in_transaction:
+            logger.warning("⚠️ Schreibverbindung mit offener Transaktion übernommen, wird zurückgerollt.")
+            self.schreiber.rollback()
+        if not self._ist_gesund(self.schreiber):
+            logger.warning("⚠️ Schreibverbindung fehlerhaft, wird ersetzt.")
+            try:
+                self.schreiber.close()
+            except sqlite3.Error:
+                pass
+            self.schreiber = verbindung_oeffnen(self.db_pfad, self.einstellungen, check_same_thread=False)
+            with self._sperre:
+                self._statistik["ersetzte_verbindungen"] += 1
+
+    @staticmethod
+    def _ist_gesund(verbindung: sqlite3.Connection) -> bool:
+        """
+        @brief Prüft eine Verbindung mit einer minimalen Abfrage.
+        @param verbindung Die zu prüfende Verbindung.
+        @return True, wenn die Verbindung antwortet.
+        """
+        try:
+            verbindung.execute("SELECT 1;").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _wartezeit_erfassen(self, art: str, wartezeit: float) -> None:
+        """
+        @brief Zählt eine Ausleihe und ihre Wartezeit.
+        @param art "lesen" oder "schreiben".
+        @param wartezeit Wartezeit in Sekunden.
+        """
+        with self._sperre:
+            werte = self._statistik[art]
+            werte["ausleihen"] += 1
+            werte["wartezeit_summe"] += wartezeit
+            werte["wartezeit_max"] = max(werte["wartezeit_max"], wartezeit)
@@ -0,0 +1,127 @@
+"""
+@file verdichtung.py
+@brief Verdichtung langer Zeitreihen auf die Breite der Zeichenfläche.
+
+Eine Linie mit mehr Punkten als Pixeln in x-Richtung sieht nicht genauer aus, kostet aber
+beim Zeichnen Zeit. Die Funktionen wählen deshalb eine Teilmenge der Punkte aus, die den
+Verlauf erhält, und liefern deren Indizes:
+
+- `min_max`: je Abschnitt den kleinsten und größten Wert; Spitzen gehen nicht verloren.
+- `lttb`: "Largest Triangle Three Buckets"; je Abschnitt der Punkt, der mit seinen
+  Nachbarn das größte Dreieck bildet. Sehr lange Reihen werden vorab per `min_max`
+  reduziert (MinMaxLTTB).
+
+Die x-Werte müssen aufsteigend sortiert sein. Die Abschnitte enthalten gleich viele Punkte,
+was bei Tageswerten gleich breiten Zeitabschnitten entspricht.
+
+@author CHOE
+@date 2025-01-31
+@version 1.0
+"""
+
+import numpy as np
+
+## Verfahren, die `verdichten` kennt.
+VERFAHREN = ("lttb", "minmax")
+## Ab diesem Vielfachen der Zielgröße reduziert `lttb` zunächst per `min_max`.
+LTTB_VORAUSWAHL = 4
+
+
+def min_max(y, abschnitte: int) -> np.ndarray:
+    """
+    @brief Wählt je Abschnitt die Indizes des kleinsten und des größten Werts.
+
+    Vollständig vektorisiert: Die Werte werden auf gleich lange Abschnitte aufgefüllt und
+    zeilenweise ausgewertet. Erster und letzter Punkt bleiben immer erhalten.
+
+    @param y Die y-Werte.
+    @param abschnitte Anzahl der Abschnitte (ergibt höchstens 2 * abschnitte + 2 Punkte).
+    @return Aufsteigend sortierte Indizes der ausgewählten Punkte.
+    """
+    anzahl = len(y)
+    if abschnitte < 1 or 2 * abschnitte + 2 >= anzahl:
+        return np.arange(anzahl)
+
+    groesse = -(-anzahl // abschnitte)
+    abschnitte = -(-anzahl // groesse)
+    # Der letzte Abschnitt wird mit NaN aufgefüllt und enthält mindestens einen echten Wert
+    bloecke = np.full(abschnitte * groesse, np.nan)
+    bloecke[:anzahl] = y
+    bloecke = bloecke.reshape(abschnitte, groesse)
+
+    beginn = np.arange(abschnitte) * groesse
+    indizes = np.concatenate((
+        [0], beginn + np.nanargmin(bloecke, axis=1), beginn + np.nanargmax(bloecke, axis=1), [anzahl - 1]
+    ))
+    return np.unique(indizes)
+
+
+def lttb(x, y, punkte: int) -> np.ndarray:
+    """
+    @brief Wählt `punkte` Indizes nach dem Verfahren "Largest Triangle Three Buckets".
+
+    Die Schwerpunkte aller Abschnitte werden vektorisiert über kumulierte Summen berechnet;
+    nur die Auswahl je Abschnitt hängt vom zuvor gewählten Punkt ab und läuft daher in einer
+    Schleife über die Abschnitte (nicht über die Punkte).
+
+    @param x Aufsteigend sortierte x-Werte.
+    @param y Die y-Werte.
+    @param punkte Gewünschte Anzahl an Punkten (mindestens 3).
+    @return Aufsteigend sortierte Indizes der ausgewählten Punkte.
+    """
+    anzahl = len(x)
+    if punkte < 3 or punkte >= anzahl:
+        return np.arange(anzahl)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if anzahl > LTTB_VORAUSWAHL * punkte:
+        vorauswahl = min_max(y, LTTB_VORAUSWAHL * punkte // 2)
+        return vorauswahl[_dreiecke_auswaehlen(x[vorauswahl], y[vorauswahl], punkte)]
+    return _dreiecke_auswaehlen(x, y, punkte)
+
+
+def _dreiecke_auswaehlen(x: np.ndarray, y: np.ndarray, punkte: int) -> np.ndarray:
+    """
+    @brief Kern von `lttb` ohne Vorauswahl; erwartet 3 <= punkte < len(x).
+    """
+    anzahl = len(x)
+    # Erster und letzter Punkt sind gesetzt, die übrigen verteilen sich auf punkte - 2 Abschnitte
+    grenzen = np.linspace(1, anzahl - 1, punkte - 1).astype(np.intp)
+    beginn, ende = grenzen[:-1], grenzen[1:]
+    summe_x = np.concatenate(([0.0], np.cumsum(x)))
+    summe_y = np.concatenate(([0.0], np.cumsum(y)))
+    mittel_x = (summe_x[ende] - summe_x[beginn]) / (ende - beginn)
+    mittel_y = (summe_y[ende] - summe_y[beginn]) / (ende - beginn)
+    # Dritte Ecke des Dreiecks: Schwerpunkt des folgenden Abschnitts bzw. der letzte Punkt
+    naechstes_x = np.append(mittel_x[1:], x[-1])
+    naechstes_y = np.append(mittel_y[1:], y[-1])
+
+    indizes = np.empty(punkte, dtype=np.intp)
+    indizes[0], indizes[-1] = 0, anzahl - 1
+    gewaehlt = 0
+    for abschnitt, (von, bis) in enumerate(zip(beginn, ende)):
+        ax, ay = x[gewaehlt], y[gewaehlt]
+        flaeche = np.abs((ax - naechstes_x[abschnitt]) * (y[von:bis] - ay)
+                         - (ax - x[von:bis]) * (naechstes_y[abschnitt] - ay))
+        gewaehlt = von + int(flaeche.argmax())
+        indizes[abschnitt + 1] = gewaehlt
+    return indizes
+
+
+def verdichten(x, y, pixel: int, verfahren: str = "lttb") -> np.ndarray:
+    """
+    @brief Wählt die Punkte einer Linie für eine Zeichenfläche mit `pixel` Pixeln Breite.
+
+    @param x Aufsteigend sortierte x-Werte.
+    @param y Die y-Werte.
+    @param pixel Breite der Zeichenfläche in Pixeln.
+    @param verfahren "lttb" (ein Punkt je Pixel) oder "minmax" (Minimum und Maximum je Pixel).
+    @return Aufsteigend sortierte Indizes der ausgewählten Punkte.
+    @throws ValueError Bei einem unbekannten Verfahren.
+    """
+    if verfahren == "lttb":
+        return lttb(x, y, pixel)
+    if verfahren == "minmax":
+        return min_max(y, pixel)
+    raise ValueError(f"Unbekanntes Verdichtungsverfahren: {verfahren} (erlaubt: {', '.join(VERFAHREN)})")
@@ -0,0 +1,491 @@
+"""
+@file virtuelle_tabelle.py
+@brief Virtualisierte Tabelle für sehr große Ergebnismengen.
+
+Eine `ttk.Treeview` mit zehntausenden Einträgen wird beim Befüllen und Scrollen träge
+und belegt viel Speicher. `VirtuelleTabelle` legt deshalb nur die gerade sichtbaren
+Zeilen als Einträge an. Die Daten kommen seitenweise aus der Datenbank
+(Keyset-Paginierung ab der Nachbarzeile, eindeutig über den Schlüssel in der ersten
+Spalte) und werden in einem begrenzten `Seitenpuffer` gehalten; Seiten am Rand des
+sichtbaren Bereichs werden vorab geladen, damit Scrollen ohne Wartezeit weiterläuft.
+Mit einem `HintergrundLader` laufen Zählung und Seitenabfragen im Worker-Thread; die
+Tabelle zeigt einen Bereich erst an, wenn seine Seiten eingetroffen sind.
+Beim Scrollen und Neuladen werden die Einträge mit dem neuen Stand abgeglichen, statt
+sie vollständig zu ersetzen.
+
+@author CHOE
+@date 2025-01-31
+@version 1.0
+"""
+
+import bisect
+import logging
+from collections import OrderedDict
+
+import tkinter as tk
+from tkinter import ttk
+
+
+class Seitenpuffer:
+    """
+    @class Seitenpuffer
+    @brief Hält Seiten eines sortierten Ergebnisses und lädt fehlende nach.
+
+    Eine Seite wird bevorzugt per Keyset ab der letzten Zeile der vorherigen (bzw. vor der
+    ersten Zeile der nächsten) Seite geladen. Nur ohne bekannte Nachbarseite, z. B. beim
+    Sprung mit der Bildlaufleiste, wird über die Position gesucht. Die Grenzzeilen aller
+    bisher geladenen Seiten bleiben auch nach dem Verdrängen der Seite bekannt.
+
+    Ohne `lader` lädt `zeilen()` fehlende Seiten sofort. Mit `lader` lädt `anfordern()` sie
+    im Hintergrund und meldet ihr Eintreffen über einen Rückruf im Tk-Thread.
+    """
+
+    def __init__(self, seite_laden, anzahl_laden, seitengroesse: int = 200, max_seiten: int = 16, lader=None):
+        """
+        @param seite_laden Funktion (anzahl, nach=None, vor=None, position=None) -> Liste von Zeilen.
+            `nach` und `vor` erhalten die Grenzzeile der Nachbarseite; aus ihr bildet die Funktion
+            den Keyset für ihre Sortierung. Der eindeutige Schlüssel steht in Spalte 0.
+        @param anzahl_laden Funktion ohne Parameter, die die Gesamtzahl der Zeilen liefert.
+        @param seitengroesse Anzahl der Zeilen je Seite.
+        @param max_seiten Maximale Anzahl gleichzeitig gehaltener Seiten.
+        @param lader Optionaler `HintergrundLader`; `seite_laden` und `anzahl_laden` erhalten dann
+            die Leser-Logik des Worker-Threads als ersten Parameter.
+        """
+        self.seite_laden = seite_laden
+        self.anzahl_laden = anzahl_laden
+        self.seitengroesse = seitengroesse
+        self.max_seiten = max_seiten
+        self.lader = lader
+        self.logger = logging.getLogger("Seitenpuffer")
+        self.abfragen = {"keyset": 0, "position": 0}
+        self._seiten = OrderedDict()
+        self._grenzen = {}
+        self._anzahl = None
+        self._auftraege = {}  # Seitennummer bzw. "anzahl" -> laufender Ladeauftrag
+        self._generation = 0  # verwirft Ergebnisse, die vor dem letzten `leeren()` angefordert wurden
+
+    def anzahl(self) -> int:
+        """
+        @brief Liefert die Gesamtzahl der Zeilen (zwischengespeichert bis `leeren()`).
+
+        Mit `lader` wird nicht gewartet: Solange die Zählung läuft, ist das Ergebnis 0.
+        """
+        if self._anzahl is None:
+            if self.lader is not None:
+                return 0
+            self._anzahl = self.anzahl_laden()
+        return self._anzahl
+
+    @property
+    def anzahl_bekannt(self) -> bool:
+        return self._anzahl is not None
+
+    def anfordern(self, start: int, ende: int, fertig) -> bool:
+        """
+        @brief Prüft, ob die Zeilen [start, ende) geladen sind, und lädt fehlende im Hintergrund.
+
+        Angefordert werden zunächst die Gesamtzahl, danach die fehlenden Seiten; bereits laufende
+        Aufträge werden nicht erneut gestellt, abgebrochene (z. B. beim Wechsel der Ansicht) schon.
+
+        @param start Erste Position.
+        @param ende Position hinter der letzten Zeile.
+        @param fertig Rückruf ohne Parameter im Tk-Thread, sobald Anzahl oder eine Seite eintrifft.
+        @return True, wenn alle Zeilen vorliegen und `zeilen()` sie ohne Abfrage liefert.
+        """
+        if self._anzahl is None:
+            if not self._laeuft("anzahl"):
+                self._hintergrund("anzahl", lambda logik: self.anzahl_laden(logik), fertig)
+            return False
+        start, ende = max(0, start), min(ende, self._anzahl)
+        vollstaendig = True
+        for nummer in range(start // self.seitengroesse, (ende - 1) // self.seitengroesse + 1) if start < ende else ():
+            if nummer in self._seiten:
+                continue
+            vollstaendig = False
+            if not self._laeuft(nummer):
+                grenze = self._ladeparameter(nummer)
+                self._hintergrund(
+                    nummer, lambda logik, grenze=grenze: self.seite_laden(logik, self.seitengroesse, **grenze), fertig
+                )
+        return vollstaendig
+
+    @property
+    def unterbrochen(self) -> bool:
+        """
+        @brief True, wenn ein laufender Auftrag von außen abgebrochen wurde und neu angefordert werden muss.
+        """
+        return any(auftrag.abgebrochen for auftrag in self._auftraege.values())
+
+    def zeilen(self, start: int, ende: int) -> list:
+        """
+        @brief Liefert die Zeilen der Positionen [start, ende) und lädt fehlende Seiten nach.
+        """
+        start, ende = max(0, start), min(ende, self.anzahl())
+        if start >= ende:
+            return []
+        ergebnis = []
+        for nummer in range(start // self.seitengroesse, (ende - 1) // self.seitengroesse + 1):
+            versatz = nummer * self.seitengroesse
+            seite = self._seite(nummer)
+            ergebnis.extend(seite[max(start - versatz, 0):ende - versatz])
+        return ergebnis
+
+    def zeilen_ersetzen(self, zeilen) -> int:
+        """
+        @brief Ersetzt geänderte Zeilen in bereits geladenen Seiten anhand ihres Schlüssels.
+
+        @param zeilen Neue Zeilen; der Schlüssel steht in Spalte 0 und darf sich nicht ändern.
+        @return Anzahl der ersetzten Zeilen.
+        """
+        neu = {zeile[0]: zeile for zeile in zeilen}
+        ersetzt = 0
+        for seite in self._seiten.values():
+            for index, zeile in enumerate(seite):
+                if zeile[0] in neu:
+                    seite[index] = neu[zeile[0]]
+                    ersetzt += 1
+        return ersetzt
+
+    def leeren(self) -> None:
+        """
+        @brief Verwirft alle Seiten, Grenzzeilen und die Gesamtzahl, z. B. nach Änderungen.
+
+        Laufende Hintergrundaufträge werden abgebrochen.
+        """
+        self._seiten.clear()
+        self._grenzen.clear()
+        self._anzahl = None
+        self._generation += 1
+        for auftrag in self._auftraege.values():
+            self.lader.abbrechen(auftrag)
+        self._auftraege.clear()
+
+    @property
+    def geladene_seiten(self) -> int:
+        return len(self._seiten)
+
+    def _seite(self, nummer: int) -> list:
+        """
+        @brief Liefert eine Seite aus dem Puffer oder lädt sie per Keyset bzw. Position.
+        """
+        seite = self._seiten.get(nummer)
+        if seite is not None:
+            self._seiten.move_to_end(nummer)
+            return seite
+        return self._seite_uebernehmen(nummer, self.seite_laden(self.seitengroesse, **self._ladeparameter(nummer)))
+
+    def _ladeparameter(self, nummer: int) -> dict:
+        """
+        @brief Wählt Keyset (ab einer bekannten Nachbarseite) oder Position zum Laden einer Seite.
+        @return Schlüsselwortparameter für `seite_laden`.
+        """
+        if nummer - 1 in self._grenzen:
+            self.abfragen["keyset"] += 1
+            return {"nach": self._grenzen[nummer - 1][1]}
+        if nummer + 1 in self._grenzen:
+            self.abfragen["keyset"] += 1
+            return {"vor": self._grenzen[nummer + 1][0]}
+        self.abfragen["position"] += 1
+        return {"position": nummer * self.seitengroesse}
+
+    def _laeuft(self, schluessel) -> bool:
+        """
+        @brief Prüft, ob für die Anzahl bzw. eine Seite bereits ein nicht abgebrochener Auftrag läuft.
+        """
+        auftrag = self._auftraege.get(schluessel)
+        return auftrag is not None and not auftrag.abgebrochen
+
+    def _hintergrund(self, schluessel, funktion, fertig) -> None:
+        """
+        @brief Stellt einen Ladeauftrag für die Anzahl oder eine Seite über den `lader`.
+        """
+        generation = self._generation
+
+        def geladen(ergebnis):
+            if generation != self._generation:
+                return
+            self._auftraege.pop(schluessel, None)
+            if schluessel == "anzahl":
+                self._anzahl = ergebnis
+            else:
+                self._seite_uebernehmen(schluessel, ergebnis)
+            fertig()
+
+        def fehlgeschlagen(ausnahme):
+            # Kein sofortiger neuer Versuch; die nächste Anforderung (z. B. beim Scrollen) lädt erneut
+            if generation == self._generation:
+                self._auftraege.pop(schluessel, None)
+            self.logger.error(f"❌ Fehler beim Laden ({schluessel}): {ausnahme}")
+
+        self._auftraege[schluessel] = self.lader.laden(funktion, geladen, fehlgeschlagen)
+
+    def _seite_uebernehmen(self, nummer: int, seite) -> list:
+        """
+        @brief Legt eine geladene Seite im Puffer ab und merkt sich ihre Grenzzeilen.
+        """
+        seite = list(seite)
+        if seite:
+            self._grenzen[nummer] = (seite[0], seite[-1])
+        self._seiten[nummer] = seite
+        while len(self._seiten) > self.max_seiten:
+            self._seiten.popitem(last=False)
+        return seite
+
+
+def treeview_abgleichen(tree, angezeigt: dict, zeilen: list) -> dict:
+    """
+    @brief Bringt die Einträge einer Treeview mit möglichst wenigen Operationen auf den Stand von `zeilen`.
+
+    Der Abgleich erfolgt über den Schlüssel in Spalte 0 (iid). Einträge, die fehlen, werden
+    gelöscht, neue eingefügt und geänderte nur in ihren Werten ersetzt. Für die Reihenfolge
+    bleibt die längste Folge von Einträgen, die schon richtig zueinander stehen, unberührt;
+    nur die übrigen werden verschoben. Nicht betroffene Einträge behalten Auswahl und Fokus.
+
+    @param tree Die `ttk.Treeview`.
+    @param angezeigt Dictionary iid -> zuletzt angezeigte Zeile; wird auf den neuen Stand gebracht.
+    @param zeilen Die anzuzeigenden Zeilen in Anzeigereihenfolge.
+    @return Dictionary mit der Anzahl der Operationen je Art
+        ("eingefuegt", "aktualisiert", "geloescht", "verschoben").
+    """
+    neu = OrderedDict((str(zeile[0]), zeile) for zeile in zeilen)
+    statistik = {"eingefuegt": 0, "aktualisiert": 0, "geloescht": 0, "verschoben": 0}
+
+    vorhanden = list(tree.get_children())
+    # Einträge, die außerhalb des Abgleichs entfernt wurden (z. B. optimistisch gelöscht), vergessen
+    for iid in set(angezeigt).difference(vorhanden):
+        del angezeigt[iid]
+    geloescht = [iid for iid in vorhanden if iid not in neu]
+    if geloescht:
+        tree.delete(*geloescht)
+        statistik["geloescht"] = len(geloescht)
+    for iid in geloescht:
+        angezeigt.pop(iid, None)
+
+    # Positionen der verbliebenen Einträge in neuer Reihenfolge; deren längste aufsteigende
+    # Teilfolge steht bereits richtig und muss nicht bewegt werden
+    alte_position = {iid: index for index, iid in enumerate(iid for iid in vorhanden if iid in neu)}
+    bleibend = set(_laengste_aufsteigende_folge([iid for iid in neu if iid in alte_position], alte_position))
+    verschieben = [iid for iid in alte_position if iid not in bleibend]
+    if verschieben:
+        tree.detach(*verschieben)
+
+    for index, (iid, zeile) in enumerate(neu.items()):
+        if iid not in alte_position:
+            tree.insert("", index, iid=iid, values=zeile)
+            statistik["eingefuegt"] += 1
+        else:
+            if iid not in bleibend:
+                tree.move(iid, "", index)
+                statistik["verschoben"] += 1
+            if angezeigt.get(iid) != zeile:
+                tree.item(iid, values=zeile)
+                statistik["aktualisiert"] += 1
+        angezeigt[iid] = zeile
+    return statistik
+
+
+def _laengste_aufsteigende_folge(iids: list, position: dict) -> list:
+    """
+    @brief Liefert die längste Teilfolge von `iids`, deren Werte in `position` aufsteigen (O(n log n)).
+    """
+    enden, vorgaenger, indizes = [], [None] * len(iids), []
+    for index, iid in enumerate(iids):
+        stelle = bisect.bisect_left(enden, position[iid])
+        if stelle == len(enden):
+            enden.append(position[iid])
+            indizes.append(index)
+        else:
+            enden[stelle] = position[iid]
+            indizes[stelle] = index
+        vorgaenger[index] = indizes[stelle - 1] if stelle else None
+
+    folge, index = [], indizes[-1] if indizes else None
+    while index is not None:
+        folge.append(iids[index])
+        index = vorgaenger[index]
+    return folge[::-1]
+
+
+class VirtuelleTabelle(ttk.Frame):
+    """
+    @class VirtuelleTabelle
+    @brief `ttk.Treeview` mit eigener Bildlaufleiste, die nur die sichtbaren Zeilen anlegt.
+
+    Die Einträge der Treeview haben den Schlüssel der Zeile (Spalte 0) als iid, sodass
+    Auswahl und Bearbeitung wie bei einer normalen Treeview über `tree` funktionieren. Die
+    Auswahl bleibt beim Scrollen über Schlüssel erhalten.
+
+    @extends ttk.Frame
+    """
+
+    def __init__(self, master, spalten, seite_laden, anzahl_laden, seitengroesse: int = 200,
+                 ueberhang: int = 50, max_seiten: int = 16, lader=None):
+        """
+        @param master Eltern-Widget.
+        @param spalten Spaltennamen; die erste Spalte enthält den eindeutigen Schlüssel.
+        @param seite_laden Ladefunktion für Seiten, siehe `Seitenpuffer`.
+        @param anzahl_laden Funktion, die die Gesamtzahl der Zeilen liefert.
+        @param seitengroesse Anzahl der Zeilen je geladener Seite.
+        @param ueberhang Anzahl der Zeilen ober- und unterhalb des sichtbaren Bereichs, die vorab
+            geladen werden.
+        @param max_seiten Maximale Anzahl gehaltener Seiten.
+        @param lader Optionaler `HintergrundLader`, über den Anzahl und Seiten geladen werden
+            (siehe `Seitenpuffer`).
+        """
+        super().__init__(master)
+        self.logger = logging.getLogger("VirtuelleTabelle")
+        self.puffer = Seitenpuffer(seite_laden, anzahl_laden, seitengroesse, max_seiten, lader)
+        self.platzhalter = None
+        self.ueberhang = ueberhang
+        self.erste_zeile = 0
+        self.sichtbare_zeilen = 20
+        self.auswahl = set()
+        self.angezeigt = {}
+        self.letzter_abgleich = None
+
+        self.tree = ttk.Treeview(self, columns=spalten, show="headings", height=self.sichtbare_zeilen)
+        for spalte in spalten:
+            self.tree.heading(spalte, text=spalte)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.tree.bind("<Configure>", self._groesse_geaendert)
+        self.tree.bind("<<TreeviewSelect>>", self._auswahl_geaendert)
+        self.tree.bind("<MouseWheel>", lambda e: self.yview("scroll", -1 if e.delta > 0 else 1, "units"))
+        self.tree.bind("<Button-4>", lambda e: self.yview("scroll", -1, "units"))
+        self.tree.bind("<Button-5>", lambda e: self.yview("scroll", 1, "units"))
+        self.tree.bind("<Up>", lambda e: self._tastatur(-1))
+        self.tree.bind("<Down>", lambda e: self._tastatur(1))
+        self.tree.bind("<Prior>", lambda e: self.yview("scroll", -1, "pages") or "break")
+        self.tree.bind("<Next>", lambda e: self.yview("scroll", 1, "pages") or "break")
+
+    def neu_laden(self, platzhalter=None) -> None:
+        """
+        @brief Verwirft alle geladenen Seiten und zeigt den aktuellen Bereich neu an.
+
+        Die Scrollposition und die Auswahl bleiben erhalten, soweit die Zeilen noch existieren.
+
+        @param platzhalter Optionales Widget (z. B. Ladehinweis), das entfernt wird, sobald der
+            sichtbare Bereich angezeigt ist.
+        """
+        if platzhalter is not None:
+            self._platzhalter_entfernen()
+            self.platzhalter = platzhalter
+        self.puffer.leeren()
+        self.darstellen()
+
+    def zeilen_aktualisieren(self, zeilen) -> None:
+        """
+        @brief Übernimmt geänderte Zeilen, ohne Seiten neu zu laden.
+        @param zeilen Zeilen mit unverändertem Schlüssel in Spalte 0.
+        """
+        self.puffer.zeilen_ersetzen(zeilen)
+        for zeile in zeilen:
+            if self.tree.exists(str(zeile[0])):
+                self.tree.item(str(zeile[0]), values=zeile)
+                self.angezeigt[str(zeile[0])] = zeile
+
+    def scrollen_zu(self, position: int) -> None:
+        """
+        @brief Scrollt so, dass die Zeile an `position` oben steht.
+        """
+        groesste = max(0, self.puffer.anzahl() - self.sichtbare_zeilen)
+        self.erste_zeile = min(max(0, int(position)), groesste)
+        self.darstellen()
+
+    def yview(self, *args) -> None:
+        """
+        @brief Befehl der Bildlaufleiste ("moveto", Anteil) bzw. ("scroll", n, "units"|"pages").
+        """
+        if not args:
+            return
+        if args[0] == "moveto":
+            self.scrollen_zu(float(args[1]) * self.puffer.anzahl())
+        elif args[0] == "scroll":
+            schritt = int(args[1]) * (self.sichtbare_zeilen if args[2] == "pages" else 1)
+            self.scrollen_zu(self.erste_zeile + schritt)
+
+    def darstellen(self) -> None:
+        """
+        @brief Gleicht die Einträge mit dem sichtbaren Bereich ab und lädt den Überhang vorab.
+
+        Es werden nur Einträge eingefügt, geändert, verschoben oder gelöscht, die sich vom
+        bisherigen Stand unterscheiden (siehe `treeview_abgleichen`). Mit `lader` bleibt der
+        bisherige Stand stehen, bis Anzahl und Seiten eingetroffen sind.
+        """
+        hintergrund = self.puffer.lader is not None
+        anzahl = self.puffer.anzahl()
+        if self.puffer.anzahl_bekannt:
+            self.erste_zeile = min(self.erste_zeile, max(0, anzahl - self.sichtbare_zeilen))
+        ende = self.erste_zeile + self.sichtbare_zeilen
+        if hintergrund and not self.puffer.anfordern(self.erste_zeile, ende, self.darstellen):
+            return  # `darstellen` läuft erneut, sobald die Anzahl bzw. eine Seite eingetroffen ist
+        zeilen = self.puffer.zeilen(self.erste_zeile, ende)
+
+        self.letzter_abgleich = treeview_abgleichen(self.tree, self.angezeigt, zeilen)
+        fehlende_auswahl = [iid for iid in self.auswahl if self.tree.exists(iid)
+                            and iid not in self.tree.selection()]
+        if fehlende_auswahl:
+            self.tree.selection_add(fehlende_auswahl)
+
+        self._platzhalter_entfernen()
+
+        # Überhang vorab laden, damit die nächsten Scrollschritte aus dem Puffer bedient werden
+        if hintergrund:
+            self.puffer.anfordern(ende, ende + self.ueberhang, self.darstellen)
+            self.puffer.anfordern(self.erste_zeile - self.ueberhang, self.erste_zeile, self.darstellen)
+        else:
+            self.puffer.zeilen(ende, ende + self.ueberhang)
+            self.puffer.zeilen(self.erste_zeile - self.ueberhang, self.erste_zeile)
+
+        if anzahl:
+            self.scrollbar.set(self.erste_zeile / anzahl, min(1.0, ende / anzahl))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _platzhalter_entfernen(self) -> None:
+        """
+        @brief Entfernt den Ladehinweis, sobald Zeilen angezeigt werden.
+        """
+        if self.platzhalter is not None:
+            try:
+                self.platzhalter.destroy()
+            except tk.TclError:
+                pass  # Platzhalter wurde bereits mit der Ansicht zerstört
+            self.platzhalter = None
+
+    def _groesse_geaendert(self, event) -> None:
+        """
+        @brief Passt die Anzahl sichtbarer Zeilen an die Höhe der Treeview an.
+        """
+        zeilenhoehe = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        sichtbar = max(1, (event.height - zeilenhoehe) // zeilenhoehe)
+        if sichtbar != self.sichtbare_zeilen:
+            self.sichtbare_zeilen = sichtbar
+            self.darstellen()
+
+    def _auswahl_geaendert(self, event=None) -> None:
+        """
+        @brief Merkt sich die Auswahl über Schlüssel, auch für gerade nicht sichtbare Zeilen.
+        """
+        sichtbar = set(self.tree.get_children())
+        self.auswahl = (self.auswahl - sichtbar) | set(self.tree.selection())
+
+    def _tastatur(self, richtung: int):
+        """
+        @brief Pfeiltasten am Rand des sichtbaren Bereichs scrollen weiter statt anzuhalten.
+        """
+        kinder = self.tree.get_children()
+        fokus = self.tree.focus()
+        if not kinder or fokus not in (kinder[0], kinder[-1]) or (fokus == kinder[0]) != (richtung < 0):
+            return None
+        position = self.erste_zeile + (0 if richtung < 0 else len(kinder) - 1) + richtung
+        self.yview("scroll", richtung, "units")
+        self.auswahl = set()
+        kinder = self.tree.get_children()
+        index = position - self.erste_zeile
+        if 0 <= index < len(kinder):
+            self.tree.focus(kinder[index])
+            self.tree.selection_set(kinder[index])
+        return "break"
@@ -0,0 +1,74 @@
+# tests/abfrage_cache_test.py
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../dashboard')))
+
+import pytest
+
+from dashboard.abfrage_cache import AbfrageCache
+
+
+def test_treffer_und_fehlversuche():
+    """Testet, ob ein zweiter Abruf aus dem Cache bedient und gezählt wird."""
+    cache = AbfrageCache(4)
+    aufrufe = []
+
+    def laden():
+        aufrufe.append(1)
+        return [(1, "MA1")]
+
+    assert cache.holen(("moduluebersicht", ()), laden, {"modul"}) == [(1, "MA1")]
+    assert cache.holen(("moduluebersicht", ()), laden, {"modul"}) == [(1, "MA1")]
+    assert len(aufrufe) == 1, "Die Abfrage sollte nur einmal ausgeführt werden."
+    assert cache.statistik()["treffer"] == 1
+    assert cache.statistik()["fehlversuche"] == 1
+
+
+def test_lru_verdraengung():
+    """Testet, ob bei voller Belegung der am längsten unbenutzte Eintrag entfernt wird."""
+    cache = AbfrageCache(2)
+    cache.holen("a", lambda: [1])
+    cache.holen("b", lambda: [2])
+    cache.holen("a", lambda: [1])
+    cache.holen("c", lambda: [3])
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache, "Der zuletzt unbenutzte Eintrag sollte verdrängt werden."
+    assert len(cache) == 2
+
+
+def test_invalidierung_nach_tabellen():
+    """Testet, ob nur Einträge verworfen werden, die von einer geänderten Tabelle abhängen."""
+    cache = AbfrageCache(8)
+    cache.holen("moduluebersicht", lambda: [], {"modul", "semester"})
+    cache.holen("startbildschirm", lambda: [], {"studiengang"})
+    cache.holen("unbekannt", lambda: [])
+
+    assert cache.invalidieren({"modul"}) == 2
+    assert "startbildschirm" in cache
+    assert cache.invalidieren(None) == 1
+    assert len(cache) == 0
+
+
+def test_invalidierung_waehrend_laden():
+    """Testet, ob ein während des Ladens invalidiertes Ergebnis nicht gespeichert wird."""
+    cache = AbfrageCache(2)
+
+    def laden():
+        cache.invalidieren({"modul"})
+        return ["veraltet"]
+
+    assert cache.holen("moduluebersicht", laden, {"modul"}) == ["veraltet"]
+    assert "moduluebersicht" not in cache
+
+
+def test_ergebnis_ist_kopie():
+    """Testet, ob Änderungen am gelieferten Ergebnis den Cache nicht verfälschen."""
+    cache = AbfrageCache(2)
+    cache.holen("a", lambda: [1, 2]).append(3)
+    assert cache.holen("a", lambda: []) == [1, 2]
+
+
+def test_ungueltige_groesse():
+    """Testet, ob eine Größe kleiner 1 abgelehnt wird."""
+    with pytest.raises(ValueError):
+        AbfrageCache(0)
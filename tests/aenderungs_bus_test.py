@@ -0,0 +1,125 @@
+# tests/aenderungs_bus_test.py
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../dashboard')))
+
+import pytest
+from pathlib import Path
+
+from dashboard.aenderungs_bus import AenderungsBus, Aenderung
+from dashboard.datenbank_zugriff import AENDERUNGEN_SAMMELGRENZE
+from dashboard.logik import Logik
+
+
+class AfterWarteschlange:
+    """Ersetzt die Tk-Ereignisschleife: sammelt `after()`-Aufrufe und führt sie auf Anforderung aus."""
+
+    def __init__(self):
+        self.geplant = []
+        self.existiert = True
+
+    def after(self, ms, funktion):
+        self.geplant.append(funktion)
+
+    def winfo_exists(self):
+        return self.existiert
+
+    def ausfuehren(self):
+        geplant, self.geplant = self.geplant, []
+        for funktion in geplant:
+            funktion()
+
+
+@pytest.fixture(scope="function")
+def logik_test():
+    """Fixture mit gestarteter Logik, angelegtem Studiengang und mitgeschriebenen Änderungen."""
+    test_db_pfad = "data/test_datenbank.db"
+    if Path(test_db_pfad).exists():
+        Path(test_db_pfad).unlink()
+
+    logik = Logik(db_pfad=test_db_pfad)
+    logik.starten()
+    logik.set_startbildschirm_ansicht_daten(("Informatik", "2022-10-01", 0, "Vollzeit"))
+    logik.empfangen = []
+    logik.aenderungen.abonnieren(logik.empfangen.extend)
+    yield logik
+
+    logik.beenden()
+    if Path(test_db_pfad).exists():
+        Path(test_db_pfad).unlink()
+
+
+def modul_einfuegen(logik, kuerzel="M1"):
+    assert logik.set_moduluebersicht_ansicht_daten("INSERT", (1, "Modul", kuerzel, "Offen", 5, "2023-10-01"))
+    return logik.datenbank.abfragen("SELECT modulID FROM modul WHERE modulKuerzel = ?;", (kuerzel,))[0][0]
+
+
+def test_bus_filtert_nach_tabellen():
+    """Testet, ob Abonnenten nur Änderungen an ihren Tabellen erhalten."""
+    bus = AenderungsBus()
+    alle, nur_modul = [], []
+    bus.abonnieren(alle.extend)
+    abonnement = bus.abonnieren(nur_modul.extend, {"modul"})
+
+    bus.veroeffentlichen([Aenderung("modul", "INSERT", 1), Aenderung("verlauf", "UPDATE", 3)])
+    abonnement.kuendigen()
+    bus.veroeffentlichen([Aenderung("modul", "DELETE", 1)])
+
+    assert len(alle) == 3
+    assert nur_modul == [Aenderung("modul", "INSERT", 1)]
+
+
+def test_zustellung_im_tk_thread_endet_mit_widget():
+    """Testet, ob Änderungen gesammelt per `after()` zugestellt werden und das Abonnement mit dem Widget endet."""
+    bus, widget, empfangen = AenderungsBus(), AfterWarteschlange(), []
+    bus.abonnieren(empfangen.append, widget=widget)
+
+    bus.veroeffentlichen([Aenderung("modul", "INSERT", 1)])
+    bus.veroeffentlichen([Aenderung("modul", "UPDATE", 1)])
+    assert empfangen == []
+    widget.ausfuehren()
+    assert empfangen == [[Aenderung("modul", "INSERT", 1), Aenderung("modul", "UPDATE", 1)]]
+
+    widget.existiert = False
+    widget.ausfuehren()
+    assert widget.geplant == [] and bus._abonnements == []
+
+
+def test_aenderungen_mit_operation_und_rowid(logik_test):
+    """Testet, ob INSERT, UPDATE und DELETE mit Tabelle und rowid gemeldet werden – auch aus Triggern."""
+    modul_id = modul_einfuegen(logik_test)
+    assert Aenderung("modul", "INSERT", modul_id) in logik_test.empfangen
+    assert any(a.tabelle == "modul_ereignis" for a in logik_test.empfangen), "Trigger-Änderungen fehlen."
+
+    logik_test.empfangen.clear()
+    logik_test.set_moduluebersicht_ansicht_daten("UPDATE", (modul_id, "Modul", "M1", "Abgeschlossen", 5, "2023-10-01"))
+    assert Aenderung("modul", "UPDATE", modul_id) in logik_test.empfangen
+
+    logik_test.empfangen.clear()
+    logik_test.set_moduluebersicht_ansicht_daten("DELETE", (modul_id,))
+    assert Aenderung("modul", "DELETE", modul_id) in logik_test.empfangen
+    assert logik_test.get_moduluebersicht_zeilen([modul_id]) == []
+
+
+def test_keine_meldung_vor_commit_und_nach_rollback(logik_test):
+    """Testet, ob erst nach dem Commit gemeldet wird und zurückgerollte Änderungen nie ankommen."""
+    with pytest.raises(RuntimeError):
+        with logik_test.transaktion():
+            modul_einfuegen(logik_test, "M1")
+            assert logik_test.empfangen == []
+            raise RuntimeError("Abbruch")
+    assert logik_test.empfangen == []
+
+    with logik_test.transaktion():
+        modul_einfuegen(logik_test, "M2")
+        assert logik_test.empfangen == []
+    assert [a.operation for a in logik_test.empfangen if a.tabelle == "modul"] == ["INSERT"]
+
+
+def test_sammelmeldung_bei_vielen_aenderungen(logik_test):
+    """Testet, ob sehr viele Änderungen an einer Tabelle als eine Sammelmeldung ankommen."""
+    module = [(1, f"Modul {i}", f"M{i}", "Offen", 5, "2023-10-01") for i in range(AENDERUNGEN_SAMMELGRENZE + 1)]
+    gespeichert, _ = logik_test.module_importieren(module)
+    assert gespeichert == len(module)
+
+    assert [a for a in logik_test.empfangen if a.tabelle == "modul"] == [Aenderung("modul", None, None)]
@@ -0,0 +1,122 @@
+# tests/ansicht_cache_test.py
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../dashboard')))
+
+import pytest
+from types import SimpleNamespace
+
+from dashboard.ansicht_cache import AnsichtCache
+from dashboard.aenderungs_bus import AenderungsBus, Aenderung
+from dashboard.ansichten.aktualisierbare_ansicht import AktualisierbareAnsicht
+
+
+class Ansicht:
+    """Ersetzt eine Tk-Ansicht und merkt sich, ob sie zerstört wurde."""
+
+    def __init__(self, name):
+        self.name = name
+        self.zerstoert = False
+
+    def destroy(self):
+        self.zerstoert = True
+
+
+class Widget:
+    """Minimaler Ersatz für `ttk.Frame` mit `after()` und Sichtbarkeit."""
+
+    def __init__(self, master):
+        self.master = master
+        self.sichtbar = True
+        self.zerstoert = False
+
+    def after(self, ms, funktion):
+        pass
+
+    def winfo_exists(self):
+        return not self.zerstoert
+
+    def winfo_ismapped(self):
+        return self.sichtbar
+
+    def destroy(self):
+        self.zerstoert = True
+
+
+class Lader:
+    def __init__(self):
+        self.auftraege = []
+
+    def laden(self, funktion, fertig, platzhalter=None):
+        auftrag = SimpleNamespace(abgebrochen=False)
+        self.auftraege.append(auftrag)
+        return auftrag
+
+
+class BeispielAnsicht(AktualisierbareAnsicht, Widget):
+    def __init__(self, master):
+        super().__init__(master)
+        self.aktualisierung_einrichten({"modul"})
+        self.geladen = 0
+        self.lade_daten()
+
+    def lade_daten(self):
+        self.geladen += 1
+        self.laden(lambda logik: None, lambda daten: None)
+
+
+def test_ansicht_wird_wiederverwendet():
+    """Testet, ob eine Ansicht nur einmal aufgebaut und danach wiederverwendet wird."""
+    cache = AnsichtCache(max_ansichten=2)
+    erste, neu = cache.holen("a", lambda: Ansicht("a"))
+    zweite, erneut_neu = cache.holen("a", lambda: Ansicht("a"))
+
+    assert neu and not erneut_neu
+    assert erste is zweite
+    assert cache.statistik()["treffer"] == 1
+
+
+def test_lru_verdraengung_zerstoert_ansicht():
+    """Testet, ob bei Überlauf die am längsten nicht besuchte Ansicht zerstört wird."""
+    cache = AnsichtCache(max_ansichten=2)
+    a, _ = cache.holen("a", lambda: Ansicht("a"))
+    b, _ = cache.holen("b", lambda: Ansicht("b"))
+    cache.holen("a", lambda: Ansicht("a"))  # a ist nun zuletzt besucht
+    cache.holen("c", lambda: Ansicht("c"))
+
+    assert b.zerstoert and not a.zerstoert
+    assert "b" not in cache and len(cache) == 2
+
+    cache.leeren()
+    assert a.zerstoert and len(cache) == 0
+
+
+def test_ungueltige_groesse():
+    with pytest.raises(ValueError):
+        AnsichtCache(max_ansichten=0)
+
+
+def test_ausgeblendete_ansicht_laedt_erst_beim_anzeigen():
+    """Testet, ob eine ausgeblendete Ansicht Änderungen nur vormerkt und beim Einblenden einmal nachlädt."""
+    bus = AenderungsBus()
+    master = SimpleNamespace(logik=SimpleNamespace(aenderungen=bus), lader=Lader())
+    ansicht = BeispielAnsicht(master)
+    abonnement = ansicht.abonnement
+
+    ansicht.sichtbar = False
+    for i in range(3):
+        abonnement.rueckruf([Aenderung("modul", "INSERT", i)])
+    assert ansicht.geladen == 1 and ansicht.veraltet
+
+    ansicht.sichtbar = True
+    ansicht.anzeigen()
+    ansicht.anzeigen()
+    assert ansicht.geladen == 2 and not ansicht.veraltet
+
+    # Ein beim Ansichtswechsel abgebrochener Ladevorgang wird beim nächsten Einblenden wiederholt
+    ansicht.ladeauftrag.abgebrochen = True
+    ansicht.anzeigen()
+    assert ansicht.geladen == 3
+
+    ansicht.destroy()
+    assert bus._abonnements == []
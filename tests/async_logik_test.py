@@ -0,0 +1,101 @@
+# tests/async_logik_test.py
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../dashboard')))
+
+import asyncio
+import functools
+import threading
+import pytest
+from pathlib import Path
+
+from dashboard.async_logik import AsyncLogik
+
+TEST_DB_PFAD = "data/test_datenbank.db"
+
+
+@pytest.fixture(scope="function")
+def async_logik_test():
+    """Fixture für eine AsyncLogik auf einer frischen Test-Datenbank."""
+    if Path(TEST_DB_PFAD).exists():
+        Path(TEST_DB_PFAD).unlink()
+    yield AsyncLogik(db_pfad=TEST_DB_PFAD, max_parallel=2)
+    if Path(TEST_DB_PFAD).exists():
+        Path(TEST_DB_PFAD).unlink()
+
+
+def test_lesen_und_schreiben(async_logik_test):
+    """Testet, ob Schreib- und Lesezugriffe als Koroutinen funktionieren."""
+    async def ablauf():
+        assert await async_logik_test.starten()
+        assert await async_logik_test.set_startbildschirm_ansicht_daten(("Informatik", "2022-10-01", 0, "Vollzeit"))
+        assert await async_logik_test.set_moduluebersicht_ansicht_daten(
+            "INSERT", (1, "Mathematik I", "MA1", "Offen", 5, "2023-10-01")
+        )
+        module, zeitmanagement = await asyncio.gather(
+            async_logik_test.get_moduluebersicht_ansicht_daten(),
+            async_logik_test.get_zeitmanagement_ansicht_daten(),
+        )
+        await async_logik_test.beenden()
+        return module, zeitmanagement
+
+    module, zeitmanagement = asyncio.run(ablauf())
+    assert [modul[2] for modul in module] == ["Mathematik I"]
+    assert zeitmanagement[0][0] == "Informatik"
+
+
+def test_gleiche_abfragen_werden_zusammengefasst(async_logik_test):
+    """Testet, ob gleichzeitige identische Lesezugriffe nur eine Abfrage auslösen."""
+    logik = async_logik_test.logik
+    original = logik.get_moduluebersicht_ansicht_daten
+    freigabe = threading.Event()
+    aufrufe = []
+
+    @functools.wraps(original)
+    def blockierend():
+        aufrufe.append(1)
+        freigabe.wait(5)
+        return original()
+
+    logik.get_moduluebersicht_ansicht_daten = blockierend
+
+    async def ablauf():
+        await async_logik_test.starten()
+        aufgaben = [asyncio.ensure_future(async_logik_test.get_moduluebersicht_ansicht_daten()) for _ in range(5)]
+        await asyncio.sleep(0.05)
+        freigabe.set()
+        ergebnisse = await asyncio.gather(*aufgaben)
+        await async_logik_test.beenden()
+        return ergebnisse
+
+    ergebnisse = asyncio.run(ablauf())
+    assert len(aufrufe) == 1, "Die Abfrage sollte nur einmal ausgeführt werden."
+    assert async_logik_test.zusammengefasst == 4
+    assert ergebnisse == [[]] * 5
+    assert ergebnisse[0] is not ergebnisse[1], "Jeder Aufrufer sollte eine eigene Liste erhalten."
+
+
+def test_parallelitaet_begrenzt(async_logik_test):
+    """Testet, ob nie mehr als `max_parallel` Zugriffe gleichzeitig laufen."""
+    logik = async_logik_test.logik
+    sperre = threading.Lock()
+    gleichzeitig = {"aktuell": 0, "maximum": 0}
+
+    def zaehlend(ansicht_name):
+        with sperre:
+            gleichzeitig["aktuell"] += 1
+            gleichzeitig["maximum"] = max(gleichzeitig["maximum"], gleichzeitig["aktuell"])
+        threading.Event().wait(0.02)
+        with sperre:
+            gleichzeitig["aktuell"] -= 1
+        return []
+
+    logik.get_daten_ansicht = zaehlend
+
+    async def ablauf():
+        await async_logik_test.starten()
+        await asyncio.gather(*(async_logik_test.get_daten_ansicht(f"ansicht_{i}") for i in range(8)))
+        await async_logik_test.beenden()
+
+    asyncio.run(ablauf())
+    assert gleichzeitig["maximum"] <= 2
@@ -1,9 +1,13 @@
 # dateiname: datenbank_zugriff_test.py
 
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../dashboard')))
+
 import pytest
 import sqlite3
 from pathlib import Path
-from dashboard.datenbank_zugriff import DatenbankZugriff
+from dashboard.datenbank_zugriff import DatenbankZugriff, VERBINDUNGSPROFILE
 
 @pytest.fixture(scope="function")
 def db_test():
@@ -124,4 +128,191 @@ def test_daten_loeschen(db_test):
     assert erfolg, "Das Löschen sollte erfolgreich sein."
 
     ergebnis = db_test.abfragen("SELECT * FROM studiengang WHERE uniqueConstraint = ?;", (99,))
-    assert len(ergebnis) == 0, "Der Datensatz sollte gelöscht worden sein."
\ No newline at end of file
+    assert len(ergebnis) == 0, "Der Datensatz sollte gelöscht worden sein."
+
+def test_schema_fingerabdruck_ueberspringt_initialisierung(db_test):
+    """Testet, ob ein unverändertes Schema beim erneuten Initialisieren übersprungen wird."""
+    version = db_test.abfragen("PRAGMA user_version;")[0][0]
+    assert version != 0, "Nach dem Start sollte eine Schema-Version hinterlegt sein."
+
+    db_test.verbindung.execute("DROP VIEW startbildschirm;")
+    db_test.initialisieren()
+    ergebnis = db_test.abfragen("SELECT name FROM sqlite_master WHERE type='view' AND name='startbildschirm';")
+    assert len(ergebnis) == 0, "Bei unverändertem Fingerabdruck sollte keine DDL ausgeführt werden."
+
+    db_test.initialisieren(erzwingen=True)
+    ergebnis = db_test.abfragen("SELECT name FROM sqlite_master WHERE type='view' AND name='startbildschirm';")
+    assert len(ergebnis) == 1, "Mit 'erzwingen' sollte die View neu erstellt werden."
+
+
+def test_schema_snapshot_ohne_pyyaml(db_test, monkeypatch):
+    """Testet, ob der Schema-Snapshot ohne PyYAML geladen werden kann."""
+    from dashboard.datenbank_zugriff import SCHEMA_VERZEICHNIS
+
+    yaml_dateien = sorted(SCHEMA_VERZEICHNIS.glob("*.yaml"))
+    fingerabdruck = db_test._schema_fingerabdruck(yaml_dateien)
+    db_test._lade_schema_definitionen(yaml_dateien, fingerabdruck)
+
+    monkeypatch.setitem(sys.modules, "yaml", None)
+    definitionen = dict(db_test._lade_schema_definitionen(yaml_dateien, fingerabdruck))
+    assert definitionen["modul.yaml"]["tabelle"] == "modul"
+    assert "#" not in definitionen["ansichten.yaml"]["views"]["startbildschirm"][0], \
+        "Kommentarzeilen sollten im Snapshot bereits entfernt sein."
+
+
+def _query_plan(db, sql_befehl, parameter=()):
+    """Liefert die Detailzeilen von EXPLAIN QUERY PLAN für einen SQL-Befehl."""
+    return [zeile[3] for zeile in db.abfragen(f"EXPLAIN QUERY PLAN {sql_befehl}", parameter)]
+
+
+def test_query_plan_der_views(db_test):
+    """Testet, ob jede View höchstens eine Tabelle vollständig durchsucht und Joins über Indizes laufen."""
+    for view in ("startbildschirm", "moduluebersicht", "studienfortschritt", "zeitmanagement", "einstellungen"):
+        plan = _query_plan(db_test, f"SELECT * FROM {view};")
+        scans = [zeile for zeile in plan if zeile.startswith("SCAN") and zeile != f"SCAN {view}"]
+        assert len(scans) <= 1, f"View '{view}' durchsucht mehrere Tabellen vollständig: {plan}"
+
+    plan = " ".join(_query_plan(db_test, "SELECT * FROM zeitmanagement;"))
+    assert "idx_semester_studiengang" in plan
+    assert "idx_modul_semester_status" in plan
+
+
+def test_query_plan_studienfortschritt_sortiert_per_index(db_test):
+    """Testet, ob die nach Datum sortierte View ihre Werte aus dem abdeckenden Index liest."""
+    plan = _query_plan(db_test, "SELECT * FROM studienfortschritt;")
+    assert "SCAN v USING COVERING INDEX idx_verlauf_zeitpunkt_werte" in plan
+    assert not any("TEMP B-TREE" in zeile for zeile in plan), f"Die View sollte nicht nachsortieren: {plan}"
+
+
+def test_spalten_abfragen(db_test):
+    """Testet, ob eine Abfrage spaltenweise in Reihenfolge und mit passenden Datentypen geliefert wird."""
+    np = pytest.importorskip("numpy")
+    leer = db_test.spalten_abfragen("SELECT modulOffen, zeitpunkt FROM verlauf;", datumsspalten={"zeitpunkt"})
+    assert [len(spalte) for spalte in leer] == [0, 0]
+
+    for zeile in [(-2, "2024-03-01"), (7, "2023-12-31")]:
+        db_test.manipulieren("INSERT INTO verlauf (modulOffen, zeitpunkt) VALUES (?, ?);", zeile)
+    offen, tage = db_test.spalten_abfragen(
+        "SELECT modulOffen, zeitpunkt FROM verlauf ORDER BY zeitpunkt;", datumsspalten={"zeitpunkt"}
+    )
+    assert offen.dtype == np.int32 and offen.tolist() == [7, -2]
+    assert tage.dtype == np.dtype("datetime64[D]") and tage.astype(str).tolist() == ["2023-12-31", "2024-03-01"]
+
+    # Werte, die sich nicht verlustfrei umwandeln lassen, werden nicht stillschweigend gekürzt
+    for sql in ("SELECT 1 AS x UNION ALL SELECT NULL", "SELECT 1.5 AS x", "SELECT '7a' AS x"):
+        with pytest.raises(ValueError):
+            db_test.spalten_abfragen(sql)
+    for datum in ("01.03.2024", None):
+        with pytest.raises(ValueError):
+            db_test.spalten_abfragen("SELECT ? AS zeitpunkt", (datum,), datumsspalten={"zeitpunkt"})
+
+
+def test_query_plan_statuszaehlung(db_test):
+    """Testet, ob die Statuszählung über den Index statt über die Tabelle läuft."""
+    plan = _query_plan(db_test, "SELECT COUNT(*) FROM modul WHERE modulStatus = ?;", ("Offen",))
+    assert plan == ["SEARCH modul USING COVERING INDEX idx_modul_status (modulStatus=?)"]
+
+
+STUDIENGANG_INSERT = """
+INSERT INTO studiengang (studiengangName, startDatumStudium, urlaubsSemester, zeitModell, uniqueConstraint)
+VALUES (?, ?, ?, ?, ?);
+"""
+
+
+def test_transaktion_committet_gemeinsam(db_test):
+    """Testet, ob Änderungen innerhalb einer Transaktion erst beim Verlassen sichtbar werden."""
+    zweite_verbindung = sqlite3.connect(db_test.db_pfad)
+    try:
+        with db_test.transaktion():
+            assert db_test.manipulieren(STUDIENGANG_INSERT, ("Informatik", "2022-10-01", 0, "Vollzeit", 1))
+            assert db_test.manipulieren(STUDIENGANG_INSERT, ("Physik", "2022-10-01", 0, "Vollzeit", 2))
+            anzahl = zweite_verbindung.execute("SELECT COUNT(*) FROM studiengang;").fetchone()[0]
+            assert anzahl == 0, "Vor dem Commit sollten andere Verbindungen nichts sehen."
+
+        anzahl = zweite_verbindung.execute("SELECT COUNT(*) FROM studiengang;").fetchone()[0]
+        assert anzahl == 2, "Nach dem Commit sollten beide Einträge sichtbar sein."
+    finally:
+        zweite_verbindung.close()
+
+
+def test_transaktion_rollback_bei_fehler(db_test):
+    """Testet, ob eine Ausnahme im Block alle Änderungen zurückrollt."""
+    with pytest.raises(RuntimeError):
+        with db_test.transaktion():
+            db_test.manipulieren(STUDIENGANG_INSERT, ("Informatik", "2022-10-01", 0, "Vollzeit", 1))
+            raise RuntimeError("Abbruch")
+
+    assert db_test.abfragen("SELECT COUNT(*) FROM studiengang;")[0][0] == 0
+    assert not db_test.verbindung.in_transaction
+
+
+def test_verschachtelte_transaktion_mit_savepoint(db_test):
+    """Testet, ob ein fehlgeschlagener innerer Block nur seine eigenen Änderungen zurückrollt."""
+    with db_test.transaktion():
+        db_test.manipulieren(STUDIENGANG_INSERT, ("Informatik", "2022-10-01", 0, "Vollzeit", 1))
+        with pytest.raises(RuntimeError):
+            with db_test.transaktion():
+                db_test.manipulieren(STUDIENGANG_INSERT, ("Physik", "2022-10-01", 0, "Vollzeit", 2))
+                raise RuntimeError("Abbruch")
+
+    ergebnis = db_test.abfragen("SELECT studiengangName FROM studiengang;")
+    assert ergebnis == [("Informatik",)], "Nur der äußere Eintrag sollte festgeschrieben sein."
+
+
+def test_semester_vorbereiten_nach_zeitmodell(db_test):
+    """Testet, ob die Semesteranzahl aus dem Zeitmodell abgeleitet und nur Fehlendes ergänzt wird."""
+    db_test.manipulieren(STUDIENGANG_INSERT, ("Informatik", "2022-10-01", 0, "Vollzeit", 1))
+    studiengang_id = db_test.abfragen("SELECT studiengangID FROM studiengang;")[0][0]
+
+    assert db_test.semester_vorbereiten(studiengang_id) == 6
+    assert db_test.semester_vorbereiten(studiengang_id) == 0, "Vorhandene Semester sollten übersprungen werden."
+
+    db_test.einstellungen_verwalten("UPDATE", ("Informatik", "2022-10-01", 0, "TeilzeitII"))
+    nummern = [zeile[0] for zeile in db_test.abfragen("SELECT semesterNR FROM semester ORDER BY semesterNR;")]
+    assert nummern == list(range(1, 13)), "Teilzeit II sollte 12 Semester erhalten."
+
+    assert db_test.semester_vorbereiten(studiengang_id, anzahl=14) == 2
+
+
+def test_semester_vorbereiten_mit_urlaub_und_unbekanntem_zeitmodell(db_test, caplog):
+    """Testet, ob Urlaubssemester mitgezählt werden und ein unbekanntes Zeitmodell gemeldet wird."""
+    db_test.manipulieren(STUDIENGANG_INSERT, ("Informatik", "2022-10-01", 2, "Vollzeit", 1))
+    studiengang_id = db_test.abfragen("SELECT studiengangID FROM studiengang;")[0][0]
+    assert db_test.semester_vorbereiten(studiengang_id) == 8, "Vollzeit mit 2 Urlaubssemestern ergibt 8 Semester."
+
+    # Das CHECK-Constraint verhindert unbekannte Zeitmodelle; ältere Datenbanken kennen es nicht
+    db_test.manipulieren("PRAGMA ignore_check_constraints = ON;")
+    db_test.manipulieren("UPDATE studiengang SET zeitModell = 'Abendstudium';")
+    with caplog.at_level("ERROR"):
+        assert db_test.semester_vorbereiten(studiengang_id) == 0
+    assert "Unbekanntes Zeitmodell 'Abendstudium'" in caplog.text
+
+
+def test_verbindungsprofil_interaktiv(db_test):
+    """Testet, ob das Standardprofil WAL, synchronous=NORMAL und einen busy_timeout setzt."""
+    assert db_test.profil == "interaktiv"
+    assert db_test.abfragen("PRAGMA journal_mode;")[0][0] == "wal"
+    assert db_test.abfragen("PRAGMA synchronous;")[0][0] == 1, "NORMAL entspricht dem Wert 1."
+    assert db_test.abfragen("PRAGMA busy_timeout;")[0][0] == VERBINDUNGSPROFILE["interaktiv"]["busy_timeout"]
+    assert db_test.abfragen("PRAGMA foreign_keys;")[0][0] == 1
+
+
+def test_verbindungsprofil_aus_umgebung(monkeypatch):
+    """Testet, ob das Profil über die Umgebungsvariable gewählt und unbekannte Profile abgelehnt werden."""
+    monkeypatch.setenv("DASHBOARD_DB_PROFIL", "massenimport")
+    assert DatenbankZugriff(db_pfad="data/test_datenbank.db").profil == "massenimport"
+    assert DatenbankZugriff(db_pfad="data/test_datenbank.db", profil="standard").profil == "standard"
+    with pytest.raises(ValueError):
+        DatenbankZugriff(db_pfad="data/test_datenbank.db", profil="unbekannt")
+
+
+def test_verbindungsprofil_analyse_nur_lesen(db_test):
+    """Testet, ob das Analyseprofil lesen, aber nicht schreiben kann."""
+    db_test.studiengang_speichern("Informatik", "2023-10-01", 0, "Vollzeit")
+    analyse = DatenbankZugriff(db_pfad=db_test.db_pfad, profil="analyse")
+    analyse.verbinden()
+    try:
+        assert analyse.abfragen("SELECT studiengangName FROM studiengang;") == [("Informatik",)]
+        assert not analyse.manipulieren("DELETE FROM studiengang;"), "Schreibzugriffe sollten fehlschlagen."
+    finally:
+        analyse.trennen()
@@ -0,0 +1,152 @@
+# tests/diagramm_renderer_test.py
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../dashboard')))
+
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("matplotlib")
+
+from dashboard.diagramm import Diagramm
+from dashboard.diagramm_renderer import DiagrammRenderer, ppm_daten
+
+BREITE, HOEHE, DPI = 320, 240, 80
+X_WERTE = np.arange(50_000, dtype=float)
+REIHEN = {"offen": X_WERTE % 997}
+GEMEINSAMER_SPEICHER = Path("/dev/shm")
+
+
+class AfterWarteschlange:
+    """Ersetzt die Tk-Ereignisschleife: sammelt `after()`-Aufrufe und führt sie auf Anforderung aus."""
+
+    def __init__(self):
+        self.geplant = {}
+
+    def after(self, ms, funktion):
+        self.geplant[len(self.geplant) + 1] = funktion
+        return len(self.geplant)
+
+    def after_cancel(self, kennung):
+        self.geplant.pop(kennung, None)
+
+    def ausfuehren(self):
+        geplant, self.geplant = self.geplant, {}
+        for funktion in geplant.values():
+            funktion()
+
+
+def aufbauen(diagramm):
+    """Richtet das Diagramm im Worker-Prozess ein (muss dafür auf Modulebene liegen)."""
+    diagramm.linie("offen", color="red")
+    diagramm.verdichtung_aktivieren("minmax")
+
+
+def speicherbloecke() -> set:
+    """Namen der Blöcke von `multiprocessing.shared_memory` (unter Linux in /dev/shm)."""
+    return {pfad.name for pfad in GEMEINSAMER_SPEICHER.glob("psm_*")}
+
+
+@pytest.fixture(scope="function")
+def renderer_test():
+    """Fixture mit einem Renderer, dessen Bilder über eine Ersatz-Ereignisschleife abgeholt werden."""
+    widget = AfterWarteschlange()
+    renderer = DiagrammRenderer(widget, aufbauen, dpi=DPI)
+    yield renderer, widget
+    renderer.beenden()
+
+
+def test_bild_wird_im_worker_gezeichnet(renderer_test):
+    """Testet, ob das Bild aus dem Worker-Prozess dem lokal gezeichneten Diagramm entspricht."""
+    renderer, widget = renderer_test
+    bilder = []
+
+    renderer.daten_setzen(X_WERTE, REIHEN)
+    renderer.zeichnen(BREITE, HOEHE, lambda bild: bilder.append((bild.pixel.copy(), bild.achse, bild.xlim)),
+                      ausschnitt=(1000, 2000)).result(timeout=60)
+    assert bilder == [], "Das Bild darf erst im Tk-Thread ausgeliefert werden."
+    widget.ausfuehren()
+
+    lokal = Diagramm(figsize=(BREITE / DPI, HOEHE / DPI), dpi=DPI)
+    aufbauen(lokal)
+    lokal.linien_setzen(X_WERTE, REIHEN, ausschnitt=(1000, 2000))
+    erwartet = np.asarray(lokal.canvas.buffer_rgba())
+
+    pixel, achse, xlim = bilder[0]
+    assert pixel.shape == (HOEHE, BREITE, 4)
+    assert (pixel == erwartet).all()
+    assert xlim == (1000, 2000) and achse == tuple(lokal.ax.bbox.bounds)
+    assert widget.geplant == {}, "Ohne offene Aufträge wird nicht weiter abgefragt."
+    lokal.zerstoeren()
+
+
+def test_veraltete_bilder_werden_verworfen(renderer_test):
+    """Testet, ob nur das Bild des neuesten Auftrags ausgeliefert wird und kein Speicher zurückbleibt."""
+    renderer, widget = renderer_test
+    vorher = speicherbloecke()
+    bilder = []
+
+    renderer.daten_setzen(X_WERTE, REIHEN)
+    futures = [
+        renderer.zeichnen(BREITE, HOEHE, bilder.append, ausschnitt=(0, 1000 * (n + 1))) for n in range(5)
+    ]
+    # Neue Daten machen auch den letzten Auftrag mit den alten Daten veraltet
+    renderer.daten_setzen(X_WERTE, {"offen": X_WERTE % 13})
+    futures.append(renderer.zeichnen(BREITE, HOEHE, lambda bild: bilder.append(bild.generation)))
+    futures[-1].result(timeout=60)
+    for future in futures[:-1]:
+        future.cancelled() or future.result(timeout=60)
+    widget.ausfuehren()
+
+    assert bilder == [6] and renderer.generation == 6
+    assert renderer.verworfen == 5
+    assert len(speicherbloecke() - vorher) <= 2, "Abgebrochene Aufträge geben ihren Block weiter."
+    renderer.beenden()
+    assert speicherbloecke() == vorher, "Alle Blöcke im gemeinsamen Speicher müssen freigegeben sein."
+
+
+def test_speicher_wird_je_groesse_wiederverwendet(renderer_test):
+    """Testet, ob aufeinanderfolgende Bilder derselben Größe denselben Speicherblock verwenden."""
+    renderer, widget = renderer_test
+    vorher = speicherbloecke()
+    renderer.daten_setzen(X_WERTE, REIHEN)
+
+    def zeichnen(breite, ausschnitt):
+        renderer.zeichnen(breite, HOEHE, lambda bild: None, ausschnitt=ausschnitt).result(timeout=60)
+        widget.ausfuehren()
+        return speicherbloecke() - vorher
+
+    bloecke = [zeichnen(BREITE, (0, 1000 * (n + 1))) for n in range(3)]
+    assert len(bloecke[0]) == 1 and bloecke[0] == bloecke[1] == bloecke[2]
+
+    neu = zeichnen(BREITE + 10, None)
+    assert len(neu) == 1 and neu.isdisjoint(bloecke[0]), "Nach einer Größenänderung wird der alte Block gelöscht."
+    renderer.beenden()
+    assert speicherbloecke() == vorher
+
+
+def test_ppm_daten():
+    """Testet, ob RGBA-Pixel als binäres PPM ohne Alphakanal geliefert werden."""
+    pixel = np.arange(2 * 3 * 4, dtype=np.uint8).reshape(2, 3, 4)
+    assert ppm_daten(pixel) == b"P6 3 2 255\n" + pixel[..., :3].tobytes()
+
+
+def test_beenden_gibt_speicher_frei(renderer_test):
+    """Testet, ob beim Beenden offene Aufträge verworfen und ihre Speicherblöcke freigegeben werden."""
+    renderer, widget = renderer_test
+    vorher = speicherbloecke()
+    bilder = []
+
+    with pytest.raises(RuntimeError):
+        renderer.zeichnen(BREITE, HOEHE, bilder.append)
+    renderer.daten_setzen(X_WERTE, REIHEN)
+    renderer.zeichnen(BREITE, HOEHE, bilder.append)
+    renderer.beenden()
+    renderer.beenden()
+
+    assert bilder == [] and widget.geplant == {}
+    assert speicherbloecke() == vorher
+    with pytest.raises(RuntimeError):
+        renderer.zeichnen(BREITE, HOEHE, bilder.append)
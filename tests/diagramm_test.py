@@ -0,0 +1,146 @@
+# tests/diagramm_test.py
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../dashboard')))
+
+import gc
+import subprocess
+import weakref
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("matplotlib")
+
+import matplotlib.text
+from dashboard.diagramm import Diagramm
+
+DASHBOARD_PFAD = Path(__file__).resolve().parent.parent / "dashboard"
+ANSICHTSWECHSEL = 1000
+## Erlaubte Zunahme lebender Python-Objekte zwischen dem 100. und dem letzten Wechsel.
+## Eine nicht freigegebene Figure allein hält mehrere tausend Objekte.
+MAX_OBJEKTWACHSTUM = 500
+
+
+def ansicht_simulieren(figures, master=None, daten=True):
+    """Baut ein Diagramm wie eine Ansicht auf, zeigt ggf. Daten an und verwirft es wieder."""
+    diagramm = Diagramm(master, figsize=(4, 3), dpi=50)
+    figures.add(diagramm.figure)
+    diagramm.linie("offen", marker="o", color="red")
+    diagramm.linie("abgeschlossen", marker="^", color="green")
+    if daten:
+        diagramm.linien_setzen([1, 2, 3], {"offen": [3, 2, 1], "abgeschlossen": [0, 1, 2]})
+    if master is not None:
+        diagramm.widget.pack()
+        master.update_idletasks()
+    diagramm.zerstoeren()
+
+
+def lebende_objekte() -> int:
+    # Der Textmaß-Cache von matplotlib ist auf 4096 Einträge begrenzt, wächst bis dahin aber
+    # mit jedem neuen Renderer; er wird geleert, damit nur echte Rückstände gezählt werden.
+    matplotlib.text._get_text_metrics_with_cache_impl.cache_clear()
+    gc.collect()
+    return len(gc.get_objects())
+
+
+def objektwachstum(ansicht_wechseln, anzahl: int = ANSICHTSWECHSEL) -> int:
+    """Zählt die lebenden Objekte nach 100 und nach `anzahl` Wechseln."""
+    for durchlauf in range(anzahl):
+        ansicht_wechseln(durchlauf)
+        if durchlauf == 99:
+            nach_aufwaermen = lebende_objekte()
+    return lebende_objekte() - nach_aufwaermen
+
+
+def test_artists_werden_aktualisiert_statt_neu_angelegt():
+    """Testet, ob Linien und Balken bei neuen Daten erhalten bleiben und nur ihre Daten ändern."""
+    diagramm = Diagramm()
+    linie = diagramm.linie("offen")
+    diagramm.linien_setzen([1, 2], {"offen": [5, 7]})
+    diagramm.linien_setzen([1, 2, 3], {"offen": [5, 7, 40]})
+
+    assert diagramm.ax.get_lines() == [linie]
+    assert list(linie.get_ydata()) == [5, 7, 40]
+    assert diagramm.ax.get_ylim()[1] >= 40, "Die Achse muss an die neuen Daten angepasst werden."
+
+    balken = diagramm.balken_anlegen(["Geplant", "Geleistet"])
+    diagramm.balken_setzen([3.5, 12])
+    assert [rechteck.get_height() for rechteck in balken] == [3.5, 12]
+    assert len(diagramm.ax.patches) == 2
+
+    diagramm.zerstoeren()
+    assert not diagramm.figure.axes and diagramm.canvas is None
+
+
+def test_verdichtung_folgt_dem_ausschnitt():
+    """Testet, ob lange Reihen auf die Pixelbreite verdichtet und beim Zoomen neu verdichtet werden."""
+    diagramm = Diagramm(figsize=(4, 3), dpi=50)
+    linie = diagramm.linie("offen")
+    diagramm.verdichtung_aktivieren("minmax")
+    pixel = int(diagramm.ax.bbox.width)
+
+    x_werte = list(range(100_000))
+    diagramm.linien_setzen(x_werte, {"offen": [wert % 1000 for wert in x_werte]})
+    assert len(linie.get_xdata()) <= 2 * pixel + 2
+    assert diagramm.ax.get_xlim()[1] >= 99_999, "Die Achse muss die vollständige Reihe umfassen."
+
+    # Im Ausschnitt mit weniger Punkten als Pixeln erscheinen alle Punkte
+    diagramm.ax.set_xlim(5000, 5050)
+    assert list(linie.get_xdata()) == list(range(4999, 5052))
+
+    with pytest.raises(ValueError):
+        diagramm.verdichtung_aktivieren("mittelwert")
+    diagramm.zerstoeren()
+
+
+def test_speicher_bleibt_bei_ansichtswechseln_konstant():
+    """Testet, ob 1000 Ansichtswechsel mit Auf- und Abbau des Diagramms keine Figures ansammeln.
+
+    Jeder zehnte Wechsel zeichnet Daten, die übrigen verlassen die Ansicht vor dem Laden.
+    """
+    figures = weakref.WeakSet()
+    wachstum = objektwachstum(lambda n: ansicht_simulieren(figures, daten=n % 10 == 0))
+
+    assert wachstum < MAX_OBJEKTWACHSTUM
+    assert len(figures) == 0, "Alle Figures müssen nach dem Zerstören freigegeben sein."
+
+
+def test_speicher_bleibt_bei_aktualisierungen_konstant():
+    """Testet, ob wiederholte Aktualisierungen eines zwischengespeicherten Diagramms keine Artists ansammeln."""
+    diagramm = Diagramm(figsize=(4, 3), dpi=50)
+    linie = diagramm.linie("offen")
+
+    wachstum = objektwachstum(
+        lambda n: diagramm.linien_setzen(list(range(50)), {"offen": [n + i for i in range(50)]}), anzahl=300
+    )
+    assert wachstum < MAX_OBJEKTWACHSTUM
+    assert diagramm.ax.get_lines() == [linie]
+    diagramm.zerstoeren()
+
+
+def test_ansichten_verwenden_kein_pyplot():
+    """Testet, ob die Diagramm-Ansichten pyplot (und damit dessen globales Figure-Register) nicht laden."""
+    ergebnis = subprocess.run(
+        [sys.executable, "-c",
+         "import sys, ansichten.studienfortschritt, ansichten.zeitmanagement; "
+         "print('matplotlib.pyplot' in sys.modules)"],
+        cwd=DASHBOARD_PFAD, capture_output=True, text=True, check=True,
+    )
+    assert ergebnis.stdout.strip() == "False"
+
+
+def test_speicher_mit_tk_konstant():
+    """Wie oben, aber mit `FigureCanvasTkAgg` in einem echten Tk-Fenster (nur mit Display)."""
+    import tkinter as tk
+    try:
+        wurzel = tk.Tk()
+    except tk.TclError:
+        pytest.skip("Kein Display verfügbar.")
+    try:
+        figures = weakref.WeakSet()
+        assert objektwachstum(lambda n: ansicht_simulieren(figures, wurzel, daten=n % 10 == 0)) < MAX_OBJEKTWACHSTUM
+        assert len(figures) == 0
+        assert len(wurzel.winfo_children()) == 0
+    finally:
+        wurzel.destroy()
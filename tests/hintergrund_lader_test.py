@@ -0,0 +1,110 @@
+# tests/hintergrund_lader_test.py
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../dashboard')))
+
+import threading
+import pytest
+from pathlib import Path
+
+from dashboard.logik import Logik
+from dashboard.hintergrund_lader import HintergrundLader
+
+
+class AfterWarteschlange:
+    """Ersetzt die Tk-Ereignisschleife: sammelt `after()`-Aufrufe und führt sie auf Anforderung aus."""
+
+    def __init__(self):
+        self.geplant = []
+
+    def after(self, ms, funktion):
+        self.geplant.append(funktion)
+
+    def ausfuehren(self):
+        geplant, self.geplant = self.geplant, []
+        for funktion in geplant:
+            funktion()
+
+
+@pytest.fixture(scope="function")
+def lader_test():
+    """Fixture mit gestarteter Logik und einem Hintergrund-Lader."""
+    test_db_pfad = "data/test_datenbank.db"
+    if Path(test_db_pfad).exists():
+        Path(test_db_pfad).unlink()
+
+    logik = Logik(db_pfad=test_db_pfad)
+    logik.starten()
+    logik.set_startbildschirm_ansicht_daten(("Informatik", "2022-10-01", 0, "Vollzeit"))
+    widget = AfterWarteschlange()
+    lader = HintergrundLader(widget, logik)
+
+    yield logik, lader, widget
+
+    lader.beenden()
+    logik.beenden()
+    if Path(test_db_pfad).exists():
+        Path(test_db_pfad).unlink()
+
+
+def test_laden_im_hintergrund(lader_test):
+    """Testet, ob die Abfrage in einem anderen Thread läuft und das Ergebnis über `after()` ankommt."""
+    logik, lader, widget = lader_test
+    threads, ergebnisse = [], []
+
+    def funktion(leser):
+        threads.append(threading.get_ident())
+        assert leser is not logik, "Der Worker sollte eine eigene Logik-Instanz verwenden."
+        return leser.get_startbildschirm_ansicht_daten()
+
+    auftrag = lader.laden(funktion, ergebnisse.append)
+    auftrag.future.result(timeout=5)
+    assert ergebnisse == [], "Das Ergebnis darf erst im Tk-Thread ausgeliefert werden."
+
+    widget.ausfuehren()
+    assert ergebnisse and ergebnisse[0][0][0] == "Informatik"
+    assert threads[0] != threading.get_ident()
+    assert widget.geplant == [], "Ohne offene Aufträge wird nicht weiter abgefragt."
+
+
+def test_abbrechen_verwirft_ergebnis(lader_test):
+    """Testet, ob ein abgebrochener Auftrag keinen Rückruf mehr auslöst."""
+    _, lader, widget = lader_test
+    freigabe = threading.Event()
+    ergebnisse = []
+
+    auftrag = lader.laden(lambda leser: freigabe.wait(5) and leser.get_moduluebersicht_ansicht_daten(), ergebnisse.append)
+    wartend = lader.laden(lambda leser: leser.get_einstellungen_ansicht_daten(), ergebnisse.append)
+    lader.alle_abbrechen()
+    freigabe.set()
+    auftrag.future.result(timeout=5)
+
+    widget.ausfuehren()
+    assert ergebnisse == []
+    assert auftrag.abgebrochen and wartend.future.cancelled()
+
+
+def test_fehler_wird_gemeldet(lader_test):
+    """Testet, ob Ausnahmen im Worker an den Fehler-Rückruf im Tk-Thread gehen."""
+    _, lader, widget = lader_test
+    fehler = []
+
+    def fehlerhaft(leser):
+        raise RuntimeError("Datenbank gesperrt")
+
+    lader.laden(fehlerhaft, lambda ergebnis: None, fehler=fehler.append).future.result(timeout=5)
+    widget.ausfuehren()
+    assert len(fehler) == 1 and str(fehler[0]) == "Datenbank gesperrt"
+
+
+def test_schreibzugriff_verwirft_gemeinsamen_cache(lader_test):
+    """Testet, ob Schreibzugriffe im GUI-Thread auch die Ergebnisse des Workers verwerfen."""
+    logik, lader, widget = lader_test
+    ergebnisse = []
+
+    lader.laden(lambda leser: leser.get_moduluebersicht_ansicht_daten(), ergebnisse.append).future.result(timeout=5)
+    logik.set_moduluebersicht_ansicht_daten("INSERT", (1, "Mathematik I", "MA1", "Offen", 5, "2023-10-01"))
+    lader.laden(lambda leser: leser.get_moduluebersicht_ansicht_daten(), ergebnisse.append).future.result(timeout=5)
+
+    widget.ausfuehren()
+    assert [len(ergebnis) for ergebnis in ergebnisse] == [0, 1]
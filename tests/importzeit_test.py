@@ -0,0 +1,93 @@
+# tests/importzeit_test.py
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../dashboard')))
+
+import subprocess
+import threading
+
+import pytest
+
+from dashboard.ansicht_register import AnsichtRegister
+
+DASHBOARD_VERZEICHNIS = os.path.abspath(os.path.join(os.path.dirname(__file__), '../dashboard'))
+
+# Obergrenze für den kumulierten Import von `dashboard_gui` (gemessen: ca. 50 ms)
+IMPORTZEIT_BUDGET_MS = 500
+
+# Diese Pakete dürfen erst beim Öffnen einer Ansicht importiert werden
+SCHWERE_MODULE = ("matplotlib", "numpy", "tkcalendar")
+
+
+def importzeiten(modul: str) -> dict:
+    """Importiert ein Modul mit `-X importtime` in einem neuen Interpreter; liefert Modul -> kumulierte µs."""
+    ergebnis = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modul}"],
+        cwd=DASHBOARD_VERZEICHNIS, capture_output=True, text=True, timeout=60,
+    )
+    assert ergebnis.returncode == 0, ergebnis.stderr[-2000:]
+    zeiten = {}
+    for zeile in ergebnis.stderr.splitlines():
+        if not zeile.startswith("import time:") or "cumulative" in zeile:
+            continue
+        _, kumuliert, name = zeile[len("import time:"):].split("|")
+        zeiten[name.strip()] = int(kumuliert)
+    return zeiten
+
+
+def test_start_ohne_schwere_importe():
+    """Testet, ob beim Start des Dashboards keine Ansichtsmodule und ihre Abhängigkeiten geladen werden."""
+    zeiten = importzeiten("dashboard_gui")
+    geladen = [name for name in zeiten if name.split(".")[0] in SCHWERE_MODULE or name.startswith("ansichten.")]
+    assert geladen == [], f"Beim Start importiert: {geladen}"
+
+
+def test_importzeit_budget():
+    """Testet, ob der Import von `dashboard_gui` im Zeitbudget bleibt."""
+    zeiten = importzeiten("dashboard_gui")
+    assert zeiten["dashboard_gui"] / 1000 < IMPORTZEIT_BUDGET_MS, (
+        f"Import von dashboard_gui dauert {zeiten['dashboard_gui'] / 1000:.0f} ms (Budget {IMPORTZEIT_BUDGET_MS} ms)."
+    )
+
+
+def test_register_importiert_erst_bei_bedarf():
+    """Testet, ob das Register ein Modul erst beim ersten Zugriff bzw. beim Vorwärmen importiert."""
+    sys.modules.pop("colorsys", None)
+    register = AnsichtRegister({"farben": ("colorsys", "rgb_to_hsv"), "fehlt": ("gibt_es_nicht", "X")})
+
+    assert "colorsys" not in sys.modules and not register.geladen("farben")
+    register.vorwaermen().join(timeout=10)
+    assert "colorsys" in sys.modules and register.geladen("farben")
+    assert not register.geladen("fehlt")
+
+    with pytest.raises(ImportError):
+        register.klasse("fehlt")
+    assert list(register) == ["farben", "fehlt"]
+
+
+def test_import_blockiert_andere_ansichten_nicht(tmp_path, monkeypatch):
+    """Testet, ob eine Ansicht geladen werden kann, während das Vorwärmen noch ein anderes Modul importiert."""
+    (tmp_path / "langsame_ansicht.py").write_text(
+        "import importzeit_signal\n"
+        "importzeit_signal.gestartet.set()\n"
+        "importzeit_signal.weiter.wait(timeout=10)\n"
+        "class Ansicht: pass\n"
+    )
+    (tmp_path / "schnelle_ansicht.py").write_text("class Ansicht: pass\n")
+    signal = type(sys)("importzeit_signal")
+    signal.gestartet, signal.weiter = threading.Event(), threading.Event()
+    monkeypatch.setitem(sys.modules, "importzeit_signal", signal)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    register = AnsichtRegister({"langsam": ("langsame_ansicht", "Ansicht"), "schnell": ("schnelle_ansicht", "Ansicht")})
+
+    thread = register.vorwaermen(["langsam"])
+    try:
+        assert signal.gestartet.wait(timeout=10)
+        assert register.klasse("schnell").__module__ == "schnelle_ansicht"
+        assert not register.geladen("langsam")
+    finally:
+        signal.weiter.set()
+        thread.join(timeout=10)
+    assert register.geladen("langsam")
+    for modul in ("langsame_ansicht", "schnelle_ansicht"):
+        sys.modules.pop(modul, None)
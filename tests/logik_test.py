@@ -3,7 +3,10 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../dashboard')))
 
+import datetime
+import threading
 import pytest
+import numpy as np
 from pathlib import Path
 
 from dashboard.logik import Logik
@@ -82,7 +85,7 @@ def test_modul_insert_und_lesen_ueber_moduluebersicht(logik_test):
     # Hole studiengangID
     studiengang_id = logik_test.datenbank.abfragen("SELECT studiengangID FROM studiengang;")[0][0]
 
-    # Semester anlegen (die Methode semester_vorbereiten legt 1..12 an)
+    # Semester anlegen (je nach Zeitmodell 6, 8 oder 12, zuzüglich Urlaubssemestern)
     logik_test.datenbank.semester_vorbereiten(studiengang_id)
 
     # Nun existiert mindestens SemesterID = 1 => Wir fügen ein Modul ein:
@@ -102,6 +105,24 @@ def test_modul_insert_und_lesen_ueber_moduluebersicht(logik_test):
     assert ergebnis[0][3] == "SE1", "Das Kürzel sollte 'SE1' sein."
 
 
+def test_module_in_allen_semestern_des_zeitmodells(logik_test):
+    """
+    Testet, ob bei Vollzeit mit Urlaubssemestern genau die angelegten Semester angeboten werden
+    und Module jedem davon zugeordnet werden können.
+    """
+    logik_test.set_startbildschirm_ansicht_daten(("Informatik", "2022-10-01", 2, "Vollzeit"))
+    assert logik_test.get_semester_nummern() == list(range(1, 9))
+
+    assert logik_test.set_moduluebersicht_ansicht_daten("INSERT", (8, "Bachelorarbeit", "BA", "Offen", 10, "2026-04-01"))
+    assert logik_test.get_moduluebersicht_ansicht_daten()[0][1] == 8
+    assert not logik_test.set_moduluebersicht_ansicht_daten("INSERT", (9, "Zu spät", "ZS", "Offen", 5, "2026-10-01")), \
+        "Semester außerhalb des Zeitmodells gibt es nicht."
+
+    # Ein längeres Zeitmodell ergänzt die Semester, und die Auswahl folgt ohne veralteten Cache
+    logik_test.set_einstellungen_ansicht_daten("UPDATE", ("Informatik", "2022-10-01", 2, "TeilzeitI"))
+    assert logik_test.get_semester_nummern() == list(range(1, 11))
+
+
 def test_modul_update(logik_test):
     """
     Testet das Aktualisieren eines vorhandenen Moduls über die Logik-Schicht.
@@ -138,4 +159,393 @@ def test_modul_update(logik_test):
     assert result[0][2] == "Softwareentwicklung II", "Der Modulname sollte aktualisiert sein."
     assert result[0][3] == "SE2", "Das Kürzel sollte aktualisiert sein."
     assert result[0][4] == "Abgeschlossen", "Der Status sollte auf 'Abgeschlossen' geändert sein."
-    assert result[0][5] == 10, "ECTS sollten auf 10 aktualisiert worden sein."
\ No newline at end of file
+    assert result[0][5] == 10, "ECTS sollten auf 10 aktualisiert worden sein."
+
+def test_transaktion_ueber_logik(logik_test):
+    """
+    Testet, ob Studiengang und Modul über die Logik-Schicht gemeinsam zurückgerollt werden.
+    """
+    with pytest.raises(RuntimeError):
+        with logik_test.transaktion():
+            assert logik_test.set_startbildschirm_ansicht_daten(("Informatik", "2022-10-01", 0, "Vollzeit"))
+            assert logik_test.set_moduluebersicht_ansicht_daten(
+                "INSERT", (1, "Softwareentwicklung", "SE1", "Offen", 5, "2023-10-01")
+            )
+            raise RuntimeError("Abbruch")
+
+    assert logik_test.get_startbildschirm_ansicht_daten() == []
+    assert logik_test.get_moduluebersicht_ansicht_daten() == []
+
+    with logik_test.transaktion():
+        logik_test.set_startbildschirm_ansicht_daten(("Informatik", "2022-10-01", 0, "Vollzeit"))
+        logik_test.set_moduluebersicht_ansicht_daten(
+            "INSERT", (1, "Softwareentwicklung", "SE1", "Offen", 5, "2023-10-01")
+        )
+
+    assert len(logik_test.get_moduluebersicht_ansicht_daten()) == 1
+
+
+def test_transaktion_verwirft_cache_anderer_leser(tmp_path):
+    """
+    Testet, ob ein Ergebnis, das ein Leser während einer offenen Transaktion zwischenspeichert,
+    mit dem Commit verworfen wird.
+    """
+    logik = Logik(db_pfad=str(tmp_path / "pool.db"), pool_groesse=2)
+    logik.starten()
+    logik.set_startbildschirm_ansicht_daten(("Informatik", "2022-10-01", 0, "Vollzeit"))
+    geschrieben, festschreiben = threading.Event(), threading.Event()
+
+    def schreiben():
+        with logik.transaktion():
+            logik.set_moduluebersicht_ansicht_daten("INSERT", (1, "Softwareentwicklung", "SE1", "Offen", 5, "2023-10-01"))
+            geschrieben.set()
+            festschreiben.wait(timeout=10)
+
+    schreiber = threading.Thread(target=schreiben)
+    schreiber.start()
+    try:
+        assert geschrieben.wait(timeout=10)
+        assert logik.get_moduluebersicht_ansicht_daten() == [], "Vor dem Commit ist das Modul nicht sichtbar."
+    finally:
+        festschreiben.set()
+        schreiber.join(timeout=10)
+
+    assert len(logik.get_moduluebersicht_ansicht_daten()) == 1, "Nach dem Commit darf kein alter Stand geliefert werden."
+    logik.beenden()
+
+
+def test_module_importieren(logik_test):
+    """
+    Testet den Sammelimport inklusive Meldung fehlerhafter Einträge ohne Abbruch des Imports.
+    """
+    logik_test.set_startbildschirm_ansicht_daten(("Informatik", "2022-10-01", 0, "Vollzeit"))
+    logik_test.set_moduluebersicht_ansicht_daten(
+        "INSERT", (1, "Softwareentwicklung", "SE1", "Offen", 5, "2023-10-01")
+    )
+
+    module = [
+        (1, "Mathematik I", "MA1", "Offen", 5, "2023-10-01"),
+        (1, "Doppeltes Kürzel", "SE1", "Offen", 5, "2023-10-01"),
+        (2, "Datenbanken", "DB1", "Abgeschlossen", 10, "2024-04-01"),
+        (2, "Doppelt im Import", "DB1", "Offen", 5, "2024-04-01"),
+        (2, "Falsche ECTS", "X1", "Offen", 7, "2024-04-01"),
+        (99, "Ohne Semester", "X2", "Offen", 5, "2024-04-01"),
+    ]
+    gespeichert, fehler = logik_test.module_importieren(module)
+
+    assert gespeichert == 2, "Nur die gültigen Module sollten gespeichert werden."
+    assert [index for index, _, _ in fehler] == [1, 3, 4, 5]
+    kuerzel = sorted(zeile[3] for zeile in logik_test.get_moduluebersicht_ansicht_daten())
+    assert kuerzel == ["DB1", "MA1", "SE1"]
+
+
+def test_statuszaehler_und_verlauf(logik_test):
+    """
+    Testet, ob die Statuszähler per Trigger gepflegt werden und Änderungen über die Logik
+    den Tageswert in 'verlauf' schreiben.
+    """
+    logik_test.set_startbildschirm_ansicht_daten(("Informatik", "2022-10-01", 0, "Vollzeit"))
+    logik_test.module_importieren([
+        (1, "Mathematik I", "MA1", "Offen", 5, "2023-10-01"),
+        (1, "Softwareentwicklung", "SE1", "Offen", 5, "2023-10-01"),
+        (2, "Datenbanken", "DB1", "In Bearbeitung", 5, "2024-04-01"),
+    ])
+    assert logik_test.get_modul_status_zaehler() == {"Offen": 2, "In Bearbeitung": 1, "Abgeschlossen": 0}
+
+    modul_id = logik_test.datenbank.abfragen("SELECT modulID FROM modul WHERE modulKuerzel = 'MA1';")[0][0]
+    logik_test.set_moduluebersicht_ansicht_daten(
+        "UPDATE", (modul_id, "Mathematik I", "MA1", "Abgeschlossen", 5, "2023-10-01")
+    )
+    modul_id = logik_test.datenbank.abfragen("SELECT modulID FROM modul WHERE modulKuerzel = 'DB1';")[0][0]
+    logik_test.set_moduluebersicht_ansicht_daten("DELETE", (modul_id,))
+    assert logik_test.get_modul_status_zaehler() == {"Offen": 1, "In Bearbeitung": 0, "Abgeschlossen": 1}
+
+    verlauf = logik_test.get_studienfortschritt_ansicht_daten()
+    assert len(verlauf) == 1, "Pro Tag sollte genau ein Verlaufseintrag existieren."
+    assert verlauf[0][:3] == (1, 0, 1)
+
+
+def test_studienfortschritt_aus_ereignissen_rekonstruieren(logik_test):
+    """
+    Testet, ob aus dem Ereignisprotokoll eine lückenlose Tagesreihe rekonstruiert wird.
+    """
+    ereignisse = [
+        (1, "2024-01-01", None, "Offen"),
+        (2, "2024-01-02", None, "Offen"),
+        (1, "2024-01-03", "Offen", "In Bearbeitung"),
+        (1, "2024-01-05", "In Bearbeitung", "Abgeschlossen"),
+        (2, "2024-01-05", "Offen", None),
+    ]
+    for ereignis in ereignisse:
+        logik_test.datenbank.manipulieren(
+            "INSERT INTO modul_ereignis (modulID, zeitpunkt, statusAlt, statusNeu) VALUES (?, ?, ?, ?);", ereignis
+        )
+
+    verlauf = logik_test.get_studienfortschritt_verlauf("2024-01-01", "2024-01-06")
+    assert verlauf == [
+        (1, 0, 0, "2024-01-01"),
+        (2, 0, 0, "2024-01-02"),
+        (1, 1, 0, "2024-01-03"),
+        (1, 1, 0, "2024-01-04"),
+        (0, 0, 1, "2024-01-05"),
+        (0, 0, 1, "2024-01-06"),
+    ]
+
+    # Ein späterer Beginn übernimmt den Stand aller vorherigen Ereignisse
+    assert logik_test.get_studienfortschritt_verlauf("2024-01-04", "2024-01-04") == [(1, 1, 0, "2024-01-04")]
+
+
+def test_studienfortschritt_spaltenweise(logik_test):
+    """
+    Testet, ob die spaltenweise Tagesreihe dieselben Werte wie die zeilenweise liefert,
+    als `datetime64[D]`/`int32` und nach Datum sortiert.
+    """
+    logik_test.set_startbildschirm_ansicht_daten(("Informatik", "2022-10-01", 0, "Vollzeit"))
+    # Ohne Ereignisse stammen die Werte aus der View, unabhängig von der Einfügereihenfolge
+    for zeile in [(3, 0, 0, "2024-02-03"), (1, 0, 0, "2024-02-01"), (2, 1, 0, "2024-02-02")]:
+        logik_test.datenbank.manipulieren(
+            "INSERT INTO verlauf (modulOffen, modulInBearbeitung, modulAbgeschlossen, zeitpunkt) VALUES (?, ?, ?, ?);",
+            zeile,
+        )
+    tage, offen, bearbeitung, abgeschlossen = logik_test.get_studienfortschritt_spalten()
+    assert tage.dtype == np.dtype("datetime64[D]") and offen.dtype == np.int32
+    assert tage.tolist() == [datetime.date(2024, 2, day) for day in (1, 2, 3)]
+    assert offen.tolist() == [1, 2, 3] and bearbeitung.tolist() == [0, 1, 0]
+    assert not offen.flags.writeable, "Die Arrays aus dem Cache dürfen nicht veränderbar sein."
+
+    for ereignis in [(1, "2024-01-01", None, "Offen"), (1, "2024-01-03", "Offen", "Abgeschlossen")]:
+        logik_test.datenbank.manipulieren(
+            "INSERT INTO modul_ereignis (modulID, zeitpunkt, statusAlt, statusNeu) VALUES (?, ?, ?, ?);", ereignis
+        )
+    zeilen = logik_test.get_studienfortschritt_verlauf("2024-01-01", "2024-01-04")
+    tage, offen, bearbeitung, abgeschlossen = logik_test.get_studienfortschritt_spalten("2024-01-01", "2024-01-04")
+    assert list(zip(offen.tolist(), bearbeitung.tolist(), abgeschlossen.tolist(), tage.astype(str).tolist())) == zeilen
+
+
+def test_studienfortschritt_je_woche_und_monat(logik_test):
+    """
+    Testet, ob Wochen- und Monatswerte in SQL gebildet werden: je Zeitraum der letzte Stand,
+    datiert auf den ersten Tag des Zeitraums.
+    """
+    ereignisse = [
+        (1, "2024-01-29", None, "Offen"),
+        (2, "2024-02-02", None, "Offen"),
+        (1, "2024-02-05", "Offen", "Abgeschlossen"),
+    ]
+    for ereignis in ereignisse:
+        logik_test.datenbank.manipulieren(
+            "INSERT INTO modul_ereignis (modulID, zeitpunkt, statusAlt, statusNeu) VALUES (?, ?, ?, ?);", ereignis
+        )
+
+    tage, offen, _, abgeschlossen = logik_test.get_studienfortschritt_spalten("2024-01-29", "2024-02-06", "woche")
+    assert tage.astype(str).tolist() == ["2024-01-29", "2024-02-05"]
+    assert offen.tolist() == [2, 1] and abgeschlossen.tolist() == [0, 1]
+
+    tage, offen, _, abgeschlossen = logik_test.get_studienfortschritt_spalten("2024-01-29", "2024-02-06", "monat")
+    assert tage.astype(str).tolist() == ["2024-01-01", "2024-02-01"]
+    assert offen.tolist() == [1, 1] and abgeschlossen.tolist() == [0, 1]
+    assert logik_test.get_studienfortschritt_spalten(zeitraum="quartal") == []
+
+
+VERLAUF_INSERT = (
+    "INSERT INTO verlauf (modulOffen, modulInBearbeitung, modulAbgeschlossen, zeitpunkt) VALUES (?, ?, ?, ?);"
+)
+ZUSAMMENFASSUNG_SQL = """
+SELECT zeitraum, zeitpunkt, letzterTag, modulOffen, modulOffenMin, modulOffenMax, modulAbgeschlossen
+FROM verlauf_zusammenfassung ORDER BY zeitraum, zeitpunkt;
+"""
+
+
+def test_verlauf_zusammenfassung_wird_fortgeschrieben(logik_test):
+    """
+    Testet, ob Wochen- und Monatswerte (letzter, kleinster und größter Stand) bei jedem
+    Tageswert fortgeschrieben werden und mit der Erstbefüllung übereinstimmen.
+    """
+    for zeile in [(5, 0, 0, "2024-01-29"), (3, 0, 1, "2024-01-31"), (4, 0, 1, "2024-02-02"), (2, 0, 2, "2024-02-05")]:
+        logik_test.datenbank.manipulieren(VERLAUF_INSERT, zeile)
+    # Ein nachgetragener älterer Tag ändert den letzten Stand nicht
+    logik_test.datenbank.manipulieren(VERLAUF_INSERT, (8, 0, 0, "2024-01-30"))
+    logik_test.datenbank.manipulieren("UPDATE verlauf SET modulOffen = 1 WHERE zeitpunkt = '2024-02-05';")
+
+    erwartet = [
+        ("monat", "2024-01-01", "2024-01-31", 3, 3, 8, 1),
+        ("monat", "2024-02-01", "2024-02-05", 1, 1, 4, 2),
+        ("woche", "2024-01-29", "2024-02-02", 4, 3, 8, 1),
+        ("woche", "2024-02-05", "2024-02-05", 1, 1, 2, 2),
+    ]
+    assert logik_test.datenbank.abfragen(ZUSAMMENFASSUNG_SQL) == erwartet
+
+    # Die Erstbefüllung bestehender Tageswerte liefert dasselbe (ohne den überschriebenen Zwischenstand)
+    verbindung = logik_test.datenbank.verbindung
+    verbindung.execute("DROP TABLE verlauf_zusammenfassung;")
+    verbindung.execute("DELETE FROM schema_objekte WHERE name LIKE '%verlauf_zusammenfassung%';")
+    verbindung.commit()
+    logik_test.datenbank.initialisieren(erzwingen=True)
+    erwartet[1] = ("monat", "2024-02-01", "2024-02-05", 1, 1, 4, 2)
+    erwartet[3] = ("woche", "2024-02-05", "2024-02-05", 1, 1, 1, 2)
+    assert logik_test.datenbank.abfragen(ZUSAMMENFASSUNG_SQL) == erwartet
+
+
+def test_verlauf_aufbewahrung(logik_test):
+    """
+    Testet, ob alte Tageswerte verdichtet werden und als Wochen- und Monatswerte lesbar bleiben.
+    """
+    logik_test.set_startbildschirm_ansicht_daten(("Informatik", "2020-10-01", 0, "Vollzeit"))
+    heute = datetime.date.today()
+    for tage_zurueck, offen in [(400, 7), (399, 6), (3, 2), (0, 1)]:
+        tag = (heute - datetime.timedelta(days=tage_zurueck)).isoformat()
+        logik_test.datenbank.manipulieren(VERLAUF_INSERT, (offen, 0, 0, tag))
+
+    assert logik_test.datenbank.verlauf_verdichten(0) == 0, "Ohne Frist wird nichts verdichtet."
+    assert logik_test.datenbank.verlauf_verdichten(30) == 2
+    assert logik_test.datenbank.abfragen("SELECT COUNT(*) FROM verlauf;")[0][0] == 2
+
+    tage, offen, _, _ = logik_test.get_studienfortschritt_spalten(zeitraum="monat")
+    assert tage[0] <= np.datetime64(heute - datetime.timedelta(days=399), "D") and offen[0] == 6
+    assert len(logik_test.get_studienfortschritt_spalten(zeitraum="tag")[0]) == 2
+
+    # Automatisch: Tageswerte nur, solange sie für den ganzen Bereich vorhanden sind
+    woechentlich = logik_test.get_studienfortschritt_spalten(zeitraum="woche")[0]
+    assert logik_test.get_studienfortschritt_spalten(zeitraum="auto")[0].tolist() == woechentlich.tolist()
+    erster_tageswert = (heute - datetime.timedelta(days=3)).isoformat()
+    assert len(logik_test.get_studienfortschritt_spalten(erster_tageswert, zeitraum="auto")[0]) == 2
+
+    # Beim Start verdichtet die Logik gemäß ihrer Frist
+    logik_test.datenbank.manipulieren(VERLAUF_INSERT, (3, 0, 0, (heute - datetime.timedelta(days=20)).isoformat()))
+    zweite = Logik(db_pfad=logik_test.datenbank.db_pfad, verlauf_aufbewahrung_tage=10)
+    zweite.starten()
+    assert zweite.datenbank.abfragen("SELECT COUNT(*) FROM verlauf;")[0][0] == 2
+    zweite.beenden()
+
+
+def _ereignisprotokoll_entfernen(logik):
+    """Versetzt die Datenbank in den Stand vor Einführung von `modul_ereignis`."""
+    verbindung = logik.datenbank.verbindung
+    for trigger in ("insert", "update", "delete", "unveraenderlich", "nicht_loeschbar"):
+        verbindung.execute(f"DROP TRIGGER IF EXISTS modul_ereignis_{trigger};")
+    verbindung.execute("DROP TABLE modul_ereignis;")
+    verbindung.execute("DELETE FROM schema_objekte WHERE name LIKE '%modul_ereignis%';")
+    verbindung.execute("PRAGMA user_version = 0;")
+    verbindung.commit()
+
+
+def _datenbank_mit_altem_verlauf(logik_test) -> str:
+    """
+    Legt 600 Tageswerte ab 2023-01-01 und ein Modul an und entfernt das Ereignisprotokoll,
+    wie in einer Datenbank vor dessen Einführung. Liefert den Pfad der geschlossenen Datenbank.
+    """
+    logik_test.set_startbildschirm_ansicht_daten(("Informatik", "2022-10-01", 0, "Vollzeit"))
+    logik_test.set_moduluebersicht_ansicht_daten("INSERT", (1, "Softwareentwicklung", "SE1", "Offen", 5, "2023-10-01"))
+    _ereignisprotokoll_entfernen(logik_test)
+    erster_tag = datetime.date(2023, 1, 1)
+    verlauf = [(600 - n, 0, n, (erster_tag + datetime.timedelta(days=n)).isoformat()) for n in range(600)]
+    with logik_test.datenbank.transaktion() as datenbank:
+        datenbank.verbindung.executemany(VERLAUF_INSERT, verlauf)
+    logik_test.beenden()
+    return logik_test.datenbank.db_pfad
+
+
+def test_verlauf_bleibt_nach_upgrade_erhalten(logik_test):
+    """
+    Testet, ob der gespeicherte Verlauf nach dem Einführen des Ereignisprotokolls weiter
+    angezeigt wird: das Protokoll beginnt erst mit dem Upgrade und gilt nur ab dann.
+    """
+    logik = Logik(db_pfad=_datenbank_mit_altem_verlauf(logik_test))
+    assert logik.starten()
+    heute = np.datetime64(datetime.date.today(), "D")
+    assert logik.datenbank.abfragen("SELECT COUNT(*) FROM modul_ereignis;")[0][0] == 1
+    assert logik.datenbank.abfragen("SELECT COUNT(*) FROM verlauf WHERE zeitpunkt < '2024-08-24';")[0][0] == 600, \
+        "Ohne gesetzte Frist darf der Start keine Tageswerte löschen."
+
+    tage, offen, _, abgeschlossen = logik.get_studienfortschritt_spalten(zeitraum="tag")
+    assert len(tage) == 601 and tage[0] == np.datetime64("2023-01-01") and tage[-1] == heute
+    assert (offen[0], abgeschlossen[0]) == (600, 0) and (offen[-1], abgeschlossen[-1]) == (1, 0)
+
+    tage, offen, _, _ = logik.get_studienfortschritt_spalten(zeitraum="monat")
+    assert tage.astype(str).tolist()[:2] == ["2023-01-01", "2023-02-01"] and len(tage) == 21
+    assert offen[0] == 600 - 30 and tage[-1] == heute.astype("datetime64[M]").astype("datetime64[D]")
+    assert (np.diff(tage) > np.timedelta64(0, "D")).all()
+    assert len(logik.get_studienfortschritt_spalten(zeitraum="auto")[0]) > 1
+    logik.beenden()
+
+
+def test_diagramm_liest_verdichteten_verlauf(logik_test):
+    """
+    Testet, ob das Diagramm nach dem Verdichten beim Start die Wochen- und Monatswerte
+    anzeigt, statt die gelöschten Tageswerte zu verlieren.
+    """
+    db_pfad = _datenbank_mit_altem_verlauf(logik_test)
+    logik = Logik(db_pfad=db_pfad)
+    assert logik.starten()
+    monatlich = [spalte.tolist() for spalte in logik.get_studienfortschritt_spalten(zeitraum="monat")]
+    logik.beenden()
+
+    logik = Logik(db_pfad=db_pfad, verlauf_aufbewahrung_tage=365)
+    assert logik.starten()
+    assert logik.datenbank.abfragen("SELECT COUNT(*) FROM verlauf WHERE zeitpunkt < '2024-08-24';")[0][0] == 0
+
+    assert [spalte.tolist() for spalte in logik.get_studienfortschritt_spalten(zeitraum="monat")] == monatlich
+    tage, offen, _, abgeschlossen = logik.get_studienfortschritt_spalten(zeitraum="auto")
+    assert tage[0] == np.datetime64("2022-12-26"), "Für den langen Bereich werden Wochenwerte gelesen."
+    assert (offen[0], abgeschlossen[0]) == (600, 0) and len(tage) > 80
+    assert (np.diff(tage[:-1]) == np.timedelta64(7, "D")).all()
+    assert tage[-2] == np.datetime64("2024-08-19"), "Nach dem gespeicherten Verlauf folgt die Woche des Upgrades."
+    logik.beenden()
+
+
+def test_zeitraum_waehlen():
+    """Testet, ob der feinste Zeitraum gewählt wird, der in die Punktzahl passt und vollständig vorliegt."""
+    assert Logik.zeitraum_waehlen("2024-01-01", "2024-12-31", 1000) == "tag"
+    assert Logik.zeitraum_waehlen("2024-01-01", "2024-12-31", 100) == "woche"
+    assert Logik.zeitraum_waehlen("2000-01-01", "2024-12-31", 100) == "monat"
+    assert Logik.zeitraum_waehlen("2024-01-01", "2024-12-31", 1000, erster_tageswert="2024-06-01") == "woche"
+
+
+def test_modulaenderungen_werden_protokolliert(logik_test):
+    """
+    Testet, ob Moduländerungen automatisch und unveränderlich im Ereignisprotokoll landen.
+    """
+    logik_test.set_startbildschirm_ansicht_daten(("Informatik", "2022-10-01", 0, "Vollzeit"))
+    logik_test.set_moduluebersicht_ansicht_daten("INSERT", (1, "Mathematik I", "MA1", "Offen", 5, "2023-10-01"))
+    modul_id = logik_test.datenbank.abfragen("SELECT modulID FROM modul;")[0][0]
+    logik_test.set_moduluebersicht_ansicht_daten(
+        "UPDATE", (modul_id, "Mathematik I", "MA1", "Abgeschlossen", 5, "2023-10-01")
+    )
+    logik_test.set_moduluebersicht_ansicht_daten("DELETE", (modul_id,))
+
+    ereignisse = logik_test.datenbank.abfragen("SELECT statusAlt, statusNeu FROM modul_ereignis ORDER BY ereignisID;")
+    assert ereignisse == [(None, "Offen"), ("Offen", "Abgeschlossen"), ("Abgeschlossen", None)]
+    assert not logik_test.datenbank.manipulieren("DELETE FROM modul_ereignis;"), \
+        "Das Ereignisprotokoll sollte nicht gelöscht werden können."
+    assert logik_test.get_studienfortschritt_verlauf()[-1][:3] == (0, 0, 0)
+
+
+def test_ansichten_werden_zwischengespeichert(logik_test):
+    """
+    Testet, ob wiederholte Abrufe aus dem Cache kommen und Schreibzugriffe nur
+    die betroffenen Ansichten verwerfen.
+    """
+    logik_test.set_startbildschirm_ansicht_daten(("Informatik", "2022-10-01", 0, "Vollzeit"))
+    assert logik_test.get_moduluebersicht_ansicht_daten() == []
+    logik_test.get_startbildschirm_ansicht_daten()
+    logik_test.get_moduluebersicht_ansicht_daten()
+    assert logik_test.cache_statistik()["treffer"] == 1
+
+    logik_test.set_moduluebersicht_ansicht_daten("INSERT", (1, "Mathematik I", "MA1", "Offen", 5, "2023-10-01"))
+    assert ("moduluebersicht", ()) not in logik_test.cache, "Die Modulübersicht sollte verworfen werden."
+    assert ("startbildschirm", ()) in logik_test.cache, "Der Startbildschirm hängt nicht von modul ab."
+    assert len(logik_test.get_moduluebersicht_ansicht_daten()) == 1
+
+
+def test_cache_nach_rollback_verworfen(logik_test):
+    """
+    Testet, ob innerhalb einer zurückgerollten Transaktion gelesene Daten nicht im Cache bleiben.
+    """
+    logik_test.set_startbildschirm_ansicht_daten(("Informatik", "2022-10-01", 0, "Vollzeit"))
+    with pytest.raises(RuntimeError):
+        with logik_test.transaktion():
+            logik_test.set_moduluebersicht_ansicht_daten("INSERT", (1, "Mathematik I", "MA1", "Offen", 5, "2023-10-01"))
+            assert len(logik_test.get_moduluebersicht_ansicht_daten()) == 1
+            raise RuntimeError("Abbruch")
+
+    assert logik_test.get_moduluebersicht_ansicht_daten() == []
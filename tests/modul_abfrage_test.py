@@ -0,0 +1,145 @@
+# tests/modul_abfrage_test.py
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../dashboard')))
+
+import pytest
+from pathlib import Path
+
+from dashboard.logik import Logik
+from dashboard.modul_abfrage import ModulAbfrage, SORTIERSPALTEN
+from dashboard.virtuelle_tabelle import Seitenpuffer
+
+ANZAHL_MODULE = 600
+STATUS = ["Offen", "In Bearbeitung", "Abgeschlossen"]
+
+
+@pytest.fixture(scope="module")
+def logik_test():
+    """Fixture mit gestarteter Logik und Modulen mit abwechslungsreichen Werten."""
+    test_db_pfad = "data/test_modul_abfrage.db"
+    if Path(test_db_pfad).exists():
+        Path(test_db_pfad).unlink()
+
+    logik = Logik(db_pfad=test_db_pfad)
+    logik.starten()
+    logik.set_startbildschirm_ansicht_daten(("Informatik", "2022-10-01", 0, "Vollzeit"))
+    namen = ["Mathematik", "mathematische Logik", "Programmierung", "Datenbanken", "Übersetzerbau"]
+    module = [
+        (i % 6 + 1, f"{namen[i % 5]} {i // 5}", f"K{i:04d}", STATUS[i % 3], 5 * (i % 2 + 1),
+         f"2023-{i % 12 + 1:02d}-{i % 28 + 1:02d}")
+        for i in range(ANZAHL_MODULE)
+    ]
+    assert logik.module_importieren(module)[0] == ANZAHL_MODULE
+    yield logik
+
+    logik.beenden()
+    if Path(test_db_pfad).exists():
+        Path(test_db_pfad).unlink()
+
+
+def alle_zeilen(logik, sql_bedingung="1", parameter=()):
+    return logik.datenbank.abfragen(f"SELECT * FROM moduluebersicht WHERE {sql_bedingung};", parameter)
+
+
+def erwartet(zeilen, sortierung, absteigend=False):
+    index = SORTIERSPALTEN[sortierung][1]
+    schluessel = (lambda z: (z[index].lower(), z[0])) if sortierung == "modulName" else (lambda z: (z[index], z[0]))
+    return sorted(zeilen, key=schluessel, reverse=absteigend)
+
+
+def test_fts_ausdruck():
+    """Testet, ob Eingaben als Präfixsuche ohne FTS-Syntax übersetzt werden."""
+    assert ModulAbfrage.fts_ausdruck("math grund") == '"math"* "grund"*'
+    assert ModulAbfrage.fts_ausdruck('a"b OR c*') == '"a"* "b"* "OR"* "c"*'
+    assert ModulAbfrage.fts_ausdruck("  -- ") == ""
+
+
+def test_parameter_statt_werte_im_sql():
+    """Testet, ob Filterwerte nur als Parameter und nie im SQL-Text landen."""
+    abfrage = ModulAbfrage("modulName", status="Offen'; DROP TABLE modul; --", suchtext="x")
+    sql, parameter = abfrage.seite_sql(10, nach=(1, 1, "Name", "K", "Offen", 5, "2023-01-01"))
+    assert "DROP" not in sql
+    assert parameter[0] == "Offen'; DROP TABLE modul; --"
+
+    with pytest.raises(ValueError):
+        ModulAbfrage("modulName; DROP TABLE modul")
+
+
+@pytest.mark.parametrize("sortierung", list(SORTIERSPALTEN))
+@pytest.mark.parametrize("absteigend", [False, True])
+def test_sortierte_seiten_entsprechen_vollstaendiger_sortierung(logik_test, sortierung, absteigend):
+    """Testet, ob Keyset-Seiten vorwärts, rückwärts und per Position der vollständigen Sortierung entsprechen."""
+    abfrage = ModulAbfrage(sortierung, absteigend)
+    soll = erwartet(alle_zeilen(logik_test), sortierung, absteigend)
+    puffer = Seitenpuffer(lambda anzahl, **grenze: logik_test.get_moduluebersicht_seite(anzahl, abfrage=abfrage, **grenze),
+                          lambda: logik_test.get_moduluebersicht_anzahl(abfrage), seitengroesse=50, max_seiten=2)
+
+    assert puffer.zeilen(300, 320) == soll[300:320]
+    for start in range(320, 600, 40):
+        assert puffer.zeilen(start, start + 40) == soll[start:start + 40]
+    for start in range(260, 0, -40):
+        assert puffer.zeilen(start, start + 40) == soll[start:start + 40]
+    assert puffer.abfragen["keyset"] > puffer.abfragen["position"]
+
+
+def test_filter(logik_test):
+    """Testet Status-, Semester-, ECTS- und Datumsfilter einzeln und kombiniert."""
+    abfrage = ModulAbfrage("modulStart", status="Offen", semester=1, ects=5, von="2023-03-01", bis="2023-08-31")
+    soll = erwartet(alle_zeilen(
+        logik_test,
+        "modulStatus = 'Offen' AND semesterNR = 1 AND modulEctsPunkte = 5 AND modulStart BETWEEN '2023-03-01' AND '2023-08-31'"
+    ), "modulStart")
+
+    assert soll, "Die Testdaten sollten Treffer für die Filterkombination enthalten."
+    assert logik_test.get_moduluebersicht_anzahl(abfrage) == len(soll)
+    assert logik_test.get_moduluebersicht_seite(1000, abfrage=abfrage) == soll
+    assert logik_test.get_moduluebersicht_anzahl(ModulAbfrage(status="Offen")) == ANZAHL_MODULE // 3
+
+
+def test_volltextsuche(logik_test):
+    """Testet die Präfixsuche in Name und Kürzel, unabhängig von Groß-/Kleinschreibung und Umlauten."""
+    def treffer(suchtext):
+        return logik_test.get_moduluebersicht_anzahl(ModulAbfrage(suchtext=suchtext))
+
+    assert treffer("math") == 2 * ANZAHL_MODULE // 5
+    assert treffer("Mathematische log") == ANZAHL_MODULE // 5
+    assert treffer("uebersetzer") == 0
+    assert treffer("ubersetzer") == ANZAHL_MODULE // 5
+    assert treffer("K0042") == 1
+    assert treffer("---") == 0
+
+
+def test_suchindex_folgt_aenderungen(logik_test):
+    """Testet, ob der FTS-Index nach INSERT, UPDATE und DELETE synchron zu `modul` bleibt."""
+    def treffer(suchtext):
+        return [zeile[3] for zeile in logik_test.get_moduluebersicht_seite(10, abfrage=ModulAbfrage(suchtext=suchtext))]
+
+    assert logik_test.set_moduluebersicht_ansicht_daten("INSERT", (1, "Quantenkryptografie", "QK1", "Offen", 5, "2024-01-01"))
+    assert treffer("quanten") == ["QK1"]
+
+    modul_id = logik_test.datenbank.abfragen("SELECT modulID FROM modul WHERE modulKuerzel = 'QK1';")[0][0]
+    assert logik_test.set_moduluebersicht_ansicht_daten("UPDATE", (modul_id, "Kryptoanalyse", "QK2", "Offen", 5, "2024-01-01"))
+    assert treffer("quanten") == []
+    assert treffer("krypto") == ["QK2"]
+    assert treffer("QK1") == []
+
+    assert logik_test.set_moduluebersicht_ansicht_daten("DELETE", (modul_id,))
+    assert treffer("krypto") == []
+    assert logik_test.datenbank.abfragen("INSERT INTO modul_suche(modul_suche) VALUES ('integrity-check');") == []
+
+
+@pytest.mark.parametrize("abfrage, index", [
+    (ModulAbfrage("modulName"), "idx_modul_name"),
+    (ModulAbfrage("semesterNR", absteigend=True), "idx_modul_semester"),
+    (ModulAbfrage("modulStart", absteigend=True), "idx_modul_start"),
+    (ModulAbfrage("modulEctsPunkte"), "idx_modul_ects"),
+    (ModulAbfrage(status="Offen"), "idx_modul_status"),
+])
+def test_abfragen_nutzen_index(logik_test, abfrage, index):
+    """Testet, ob Sortierung und Filter über einen Index statt einer Sortierung im Speicher laufen."""
+    sql, parameter = abfrage.seite_sql(50, nach=alle_zeilen(logik_test)[0])
+    plan = " | ".join(zeile[3] for zeile in logik_test.datenbank.abfragen(f"EXPLAIN QUERY PLAN {sql}", parameter))
+
+    assert index in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
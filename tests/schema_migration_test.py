@@ -0,0 +1,151 @@
+# dateiname: schema_migration_test.py
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../dashboard')))
+
+import copy
+import sqlite3
+import pytest
+
+from dashboard.schema_migration import SchemaMigration, Migrationsschritt
+
+DEFINITIONEN = [
+    ("semester.yaml", {
+        "tabelle": "semester",
+        "spalten": {"semesterID": "INTEGER PRIMARY KEY AUTOINCREMENT", "semesterNR": "INTEGER NOT NULL"},
+    }),
+    ("modul.yaml", {
+        "tabelle": "modul",
+        "spalten": {
+            "modulID": "INTEGER PRIMARY KEY AUTOINCREMENT",
+            "semesterID": "INTEGER NOT NULL REFERENCES semester(semesterID) ON DELETE CASCADE",
+            "modulName": "TEXT NOT NULL",
+        },
+    }),
+    ("ansichten.yaml", {
+        "views": {"module": ["CREATE VIEW IF NOT EXISTS module AS SELECT modulName FROM modul;"]},
+    }),
+]
+
+
+@pytest.fixture(scope="function")
+def migration():
+    """Fixture mit einer In-Memory-Datenbank, auf die die Basisdefinitionen angewendet wurden."""
+    verbindung = sqlite3.connect(":memory:", isolation_level=None)
+    verbindung.execute("PRAGMA foreign_keys = ON;")
+    migration = SchemaMigration(verbindung)
+    migration.anwenden(migration.planen(DEFINITIONEN), DEFINITIONEN)
+    verbindung.execute("INSERT INTO semester (semesterNR) VALUES (1);")
+    verbindung.execute("INSERT INTO modul (semesterID, modulName) VALUES (1, 'Mathe I');")
+    verbindung.commit()
+    yield migration
+    verbindung.close()
+
+
+def _aendere_modul(spalten_aenderung):
+    """Liefert eine Kopie der Definitionen mit geänderten `modul`-Spalten."""
+    definitionen = copy.deepcopy(DEFINITIONEN)
+    spalten_aenderung(definitionen[1][1]["spalten"])
+    return definitionen
+
+
+def test_unveraenderte_definitionen_ohne_schritte(migration):
+    """Testet, ob für ein unverändertes Schema keine Migrationsschritte geplant werden."""
+    assert migration.planen(DEFINITIONEN) == []
+
+
+def test_spalte_hinzufuegen(migration):
+    """Testet, ob eine neue Spalte per ADD COLUMN ohne Neuaufbau ergänzt wird."""
+    definitionen = _aendere_modul(lambda spalten: spalten.update(modulNotiz="TEXT DEFAULT ''"))
+    schritte = migration.planen(definitionen)
+
+    assert [(s.art, s.ziel) for s in schritte] == [(Migrationsschritt.SPALTE_HINZUFUEGEN, "modul")]
+    migration.anwenden(schritte, definitionen)
+
+    zeile = migration.verbindung.execute("SELECT modulName, modulNotiz FROM modul;").fetchone()
+    assert zeile == ("Mathe I", "")
+    assert migration.planen(definitionen) == []
+
+
+def test_tabelle_neu_aufbauen_erhaelt_daten(migration):
+    """Testet, ob eine geänderte Spalte per Neuaufbau migriert wird, ohne Daten oder andere Tabellen zu verändern."""
+    definitionen = _aendere_modul(lambda spalten: spalten.update(modulName="TEXT NOT NULL UNIQUE"))
+    schritte = migration.planen(definitionen)
+
+    arten = [(s.art, s.ziel) for s in schritte]
+    assert (Migrationsschritt.TABELLE_NEU_AUFBAUEN, "modul") in arten
+    assert not any(ziel == "semester" for _, ziel in arten), "Unveränderte Tabellen dürfen nicht neu aufgebaut werden."
+    assert arten[-1] == (Migrationsschritt.VIEW_NEU_ERSTELLEN, "module")
+
+    migration.anwenden(schritte, definitionen)
+    assert migration.verbindung.execute("SELECT * FROM module;").fetchall() == [("Mathe I",)]
+    assert migration.verbindung.execute("SELECT COUNT(*) FROM semester;").fetchone()[0] == 1
+
+
+def test_fehlgeschlagene_migration_wird_zurueckgerollt(migration):
+    """Testet, ob eine nicht anwendbare Migration vollständig zurückgerollt wird."""
+    definitionen = _aendere_modul(lambda spalten: spalten.update(modulPflicht="TEXT NOT NULL"))
+    schritte = migration.planen(definitionen)
+
+    with pytest.raises(sqlite3.Error):
+        migration.anwenden(schritte, definitionen)
+
+    spalten = [zeile[1] for zeile in migration.verbindung.execute("PRAGMA table_info(modul);")]
+    assert "modulPflicht" not in spalten
+    assert migration.verbindung.execute("SELECT COUNT(*) FROM modul;").fetchone()[0] == 1
+
+
+def test_indizes_erstellen_und_entfernen(migration):
+    """Testet zusammengesetzte und partielle Indizes sowie das Entfernen nicht mehr deklarierter Indizes."""
+    definitionen = copy.deepcopy(DEFINITIONEN)
+    definitionen[1][1]["indizes"] = {
+        "idx_modul_semester_name": {"spalten": ["semesterID", "modulName"]},
+        "idx_modul_name_eindeutig": {"spalten": ["modulName"], "eindeutig": True, "bedingung": "semesterID > 0"},
+    }
+    schritte = migration.planen(definitionen)
+    assert [s.art for s in schritte] == [Migrationsschritt.INDEX_ERSTELLEN] * 2
+    migration.anwenden(schritte, definitionen)
+
+    indizes = dict(migration.verbindung.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%';"
+    ).fetchall())
+    assert indizes["idx_modul_semester_name"].endswith("ON modul (semesterID, modulName)")
+    assert indizes["idx_modul_name_eindeutig"].startswith("CREATE UNIQUE INDEX")
+    assert indizes["idx_modul_name_eindeutig"].endswith("WHERE semesterID > 0")
+    assert migration.planen(definitionen) == []
+
+    del definitionen[1][1]["indizes"]["idx_modul_semester_name"]
+    schritte = migration.planen(definitionen)
+    assert [(s.art, s.ziel) for s in schritte] == [(Migrationsschritt.INDEX_ENTFERNEN, "idx_modul_semester_name")]
+    migration.anwenden(schritte, definitionen)
+    assert migration.planen(definitionen) == []
+
+
+def test_trigger_und_erstbefuellung(migration):
+    """Testet, ob eine neue Tabelle einmalig befüllt wird und ihre Trigger angelegt werden."""
+    definitionen = copy.deepcopy(DEFINITIONEN) + [("modul_anzahl.yaml", {
+        "tabelle": "modul_anzahl",
+        "spalten": {"semesterID": "INTEGER PRIMARY KEY", "anzahl": "INTEGER NOT NULL DEFAULT 0"},
+        "befuellen": ["INSERT INTO modul_anzahl SELECT semesterID, COUNT(*) FROM modul GROUP BY semesterID;"],
+        "trigger": {"modul_anzahl_insert": [
+            "CREATE TRIGGER IF NOT EXISTS modul_anzahl_insert AFTER INSERT ON modul BEGIN "
+            "UPDATE modul_anzahl SET anzahl = anzahl + 1 WHERE semesterID = NEW.semesterID; END;"
+        ]},
+    })]
+    schritte = migration.planen(definitionen)
+    assert [s.art for s in schritte] == [
+        Migrationsschritt.TABELLE_ERSTELLEN,
+        Migrationsschritt.TABELLE_BEFUELLEN,
+        Migrationsschritt.TRIGGER_NEU_ERSTELLEN,
+    ]
+    migration.anwenden(schritte, definitionen)
+    migration.verbindung.execute("INSERT INTO modul (semesterID, modulName) VALUES (1, 'Mathe II');")
+    assert migration.verbindung.execute("SELECT anzahl FROM modul_anzahl;").fetchone()[0] == 2
+
+    # Beim Neuaufbau von 'modul' wird der Trigger neu angelegt, aber nicht erneut befüllt
+    definitionen[1][1]["spalten"]["modulName"] = "TEXT NOT NULL UNIQUE"
+    schritte = migration.planen(definitionen)
+    assert Migrationsschritt.TABELLE_BEFUELLEN not in [s.art for s in schritte]
+    migration.anwenden(schritte, definitionen)
+    migration.verbindung.execute("INSERT INTO modul (semesterID, modulName) VALUES (1, 'Mathe III');")
+    assert migration.verbindung.execute("SELECT anzahl FROM modul_anzahl;").fetchone()[0] == 3
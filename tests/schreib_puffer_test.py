@@ -0,0 +1,128 @@
+# tests/schreib_puffer_test.py
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../dashboard')))
+
+import pytest
+from pathlib import Path
+
+from dashboard.logik import Logik
+
+
+class AfterWarteschlange:
+    """Ersetzt die Tk-Ereignisschleife: sammelt `after()`-Aufrufe und führt sie auf Anforderung aus."""
+
+    def __init__(self):
+        self.geplant = []
+
+    def after(self, ms, funktion):
+        self.geplant.append(funktion)
+
+    def ausfuehren(self):
+        geplant, self.geplant = self.geplant, []
+        for funktion in geplant:
+            funktion()
+
+
+@pytest.fixture(scope="function")
+def logik_test():
+    """Fixture mit gestarteter Logik und angelegtem Studiengang."""
+    test_db_pfad = "data/test_datenbank.db"
+    if Path(test_db_pfad).exists():
+        Path(test_db_pfad).unlink()
+
+    logik = Logik(db_pfad=test_db_pfad)
+    logik.starten()
+    logik.set_startbildschirm_ansicht_daten(("Informatik", "2022-10-01", 0, "Vollzeit"))
+    yield logik
+
+    logik.beenden()
+    if Path(test_db_pfad).exists():
+        Path(test_db_pfad).unlink()
+
+
+def anzahl_module(logik):
+    return logik.datenbank.abfragen("SELECT COUNT(*) FROM modul;")[0][0]
+
+
+def test_aenderungen_werden_gebuendelt(logik_test):
+    """Testet, ob eingereihte Änderungen sofort bestätigt und gesammelt geschrieben werden."""
+    puffer = logik_test.schreibpuffer_aktivieren(sammelzeit=0.2)
+    for i in range(20):
+        assert logik_test.set_moduluebersicht_ansicht_daten("INSERT", (1, f"Modul {i}", f"M{i}", "Offen", 5, "2023-10-01"))
+
+    assert puffer.barriere(timeout=5)
+    assert anzahl_module(logik_test) == 20
+    assert puffer.geschriebene_stapel < 20, "Die Änderungen sollten in Stapeln geschrieben werden."
+    assert len(logik_test.get_moduluebersicht_ansicht_daten()) == 20
+
+
+def test_konflikt_wird_gemeldet(logik_test):
+    """Testet, ob ein doppeltes Kürzel gemeldet wird, ohne die übrigen Änderungen zu verwerfen."""
+    puffer = logik_test.schreibpuffer_aktivieren(sammelzeit=0.2)
+    rueckmeldungen = []
+    for kuerzel in ("MA1", "MA1", "MA2"):
+        logik_test.set_moduluebersicht_ansicht_daten(
+            "INSERT", (1, "Mathematik", kuerzel, "Offen", 5, "2023-10-01"),
+            lambda erfolg, meldung, kuerzel=kuerzel: rueckmeldungen.append((kuerzel, erfolg, meldung))
+        )
+    logik_test.set_moduluebersicht_ansicht_daten(
+        "DELETE", (999,), lambda erfolg, meldung: rueckmeldungen.append(("999", erfolg, meldung))
+    )
+
+    assert puffer.barriere(timeout=5)
+    assert [(kuerzel, erfolg) for kuerzel, erfolg, _ in rueckmeldungen] == [
+        ("MA1", True), ("MA1", False), ("MA2", True), ("999", False)
+    ]
+    assert "UNIQUE" in rueckmeldungen[1][2]
+    assert anzahl_module(logik_test) == 2
+
+
+def test_ausnahme_betrifft_nur_eine_aenderung(logik_test):
+    """Testet, ob eine Ausnahme (kein SQLite-Fehler) nur ihre Änderung scheitern lässt, nicht den Stapel."""
+    puffer = logik_test.schreibpuffer_aktivieren(sammelzeit=0.2)
+    rueckmeldungen = []
+    logik_test.set_moduluebersicht_ansicht_daten(
+        "INSERT", (1, "Betriebssysteme", "B1", "Offen", 5, "2023-10-01"),
+        lambda erfolg, meldung: rueckmeldungen.append(("B1", erfolg, meldung))
+    )
+    # Ein UPDATE mit falscher Anzahl an Werten löst einen TypeError aus
+    logik_test.set_moduluebersicht_ansicht_daten(
+        "UPDATE", (1, 1, "Mathematik", "MA1", "Offen", 5, "2023-10-01"),
+        lambda erfolg, meldung: rueckmeldungen.append(("UPDATE", erfolg, meldung))
+    )
+
+    assert puffer.barriere(timeout=5)
+    assert [(name, erfolg) for name, erfolg, _ in rueckmeldungen] == [("B1", True), ("UPDATE", False)]
+    assert "TypeError" in rueckmeldungen[1][2]
+    assert anzahl_module(logik_test) == 1 and puffer.geschriebene_stapel == 1
+
+
+def test_rueckmeldung_im_tk_thread(logik_test):
+    """Testet, ob Rückmeldungen mit Widget erst über `after()` ausgeliefert werden."""
+    widget = AfterWarteschlange()
+    puffer = logik_test.schreibpuffer_aktivieren(widget)
+    rueckmeldungen = []
+    logik_test.set_moduluebersicht_ansicht_daten(
+        "INSERT", (1, "Mathematik I", "MA1", "Offen", 5, "2023-10-01"),
+        lambda erfolg, meldung: rueckmeldungen.append(erfolg)
+    )
+
+    assert puffer.barriere(timeout=5)
+    assert rueckmeldungen == []
+    widget.ausfuehren()
+    assert rueckmeldungen == [True]
+    assert widget.geplant == [], "Ohne offene Rückmeldungen wird nicht weiter abgefragt."
+
+
+def test_haltelinie_beim_beenden(logik_test):
+    """Testet, ob beim Beenden alle gepufferten Änderungen festgeschrieben werden."""
+    logik_test.schreibpuffer_aktivieren(sammelzeit=1.0)
+    for i in range(5):
+        logik_test.set_moduluebersicht_ansicht_daten("INSERT", (1, f"Modul {i}", f"M{i}", "Offen", 5, "2023-10-01"))
+
+    logik_test.schreibpuffer_beenden()
+    assert logik_test.schreibpuffer is None
+    assert anzahl_module(logik_test) == 5
+    assert logik_test.set_moduluebersicht_ansicht_daten("INSERT", (1, "Direkt", "D1", "Offen", 5, "2023-10-01"))
+    assert anzahl_module(logik_test) == 6, "Ohne Puffer wird wieder direkt geschrieben."
@@ -0,0 +1,106 @@
+# tests/verbindungs_pool_test.py
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../dashboard')))
+
+import sqlite3
+import threading
+import pytest
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from dashboard.datenbank_zugriff import DatenbankZugriff, VERBINDUNGSPROFILE
+from dashboard.verbindungs_pool import VerbindungsPool
+
+
+@pytest.fixture(scope="function")
+def pool_db():
+    """Fixture mit einem Datenbankzugriff im Pool-Betrieb (zwei Leseverbindungen)."""
+    test_db_pfad = "data/test_datenbank.db"
+    if Path(test_db_pfad).exists():
+        Path(test_db_pfad).unlink()
+
+    db = DatenbankZugriff(db_pfad=test_db_pfad, pool_groesse=2)
+    db.starten()
+    db.studiengang_speichern("Informatik", "2023-10-01", 0, "Vollzeit")
+    yield db
+
+    db.trennen()
+    if Path(test_db_pfad).exists():
+        Path(test_db_pfad).unlink()
+
+
+def test_parallele_leser(pool_db):
+    """Testet, ob mehrere Threads gleichzeitig über den Pool lesen können."""
+    barriere = threading.Barrier(2, timeout=5)
+
+    def lesen(_):
+        with pool_db.pool.lesen() as verbindung:
+            barriere.wait()  # beide Leser halten gleichzeitig eine Verbindung
+            return verbindung.execute("SELECT COUNT(*) FROM semester;").fetchone()[0]
+
+    with ThreadPoolExecutor(max_workers=2) as ausfuehrer:
+        assert list(ausfuehrer.map(lesen, range(2))) == [6, 6]
+    assert pool_db.pool.statistik()["leseverbindungen"] == 2
+
+
+def test_lesen_waehrend_transaktion(pool_db):
+    """Testet, ob andere Threads während einer Transaktion den letzten festgeschriebenen Stand lesen."""
+    with pool_db.transaktion():
+        pool_db.modul_speichern(1, "Mathematik I", "MA1", "Offen", 5, "2023-10-01")
+        assert pool_db.abfragen("SELECT COUNT(*) FROM modul;")[0][0] == 1, \
+            "Innerhalb der Transaktion sollte die eigene Änderung sichtbar sein."
+        with ThreadPoolExecutor(max_workers=1) as ausfuehrer:
+            anzahl = ausfuehrer.submit(pool_db.abfragen, "SELECT COUNT(*) FROM modul;").result(timeout=5)
+        assert anzahl[0][0] == 0, "Andere Threads sollten die offene Transaktion nicht sehen."
+
+    assert pool_db.abfragen("SELECT COUNT(*) FROM modul;")[0][0] == 1
+
+
+def test_schreiber_serialisiert(pool_db):
+    """Testet, ob parallele Schreibzugriffe nacheinander ausgeführt werden und alle ankommen."""
+    def speichern(i):
+        with pool_db.transaktion():
+            return pool_db.modul_speichern(i % 6 + 1, f"Modul {i}", f"M{i}", "Offen", 5, "2023-10-01")
+
+    with ThreadPoolExecutor(max_workers=4) as ausfuehrer:
+        assert all(ausfuehrer.map(speichern, range(40)))
+    assert pool_db.abfragen("SELECT COUNT(*) FROM modul;")[0][0] == 40
+    assert pool_db.pool.statistik()["schreiben"]["ausleihen"] >= 40
+
+
+def test_wartezeit_und_zeitueberschreitung(tmp_path):
+    """Testet, ob ein erschöpfter Pool nach der Wartezeit abbricht und Wartezeiten gezählt werden."""
+    pool = VerbindungsPool(str(tmp_path / "pool.db"), VERBINDUNGSPROFILE["interaktiv"], groesse=1, wartezeit=0.05)
+    try:
+        with pool.lesen():
+            with pytest.raises(sqlite3.OperationalError):
+                with pool.lesen():
+                    pass
+        statistik = pool.statistik()
+        assert statistik["lesen"]["ausleihen"] == 1
+        assert statistik["lesen"]["wartezeit_max"] >= 0
+    finally:
+        pool.schliessen()
+
+
+def test_defekte_verbindung_wird_ersetzt(tmp_path):
+    """Testet, ob eine unbrauchbare Leseverbindung bei der Gesundheitsprüfung ersetzt wird."""
+    pool = VerbindungsPool(str(tmp_path / "pool.db"), VERBINDUNGSPROFILE["interaktiv"], groesse=1, pruefintervall=0)
+    try:
+        with pool.lesen() as verbindung:
+            defekt = verbindung
+        defekt.close()
+        with pool.lesen() as verbindung:
+            assert verbindung is not defekt
+            assert verbindung.execute("SELECT 1;").fetchone() == (1,)
+        assert pool.statistik()["ersetzte_verbindungen"] == 1
+    finally:
+        pool.schliessen()
+
+
+def test_leser_sind_schreibgeschuetzt(pool_db):
+    """Testet, ob über Leseverbindungen keine Änderungen möglich sind."""
+    with pool_db.pool.lesen() as verbindung:
+        with pytest.raises(sqlite3.OperationalError):
+            verbindung.execute("DELETE FROM studiengang;")
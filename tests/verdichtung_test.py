@@ -0,0 +1,54 @@
+# tests/verdichtung_test.py
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../dashboard')))
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from dashboard.verdichtung import lttb, min_max, verdichten
+
+
+@pytest.fixture
+def zufallsreihe():
+    """Eine lange, zufällig auf- und absteigende Tagesreihe."""
+    schritte = np.random.default_rng(0).integers(-1, 2, 100_000)
+    return np.arange(len(schritte), dtype=float), np.cumsum(schritte)
+
+
+def test_min_max_behaelt_extremwerte(zufallsreihe):
+    """Testet, ob Minimum und Maximum jedes Abschnitts sowie Anfang und Ende erhalten bleiben."""
+    x, y = zufallsreihe
+    indizes = min_max(y, 500)
+
+    assert len(indizes) <= 2 * 500 + 2
+    assert indizes[0] == 0 and indizes[-1] == len(y) - 1
+    assert (np.diff(indizes) > 0).all(), "Die Indizes müssen aufsteigend und eindeutig sein."
+    for abschnitt in np.array_split(np.arange(len(y)), 500)[:5]:
+        gewaehlt = y[indizes[(indizes >= abschnitt[0]) & (indizes <= abschnitt[-1])]]
+        assert gewaehlt.min() == y[abschnitt].min() and gewaehlt.max() == y[abschnitt].max()
+
+
+def test_lttb(zufallsreihe):
+    """Testet, ob LTTB genau die gewünschte Punktzahl liefert, auch mit Min/Max-Vorauswahl."""
+    x, y = zufallsreihe
+    for punkte in (800, 30_000):
+        indizes = lttb(x, y, punkte)
+        assert len(indizes) == punkte
+        assert indizes[0] == 0 and indizes[-1] == len(y) - 1
+        assert (np.diff(indizes) > 0).all()
+
+    # Ein einzelner Ausreißer bildet das größte Dreieck und wird gewählt
+    spitze = np.zeros(1000)
+    spitze[437] = 50
+    assert 437 in lttb(np.arange(1000), spitze, 20)
+
+
+def test_kurze_reihen_bleiben_unveraendert():
+    """Testet, ob Reihen mit höchstens so vielen Punkten wie Pixeln vollständig bleiben."""
+    y = np.array([3, 1, 4, 1, 5])
+    assert verdichten(np.arange(5), y, 800, "lttb").tolist() == [0, 1, 2, 3, 4]
+    assert verdichten(np.arange(5), y, 800, "minmax").tolist() == [0, 1, 2, 3, 4]
+    with pytest.raises(ValueError):
+        verdichten(np.arange(5), y, 800, "mittelwert")
@@ -0,0 +1,233 @@
+# tests/virtuelle_tabelle_test.py
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../dashboard')))
+
+import threading
+import pytest
+from pathlib import Path
+
+from dashboard.logik import Logik
+from dashboard.hintergrund_lader import HintergrundLader
+from dashboard.virtuelle_tabelle import Seitenpuffer, treeview_abgleichen
+from tests.hintergrund_lader_test import AfterWarteschlange
+
+ANZAHL_MODULE = 1000
+
+
+class Treeview:
+    """Ersatz für `ttk.Treeview` (nur oberste Ebene), der jede verändernde Operation zählt."""
+
+    def __init__(self):
+        self.kinder = []
+        self.werte = {}
+        self.abgehaengt = set()
+        self.operationen = 0
+
+    def get_children(self, item=""):
+        return tuple(self.kinder)
+
+    def exists(self, iid):
+        return iid in self.werte
+
+    def insert(self, parent, index, iid, values):
+        self.operationen += 1
+        self.kinder.insert(index, iid)
+        self.werte[iid] = values
+
+    def item(self, iid, values):
+        self.operationen += 1
+        self.werte[iid] = values
+
+    def delete(self, *iids):
+        self.operationen += len(iids)
+        for iid in iids:
+            self.kinder.remove(iid)
+            del self.werte[iid]
+
+    def detach(self, *iids):
+        for iid in iids:
+            self.kinder.remove(iid)
+            self.abgehaengt.add(iid)
+
+    def move(self, iid, parent, index):
+        # Wie Tk: nur abgehängte Einträge oder Einträge hinter `index` werden hier bewegt
+        assert iid in self.abgehaengt or self.kinder.index(iid) >= index
+        self.operationen += 1
+        if iid in self.abgehaengt:
+            self.abgehaengt.remove(iid)
+        else:
+            self.kinder.remove(iid)
+        self.kinder.insert(index, iid)
+
+
+def zeilen(*schluessel, geaendert=()):
+    return [(k, f"Modul {k}{' neu' if k in geaendert else ''}") for k in schluessel]
+
+
+def abgleichen(tree, angezeigt, neu):
+    tree.operationen = 0
+    statistik = treeview_abgleichen(tree, angezeigt, neu)
+    assert list(tree.get_children()) == [str(zeile[0]) for zeile in neu]
+    assert all(tree.werte[str(zeile[0])] == zeile for zeile in neu)
+    assert not tree.abgehaengt
+    return statistik
+
+
+@pytest.fixture(scope="module")
+def logik_test():
+    """Fixture mit gestarteter Logik und vielen importierten Modulen."""
+    test_db_pfad = "data/test_virtuelle_tabelle.db"
+    if Path(test_db_pfad).exists():
+        Path(test_db_pfad).unlink()
+
+    logik = Logik(db_pfad=test_db_pfad)
+    logik.starten()
+    logik.set_startbildschirm_ansicht_daten(("Informatik", "2022-10-01", 0, "Vollzeit"))
+    module = [(i % 6 + 1, f"Modul {i}", f"M{i}", "Offen", 5, "2023-10-01") for i in range(ANZAHL_MODULE)]
+    assert logik.module_importieren(module)[0] == ANZAHL_MODULE
+    yield logik
+
+    logik.beenden()
+    if Path(test_db_pfad).exists():
+        Path(test_db_pfad).unlink()
+
+
+def puffer_erstellen(logik, max_seiten=4):
+    return Seitenpuffer(logik.get_moduluebersicht_seite, logik.get_moduluebersicht_anzahl,
+                        seitengroesse=100, max_seiten=max_seiten)
+
+
+def test_seiten_entsprechen_vollstaendiger_abfrage(logik_test):
+    """Testet, ob beliebige Ausschnitte den Zeilen der vollständigen, sortierten Abfrage entsprechen."""
+    alle = logik_test.datenbank.abfragen("SELECT * FROM moduluebersicht ORDER BY modulID;")
+    puffer = puffer_erstellen(logik_test)
+
+    assert puffer.anzahl() == ANZAHL_MODULE
+    for start, ende in ((0, 20), (95, 130), (550, 560), (980, 1200), (420, 410)):
+        assert puffer.zeilen(start, ende) == alle[start:ende]
+
+
+def test_scrollen_nutzt_keyset(logik_test):
+    """Testet, ob nach einem Sprung die Nachbarseiten per Keyset statt per Position geladen werden."""
+    puffer = puffer_erstellen(logik_test)
+    puffer.zeilen(500, 520)
+    for start in range(520, 900, 20):
+        puffer.zeilen(start, start + 20)
+    for start in range(480, 200, -20):
+        puffer.zeilen(start, start + 20)
+
+    assert puffer.abfragen["position"] == 1
+    assert puffer.abfragen["keyset"] >= 6
+    assert puffer.geladene_seiten <= 4, "Der Puffer darf nur eine begrenzte Anzahl Seiten halten."
+
+
+def test_zeilen_ersetzen_und_leeren(logik_test):
+    """Testet, ob geänderte Zeilen im Puffer ersetzt werden und `leeren` alles verwirft."""
+    puffer = puffer_erstellen(logik_test)
+    zeile = puffer.zeilen(10, 11)[0]
+    geaendert = (zeile[0], zeile[1], "Neu", *zeile[3:])
+
+    assert puffer.zeilen_ersetzen([geaendert]) == 1
+    assert puffer.zeilen(10, 11) == [geaendert]
+
+    puffer.leeren()
+    assert puffer.geladene_seiten == 0
+    assert puffer.zeilen(10, 11) == [zeile]
+
+
+def test_seite_vor_schluessel(logik_test):
+    """Testet die Rückwärtssuche einer Seite vor einem Schlüssel."""
+    alle = logik_test.datenbank.abfragen("SELECT * FROM moduluebersicht ORDER BY modulID;")
+    assert logik_test.get_moduluebersicht_seite(5, vor=alle[50]) == alle[45:50]
+    assert logik_test.get_moduluebersicht_seite(5, nach=alle[50]) == alle[51:56]
+
+
+def abwarten(lader, widget):
+    """Führt die Ereignisschleife aus, bis alle Aufträge des Laders ausgeliefert sind."""
+    while lader._offen:
+        for auftrag in list(lader._offen):
+            auftrag.future.result(timeout=5)
+        widget.ausfuehren()
+
+
+def test_seiten_im_hintergrund(logik_test):
+    """Testet, ob Anzahl und Seiten im Worker-Thread geladen und erst im Rückruf übernommen werden."""
+    alle = logik_test.datenbank.abfragen("SELECT * FROM moduluebersicht ORDER BY modulID;")
+    widget = AfterWarteschlange()
+    lader = HintergrundLader(widget, logik_test)
+    threads, rueckrufe = set(), []
+
+    def seite_laden(leser, anzahl, **grenze):
+        threads.add(threading.get_ident())
+        return leser.get_moduluebersicht_seite(anzahl, **grenze)
+
+    puffer = Seitenpuffer(seite_laden, lambda leser: leser.get_moduluebersicht_anzahl(),
+                          seitengroesse=100, lader=lader)
+    try:
+        assert not puffer.anfordern(150, 170, lambda: rueckrufe.append("fertig"))
+        assert puffer.anzahl() == 0 and not puffer.anzahl_bekannt
+        abwarten(lader, widget)
+        assert puffer.anzahl() == ANZAHL_MODULE and rueckrufe == ["fertig"]
+
+        assert not puffer.anfordern(150, 250, lambda: rueckrufe.append("seite"))
+        assert puffer.geladene_seiten == 0, "Seiten dürfen erst im Rückruf übernommen werden."
+        abwarten(lader, widget)
+        assert rueckrufe.count("seite") == 2
+        assert puffer.anfordern(150, 250, rueckrufe.append)
+        assert puffer.zeilen(150, 250) == alle[150:250]
+        assert threads and threading.get_ident() not in threads
+
+        # Ergebnisse, die vor `leeren()` angefordert wurden, werden verworfen
+        assert not puffer.anfordern(400, 420, lambda: rueckrufe.append("veraltet"))
+        puffer.leeren()
+        assert not lader._offen, "Abgebrochene Aufträge dürfen die Abfrage nicht am Laufen halten."
+        abwarten(lader, widget)
+        assert "veraltet" not in rueckrufe and puffer.geladene_seiten == 0
+
+        # Ein beim Wechsel der Ansicht abgebrochener Auftrag wird erneut angefordert
+        assert not puffer.anfordern(0, 10, rueckrufe.append)
+        lader.alle_abbrechen()
+        assert puffer.unterbrochen
+        assert not puffer.anfordern(0, 10, lambda: rueckrufe.append("erneut"))
+        abwarten(lader, widget)
+        assert puffer.anzahl_bekannt and not puffer.unterbrochen
+    finally:
+        lader.beenden()
+
+
+def test_abgleich_aendert_nur_unterschiede():
+    """Testet, ob der Abgleich nur die tatsächlich geänderten Einträge anfasst."""
+    tree, angezeigt = Treeview(), {}
+    assert abgleichen(tree, angezeigt, zeilen(*range(1, 26)))["eingefuegt"] == 25
+
+    statistik = abgleichen(tree, angezeigt, zeilen(*range(1, 26)))
+    assert tree.operationen == 0 and not any(statistik.values())
+
+    statistik = abgleichen(tree, angezeigt, zeilen(*range(1, 26), geaendert={7}))
+    assert statistik == {"eingefuegt": 0, "aktualisiert": 1, "geloescht": 0, "verschoben": 0}
+
+    # Ein neues Modul oben verschiebt den Bereich um eine Zeile: eine Einfügung, eine Löschung
+    statistik = abgleichen(tree, angezeigt, [(0, "Modul 0"), *zeilen(*range(1, 25), geaendert={7})])
+    assert statistik == {"eingefuegt": 1, "aktualisiert": 0, "geloescht": 1, "verschoben": 0}
+
+
+def test_abgleich_verschiebt_minimal():
+    """Testet, ob bei Umsortierungen nur die Einträge außerhalb der längsten geordneten Folge bewegt werden."""
+    tree, angezeigt = Treeview(), {}
+    abgleichen(tree, angezeigt, zeilen(1, 2, 3, 4, 5, 6))
+
+    assert abgleichen(tree, angezeigt, zeilen(2, 3, 4, 5, 6, 1))["verschoben"] == 1
+    assert abgleichen(tree, angezeigt, zeilen(6, 2, 3, 4, 5, 1))["verschoben"] == 1
+    assert abgleichen(tree, angezeigt, zeilen(1, 2, 3, 4, 5, 6))["verschoben"] == 2
+    statistik = abgleichen(tree, angezeigt, zeilen(1, 6, 5, 9, 4, geaendert={6}))
+    assert statistik["verschoben"] <= 2 and statistik["eingefuegt"] == 1 and statistik["geloescht"] == 2
+
+
+def test_abgleich_nach_externer_loeschung():
+    """Testet, ob optimistisch gelöschte Einträge bei einem Abgleich wieder erscheinen, wenn es sie noch gibt."""
+    tree, angezeigt = Treeview(), {}
+    abgleichen(tree, angezeigt, zeilen(1, 2, 3))
+    tree.delete("2")
+
+    assert abgleichen(tree, angezeigt, zeilen(1, 2, 3))["eingefuegt"] == 1